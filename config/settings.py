@@ -14,6 +14,15 @@ class VoiceConfig:
     voice_language: str = "pt-BR"
     recognition_language: str = "pt-BR"
     wake_word: str = "sexta-feira"  # MUDANÇA AQUI
+    latency_bar: float = 2.0        # síntese de teste máxima para um engine ser usado (s)
+    ready_timeout: float = 15.0     # sem engine pronto até aqui: modo texto (s)
+    breaker_failures: int = 3       # falhas seguidas que tiram um engine de rotação
+    breaker_cooldown: float = 30.0  # tempo fora de rotação antes de uma nova tentativa (s)
+    stt_backend: str = "whisper"    # reconhecimento: "whisper" (local) ou "google"
+    whisper_model: str = "base"     # tiny, base, small... (maior = mais preciso e mais lento)
+    vad_aggressiveness: int = 2     # webrtcvad: 0 (deixa passar mais) a 3 (filtra mais ruído)
+    vad_hangover_ms: int = 300      # silêncio que encerra uma fala
+    vad_min_speech_ms: int = 250    # falas mais curtas (cliques, tosse) são ignoradas
     
 @dataclass
 class ModelConfig:
@@ -78,7 +87,16 @@ def save_config(config: AgentConfig):
             "voice_volume": config.voice.voice_volume,
             "voice_language": config.voice.voice_language,
             "recognition_language": config.voice.recognition_language,
-            "wake_word": config.voice.wake_word
+            "wake_word": config.voice.wake_word,
+            "latency_bar": config.voice.latency_bar,
+            "ready_timeout": config.voice.ready_timeout,
+            "breaker_failures": config.voice.breaker_failures,
+            "breaker_cooldown": config.voice.breaker_cooldown,
+            "stt_backend": config.voice.stt_backend,
+            "whisper_model": config.voice.whisper_model,
+            "vad_aggressiveness": config.voice.vad_aggressiveness,
+            "vad_hangover_ms": config.voice.vad_hangover_ms,
+            "vad_min_speech_ms": config.voice.vad_min_speech_ms
         },
         "model": {
             "model_name": config.model.model_name,
@@ -15,9 +15,16 @@ class UltraVoiceConfig:
             "model": {
                 "name": "tts_models/multilingual/multi-dataset/xtts_v2",
                 "type": "xtts_v2",
-                "device": "auto",  # auto, cuda, cpu
+                "device": "auto",  # auto (cuda só com use_gpu e GPU presente), cuda, cpu
                 "sample_rate": 24000,
-                "use_gpu": True
+                "use_gpu": False
+            },
+            "cpu_inference": {
+                "quantize": True,          # int8 dinâmico nas camadas nn.Linear
+                "intra_op_threads": 0,     # 0 = metade dos núcleos
+                "inter_op_threads": 1,
+                "warmup": True,
+                "synthesis_process": True  # XTTS em processo próprio
             },
             "voice": {
                 "default_emotion": "neutro",
@@ -142,6 +149,10 @@ class UltraVoiceConfig:
         """Configuração de uma emoção específica"""
         return self.config["emotions"].get(emotion, self.config["emotions"]["neutro"])
     
+    def get_cpu_inference_config(self):
+        """Perfil de inferência em CPU"""
+        return self.config["cpu_inference"]
+    
     def get_processing_config(self):
         """Configuração de processamento"""
         return self.config["processing"]
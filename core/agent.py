@@ -6,7 +6,7 @@ import sys
 import threading
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union, AsyncIterable
 
 from core.speech_to_text import SpeechToText
 from core.text_to_speech import BarkHumanizedTTS as HumanizedTTS
@@ -19,6 +19,11 @@ from config.settings import AgentConfig
 from core.self_modifier import SelfModifier
 from core.command_executor import InternalCommandExecutor
 from core.self_evolution import SelfEvolutionSystem
+from core.intent_router import IntentRouter
+from core.turn_pipeline import BackgroundTasks, TurnTimings
+from core.speech_queue import SpeechQueue
+from core.audio_playback import get_playback_backend
+from utils.nlu import Utterance, as_utterance
 
 class AIAgent:
     """Classe principal do agente de IA SEXTA-FEIRA com todas as funcionalidades"""
@@ -39,6 +44,17 @@ class AIAgent:
         # Sistemas avançados
         self.self_modifier: Optional[SelfModifier] = None
         self.command_executor: Optional[InternalCommandExecutor] = None
+        self.evolution_system: Optional[SelfEvolutionSystem] = None
+        self.intent_router: Optional[IntentRouter] = None
+        
+        # Pipeline do turno: tarefas fora do caminho crítico e tempos por etapa
+        self.background = BackgroundTasks()
+        self.show_turn_timings = True
+        self.stream_speech = True  # falar a resposta do LLM enquanto ela é gerada
+        
+        # Fila única de fala: ordem garantida e interrupção quando o usuário fala
+        self.speech_queue = SpeechQueue(self._speak_now, self._speak_stream_now, stop=self._stop_playback)
+        self.barge_in = True
         
         # Estado do agente
         self.is_listening = False
@@ -83,18 +99,22 @@ class AIAgent:
                 self.user_profile,
                 self.config
             )
+            await self.conversation_manager.load_timeline()
             
             # Inicializar sistemas avançados
             self.self_modifier = SelfModifier(self.llm, self.user_profile)
             self.command_executor = InternalCommandExecutor(self)
             
-        
-        # Inicializar sistema de auto-evolução
-        try:
-            self.evolution_system = SelfEvolutionSystem(self.llm, self.user_profile)
-            self.logger.info("Sistema de auto-evolução ativado!")
-        except Exception as e:
-            self.logger.warning(f"Sistema de auto-evolução não pôde ser ativado: {e}")
+            # Inicializar sistema de auto-evolução
+            try:
+                self.evolution_system = SelfEvolutionSystem(self.llm, self.user_profile)
+                self.logger.info("Sistema de auto-evolução ativado!")
+            except Exception as e:
+                self.logger.warning(f"Sistema de auto-evolução não pôde ser ativado: {e}")
+            
+            # Roteador de intenções (depende dos sistemas acima)
+            self.intent_router = self.build_intent_router()
+            
             self.logger.info("Todos os componentes inicializados com sucesso!")
             
         except Exception as e:
@@ -114,6 +134,10 @@ class AIAgent:
         
         print(f"\n🤖 SEXTA-FEIRA: {greeting}")
         
+        # Lembretes de eventos próximos (busca por intervalo na tabela de eventos)
+        for reminder in await self.conversation_manager.get_event_reminders(days=1):
+            print(f"📅 {reminder}")
+        
         print("\n" + "="*70)
         print("🤖 FUNCIONALIDADES DISPONÍVEIS:")
         print("⌨️  Digite normalmente para conversar")
@@ -133,6 +157,12 @@ class AIAgent:
                     user_input = await self.get_user_input()
                     
                     if user_input:
+                        if self.is_loop_command(user_input):
+                            # Comandos tratados aqui não passam por process_input:
+                            # gravar no histórico (o shutdown espera, inclusive no "sair")
+                            self.background.spawn(
+                                self.persist_user_turn(Utterance.from_text(user_input)), "persistência")
+                        
                         if self.check_exit_command(user_input):
                             break
                         
@@ -149,7 +179,6 @@ class AIAgent:
                             name = user_input[5:].strip()
                             await self.set_user_name(name)
                             continue
-                        
                         response = await self.process_input(user_input)
                         if response:
                             await self.speak_robust(response)
@@ -196,7 +225,7 @@ class AIAgent:
         print("\n" + "="*60)
         
         # Iniciar escuta contínua
-        self.stt.start_continuous_listening(self.on_continuous_speech)
+        self.stt.start_continuous_listening(self.on_continuous_speech, self.on_user_speech_start)
         
         # Loop para comandos de texto enquanto escuta
         while self.continuous_mode and self.is_running:
@@ -233,14 +262,22 @@ class AIAgent:
         print("\n🔇 Modo contínuo desativado")
         print("💬 Voltando ao modo normal...")
     
+    def on_user_speech_start(self):
+        """Chamado pela thread do STT quando o usuário começa a falar (barge-in)"""
+        if self.barge_in and self.main_loop and self.main_loop.is_running():
+            self.main_loop.call_soon_threadsafe(self.speech_queue.interrupt)
+    
     def on_continuous_speech(self, text: str):
         """Callback chamado quando detecta fala no modo contínuo"""
         try:
             print(f"\n👂 Ouvi: '{text}'")
             
+            # Normalizar uma única vez para todos os analisadores
+            utterance = Utterance.from_text(text)
+            
             # Analisar se deve responder
             should_respond, reason, confidence = self.context_analyzer.should_respond(
-                text,
+                utterance,
                 self.user_profile.get_user_name()
             )
             
@@ -252,7 +289,7 @@ class AIAgent:
                 # Agendar resposta no loop principal
                 if self.main_loop and self.main_loop.is_running():
                     asyncio.run_coroutine_threadsafe(
-                        self.handle_continuous_response(text, reason, confidence),
+                        self.handle_continuous_response(utterance, reason, confidence),
                         self.main_loop
                     )
                 else:
@@ -263,11 +300,12 @@ class AIAgent:
         except Exception as e:
             self.logger.error(f"Erro no processamento contínuo: {e}")
     
-    async def handle_continuous_response(self, text: str, reason: str, confidence: float):
+    async def handle_continuous_response(self, text: Union[str, Utterance], reason: str, confidence: float):
         """Manipula resposta no modo contínuo"""
         try:
-            await self.conversation_manager.add_message("user", text)
-            response = await self.create_contextual_response(text, reason, confidence)
+            utterance = as_utterance(text)
+            self.background.spawn(self.persist_user_turn(utterance), "persistência")
+            response = await self.create_contextual_response(utterance, reason, confidence)
             if response:
                 await self.speak_robust(response)
         except Exception as e:
@@ -278,21 +316,46 @@ class AIAgent:
         """Fala com emoção específica"""
         try:
             print(f"\n🤖 SEXTA-FEIRA ({emotion}): {text}")
-            await self.tts.speak(text, emotion)
-            await self.conversation_manager.add_message("assistant", text)
+            # Gravar a resposta enquanto ela é falada
+            self.background.spawn(self.conversation_manager.add_message("assistant", text), "persistência")
+            # Na fila: não atropela nem descarta a fala em andamento
+            await self.speech_queue.say(text, emotion)
         except Exception as e:
             self.logger.error(f"Erro na fala emocional: {e}")
             print(f"⚠️ [ERRO DE ÁUDIO] {text}")
 
+    async def speak_streamed(self, chunks: AsyncIterable[str], emotion: str = "neutro") -> str:
+        """Fala texto que chega aos pedaços (LLM em streaming) e grava a resposta completa"""
+        try:
+            text = await self.speech_queue.say_stream(chunks, emotion)
+        except Exception as e:
+            self.logger.error(f"Erro na fala em streaming: {e}")
+            return ""
+        if text:
+            print(f"\n🤖 SEXTA-FEIRA ({emotion}): {text}")
+            self.background.spawn(self.conversation_manager.add_message("assistant", text), "persistência")
+        return text
+    
+    async def _speak_now(self, text: str, emotion: str):
+        await self.tts.speak(text, emotion)
+    
+    async def _speak_stream_now(self, chunks: AsyncIterable[str], emotion: str) -> str:
+        return await self.tts.speak_stream(chunks, emotion)
+    
+    def _stop_playback(self):
+        get_playback_backend().stop_all()
+    
     async def speak_robust(self, text: str, emotion: str = "neutro"):
         """Fala robusta com retry automático e fallback"""
         await self.speak_with_emotion(text, emotion)
 
-    async def create_contextual_response(self, text: str, reason: str, confidence: float) -> str:
+    async def create_contextual_response(self, text: Union[str, Utterance], reason: str, confidence: float) -> str:
         """Cria resposta baseada no contexto"""
         try:
+            utterance = as_utterance(text)
+            text = utterance.raw
             user_info = self.user_profile.get_summary()
-            emotions = self.context_analyzer.analyze_emotional_context(text)
+            emotions = self.context_analyzer.analyze_emotional_context(utterance)
             dominant_emotion = max(emotions, key=emotions.get)
             
             # Contexto baseado em como foi detectada
@@ -316,6 +379,10 @@ INSTRUÇÃO: Responda de forma direta e útil."""
 FALA: "{text}"
 INSTRUÇÃO: Responda brevemente oferecendo ajuda."""
             
+            timeline_context = self.conversation_manager.get_timeline_context(utterance)
+            if timeline_context:
+                context_prompt += f"\nO USUÁRIO JÁ MENCIONOU SOBRE ESSE PERÍODO:\n{timeline_context}"
+            
             prompt = f"""Você é SEXTA-FEIRA, uma assistente pessoal IA amigável e inteligente.
 
 USUÁRIO: {user_info}
@@ -389,7 +456,6 @@ RESPOSTA:"""
             
             if user_text.strip():
                 print(f"👤 Você: {user_text}")
-                await self.conversation_manager.add_message("user", user_text)
                 return user_text.strip()
                 
         except Exception as e:
@@ -401,71 +467,117 @@ RESPOSTA:"""
         text = await self.stt.listen()
         if text:
             print(f"👤 Você (voz): {text}")
-            await self.conversation_manager.add_message("user", text)
         return text
     
+    # Gatilhos das intenções (comparados sem acento, uma varredura por entrada)
+    EVOLUTION_TRIGGERS = [
+        "analise seu código", "melhore seu sistema", "otimize",
+        "revise", "como está seu código", "evolua"
+    ]
+    
+    SELF_MODIFICATION_TRIGGERS = [
+        "analisar código", "analise seu código", "verifica seu código",
+        "melhorar código", "melhore seu código", "otimize seu código",
+        "status código", "como está seu código",
+        "backup código", "faça backup", "crie backup",
+        "teste sua voz", "teste de voz", "demonstre emoções",
+        "como você está", "qual seu status", "relatório completo"
+    ]
+    
+    def build_intent_router(self) -> IntentRouter:
+        """Registra as intenções na ordem de prioridade; conversa normal é o fallback"""
+        router = IntentRouter()
+        
+        if self.evolution_system:
+            router.register(
+                "evolution", self.handle_evolution_intent, self.EVOLUTION_TRIGGERS,
+                error_response="Erro no sistema de auto-evolução. Verifique os logs."
+            )
+        
+        if self.command_executor:
+            router.register("internal_command", self.handle_internal_command_intent,
+                            self.command_executor.trigger_literals())
+        
+        if self.self_modifier:
+            router.register("self_modification", self.handle_self_modification_intent,
+                            self.SELF_MODIFICATION_TRIGGERS)
+        
+        router.set_fallback("chat", self.handle_chat_intent)
+        router.compile()
+        return router
+    
+    async def handle_evolution_intent(self, utterance: Utterance, timings=None) -> Optional[str]:
+        return await self.evolution_system.handle_evolution_command(utterance.raw)
+    
+    async def handle_internal_command_intent(self, utterance: Utterance, timings=None) -> Optional[str]:
+        """Comandos internos (com resposta falada)"""
+        return await self.command_executor.process_natural_command(utterance)
+    
+    async def handle_self_modification_intent(self, utterance: Utterance, timings=None) -> Optional[str]:
+        return await self.self_modifier.handle_modification_request(utterance.raw)
+    
+    async def handle_chat_intent(self, utterance: Utterance, timings: Optional[TurnTimings] = None) -> Optional[str]:
+        """Conversa normal: o LLM começa já; extração do perfil corre em paralelo"""
+        timings = timings or TurnTimings()   # do próprio turno (turnos contínuos se sobrepõem)
+        
+        # A própria fala vai no prompt, então a extração não precisa terminar antes
+        self.background.spawn(self.user_profile.extract_and_update_info(utterance), "extração", timings)
+        
+        with timings.stage("prompt"):
+            timeline_context = self.conversation_manager.get_timeline_context(utterance)
+            prompt = self.create_simple_prompt(utterance.raw, timeline_context)
+        
+        if self.stream_speech and hasattr(self.tts, 'speak_stream') and hasattr(self.llm, 'stream_response'):
+            # Resposta falada frase a frase enquanto o LLM gera (nada a falar depois)
+            with timings.stage("llm + voz"):
+                await self.speak_streamed(self.llm.stream_response(prompt))
+            return None
+        
+        with timings.stage("llm"):
+            return await self.llm.generate_response(prompt)
+    
+    async def persist_user_turn(self, utterance: Utterance):
+        """Salva a fala do usuário (com a emoção detectada) e indexa a linha do tempo"""
+        emotions = self.context_analyzer.analyze_emotional_context(utterance)
+        dominant_emotion = max(emotions, key=emotions.get)
+        await self.conversation_manager.add_message("user", utterance.raw, {'emotion': dominant_emotion})
+    
     async def process_input(self, user_input: str) -> Optional[str]:
         """Processa entrada normal do usuário"""
         try:
             print("🧠 Processando...")
             
-        
-        # NOVO: Verificar comandos de auto-evolução
-        if self.evolution_system:
-            evolution_commands = [
-                "analise seu código", "melhore seu sistema", "otimize", 
-                "revise", "como está seu código", "evolua"
-            ]
-            
-            if any(cmd in user_input.lower() for cmd in evolution_commands):
-                try:
-                    evolution_response = await self.evolution_system.handle_evolution_command(user_input)
-                    if evolution_response:
-                        return evolution_response
-                except Exception as e:
-                    self.logger.error(f"Erro no sistema de evolução: {e}")
-                    return "Erro no sistema de auto-evolução. Verifique os logs."
-
-            # PRIMEIRO: Verificar comandos internos (com resposta falada)
-            if self.command_executor:
-                internal_response = await self.command_executor.process_natural_command(user_input)
-                if internal_response:
-                    return internal_response
-            
-            # SEGUNDO: Verificar comandos de auto-modificação diretos
-            mod_commands = [
-                "analisar código", "analise seu código", "verifica seu código",
-                "melhorar código", "melhore seu código", "otimize seu código",
-                "status código", "como está seu código",
-                "backup código", "faça backup", "crie backup",
-                "teste sua voz", "teste de voz", "demonstre emoções",
-                "como você está", "qual seu status", "relatório completo"
-            ]
-            
-            if any(cmd in user_input.lower() for cmd in mod_commands):
-                if self.self_modifier:
-                    return await self.self_modifier.handle_modification_request(user_input)
-            
-            # TERCEIRO: Processar como conversa normal
-            await self.user_profile.extract_and_update_info(user_input)
-            
-            prompt = self.create_simple_prompt(user_input)
-            response = await self.llm.generate_response(prompt)
+            timings = TurnTimings()
+            
+            # Normalizar uma única vez para todos os analisadores
+            with timings.stage("normalização"):
+                utterance = Utterance.from_text(user_input)
+            
+            # Persistência e análise emocional fora do caminho crítico
+            self.background.spawn(self.persist_user_turn(utterance), "persistência", timings)
+            
+            if self.intent_router is None:
+                self.intent_router = self.build_intent_router()
+            
+            response = await self.intent_router.dispatch(utterance, timings)
             
+            if self.show_turn_timings:
+                print(f"⏱️ {timings.format()}")
             return response
             
         except Exception as e:
             self.logger.error(f"Erro ao processar: {e}")
             return "Desculpe, houve um erro."
     
-    def create_simple_prompt(self, user_input: str) -> str:
-        """Cria prompt simples"""
+    def create_simple_prompt(self, user_input: str, timeline_context: str = "") -> str:
+        """Cria prompt simples (com o que o usuário já contou sobre o período citado)"""
         user_info = self.user_profile.get_summary()
+        timeline_section = f"\nO USUÁRIO JÁ MENCIONOU SOBRE ESSE PERÍODO:\n{timeline_context}\n" if timeline_context else ""
         
         prompt = f"""Você é SEXTA-FEIRA, uma assistente pessoal amigável e inteligente.
 
 USUÁRIO: {user_info}
-
+{timeline_section}
 PERGUNTA: {user_input}
 
 Responda de forma natural e concisa (máximo 2-3 frases).
@@ -474,6 +586,12 @@ RESPOSTA:"""
         
         return prompt
     
+    def is_loop_command(self, text: str) -> bool:
+        """Entradas resolvidas no loop principal, antes do roteamento de intenções"""
+        lowered = text.lower()
+        return (self.check_exit_command(text) or lowered in ("continuo", "voz")
+                or lowered.startswith("nome "))
+    
     def check_exit_command(self, text: str) -> bool:
         """Verifica comandos de saída"""
         exit_commands = ["sair", "tchau", "encerrar", "quit", "exit"]
@@ -487,11 +605,21 @@ RESPOSTA:"""
         if self.continuous_mode:
             self.stop_continuous_mode()
         
+        # Despedida primeiro: ela também grava a mensagem em segundo plano
+        await self.speak_robust("Até logo! Foi um prazer ajudá-lo.", "feliz")
+        await self.speech_queue.close()
+        self.logger.info(f"Fila de fala nesta sessão: {self.speech_queue.format_stats()}")
+        
+        # Terminar gravações pendentes (inclusive a da despedida) antes de fechar o banco
+        await self.background.drain()
+        
+        if self.intent_router:
+            self.logger.info(f"Intenções nesta sessão:\n{self.intent_router.format_stats()}")
+        
         if self.user_profile:
             await self.user_profile.save_profile()
         
         if self.database:
             await self.database.close()
         
-        await self.speak_robust("Até logo! Foi um prazer ajudá-lo.", "feliz")
         print("👋 SEXTA-FEIRA encerrada!")
\ No newline at end of file
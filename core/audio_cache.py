@@ -0,0 +1,228 @@
+# core/audio_cache.py - Cache de áudio sintetizado (memória + disco) endereçado por conteúdo
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+# Frases fixas que a SEXTA-FEIRA repete (pré-aquecidas em segundo plano)
+COMMON_PHRASES: Tuple[Tuple[str, str], ...] = (
+    ("Analisando meu código...", "curioso"),
+    ("Criando backup do meu código...", "neutro"),
+    ("Backup criado com sucesso!", "feliz"),
+    ("Analisando possibilidades de melhoria...", "curioso"),
+    ("Gerando relatório de status completo...", "neutro"),
+    ("Testando qualidade vocal...", "curioso"),
+    ("Resetando sistema de áudio...", "neutro"),
+    ("Sistema de áudio resetado com sucesso!", "feliz"),
+    ("Ativando modo de escuta contínua inteligente!", "neutro"),
+    ("Vou demonstrar minhas diferentes emoções!", "feliz"),
+    ("Demonstração de emoções concluída!", "feliz"),
+    ("Desculpe, houve um erro interno.", "neutro"),
+    ("Até logo! Foi um prazer ajudá-lo.", "feliz"),
+)
+
+def file_digest(path: Path) -> str:
+    """Hash do conteúdo de um arquivo (ex.: voz de referência do XTTS)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+@dataclass
+class CachedAudio:
+    """Áudio pronto para tocar"""
+    key: str
+    data: bytes
+    fmt: str          # extensão/codec: mp3, wav, ogg
+    path: Path        # arquivo no disco (pode ser tocado direto)
+
+class AudioCache:
+    """
+    Cache LRU em dois níveis: bytes em memória e arquivos em disco.
+
+    A chave é o hash do texto já processado, emoção, engine e parâmetros
+    da voz; o áudio é guardado no formato que a engine gera (MP3 do gTTS,
+    WAV PCM 16-bit do XTTS). Cada nível tem limite de tamanho próprio.
+    """
+
+    def __init__(self, directory: str = "cache/audio", max_disk_mb: float = 200,
+                 max_memory_mb: float = 16):
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+
+        self._lock = threading.RLock()
+        self._disk: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()   # chave -> (formato, bytes)
+        self._memory: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._memory_bytes = 0
+        self.stats = {"hits": 0, "memory_hits": 0, "misses": 0, "evictions": 0}
+
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, emotion: str, engine: str, params: Dict[str, Any] = None) -> str:
+        """Hash estável de (texto processado, emoção, engine, parâmetros)"""
+        payload = json.dumps([text, emotion, engine, params or {}], sort_keys=True,
+                             ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _load_index(self):
+        """Reconstrói a ordem LRU a partir do mtime dos arquivos"""
+        files = []
+        for path in self.directory.iterdir():
+            if path.is_file() and not path.name.endswith(".tmp"):
+                files.append((path.stat().st_mtime, path))
+        for _, path in sorted(files):
+            size = path.stat().st_size
+            self._disk[path.stem] = (path.suffix.lstrip("."), size)
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _path(self, key: str, fmt: str) -> Path:
+        return self.directory / f"{key}.{fmt}"
+
+    def get(self, key: str) -> Optional[CachedAudio]:
+        """Busca na memória e depois no disco (promovendo para a memória)"""
+        with self._lock:
+            entry = self._disk.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            fmt, _ = entry
+            path = self._path(key, fmt)
+            self._disk.move_to_end(key)
+
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return CachedAudio(key, cached[1], fmt, path)
+
+            try:
+                data = path.read_bytes()
+                os.utime(path)  # mantém a ordem LRU entre execuções
+            except OSError:
+                self._forget(key)
+                self.stats["misses"] += 1
+                return None
+
+            self._remember(key, fmt, data)
+            self.stats["hits"] += 1
+            return CachedAudio(key, data, fmt, path)
+
+    def put(self, key: str, data: bytes, fmt: str) -> Optional[CachedAudio]:
+        """Guarda o áudio (escrita atômica no disco + memória)"""
+        if not data:
+            return None
+        with self._lock:
+            path = self._path(key, fmt)
+            temp_path = path.with_name(path.name + ".tmp")
+            try:
+                temp_path.write_bytes(data)
+                os.replace(temp_path, path)
+            except OSError as e:
+                self.logger.error(f"Erro ao gravar cache de áudio: {e}")
+                return None
+
+            if key in self._disk:
+                self._disk_bytes -= self._disk.pop(key)[1]
+            self._disk[key] = (fmt, len(data))
+            self._disk_bytes += len(data)
+            self._remember(key, fmt, data)
+            self._evict_disk()
+            return CachedAudio(key, data, fmt, path)
+
+    def put_file(self, key: str, source: Path, fmt: str = None) -> Optional[CachedAudio]:
+        """Guarda um arquivo gerado pela engine"""
+        try:
+            data = Path(source).read_bytes()
+        except OSError as e:
+            self.logger.error(f"Erro ao ler áudio para o cache: {e}")
+            return None
+        return self.put(key, data, fmt or Path(source).suffix.lstrip("."))
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._disk
+
+    def _remember(self, key: str, fmt: str, data: bytes):
+        """Nível de memória (não guarda áudio maior que o próprio limite)"""
+        if len(data) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[1])
+        self._memory[key] = (fmt, data)
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _forget(self, key: str):
+        if key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)[1]
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[1])
+
+    def _evict_disk(self):
+        """Remove os menos usados até caber no limite do disco"""
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, (fmt, _) = next(iter(self._disk.items()))
+            self._forget(key)
+            self.stats["evictions"] += 1
+            try:
+                self._path(key, fmt).unlink()
+            except OSError:
+                pass
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._disk),
+                "disk_mb": self._disk_bytes / (1024 * 1024),
+                "memory_mb": self._memory_bytes / (1024 * 1024),
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
+
+    async def prewarm(self, phrases: Iterable[Tuple[str, str]],
+                      synthesize: Callable[[str, str], Awaitable[Optional[CachedAudio]]],
+                      delay: float = 0.1) -> int:
+        """
+        Sintetiza em segundo plano as frases que ainda não estão no cache.
+
+        synthesize(texto, emoção) deve usar o mesmo caminho da fala normal
+        (mesma chave); retorna quantas frases foram geradas.
+        """
+        generated = 0
+        for text, emotion in phrases:
+            try:
+                if await synthesize(text, emotion) is not None:
+                    generated += 1
+            except Exception as e:
+                self.logger.debug(f"Pré-aquecimento falhou para '{text}': {e}")
+            await asyncio.sleep(delay)  # não competir com a fala em andamento
+        if generated:
+            self.logger.info(f"Cache de áudio pré-aquecido: {generated} frases")
+        return generated
+
+_default_cache: Optional[AudioCache] = None
+
+def get_audio_cache() -> AudioCache:
+    """Cache compartilhado entre os sistemas de voz, criado uma única vez"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AudioCache()
+    return _default_cache
@@ -0,0 +1,89 @@
+# core/audio_io.py - Áudio em memória: síntese -> bytes/PCM -> reprodução sem arquivos temporários
+import io
+import wave
+from typing import Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+def gtts_to_bytes(tts) -> bytes:
+    """MP3 do gTTS direto para memória (write_to_fp em vez de save)"""
+    buffer = io.BytesIO()
+    tts.write_to_fp(buffer)
+    return buffer.getvalue()
+
+def float_to_pcm16(samples) -> "np.ndarray":
+    """Amostras float (-1..1, lista ou array) para PCM 16-bit"""
+    audio = np.asarray(samples, dtype=np.float32)
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+def wav_bytes(samples: Union[bytes, "np.ndarray", list], sample_rate: int, channels: int = 1) -> bytes:
+    """WAV PCM 16-bit em memória (amostras float são convertidas)"""
+    if isinstance(samples, (bytes, bytearray)):
+        frames = bytes(samples)
+    else:
+        audio = np.asarray(samples)
+        if audio.dtype != np.int16:
+            audio = float_to_pcm16(audio)
+        frames = audio.tobytes()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+def read_wav(data: bytes):
+    """(PCM 16-bit bytes, taxa, canais) de um WAV em memória"""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        return wav.readframes(wav.getnframes()), wav.getframerate(), wav.getnchannels()
+
+def load_sound(data: bytes) -> "pygame.mixer.Sound":
+    """
+    Som do pygame a partir de bytes (MP3, OGG ou WAV).
+
+    WAV na mesma taxa/canais do mixer vira Sound(buffer=...) direto; os
+    demais formatos são decodificados pelo SDL a partir do BytesIO.
+    """
+    if data[:4] == b"RIFF":
+        frames, rate, channels = read_wav(data)
+        mixer = pygame.mixer.get_init()
+        if mixer and mixer[0] == rate and mixer[1] == -16 and mixer[2] == channels:
+            return pygame.mixer.Sound(buffer=frames)
+    return pygame.mixer.Sound(file=io.BytesIO(data))
+
+def decode_to_float(data: bytes):
+    """
+    MP3/OGG/WAV em bytes para (float32 mono -1..1, taxa).
+
+    WAV é lido direto; os demais formatos são decodificados pelo SDL na
+    taxa do mixer (pygame.mixer precisa estar inicializado).
+    """
+    if data[:4] == b"RIFF":
+        frames, rate, channels = read_wav(data)
+    else:
+        frames = pygame.mixer.Sound(file=io.BytesIO(data)).get_raw()
+        rate, _, channels = pygame.mixer.get_init()
+    return pcm16_to_float(frames, channels), rate
+
+def pcm16_to_float(frames: bytes, channels: int = 1) -> "np.ndarray":
+    """PCM 16-bit em bytes para float32 mono (-1..1)"""
+    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    return audio
+
+def sound_from_pcm(samples, sample_rate: int) -> "pygame.mixer.Sound":
+    """Som do pygame a partir de PCM/float em NumPy, sem passar por disco"""
+    return load_sound(wav_bytes(samples, sample_rate))
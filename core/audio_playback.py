@@ -0,0 +1,323 @@
+# core/audio_playback.py - Reprodução com aviso de término (sem get_busy a cada 50 ms)
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+from core.audio_io import load_sound, read_wav, wav_bytes
+from core.audio_stream import PcmRingBuffer
+
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+class PlaybackHandle:
+    """
+    Uma reprodução em andamento.
+
+    O término chega como resultado de um future asyncio: True quando o áudio
+    acabou, False quando foi interrompido. Outras threads avisam com
+    finish_threadsafe().
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, stop: Optional[Callable[[], None]] = None):
+        self.loop = loop
+        self.future: asyncio.Future = loop.create_future()
+        self.started = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self._stop = stop
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def finish(self, completed: bool = True):
+        if not self.future.done():
+            self.finished_at = time.perf_counter()
+            self.future.set_result(completed)
+        if self.timer is not None:
+            self.timer.cancel()
+
+    def finish_threadsafe(self, completed: bool = True):
+        try:
+            self.loop.call_soon_threadsafe(self.finish, completed)
+        except RuntimeError:
+            pass  # loop já encerrado
+
+    def stop(self):
+        """Interrompe já (o future resolve na hora, sem esperar o dispositivo)"""
+        if self.done:
+            return
+        if self._stop is not None:
+            try:
+                self._stop()
+            except Exception:
+                pass
+        self.finish(False)
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera o fim; no timeout interrompe e retorna False"""
+        try:
+            return await asyncio.wait_for(asyncio.shield(self.future), timeout)
+        except asyncio.TimeoutError:
+            self.stop()
+            return False
+
+class PlaybackBackend(ABC):
+    """Interface dos dispositivos de saída"""
+
+    name = "base"
+
+    @abstractmethod
+    async def play(self, data: bytes, volume: float = 1.0, cue: bool = False) -> PlaybackHandle:
+        """
+        Toca o áudio (MP3/OGG/WAV em bytes) e retorna sem esperar.
+
+        A fala usa um canal próprio (uma fala nova substitui a anterior);
+        cue=True toca em um canal livre, sobrepondo sons curtos à fala.
+        """
+
+    @abstractmethod
+    async def play_stream(self, stream: PcmRingBuffer, volume: float = 1.0) -> PlaybackHandle:
+        """
+        Toca PCM à medida que chega no buffer (síntese em streaming).
+
+        O handle começa quando o primeiro pedaço toca (handle.started) e
+        termina quando o buffer é fechado e esvaziado; stop() cancela o
+        buffer, o que também interrompe a síntese.
+        """
+
+    @abstractmethod
+    def stop_all(self):
+        """Interrompe tudo o que está tocando"""
+
+class PygameBackend(PlaybackBackend):
+    """
+    pygame.mixer com canais: o canal 0 é reservado para a fala.
+
+    O pygame só entrega eventos de fim de canal com a fila de eventos do
+    display rodando; aqui o término é agendado para a duração do som e
+    confirmado uma vez no canal (resto do buffer do dispositivo).
+    """
+
+    name = "pygame"
+    VOICE_CHANNEL = 0
+    CONFIRM_INTERVAL = 0.01
+    STREAM_CHUNK_SECONDS = 0.5
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._reserved = False
+        self._handles: List[PlaybackHandle] = []
+
+    def _voice_channel(self):
+        if not self._reserved:
+            pygame.mixer.set_reserved(self.VOICE_CHANNEL + 1)
+            self._reserved = True
+        return pygame.mixer.Channel(self.VOICE_CHANNEL)
+
+    async def play(self, data: bytes, volume: float = 1.0, cue: bool = False) -> PlaybackHandle:
+        if not pygame.mixer.get_init():
+            raise RuntimeError("pygame.mixer não inicializado")
+
+        loop = asyncio.get_running_loop()
+        sound = await loop.run_in_executor(None, load_sound, data)
+        sound.set_volume(volume)
+
+        channel = pygame.mixer.find_channel(True) if cue else self._voice_channel()
+        channel.play(sound)
+
+        handle = PlaybackHandle(loop, stop=channel.stop)
+
+        def confirm():
+            if handle.done:
+                return
+            if channel.get_busy() and channel.get_sound() is sound:
+                handle.timer = loop.call_later(self.CONFIRM_INTERVAL, confirm)
+            else:
+                handle.finish()
+
+        handle.timer = loop.call_later(sound.get_length(), confirm)
+        self._track(handle)
+        return handle
+
+    async def play_stream(self, stream: PcmRingBuffer, volume: float = 1.0) -> PlaybackHandle:
+        if not pygame.mixer.get_init():
+            raise RuntimeError("pygame.mixer não inicializado")
+
+        loop = asyncio.get_running_loop()
+        channel = self._voice_channel()
+
+        def stop():
+            stream.cancel()
+            channel.stop()
+
+        handle = PlaybackHandle(loop, stop=stop)
+        asyncio.ensure_future(self._feed(stream, channel, volume, handle))
+        self._track(handle)
+        return handle
+
+    async def _feed(self, stream: PcmRingBuffer, channel, volume: float, handle: PlaybackHandle):
+        """
+        Um pedaço tocando e um na fila do canal (Channel.queue); o próximo
+        entra quando a fila esvazia, conferido a cada CONFIRM_INTERVAL
+        apenas durante a fala em streaming.
+        """
+        loop = asyncio.get_running_loop()
+        max_bytes = int(stream.sample_rate * self.STREAM_CHUNK_SECONDS) * 2
+        started = False
+        try:
+            while not handle.done:
+                data = await stream.read_chunk(max_bytes)
+                if not data or handle.done:
+                    break
+                sound = await loop.run_in_executor(None, load_sound, wav_bytes(data, stream.sample_rate))
+                sound.set_volume(volume)
+
+                if not started:
+                    channel.play(sound)
+                    handle.started = stream.stats.first_audio = time.perf_counter()
+                    started = True
+                    continue
+                while channel.get_queue() is not None and not handle.done:
+                    await asyncio.sleep(self.CONFIRM_INTERVAL)
+                if handle.done:
+                    break
+                if channel.get_busy():
+                    channel.queue(sound)
+                else:
+                    stream.stats.underruns += 1  # a fala alcançou a síntese
+                    channel.play(sound)
+
+            while started and channel.get_busy() and not handle.done:
+                await asyncio.sleep(self.CONFIRM_INTERVAL)
+            handle.finish(not stream.cancelled)
+        except Exception as e:
+            self.logger.error(f"Erro na reprodução em streaming: {e}")
+            handle.stop()
+
+    def _track(self, handle: PlaybackHandle):
+        self._handles = [h for h in self._handles if not h.done]
+        self._handles.append(handle)
+
+    def stop_all(self):
+        for handle in self._handles:
+            handle.stop()
+        self._handles = []
+        if pygame.mixer.get_init():
+            pygame.mixer.stop()
+
+class NullBackend(PlaybackBackend):
+    """
+    Saída silenciosa para testes e máquinas sem áudio.
+
+    Respeita a duração do WAV (dividida por speed); o fim é avisado por uma
+    thread (threading.Timer), como faria o callback de um dispositivo real.
+    """
+
+    name = "null"
+
+    def __init__(self, speed: float = 1.0, default_duration: float = 0.0):
+        self.speed = speed
+        self.default_duration = default_duration
+        self.played: List[bytes] = []
+        self.active = 0
+        self.max_active = 0
+        self._voice: Optional[PlaybackHandle] = None
+        self._handles: List[PlaybackHandle] = []
+        self._lock = threading.Lock()
+
+    def duration(self, data: bytes) -> float:
+        if data[:4] == b"RIFF":
+            frames, rate, channels = read_wav(data)
+            return len(frames) / (2 * channels * rate) / self.speed
+        return self.default_duration / self.speed
+
+    async def play(self, data: bytes, volume: float = 1.0, cue: bool = False) -> PlaybackHandle:
+        loop = asyncio.get_running_loop()
+        if not cue and self._voice is not None:
+            self._voice.stop()  # como o canal da fala: o novo substitui
+
+        timer = threading.Timer(self.duration(data), lambda: handle.finish_threadsafe())
+        timer.daemon = True
+        handle = PlaybackHandle(loop, stop=timer.cancel)
+        handle.future.add_done_callback(lambda _: self._release())
+
+        with self._lock:
+            self.played.append(data)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        if not cue:
+            self._voice = handle
+        self._handles = [h for h in self._handles if not h.done] + [handle]
+        timer.start()
+        return handle
+
+    async def play_stream(self, stream: PcmRingBuffer, volume: float = 1.0) -> PlaybackHandle:
+        loop = asyncio.get_running_loop()
+        if self._voice is not None:
+            self._voice.stop()
+
+        handle = PlaybackHandle(loop, stop=stream.cancel)
+        handle.future.add_done_callback(lambda _: self._release())
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self._voice = handle
+        self._handles = [h for h in self._handles if not h.done] + [handle]
+        asyncio.ensure_future(self._consume(stream, handle))
+        return handle
+
+    async def _consume(self, stream: PcmRingBuffer, handle: PlaybackHandle):
+        """Linha do tempo de um dispositivo real: cada pedaço dura o que o PCM dura"""
+        bytes_per_second = 2 * stream.sample_rate * self.speed
+        max_bytes = int(stream.sample_rate * 0.5) * 2
+        end = None
+        while not handle.done:
+            data = await stream.read_chunk(max_bytes)
+            if not data or handle.done:
+                break
+            now = time.perf_counter()
+            if end is None:
+                handle.started = stream.stats.first_audio = end = now
+            elif now > end:
+                stream.stats.underruns += 1
+                end = now
+            duration = len(data) / bytes_per_second
+            end += duration
+            with self._lock:
+                self.played.append(data)
+            # Como Channel.queue: só um pedaço esperando atrás do que toca
+            await asyncio.sleep(max(0.0, end - duration - time.perf_counter()))
+
+        if end is not None and not handle.done:
+            await asyncio.sleep(max(0.0, end - time.perf_counter()))
+        handle.finish(not stream.cancelled)
+
+    def _release(self):
+        with self._lock:
+            self.active -= 1
+
+    def stop_all(self):
+        for handle in self._handles:
+            handle.stop()
+        self._handles = []
+
+_default_backend: Optional[PlaybackBackend] = None
+
+def get_playback_backend() -> PlaybackBackend:
+    """Saída compartilhada: pygame se instalado, senão silenciosa"""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = PygameBackend() if PYGAME_AVAILABLE else NullBackend()
+    return _default_backend
+
+def set_playback_backend(backend: PlaybackBackend):
+    """Troca a saída (ex.: NullBackend em testes ou servidor sem áudio)"""
+    global _default_backend
+    _default_backend = backend
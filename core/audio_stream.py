@@ -0,0 +1,125 @@
+# core/audio_stream.py - Buffer circular de PCM entre a síntese em streaming e a reprodução
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class StreamStats:
+    """Métricas de uma frase sintetizada em streaming"""
+    sample_rate: int
+    requested_at: float
+    first_chunk: Optional[float] = None     # primeiro pedaço pronto (síntese)
+    first_audio: Optional[float] = None     # primeiro pedaço tocando
+    synthesis_time: float = 0.0
+    audio_seconds: float = 0.0
+    chunks: int = 0
+    underruns: int = 0                      # reprodução alcançou a síntese
+
+    @property
+    def time_to_first_audio(self) -> Optional[float]:
+        return self.first_audio - self.requested_at if self.first_audio else None
+
+    @property
+    def rtf(self) -> Optional[float]:
+        """Fator de tempo real: segundos de síntese por segundo de áudio (< 1 acompanha a fala)"""
+        return self.synthesis_time / self.audio_seconds if self.audio_seconds else None
+
+    def format(self) -> str:
+        ttfa = self.time_to_first_audio
+        rtf = self.rtf
+        return (f"primeiro áudio {ttfa * 1000:.0f} ms" if ttfa is not None else "sem áudio") + (
+            f", RTF {rtf:.2f}" if rtf is not None else "") + (
+            f", {self.chunks} pedaços, {self.audio_seconds:.1f} s, {self.underruns} esperas")
+
+class PcmRingBuffer:
+    """
+    Buffer circular de PCM 16-bit: uma thread escreve, o event loop lê.
+
+    write() bloqueia com o buffer cheio (a síntese não corre muito à frente
+    da fala) e retorna False se a reprodução foi cancelada, para a síntese
+    parar. read_chunk() espera sem polling: a thread avisa o loop.
+    """
+
+    def __init__(self, sample_rate: int, capacity_seconds: float = 4.0,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.sample_rate = sample_rate
+        self.capacity = int(sample_rate * capacity_seconds) * 2
+        self._buffer = bytearray(self.capacity)
+        self._read_pos = 0
+        self._size = 0
+        self.closed = False
+        self.cancelled = False
+        self.stats = StreamStats(sample_rate, time.perf_counter())
+
+        self._cond = threading.Condition()
+        self._loop = loop or asyncio.get_running_loop()
+        self._data_ready = asyncio.Event()
+
+    @property
+    def available(self) -> int:
+        with self._cond:
+            return self._size
+
+    def _notify_loop(self):
+        try:
+            self._loop.call_soon_threadsafe(self._data_ready.set)
+        except RuntimeError:
+            pass  # loop já encerrado
+
+    def write(self, frames: bytes) -> bool:
+        """Escreve PCM (bloqueia com o buffer cheio); False se cancelado"""
+        view = memoryview(frames)
+        while view:
+            with self._cond:
+                while self._size == self.capacity and not self.cancelled:
+                    self._cond.wait()
+                if self.cancelled:
+                    return False
+                write_pos = (self._read_pos + self._size) % self.capacity
+                count = min(len(view), self.capacity - self._size, self.capacity - write_pos)
+                self._buffer[write_pos:write_pos + count] = view[:count]
+                self._size += count
+                view = view[count:]
+            self._notify_loop()
+        return True
+
+    def read(self, max_bytes: int) -> bytes:
+        """Lê o que houver (até max_bytes, em amostras inteiras) sem bloquear"""
+        with self._cond:
+            count = min(self._size, max_bytes) & ~1
+            first = min(count, self.capacity - self._read_pos)
+            data = bytes(self._buffer[self._read_pos:self._read_pos + first])
+            data += bytes(self._buffer[:count - first])
+            self._read_pos = (self._read_pos + count) % self.capacity
+            self._size -= count
+            self._cond.notify_all()
+            return data
+
+    async def read_chunk(self, max_bytes: int) -> bytes:
+        """Espera haver áudio; b"" quando a síntese terminou ou foi cancelada"""
+        while True:
+            self._data_ready.clear()
+            if self.cancelled:
+                return b""
+            data = self.read(max_bytes)
+            if data:
+                return data
+            if self.closed:
+                return b""
+            await self._data_ready.wait()
+
+    def close(self):
+        """Síntese terminou: o leitor esvazia o que sobrou e encerra"""
+        with self._cond:
+            self.closed = True
+        self._notify_loop()
+
+    def cancel(self):
+        """Reprodução interrompida: libera o escritor e descarta o restante"""
+        with self._cond:
+            self.cancelled = True
+            self.closed = True
+            self._cond.notify_all()
+        self._notify_loop()
@@ -0,0 +1,119 @@
+# core/chunked_tts.py - Falas longas do gTTS: trechos buscados em paralelo e juntados em ordem
+import asyncio
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from core.audio_io import gtts_to_bytes
+
+try:
+    from gtts import gTTS
+    GTTS_AVAILABLE = True
+except ImportError:
+    GTTS_AVAILABLE = False
+
+GTTS_MAX_CHARS = 100   # limite de caracteres por requisição do gTTS
+
+# Fronteiras de frase e de oração: o gTTS também quebra nelas (uma requisição por trecho)
+_PHRASE_END = re.compile(r'(?<=[.!?…,;:])\s+')
+
+def split_for_tts(text: str, max_chars: int = GTTS_MAX_CHARS) -> List[str]:
+    """Trechos de até max_chars, quebrando em frases/orações e, se preciso, entre palavras"""
+    chunks: List[str] = []
+    for phrase in _PHRASE_END.split(text.strip()):
+        phrase = phrase.strip()
+        if not phrase:
+            continue
+        current = ""
+        for word in phrase.split():
+            if current and len(current) + len(word) + 1 > max_chars:
+                chunks.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            chunks.append(current)
+    return chunks
+
+def gtts_fetcher(lang: str = "pt", slow: bool = False) -> Callable[[str], bytes]:
+    """Busca de um trecho no gTTS (bloqueante: roda no executor do sintetizador)"""
+    def fetch(chunk: str) -> bytes:
+        return gtts_to_bytes(gTTS(text=chunk, lang=lang, slow=slow))
+    return fetch
+
+@dataclass
+class ChunkStats:
+    """Uma fala buscada em trechos"""
+    chunks: int = 0
+    fetch_time: float = 0.0   # soma das buscas (o que custaria em série)
+    wall_time: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.fetch_time / self.wall_time if self.wall_time > 0 else 1.0
+
+    def format(self) -> str:
+        return (f"{self.chunks} trechos | {self.wall_time * 1000:.0f} ms "
+                f"(em série {self.fetch_time * 1000:.0f} ms, {self.speedup:.1f}x)")
+
+class ParallelChunkSynthesizer:
+    """
+    Divide a fala em trechos e busca todos ao mesmo tempo.
+
+    O paralelismo é limitado pelo pool de threads (max_concurrency
+    requisições simultâneas no processo inteiro, não por fala). Os bytes
+    voltam na ordem do texto e são concatenados: quadros MP3 de trechos
+    seguidos tocam como um único arquivo, como o próprio gTTS faz.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_chars: int = GTTS_MAX_CHARS):
+        self.logger = logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency
+        self.max_chars = max_chars
+        self.executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix="tts-fetch")
+        self.last_stats: Optional[ChunkStats] = None
+
+    async def synthesize(self, text: str, fetch: Callable[[str], bytes]) -> bytes:
+        """Áudio da fala inteira; erro em qualquer trecho cancela os que não começaram"""
+        chunks = split_for_tts(text, self.max_chars)
+        if not chunks:
+            return b""
+
+        loop = asyncio.get_running_loop()
+        stats = ChunkStats(chunks=len(chunks))
+        start = time.perf_counter()
+        futures = [loop.run_in_executor(self.executor, self._timed_fetch, fetch, chunk) for chunk in chunks]
+        try:
+            results = await asyncio.gather(*futures)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        stats.wall_time = time.perf_counter() - start
+        stats.fetch_time = sum(elapsed for _, elapsed in results)
+        self.last_stats = stats
+        if len(chunks) > 1:
+            self.logger.debug(f"🧩 gTTS em trechos: {stats.format()}")
+        return b"".join(data for data, _ in results)
+
+    @staticmethod
+    def _timed_fetch(fetch: Callable[[str], bytes], chunk: str):
+        start = time.perf_counter()
+        data = fetch(chunk)
+        return data, time.perf_counter() - start
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+_default_synthesizer: Optional[ParallelChunkSynthesizer] = None
+
+def get_chunked_tts() -> ParallelChunkSynthesizer:
+    """Sintetizador compartilhado: um limite de requisições para todas as vozes"""
+    global _default_synthesizer
+    if _default_synthesizer is None:
+        _default_synthesizer = ParallelChunkSynthesizer()
+    return _default_synthesizer
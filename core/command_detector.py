@@ -1,7 +1,8 @@
 # core/command_detector.py - Atualizado com comandos de voz humana
 import re
 import logging
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional, Union
+from utils.nlu import Utterance, as_utterance, compile_any
 
 class InternalCommandDetector:
     def __init__(self):
@@ -65,41 +66,39 @@ class InternalCommandDetector:
             r"\b(diagnóstico|diagnóstica)\s+(completo|geral)\b",
         ]
     
-    def detect_command(self, text: str) -> Tuple[Optional[str], str, float]:
-        text_lower = text.lower()
-        
-        # Verificar análise de código
-        for pattern in self.code_analysis_patterns:
-            if re.search(pattern, text_lower):
-                return "analyze_code", f"Comando de análise detectado", 0.95
-        
-        # Verificar teste de voz (incluindo voz humana)
-        for pattern in self.voice_test_patterns:
-            if re.search(pattern, text_lower):
-                return "test_voice", f"Comando de teste de voz detectado", 0.95
-        
-        # Verificar especificamente voz humana/Coqui
-        for pattern in self.human_voice_patterns:
-            if re.search(pattern, text_lower):
-                return "test_human_voice", f"Comando de voz humana detectado", 0.98
-        
-        # Verificar backup
-        for pattern in self.backup_patterns:
-            if re.search(pattern, text_lower):
-                return "create_backup", f"Comando de backup detectado", 0.95
-        
-        # Verificar melhorias
-        for pattern in self.improvement_patterns:
-            if re.search(pattern, text_lower):
-                return "self_improve", f"Comando de melhoria detectado", 0.95
+        # Grupos compilados uma vez: (comando, motivo, confiança, literais sem acento, regex)
+        # A regex do grupo só roda se algum literal aparecer no texto
+        self._command_groups = [
+            ("analyze_code", "Comando de análise detectado", 0.95,
+             ("codigo", "analis", "verifica"), compile_any(self.code_analysis_patterns)),
+            ("test_voice", "Comando de teste de voz detectado", 0.95,
+             ("voz", "emoco", "coqui", "completo", "qualidade"), compile_any(self.voice_test_patterns)),
+            ("test_human_voice", "Comando de voz humana detectado", 0.98,
+             ("voz", "humano", "coqui", "xtts"), compile_any(self.human_voice_patterns)),
+            ("create_backup", "Comando de backup detectado", 0.95,
+             ("backup", "codigo"), compile_any(self.backup_patterns)),
+            ("self_improve", "Comando de melhoria detectado", 0.95,
+             ("melhor", "otimiz", "aprimor", "fica"), compile_any(self.improvement_patterns)),
+            ("status_report", "Comando de status detectado", 0.95,
+             ("voce", "status", "estado", "relat", "report", "diagnost"), compile_any(self.status_patterns)),
+        ]
+    
+    def detect_command(self, text: Union[str, Utterance]) -> Tuple[Optional[str], str, float]:
+        utterance = as_utterance(text)
         
-        # Verificar status geral
-        for pattern in self.status_patterns:
-            if re.search(pattern, text_lower):
-                return "status_report", f"Comando de status detectado", 0.95
+        for command, reason, confidence, literals, pattern in self._command_groups:
+            if utterance.mentions(*literals) and pattern.search(utterance.lower):
+                return command, reason, confidence
         
         return None, "Nenhum comando interno detectado", 0.0
     
-    def is_internal_command(self, text: str) -> bool:
+    def trigger_literals(self) -> List[str]:
+        """Literais (sem acento) que precisam aparecer para algum comando ser detectado"""
+        literals = []
+        for _, _, _, group_literals, _ in self._command_groups:
+            literals.extend(literal for literal in group_literals if literal not in literals)
+        return literals
+    
+    def is_internal_command(self, text: Union[str, Utterance]) -> bool:
         command, _, confidence = self.detect_command(text)
         return command is not None and confidence > 0.8
\ No newline at end of file
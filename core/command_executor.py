@@ -1,8 +1,9 @@
 # core/command_executor.py - Corrigido completamente
 import asyncio
 import logging
-from typing import Optional
+from typing import List, Optional, Union
 from core.command_detector import InternalCommandDetector
+from utils.nlu import Utterance, as_utterance
 
 class InternalCommandExecutor:
     def __init__(self, agent):
@@ -10,51 +11,53 @@ class InternalCommandExecutor:
         self.detector = InternalCommandDetector()
         self.logger = logging.getLogger(__name__)
     
-    async def process_natural_command(self, text: str) -> Optional[str]:
-        command, reason, confidence = self.detector.detect_command(text)
+    async def process_natural_command(self, text: Union[str, Utterance]) -> Optional[str]:
+        utterance = as_utterance(text)
+        command, reason, confidence = self.detector.detect_command(utterance)
         
         if command and confidence > 0.8:
             self.logger.info(f"Comando interno detectado: {command} ({confidence:.2f})")
-            return await self.execute_command(command, text)
+            return await self.execute_command(command, utterance.raw)
         
         # Verificar novos comandos de voz
-        voice_command = self._detect_voice_commands(text)
+        voice_command = self._detect_voice_commands(utterance)
         if voice_command:
-            return await self.execute_voice_command(voice_command, text)
+            return await self.execute_voice_command(voice_command, utterance.raw)
         
         return None
     
-    def _detect_voice_commands(self, text: str) -> Optional[str]:
-        """Detecta comandos específicos de voz"""
-        text_lower = text.lower()
-        
+    # Comandos específicos de voz: comando -> frases que o disparam
+    VOICE_COMMAND_TRIGGERS = {
         # Comandos de teste de voz humana
-        if any(cmd in text_lower for cmd in [
+        "test_human_voice": [
             "teste voz humana", "voz humana", "teste coqui",
             "demonstre voz humana", "sistema de voz"
-        ]):
-            return "test_human_voice"
-        
+        ],
         # Comandos de qualidade de voz
-        if any(cmd in text_lower for cmd in [
-            "qualidade de voz", "teste qualidade", "como está sua voz"
-        ]):
-            return "test_voice_quality"
-        
+        "test_voice_quality": ["qualidade de voz", "teste qualidade", "como está sua voz"],
         # Comandos de sistema de áudio
-        if any(cmd in text_lower for cmd in [
-            "reset áudio", "reseta áudio", "problema de áudio"
-        ]):
-            return "reset_audio"
-        
+        "reset_audio": ["reset áudio", "reseta áudio", "problema de áudio"],
         # Info do sistema de voz
-        if any(cmd in text_lower for cmd in [
-            "info da voz", "sistema atual", "que voz você usa"
-        ]):
-            return "voice_system_info"
+        "voice_system_info": ["info da voz", "sistema atual", "que voz você usa"],
+    }
+    
+    def _detect_voice_commands(self, text: Union[str, Utterance]) -> Optional[str]:
+        """Detecta comandos específicos de voz"""
+        text_lower = as_utterance(text).lower
+        
+        for command, phrases in self.VOICE_COMMAND_TRIGGERS.items():
+            if any(cmd in text_lower for cmd in phrases):
+                return command
         
         return None
     
+    def trigger_literals(self) -> List[str]:
+        """Literais que podem levar a algum comando interno (para o roteador de intenções)"""
+        literals = self.detector.trigger_literals()
+        for phrases in self.VOICE_COMMAND_TRIGGERS.values():
+            literals.extend(phrases)
+        return literals
+    
     async def execute_voice_command(self, command: str, original_text: str) -> str:
         """Executa comandos específicos de voz"""
         try:
@@ -160,6 +163,11 @@ class InternalCommandExecutor:
                     emotions = self.agent.tts.get_available_emotions()
                     await self.agent.speak_robust(f"Tenho {len(emotions)} emoções disponíveis.", "feliz")
                 
+                # Roteamento: qual engine falou por último, por quê, e a saúde de cada um
+                if hasattr(self.agent.tts, 'get_routing_status'):
+                    routing = self.agent.tts.get_routing_status()
+                    return f"Sistema atual: {current_system}\n{routing}"
+                
                 return f"Sistema atual: {current_system}"
             else:
                 await self.agent.speak_robust("Informações do sistema de voz não disponíveis.", "neutro")
@@ -1,17 +1,21 @@
 # core/context_analyzer.py
 import re
 import logging
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Tuple, FrozenSet, Pattern, Union
 from datetime import datetime
 from core.conversation_state import ConversationState
+from core.emotion_lexicon import get_emotion_scorer
+from utils.nlu import Utterance, as_utterance, compile_any, compile_literals
 
 class ContextAnalyzer:
     """Analisa contexto da fala para SEXTA-FEIRA"""
     
-    def __init__(self, agent_name: str = "SEXTA-FEIRA"):
+    def __init__(self, agent_name: str = "SEXTA-FEIRA", classifier_cache_size: int = 512):
         self.agent_name = agent_name.lower()
         self.logger = logging.getLogger(__name__)
         self.conversation_state = ConversationState()
+        self.emotion_scorer = get_emotion_scorer()
         
         # Padrões MUITO ESPECÍFICOS para SEXTA-FEIRA
         self.friday_name_patterns = [
@@ -88,94 +92,95 @@ class ContextAnalyzer:
             r"\b(gosto|não\s+gosto|amo|odeio).{0,20}(da|dessa).{0,20}(sexta|assistente)\b",
             r"\ba\s+(sexta|assistente).{0,20}(me\s+)?(ajuda|entende|sabe)\b",
         ]
+        
+        # Padrões de defesa (falando mal dela)
+        self.negative_patterns = [
+            r"\b(sexta|assistente|ia).{0,30}(ruim|horrível|péssima|inútil|burra|idiota)\b",
+            r"\b(odeio|detesto|não\s+gosto).{0,20}(da|dessa).{0,20}(sexta|assistente)\b",
+            r"\b(sexta|assistente).{0,20}(não|nunca).{0,20}(funciona|entende|ajuda|serve)\b",
+        ]
+        
+        # Classificador compilado uma única vez (escuta contínua chama a cada frase)
+        self._compile_classifier()
+        self._classify = lru_cache(maxsize=classifier_cache_size)(self._classify_stages)
+    
+    def _compile_classifier(self):
+        """Compila os padrões em estágios: (nome, pré-filtro literal, regex combinada)"""
+        self._stages: List[Tuple[str, Pattern, Pattern]] = [
+            ("temporal", compile_literals(["sexta"]), compile_any(self.temporal_friday_patterns)),
+            ("name", compile_literals(["sext", "fri"]), compile_any(self.friday_name_patterns)),
+            ("deactivation",
+             compile_literals(["mudo", "silêncio", "quieta", "para", "não", "modo", "fique", "chega"]),
+             compile_any(self.deactivation_patterns)),
+            ("self_reference",
+             compile_literals(["qual", "como", "você", "seu", "me", "responda", "diga",
+                                "fale", "conte", "explique", "?"]),
+             compile_any(self.self_reference_patterns)),
+            ("indirect", compile_literals(["sexta", "assistente", "ia"]), compile_any(self.indirect_patterns)),
+            ("negative", compile_literals(["sexta", "assistente", "ia"]), compile_any(self.negative_patterns)),
+        ]
     
-    def should_respond(self, text: str, user_name: str = "") -> Tuple[bool, str, float]:
+    def _classify_stages(self, text_lower: str) -> FrozenSet[str]:
+        """Retorna os estágios cujos padrões casam com o texto (sem efeitos colaterais)"""
+        matched = set()
+        for name, literal_filter, pattern in self._stages:
+            if literal_filter.search(text_lower) and pattern.search(text_lower):
+                matched.add(name)
+        return frozenset(matched)
+    
+    def get_classifier_cache_info(self):
+        """Estatísticas do cache LRU do classificador"""
+        return self._classify.cache_info()
+    
+    def should_respond(self, text: Union[str, Utterance], user_name: str = "") -> Tuple[bool, str, float]:
         """
         Determina se SEXTA-FEIRA deve responder
         """
-        text_lower = text.lower()
+        utterance = as_utterance(text)
+        matched = self._classify(utterance.lower)
         
         # 1. VERIFICAR SE É CONTEXTO TEMPORAL (sexta-feira do calendário)
-        for pattern in self.temporal_friday_patterns:
-            if re.search(pattern, text_lower):
-                return False, "Contexto temporal detectado - não é sobre mim", 0.0
+        if "temporal" in matched:
+            return False, "Contexto temporal detectado - não é sobre mim", 0.0
         
         # 2. VERIFICAR MENÇÃO DIRETA DO NOME SEXTA-FEIRA
-        for pattern in self.friday_name_patterns:
-            if re.search(pattern, text_lower):
-                self.conversation_state.activate_conversation("explicit")
-                return True, f"Nome SEXTA-FEIRA detectado explicitamente", 0.98
+        if "name" in matched:
+            self.conversation_state.activate_conversation("explicit")
+            return True, f"Nome SEXTA-FEIRA detectado explicitamente", 0.98
         
         # 3. VERIFICAR COMANDOS DE DESATIVAÇÃO
-        for pattern in self.deactivation_patterns:
-            if re.search(pattern, text_lower):
-                self.conversation_state.deactivate_conversation("explicit")
-                return False, f"Comando de desativação detectado", 0.0
+        if "deactivation" in matched:
+            self.conversation_state.deactivate_conversation("explicit")
+            return False, f"Comando de desativação detectado", 0.0
         
         # 4. USAR SISTEMA DE ESTADO DE CONVERSA
-        should_respond, reason, confidence = self.conversation_state.should_respond_to_input(text)
+        should_respond, reason, confidence = self.conversation_state.should_respond_to_input(utterance.raw)
         
         # 5. SE JÁ DISSE QUE DEVE RESPONDER, VERIFICAR PADRÕES ADICIONAIS
         if should_respond:
             return should_respond, reason, confidence
         
         # 6. VERIFICAR REFERÊNCIAS A ELA MESMO SEM NOME
-        for pattern in self.self_reference_patterns:
-            if re.search(pattern, text_lower):
-                return True, "Referência direta detectada (sem nome)", 0.85
+        if "self_reference" in matched:
+            return True, "Referência direta detectada (sem nome)", 0.85
         
         # 7. VERIFICAR MENÇÕES INDIRETAS
-        for pattern in self.indirect_patterns:
-            if re.search(pattern, text_lower):
-                return True, "Menção indireta detectada", 0.7
+        if "indirect" in matched:
+            return True, "Menção indireta detectada", 0.7
         
         # 8. VERIFICAR DEFESA (falando mal)
-        negative_patterns = [
-            r"\b(sexta|assistente|ia).{0,30}(ruim|horrível|péssima|inútil|burra|idiota)\b",
-            r"\b(odeio|detesto|não\s+gosto).{0,20}(da|dessa).{0,20}(sexta|assistente)\b",
-            r"\b(sexta|assistente).{0,20}(não|nunca).{0,20}(funciona|entende|ajuda|serve)\b",
-        ]
-        
-        for pattern in negative_patterns:
-            if re.search(pattern, text_lower):
-                return True, "Comentário negativo detectado - defesa necessária", 0.9
+        if "negative" in matched:
+            return True, "Comentário negativo detectado - defesa necessária", 0.9
         
         return False, "Não parece ser direcionado à SEXTA-FEIRA", 0.0
     
-    def analyze_emotional_context(self, text: str) -> Dict[str, float]:
+    def analyze_emotional_context(self, text: Union[str, Utterance]) -> Dict[str, float]:
         """Analisa contexto emocional da fala"""
-        text_lower = text.lower()
-        
-        emotions = {
-            "feliz": 0.0,
-            "triste": 0.0,
-            "raiva": 0.0,
-            "neutro": 0.0,
-            "curioso": 0.0,
-            "frustrado": 0.0
-        }
-        
-        # Palavras de cada emoção
-        emotion_words = {
-            "feliz": ["feliz", "alegre", "ótimo", "excelente", "adorei", "amei", "legal", "bom", "maravilhoso", "perfeito"],
-            "triste": ["triste", "chateado", "ruim", "péssimo", "horrível", "mal", "deprimido", "desanimado"],
-            "raiva": ["raiva", "ódio", "irritado", "furioso", "puto", "bravo", "nervoso", "maldito"],
-            "curioso": ["como", "por que", "quando", "onde", "qual", "o que", "me explique", "não entendi"],
-            "frustrado": ["não funciona", "não entende", "burra", "inútil", "não serve", "problemática"]
-        }
-        
-        words = text_lower.split()
-        total_words = max(len(words), 1)
-        
-        for emotion, word_list in emotion_words.items():
-            count = sum(1 for word in word_list if word in text_lower)
-            emotions[emotion] = count / total_words * 10
-        
-        # Se nenhuma emoção forte, é neutro
-        if max(emotions.values()) < 0.1:
-            emotions["neutro"] = 1.0
-        
-        return emotions
+        return self.emotion_scorer.score(as_utterance(text).lower)
+    
+    def analyze_emotional_history(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Analisa o contexto emocional de várias falas (ex.: histórico armazenado)"""
+        return self.emotion_scorer.score_many(texts)
     
     def get_conversation_status(self) -> str:
         """Retorna status da conversa"""
@@ -185,10 +190,6 @@ class ContextAnalyzer:
         """Retorna contexto para respostas"""
         return self.conversation_state.get_response_context()
     
-    def is_talking_about_friday_calendar(self, text: str) -> bool:
+    def is_talking_about_friday_calendar(self, text: Union[str, Utterance]) -> bool:
         """Verifica se está falando sobre sexta-feira do calendário"""
-        text_lower = text.lower()
-        for pattern in self.temporal_friday_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        return False
\ No newline at end of file
+        return "temporal" in self._classify(as_utterance(text).lower)
\ No newline at end of file
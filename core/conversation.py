@@ -2,11 +2,14 @@
 import asyncio
 import logging
 import uuid
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Union
 from memory.database import DatabaseManager
 from memory.user_profile import UserProfile
+from memory.timeline import TimelineEntry, TimelineIndex
+from core.temporal_inference import TemporalInferenceEngine
 from config.settings import AgentConfig
+from utils.nlu import Utterance, as_utterance
 
 class ConversationManager:
     """Gerencia contexto e histórico de conversas"""
@@ -30,12 +33,16 @@ class ConversationManager:
             'session_start': datetime.now(),
             'total_interactions': 0
         }
+        
+        # Linha do tempo: referências temporais das mensagens do usuário
+        self.temporal_engine = TemporalInferenceEngine()
+        self.timeline = TimelineIndex()
     
-    async def add_message(self, role: str, content: str, metadata: Dict = None):
-        """Adiciona mensagem à conversa"""
+    async def add_message(self, role: str, content: str, metadata: Dict = None) -> Optional[int]:
+        """Adiciona mensagem à conversa e retorna o id salvo"""
         try:
             # Salvar no banco
-            await self.database.save_conversation_message(
+            message_id = await self.database.save_conversation_message(
                 self.current_session_id,
                 role,
                 content,
@@ -44,6 +51,7 @@ class ConversationManager:
             
             # Adicionar ao contexto atual
             message = {
+                'id': message_id,
                 'role': role,
                 'content': content,
                 'timestamp': datetime.now().isoformat()
@@ -63,10 +71,84 @@ class ConversationManager:
             if role == 'user':
                 self.conversation_stats['messages_today'] += 1
             
+            if role == 'user':
+                await self.index_message(content, message_id)
+            
             self.logger.debug(f"Mensagem adicionada: {role} - {content[:50]}...")
+            return message_id
             
         except Exception as e:
             self.logger.error(f"Erro ao adicionar mensagem: {e}")
+            return None
+    
+    async def load_timeline(self):
+        """Carrega a linha do tempo salva para o índice em memória"""
+        for row in await self.database.get_timeline_entries():
+            self.timeline.add(TimelineEntry(
+                start=date.fromisoformat(row['start_date']),
+                end=date.fromisoformat(row['end_date']),
+                kind=row['kind'],
+                original=row['original'] or "",
+                message_id=row['message_id'],
+                excerpt=row['excerpt'] or "",
+                confidence=row['confidence'] or 0.0
+            ))
+        self.logger.info(f"Linha do tempo carregada: {len(self.timeline)} referências")
+    
+    async def index_message(self, text: Union[str, Utterance], message_id: Optional[int],
+                            reference_date: date = None) -> List[TimelineEntry]:
+        """Extrai referências temporais da mensagem e guarda como intervalos"""
+        utterance = as_utterance(text)
+        reference_date = reference_date or date.today()
+        
+        age = self.user_profile.user_info.age if self.user_profile else None
+        birth_year = reference_date.year - age if age else None
+        
+        entries = []
+        for ref in self.temporal_engine.extract_references(utterance):
+            interval = self.temporal_engine.reference_to_interval(ref, reference_date, birth_year)
+            if interval is None:
+                continue
+            entry = TimelineEntry(
+                start=interval[0],
+                end=interval[1],
+                kind=ref['type'],
+                original=ref['original'],
+                message_id=message_id,
+                excerpt=utterance.raw[:120],
+                confidence=ref.get('confidence', 0.0)
+            )
+            self.timeline.add(entry)
+            entries.append(entry)
+        
+        if entries:
+            await self.database.add_timeline_entries([
+                {
+                    'message_id': entry.message_id,
+                    'start_date': entry.start.isoformat(),
+                    'end_date': entry.end.isoformat(),
+                    'kind': entry.kind,
+                    'original': entry.original,
+                    'excerpt': entry.excerpt,
+                    'confidence': entry.confidence
+                }
+                for entry in entries
+            ])
+        
+        return entries
+    
+    def get_timeline_context(self, text: Union[str, Utterance], limit: int = 5) -> str:
+        """Referências da linha do tempo para o período citado na pergunta (vazio se não houver)"""
+        period = self.temporal_engine.parse_time_query(text)
+        if period is None:
+            return ""
+        
+        current_id = self.current_context[-1].get('id') if self.current_context else None
+        entries = [
+            entry for entry in self.timeline.query(*period)
+            if entry.message_id is None or entry.message_id != current_id
+        ]
+        return TimelineIndex.format_for_prompt(entries, limit)
     
     async def get_context(self, max_messages: int = None) -> str:
         """Obtém contexto atual da conversa formatado"""
@@ -260,6 +342,21 @@ Resumo da Conversa:
         except Exception as e:
             self.logger.error(f"Erro ao iniciar nova sessão: {e}")
     
+    async def get_event_reminders(self, days: int = 1) -> List[str]:
+        """Lembretes proativos dos eventos de hoje até os próximos dias"""
+        reminders = []
+        for event in await self.database.get_upcoming_events(days):
+            if event['days_until'] == 0:
+                when = "Hoje"
+            elif event['days_until'] == 1:
+                when = "Amanhã"
+            else:
+                when = f"Em {event['days_until']} dias ({event['date']})"
+            
+            detail = f" ({event['years']} anos)" if event.get('years') else ""
+            reminders.append(f"{when}: {event['name']}{detail}")
+        return reminders
+    
     async def get_conversation_suggestions(self) -> List[str]:
         """Sugere tópicos de conversa baseados no histórico"""
         try:
@@ -0,0 +1,206 @@
+# core/emotion_dsp.py - Processamento emocional da voz em uma passada sobre um único array float32
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Filtros por estilo de voz: (tipo, frequência em Hz). O passa-altas de 70 Hz
+# (ronco/DC) entra em todos; tudo é aplicado junto em uma única FFT.
+VOICE_STYLE_FILTERS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    "soft": (("lowpass", 3000.0),),
+    "energetic": (("highpass", 100.0),),
+    "excited": (("highpass", 100.0),),
+    "melancholic": (("lowpass", 2000.0),),
+}
+BASE_FILTERS: Tuple[Tuple[str, float], ...] = (("highpass", 70.0),)
+
+PITCH_STEP = 0.05  # 5% por unidade de pitch_shift
+
+def rational_ratio(ratio: float, max_denominator: int = 1000) -> Tuple[int, int]:
+    """up/down inteiros que aproximam a razão de reamostragem"""
+    fraction = Fraction(ratio).limit_denominator(max_denominator)
+    return fraction.numerator, fraction.denominator
+
+@lru_cache(maxsize=32)
+def _polyphase_filter(up: int, down: int, zero_crossings: int) -> "np.ndarray":
+    """Passa-baixas (sinc com janela de Kaiser) dividido em `up` fases"""
+    factor = max(up, down)
+    half = zero_crossings * factor
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    taps = np.sinc(n / factor) * np.kaiser(len(n), 8.0) * (up / factor)
+    taps = np.concatenate([taps, np.zeros((-len(taps)) % up)])
+    # Fase p usa taps[p::up]; cada linha é uma sub-banda curta
+    return taps.reshape(-1, up).T.astype(np.float32).copy()
+
+def resample_poly(samples: "np.ndarray", up: int, down: int, zero_crossings: int = 10,
+                  block: int = 65536) -> "np.ndarray":
+    """
+    Reamostragem polifásica por up/down.
+
+    Cada amostra de saída usa só a fase do filtro que lhe corresponde (sem
+    inserir zeros nem filtrar amostras descartadas); o cálculo é feito em
+    blocos de saída com gather + produto vetorizado.
+    """
+    x = np.asarray(samples, dtype=np.float32)
+    if up == down:
+        return x.copy()
+    phases = _polyphase_filter(up, down, zero_crossings)
+    taps_per_phase = phases.shape[1]
+    delay = zero_crossings * max(up, down)           # atraso do filtro (em amostras a up*taxa)
+
+    out_len = int(np.ceil(len(x) * up / down))
+    padded = np.concatenate([np.zeros(taps_per_phase, np.float32), x, np.zeros(taps_per_phase, np.float32)])
+    offsets = np.arange(taps_per_phase)
+    out = np.empty(out_len, dtype=np.float32)
+
+    for start in range(0, out_len, block):
+        m = np.arange(start, min(start + block, out_len), dtype=np.int64)
+        position = m * down + delay                  # posição na grade superamostrada
+        base = position // up + taps_per_phase
+        phase = position % up
+        window = padded[np.clip(base[:, None] - offsets[None, :], 0, len(padded) - 1)]
+        out[start:start + len(m)] = np.einsum("ij,ij->i", window, phases[phase])
+    return out
+
+def time_stretch(samples: "np.ndarray", sample_rate: int, stretch: float,
+                 frame_ms: float = 20.0, tolerance_ms: float = 5.0) -> "np.ndarray":
+    """
+    Muda a duração sem mudar o tom (WSOLA).
+
+    stretch = duração de saída / duração de entrada. Cada quadro de saída é
+    tirado perto da posição ideal, no deslocamento que melhor continua o
+    quadro anterior (correlação cruzada), e somado com janela de Hann.
+    """
+    x = np.asarray(samples, dtype=np.float32)
+    if abs(stretch - 1.0) < 1e-3 or len(x) == 0:
+        return x.copy()
+
+    frame = max(16, int(sample_rate * frame_ms / 1000)) & ~1
+    hop = frame // 2
+    tolerance = int(sample_rate * tolerance_ms / 1000)
+    out_len = int(round(len(x) * stretch))
+    frames = max(1, (out_len - frame) // hop + 1)
+
+    padded = np.concatenate([np.zeros(tolerance, np.float32), x,
+                             np.zeros(frame + hop + 2 * tolerance, np.float32)])
+    window = np.hanning(frame).astype(np.float32)
+    out = np.zeros(frames * hop + frame, dtype=np.float32)
+    norm = np.zeros_like(out)
+
+    previous = tolerance
+    for k in range(frames):
+        ideal = tolerance + int(k * hop / stretch)
+        if k == 0:
+            position = ideal
+        else:
+            target = padded[previous + hop:previous + hop + frame]
+            region = padded[ideal - tolerance:ideal + tolerance + frame]
+            position = ideal - tolerance + int(np.argmax(np.correlate(region, target, "valid")))
+        out[k * hop:k * hop + frame] += padded[position:position + frame] * window
+        norm[k * hop:k * hop + frame] += window
+        previous = position
+
+    out /= np.maximum(norm, 1e-3)
+    return out[:out_len]
+
+def biquad(kind: str, frequency: float, sample_rate: int, q: float = 0.7071) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Coeficientes (b, a) de passa-baixas/passa-altas de 2ª ordem (RBJ)"""
+    w0 = 2 * np.pi * min(frequency, 0.49 * sample_rate) / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    if kind == "lowpass":
+        b = ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2)
+    elif kind == "highpass":
+        b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    else:
+        raise ValueError(f"Filtro desconhecido: {kind}")
+    a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    return tuple(v / a[0] for v in b), tuple(v / a[0] for v in a)
+
+def apply_biquads(samples: "np.ndarray", filters: Iterable[Tuple[str, float]], sample_rate: int,
+                  tail: int = 4096) -> "np.ndarray":
+    """
+    Cascata de biquads em uma passada: as respostas em frequência são
+    multiplicadas e aplicadas com uma única FFT (o preenchimento com zeros
+    guarda a cauda da resposta ao impulso, equivalente ao filtro causal).
+    """
+    x = np.asarray(samples, dtype=np.float32)
+    filters = tuple(filters)
+    if not filters or len(x) == 0:
+        return x.copy()
+
+    n_fft = 1 << int(np.ceil(np.log2(len(x) + tail)))
+    z = np.exp(-1j * np.linspace(0, np.pi, n_fft // 2 + 1))   # e^{-jw}
+    response = np.ones_like(z)
+    for kind, frequency in filters:
+        b, a = biquad(kind, frequency, sample_rate)
+        response *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+
+    spectrum = np.fft.rfft(x, n_fft)
+    return np.fft.irfft(spectrum * response, n_fft)[:len(x)].astype(np.float32)
+
+def _moving_average(values: "np.ndarray", width: int) -> "np.ndarray":
+    width = max(1, width)
+    cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    start = np.clip(np.arange(len(values)) - width // 2, 0, len(values))
+    end = np.clip(start + width, 0, len(values))
+    return ((cumulative[end] - cumulative[start]) / np.maximum(end - start, 1)).astype(np.float32)
+
+def normalize(samples: "np.ndarray", headroom_db: float = 0.1) -> "np.ndarray":
+    """Ganho para o pico ficar headroom_db abaixo do máximo (como pydub.normalize)"""
+    peak = float(np.max(np.abs(samples))) if len(samples) else 0.0
+    if peak == 0.0:
+        return samples
+    return samples * np.float32(10 ** (-headroom_db / 20) / peak)
+
+def compress(samples: "np.ndarray", sample_rate: int, threshold_db: float = -20.0, ratio: float = 4.0,
+             attack_ms: float = 5.0, release_ms: float = 50.0) -> "np.ndarray":
+    """
+    Compressor vetorizado (mesmos padrões do pydub.compress_dynamic_range).
+
+    O nível RMS é medido em janelas de attack_ms; a redução em dB acima do
+    limiar é suavizada em release_ms e aplicada de uma vez.
+    """
+    power = _moving_average(samples * samples, int(sample_rate * attack_ms / 1000))
+    level_db = 10 * np.log10(np.maximum(power, 1e-10))
+    reduction_db = np.maximum(level_db - threshold_db, 0.0) * (1.0 - 1.0 / ratio)
+    reduction_db = _moving_average(reduction_db, int(sample_rate * release_ms / 1000))
+    return samples * (10 ** (-reduction_db / 20)).astype(np.float32)
+
+def process_emotion(samples: "np.ndarray", sample_rate: int, config: Dict,
+                    out_rate: Optional[int] = None) -> "np.ndarray":
+    """
+    Cadeia emocional completa sobre um único array float32 (-1..1).
+
+    1. Uma reamostragem polifásica faz pitch_shift e a conversão para
+       out_rate juntas.
+    2. O time-stretch (WSOLA) ajusta a duração para speed_multiplier sem
+       mudar o tom.
+    3. Os filtros do voice_style são fundidos em uma FFT.
+    4. normalize + compress.
+
+    Retorna float32 em out_rate, pronto para float_to_pcm16/wav_bytes.
+    """
+    out_rate = out_rate or sample_rate
+    x = np.asarray(samples, dtype=np.float32)
+
+    pitch_factor = 1.0 + config.get("pitch_shift", 0) * PITCH_STEP
+    speed = config.get("speed_multiplier", 1.0)
+
+    # Tom: menos amostras na mesma taxa = tom mais alto (e fala mais curta)
+    up, down = rational_ratio(out_rate / (sample_rate * pitch_factor))
+    x = resample_poly(x, up, down)
+
+    # Duração: de 1/pitch_factor para 1/speed da original
+    x = time_stretch(x, out_rate, pitch_factor / speed)
+
+    filters = BASE_FILTERS + VOICE_STYLE_FILTERS.get(config.get("voice_style", "normal"), ())
+    x = apply_biquads(x, filters, out_rate)
+
+    x = compress(normalize(x), out_rate)
+    return np.clip(x, -1.0, 1.0)
@@ -0,0 +1,153 @@
+# core/emotion_lexicon.py
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Léxico emocional padrão: emoção -> {entrada: peso}
+# Entradas podem ter várias palavras ("não funciona"); "neutro" não tem entradas
+DEFAULT_EMOTION_LEXICON: Dict[str, Dict[str, float]] = {
+    "feliz": {
+        "feliz": 1.0, "alegre": 1.0, "ótimo": 1.0, "excelente": 1.0, "adorei": 1.0,
+        "amei": 1.0, "legal": 1.0, "bom": 1.0, "maravilhoso": 1.0, "perfeito": 1.0,
+    },
+    "triste": {
+        "triste": 1.0, "chateado": 1.0, "ruim": 1.0, "péssimo": 1.0, "horrível": 1.0,
+        "mal": 1.0, "deprimido": 1.0, "desanimado": 1.0,
+    },
+    "raiva": {
+        "raiva": 1.0, "ódio": 1.0, "irritado": 1.0, "furioso": 1.0, "puto": 1.0,
+        "bravo": 1.0, "nervoso": 1.0, "maldito": 1.0,
+    },
+    "neutro": {},
+    "curioso": {
+        "como": 1.0, "por que": 1.0, "quando": 1.0, "onde": 1.0, "qual": 1.0,
+        "o que": 1.0, "me explique": 1.0, "não entendi": 1.0,
+    },
+    "frustrado": {
+        "não funciona": 1.0, "não entende": 1.0, "burra": 1.0, "inútil": 1.0,
+        "não serve": 1.0, "problemática": 1.0,
+    },
+}
+
+LexiconEntries = Union[Dict[str, float], List[str]]
+
+class EmotionLexiconScorer:
+    """Pontua todas as emoções em uma única passada (autômato Aho-Corasick)"""
+
+    def __init__(self, lexicon: Dict[str, LexiconEntries] = None):
+        self.logger = logging.getLogger(__name__)
+        lexicon = lexicon if lexicon is not None else DEFAULT_EMOTION_LEXICON
+
+        # Ordem das emoções é preservada no resultado
+        self.emotions: List[str] = list(lexicon.keys())
+        if "neutro" not in self.emotions:
+            self.emotions.append("neutro")
+
+        # Autômato: transições, links de falha e saídas (emoção, peso, tamanho)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, float, int]]] = [[]]
+
+        for emotion, entries in lexicon.items():
+            if isinstance(entries, dict):
+                weighted = entries.items()
+            else:
+                weighted = ((entry, 1.0) for entry in entries)
+            for entry, weight in weighted:
+                self._add_entry(self._normalize(entry), emotion, float(weight))
+
+        self._build_failure_links()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Minúsculas e espaços simples (entradas de várias palavras casam com qualquer espaçamento)"""
+        return " ".join(text.lower().split())
+
+    def _add_entry(self, entry: str, emotion: str, weight: float):
+        """Adiciona uma entrada do léxico na trie"""
+        if not entry:
+            return
+        state = 0
+        for char in entry:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append((emotion, weight, len(entry)))
+
+    def _build_failure_links(self):
+        """Calcula links de falha em largura (BFS) e propaga as saídas"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_matches(self, text: str) -> List[Tuple[int, int, str, float]]:
+        """Retorna (início, fim, emoção, peso) de cada entrada encontrada como palavra inteira"""
+        normalized = self._normalize(text)
+        length = len(normalized)
+        matches = []
+        state = 0
+
+        for index, char in enumerate(normalized):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for emotion, weight, size in self._output[state]:
+                start = index - size + 1
+                end = index + 1
+                # Fronteira de palavra: "mal" não conta dentro de "normal"
+                if start > 0 and normalized[start - 1].isalnum():
+                    continue
+                if end < length and normalized[end].isalnum():
+                    continue
+                matches.append((start, end, emotion, weight))
+
+        return matches
+
+    def score(self, text: str) -> Dict[str, float]:
+        """Pontua as emoções de um texto (peso das ocorrências por palavra, escala 0-10)"""
+        scores = {emotion: 0.0 for emotion in self.emotions}
+        total_words = max(len(text.split()), 1)
+
+        for _, _, emotion, weight in self.find_matches(text):
+            scores[emotion] += weight
+
+        for emotion in scores:
+            scores[emotion] = scores[emotion] / total_words * 10
+
+        # Se nenhuma emoção forte, é neutro
+        if max(scores.values()) < 0.1:
+            scores["neutro"] = 1.0
+
+        return scores
+
+    def score_many(self, texts: Iterable[str]) -> List[Dict[str, float]]:
+        """Pontua várias falas (ex.: histórico armazenado) reutilizando o mesmo autômato"""
+        return [self.score(text) for text in texts]
+
+    def dominant_emotion(self, text: str) -> str:
+        """Emoção com maior pontuação"""
+        scores = self.score(text)
+        return max(scores, key=scores.get)
+
+_default_scorer: Optional[EmotionLexiconScorer] = None
+
+def get_emotion_scorer() -> EmotionLexiconScorer:
+    """Scorer com o léxico padrão, construído uma única vez"""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = EmotionLexiconScorer(DEFAULT_EMOTION_LEXICON)
+    return _default_scorer
@@ -0,0 +1,183 @@
+# core/history_backfill.py - Extrai fatos do histórico armazenado em paralelo
+import argparse
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.intelligent_extractor import IntelligentFactExtractor
+from core.temporal_inference import TemporalInferenceEngine
+from memory.database import DatabaseManager
+from memory.user_profile import UserProfile
+from utils.nlu import Utterance
+
+CHECKPOINT_NAME = "profile_facts"
+
+# Extratores do processo worker (criados uma vez por processo)
+_worker_extractor: Optional[IntelligentFactExtractor] = None
+_worker_temporal: Optional[TemporalInferenceEngine] = None
+_worker_known_facts: Dict[str, Any] = {}
+
+def _init_worker(known_facts: Dict[str, Any]):
+    """Inicializa os extratores dentro de cada processo do pool"""
+    global _worker_extractor, _worker_temporal, _worker_known_facts
+    _worker_extractor = IntelligentFactExtractor()
+    _worker_temporal = TemporalInferenceEngine()
+    _worker_known_facts = known_facts
+
+def is_explicit_age(fact: Dict[str, Any]) -> bool:
+    """
+    Idade dita pelo usuário: "tenho 30 anos" (extrator, não inferida) ou
+    "há 5 anos eu tinha 20" (cálculo relativo). Idades tiradas de um ano
+    qualquer ("em 2008 fui pra praia") ou de marcos da vida ficam de fora.
+    """
+    if 'inference_method' in fact:
+        return fact['inference_method'] == 'relative_time_calculation'
+    return not fact.get('inferred', False)
+
+def extract_chunk(messages: List[Tuple[int, str]]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """Roda no worker: fatos explícitos + inferências temporais de um bloco de mensagens"""
+    if _worker_extractor is None:
+        _init_worker({})
+
+    results = []
+    for message_id, content in messages:
+        utterance = Utterance.from_text(content)
+        facts = [asdict(fact) for fact in _worker_extractor.extract_facts(utterance)]
+        facts.extend(_worker_temporal.analyze_temporal_context(utterance, _worker_known_facts))
+        if facts:
+            results.append((message_id, facts))
+    return results
+
+@dataclass
+class BackfillStats:
+    """Resultado de uma execução do backfill"""
+    messages: int = 0
+    chunks: int = 0
+    facts_found: int = 0
+    facts_applied: int = 0
+    last_message_id: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.elapsed if self.elapsed > 0 else 0.0
+
+class HistoryBackfill:
+    """Alimenta o perfil com fatos de conversas antigas (retomável por checkpoint)"""
+
+    def __init__(self, database: DatabaseManager, user_profile: UserProfile,
+                 chunk_size: int = 200, workers: Optional[int] = None):
+        self.database = database
+        self.user_profile = user_profile
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.logger = logging.getLogger(__name__)
+
+    def _known_facts(self) -> Dict[str, Any]:
+        """Fatos já conhecidos usados pelo motor temporal para calibrar confiança"""
+        if self.user_profile.user_info.age:
+            return {'age': {'value': self.user_profile.user_info.age}}
+        return {}
+
+    async def run(self, reset: bool = False) -> BackfillStats:
+        """Lê o histórico em blocos, distribui para o pool e aplica os fatos em ordem"""
+        stats = BackfillStats()
+        start_time = time.perf_counter()
+
+        last_id = 0 if reset else await self.database.get_backfill_checkpoint(CHECKPOINT_NAME)
+        self.logger.info(f"Backfill iniciando após mensagem {last_id} com {self.workers} processos")
+
+        loop = asyncio.get_running_loop()
+        max_in_flight = self.workers * 2
+        pending = deque()
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self._known_facts(),)) as pool:
+            exhausted = False
+            while not exhausted or pending:
+                # Manter o pool ocupado sem carregar o histórico inteiro na memória
+                while not exhausted and len(pending) < max_in_flight:
+                    rows = await self.database.get_user_messages_after(last_id, self.chunk_size)
+                    if not rows:
+                        exhausted = True
+                        break
+                    last_id = rows[-1]['id']
+                    chunk = [(row['id'], row['content']) for row in rows]
+                    future = loop.run_in_executor(pool, extract_chunk, chunk)
+                    pending.append((future, len(rows), last_id))
+
+                if not pending:
+                    break
+
+                # Mesclar na ordem de envio: o checkpoint nunca pula mensagens
+                future, chunk_messages, chunk_last_id = pending.popleft()
+                results = await future
+                stats.facts_applied += self._merge_results(results, stats)
+                stats.messages += chunk_messages
+                stats.chunks += 1
+                stats.last_message_id = chunk_last_id
+
+                await self.user_profile.save_profile()
+                await self.database.save_backfill_checkpoint(CHECKPOINT_NAME, chunk_last_id)
+
+        stats.elapsed = time.perf_counter() - start_time
+        self.logger.info(
+            f"Backfill concluído: {stats.messages} mensagens, {stats.facts_applied} fatos aplicados "
+            f"({stats.messages_per_second:.0f} msg/s)"
+        )
+        return stats
+
+    def _merge_results(self, results: List[Tuple[int, List[Dict[str, Any]]]], stats: BackfillStats) -> int:
+        """Upsert com confiança: mensagens mais novas vencem empates"""
+        applied = 0
+        for _, facts in results:
+            for fact in facts:
+                stats.facts_found += 1
+                if fact.get('subcategory') == 'age' and not is_explicit_age(fact):
+                    continue
+                if self.user_profile.upsert_fact(
+                    fact.get('subcategory', ''),
+                    fact.get('value'),
+                    float(fact.get('confidence', 0.0))
+                ):
+                    applied += 1
+        return applied
+
+async def main():
+    """Comando: python -m core.history_backfill [--chunk-size N] [--workers N] [--reset]"""
+    from config.settings import load_config
+
+    parser = argparse.ArgumentParser(description="Extrai fatos do histórico de conversas para o perfil")
+    parser.add_argument("--chunk-size", type=int, default=200, help="mensagens por bloco")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos da CPU)")
+    parser.add_argument("--reset", action="store_true", help="ignorar checkpoint e recomeçar do início")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = load_config()
+
+    database = DatabaseManager(config.database)
+    await database.initialize()
+    user_profile = UserProfile(database)
+    await user_profile.load_profile()
+
+    print("📚 BACKFILL DO HISTÓRICO")
+    print("=" * 40)
+
+    backfill = HistoryBackfill(database, user_profile, args.chunk_size, args.workers)
+    stats = await backfill.run(reset=args.reset)
+
+    print(f"✅ {stats.messages} mensagens em {stats.chunks} blocos")
+    print(f"🧠 {stats.facts_found} fatos encontrados, {stats.facts_applied} aplicados ao perfil")
+    print(f"⚡ {stats.messages_per_second:,.0f} mensagens/s com {backfill.workers} processos")
+    print(f"📍 Checkpoint: mensagem {stats.last_message_id}")
+
+    await database.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,10 +9,21 @@ import random
 import threading
 import torch
 from pathlib import Path
-from typing import Optional, Dict, List, Union
+from typing import Optional, Dict, List, Union, AsyncIterable
 from dataclasses import dataclass
 import numpy as np
 
+from core.audio_cache import COMMON_PHRASES, CachedAudio, get_audio_cache
+from core.audio_io import float_to_pcm16, wav_bytes
+from core.chunked_tts import get_chunked_tts, gtts_fetcher
+from core.audio_playback import get_playback_backend
+from core.audio_stream import PcmRingBuffer, StreamStats
+from core.speaker_latents import SpeakerLatentCache, SpeakerLatents
+from core.speech_pipeline import PipelineStats, SentencePipeline, iter_sentences, split_sentences
+from core.inference_profile import CpuInferenceProfile, apply_cpu_profile, inference_context, resolve_device
+from core.synthesis_process import SynthesisProcess, XttsWorkerModel
+from config.ultra_voice_config import ULTRA_VOICE_CONFIG
+
 # Coqui TTS imports
 try:
     from TTS.api import TTS
@@ -31,6 +42,8 @@ try:
 except ImportError:
     GTTS_AVAILABLE = False
 
+XTTS_MODEL = "tts_models/multilingual/multi-dataset/xtts_v2"
+
 @dataclass
 class VoiceProfile:
     """Perfil de voz com configurações emocionais"""
@@ -63,7 +76,39 @@ class CoquiHumanVoice:
         
         # Sistema TTS
         self.tts_model = None
-        self.current_device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.current_device = resolve_device(ULTRA_VOICE_CONFIG.get_model_config())
+        
+        # Sem GPU: int8 dinâmico, threads do torch, inference_mode e aquecimento
+        cpu_config = ULTRA_VOICE_CONFIG.get_cpu_inference_config()
+        self.cpu_profile = CpuInferenceProfile.from_config(cpu_config)
+        self.cpu_profile_report: Dict = {}
+        self._synthesis_lock = threading.Lock()  # fala e pré-aquecimento usam o mesmo modelo
+        
+        # XTTS em processo próprio (fora do GIL e da CPU do agente); threads do
+        # torch de lá ajustadas à parte. Se não subir, o modelo carrega aqui.
+        self.use_synthesis_process = cpu_config.get("synthesis_process", True)
+        self.synthesis_threads = self.cpu_profile.threads
+        self.synthesis_process: Optional[SynthesisProcess] = None
+        
+        # Voz de referência codificada uma vez (não a cada frase)
+        self.speaker_latent_cache = SpeakerLatentCache()
+        self.speaker_latents: Optional[SpeakerLatents] = None
+        self.synthesis_stats = {"latents": [0, 0.0], "speaker_wav": [0, 0.0], "process": [0, 0.0]}  # [frases, segundos]
+        
+        # Síntese em streaming: a fala começa no primeiro pedaço gerado
+        self.streaming_synthesis = True
+        self.last_stream_stats: Optional[StreamStats] = None
+        self.last_speech_stats: Optional[PipelineStats] = None  # lido pelo roteador de TTS
+        
+        # Cache de áudio compartilhado
+        self.audio_cache = get_audio_cache()
+        
+        # Saída de áudio com aviso de término
+        self.playback = get_playback_backend()
+        self.current_playback = None
+        
+        # gTTS: trechos de falas longas buscados em paralelo
+        self.chunked_tts = get_chunked_tts()
         
         # Perfis emocionais realistas
         self.voice_profiles = {
@@ -162,8 +207,8 @@ class CoquiHumanVoice:
         # Thread para operações assíncronas
         self.audio_thread = None
         
-        # Inicializar sistema
-        asyncio.create_task(self.initialize())
+        # Inicializar sistema (o registro de vozes aguarda esta mesma task)
+        self.init_task = asyncio.create_task(self.initialize())
     
     async def initialize(self):
         """Inicializa o sistema de voz humana"""
@@ -183,6 +228,10 @@ class CoquiHumanVoice:
         
         self.is_initialized = True
         self._print_system_status()
+        
+        # Frases fixas geradas em segundo plano
+        if self.xtts_ready or GTTS_AVAILABLE:
+            asyncio.create_task(self.prewarm_common_phrases())
     
     async def _init_pygame(self):
         """Inicializa pygame para reprodução de áudio"""
@@ -201,13 +250,25 @@ class CoquiHumanVoice:
             self.logger.error(f"Erro ao inicializar áudio: {e}")
             self.pygame_ready = False
     
+    @property
+    def xtts_ready(self) -> bool:
+        """XTTS disponível, neste processo ou no processo de síntese"""
+        if self.synthesis_process is not None and self.synthesis_process.is_ready:
+            return True
+        return COQUI_AVAILABLE and self.tts_model is not None
+    
     async def _init_coqui_tts(self):
         """Inicializa Coqui TTS com XTTS para voz humana"""
+        if self.use_synthesis_process:
+            if await self._start_synthesis_process():
+                return
+            self.logger.warning("Processo de síntese indisponível, carregando XTTS neste processo")
+        
         try:
             self.logger.info("🧠 Carregando modelo XTTS...")
             
             # Usar XTTS v2 - melhor qualidade humana
-            model_name = "tts_models/multilingual/multi-dataset/xtts_v2"
+            model_name = XTTS_MODEL
             
             # Inicializar TTS
             self.tts_model = TTS(model_name, progress_bar=False)
@@ -221,10 +282,57 @@ class CoquiHumanVoice:
             # Criar voz de referência se não existir
             await self._setup_reference_voice()
             
+            if self.current_device == "cpu":
+                await self._apply_cpu_profile()
+            
         except Exception as e:
             self.logger.error(f"Erro ao carregar XTTS: {e}")
             self.tts_model = None
     
+    async def _apply_cpu_profile(self):
+        """Perfil de CPU no modelo deste processo (aquecimento com a voz de referência)"""
+        model = self._xtts_model() or getattr(getattr(self.tts_model, "synthesizer", None), "tts_model", None)
+        if model is None:
+            return
+        
+        def warmup(text: str):
+            if self.speaker_latents is not None:
+                latents = self.speaker_latents
+                return model.inference(text, "pt", latents.gpt_cond_latent, latents.speaker_embedding)["wav"]
+            return self.tts_model.tts(text=text, language="pt")
+        
+        def apply():
+            # Lock tomado no executor: segurá-lo no event loop através do await travaria o loop
+            with self._synthesis_lock:
+                return apply_cpu_profile(model, self.cpu_profile, warmup)
+        
+        try:
+            loop = asyncio.get_event_loop()
+            self.cpu_profile_report = await loop.run_in_executor(None, apply)
+        except Exception as e:
+            self.logger.warning(f"Perfil de CPU não aplicado: {e}")
+    
+    async def _start_synthesis_process(self) -> bool:
+        """Sobe o processo de síntese e espera o XTTS (e os latentes da voz) carregar lá"""
+        self.logger.info(f"🧠 Carregando XTTS no processo de síntese ({self.synthesis_threads} threads)...")
+        model = XttsWorkerModel(XTTS_MODEL, device=self.current_device,
+                                reference_wav=str(self.voices_dir / "reference_voice.wav"),
+                                latents_dir=str(self.speaker_latent_cache.directory),
+                                cpu_profile=self.cpu_profile)
+        self.synthesis_process = SynthesisProcess(model, torch_threads=self.synthesis_threads)
+        try:
+            ready = await self.synthesis_process.wait_ready(timeout=300)
+        except Exception as e:
+            self.logger.error(f"Erro ao iniciar processo de síntese: {e}")
+            ready = False
+        if not ready:
+            self.synthesis_process.shutdown()
+            self.synthesis_process = None
+        else:
+            self.cpu_profile_report = {key: value for key, value in self.synthesis_process.info.items()
+                                       if key in ("intra_op", "inter_op", "quantized_layers", "warmup_s")}
+        return ready
+    
     async def _setup_reference_voice(self):
         """Configura voz de referência para clonagem"""
         reference_path = self.voices_dir / "reference_voice.wav"
@@ -251,6 +359,34 @@ class CoquiHumanVoice:
                     self.logger.info("✅ Voz de referência criada")
             except Exception as e:
                 self.logger.error(f"Erro ao criar voz de referência: {e}")
+        
+        # Codificar a referência agora (ou ler do disco) para todas as frases
+        if reference_path.exists() and self._xtts_model() is not None:
+            try:
+                loop = asyncio.get_event_loop()
+                digest = await loop.run_in_executor(None, self.speaker_latent_cache.digest_for, reference_path)
+                await loop.run_in_executor(None, self._speaker_latents_for, reference_path, digest)
+            except Exception as e:
+                self.logger.error(f"Erro ao calcular latentes da voz: {e}")
+    
+    def _xtts_model(self):
+        """Modelo Xtts por trás do TTS.api (None se não expõe os latentes)"""
+        synthesizer = getattr(self.tts_model, "synthesizer", None)
+        model = getattr(synthesizer, "tts_model", None)
+        if model is not None and hasattr(model, "get_conditioning_latents") and hasattr(model, "inference"):
+            return model
+        return None
+    
+    def _compute_speaker_latents(self, reference_path: Path):
+        return self._xtts_model().get_conditioning_latents(audio_path=[str(reference_path)])
+    
+    def _speaker_latents_for(self, reference_path: Path, digest: str) -> SpeakerLatents:
+        """Latentes da referência atual; recalcula se o arquivo mudou"""
+        if self.speaker_latents is None or self.speaker_latents.digest != digest:
+            self.speaker_latents = self.speaker_latent_cache.get(
+                reference_path, self._compute_speaker_latents, self.current_device
+            )
+        return self.speaker_latents
     
     def _print_system_status(self):
         """Mostra status do sistema"""
@@ -258,9 +394,11 @@ class CoquiHumanVoice:
         print("🎭 SISTEMA DE VOZ HUMANA OFFLINE")
         print("="*60)
         
-        if COQUI_AVAILABLE and self.tts_model:
+        if self.xtts_ready:
             print("🌟 Coqui TTS (XTTS): ATIVO - Voz Ultra-Humana")
             print(f"📱 Dispositivo: {self.current_device.upper()}")
+            if self.synthesis_process is not None:
+                print(f"🧵 Processo de síntese: pid {self.synthesis_process.info.get('pid')}")
         elif GTTS_AVAILABLE:
             print("🔄 Google TTS: ATIVO - Fallback")
         else:
@@ -282,7 +420,7 @@ class CoquiHumanVoice:
             processed_text = self._humanize_text(text, emotion)
             
             # Gerar e reproduzir áudio
-            if COQUI_AVAILABLE and self.tts_model:
+            if self.xtts_ready:
                 await self._speak_with_xtts(processed_text, emotion, clone_voice)
             elif GTTS_AVAILABLE:
                 await self._speak_with_gtts_fallback(processed_text, emotion)
@@ -353,50 +491,78 @@ class CoquiHumanVoice:
         
         return processed
     
-    async def _speak_with_xtts(self, text: str, emotion: str, clone_voice: bool = True):
-        """Sintetiza voz usando XTTS com clonagem"""
+    async def speak_stream(self, chunks: AsyncIterable[str], emotion: str = "neutro",
+                           clone_voice: bool = True) -> str:
+        """Fala o texto conforme ele chega (ex.: LLM em streaming); retorna o texto completo"""
+        received = []
+        
+        async def sentences():
+            async def collect():
+                async for chunk in chunks:
+                    received.append(chunk)
+                    yield chunk
+            async for sentence in iter_sentences(collect(), emotion):
+                yield self._humanize_text(sentence, emotion)
+        
+        if self.is_speaking or not (self.xtts_ready or GTTS_AVAILABLE):
+            async for _ in sentences():
+                pass
+            text = "".join(received).strip()
+            print(f"🤖 SEXTA-FEIRA ({emotion}): {text}")
+            return text
+        
+        self.is_speaking = True
         try:
-            profile = self.voice_profiles[emotion]
-            
-            # Gerar áudio
-            audio_path = self.temp_dir / f"voice_{emotion}_{int(time.time())}.wav"
-            
-            # Configurar parâmetros do XTTS
-            kwargs = {
-                "text": text,
-                "file_path": str(audio_path),
-                "language": "pt",
-                "speed": profile.speed_factor
-            }
-            
-            # Usar voz clonada se disponível
-            reference_voice = self.voices_dir / "reference_voice.wav"
-            if clone_voice and reference_voice.exists():
-                kwargs["speaker_wav"] = str(reference_voice)
-            
-            # Executar síntese em thread separada para não bloquear
-            def synthesize():
-                try:
-                    self.tts_model.tts_to_file(**kwargs)
-                    return True
-                except Exception as e:
-                    self.logger.error(f"Erro na síntese XTTS: {e}")
-                    return False
-            
-            # Executar síntese
-            loop = asyncio.get_event_loop()
-            success = await loop.run_in_executor(None, synthesize)
-            
-            if success and audio_path.exists():
-                # Reproduzir áudio
-                await self._play_audio_with_emotion(audio_path, profile)
-                
-                # Limpar arquivo temporário
-                try:
-                    audio_path.unlink()
-                except:
-                    pass
+            stats = await self._speak_sentences(sentences(), emotion, clone_voice)
+            text = "".join(received).strip()
+            if not stats.sentences:
+                print(f"🤖 SEXTA-FEIRA ({emotion}): {text}")
+            return text
+        finally:
+            self.is_speaking = False
+    
+    async def _speak_sentences(self, sentences, emotion: str, clone_voice: bool = True) -> PipelineStats:
+        """XTTS sintetiza a próxima frase (executor) enquanto a anterior toca"""
+        profile = self.voice_profiles.get(emotion, self.voice_profiles["neutro"])
+        
+        streams: List[PcmRingBuffer] = []
+        
+        async def synthesize(sentence: str):
+            audio = None
+            if self.xtts_ready:
+                audio = await self._get_xtts_audio(sentence, profile.emotion, clone_voice, stream=True)
+            if audio is None and GTTS_AVAILABLE:
+                audio = await self._get_gtts_audio(sentence, profile.emotion)
+            if isinstance(audio, PcmRingBuffer):
+                streams.append(audio)
+            return audio
+        
+        async def play(audio: Union[CachedAudio, PcmRingBuffer]):
+            if isinstance(audio, PcmRingBuffer):
+                await self._play_stream_with_emotion(audio, profile)
             else:
+                await self._play_audio_with_emotion(audio, profile, pause=False)
+        
+        try:
+            stats = await SentencePipeline(synthesize, play).run(sentences)
+        finally:
+            # Fala interrompida: liberar a síntese das frases que não vão tocar
+            for stream in streams:
+                if not stream.closed:
+                    stream.cancel()
+        self.last_speech_stats = stats
+        self.logger.info(f"🎭 Fala em pipeline: {stats.format()}")
+        
+        # Pausa emocional só no fim da fala
+        if stats.sentences and profile.pause_multiplier > 1.0:
+            await asyncio.sleep(0.3 * profile.pause_multiplier)
+        return stats
+    
+    async def _speak_with_xtts(self, text: str, emotion: str, clone_voice: bool = True):
+        """Sintetiza voz usando XTTS com clonagem, frase a frase"""
+        try:
+            stats = await self._speak_sentences(split_sentences(text, emotion), emotion, clone_voice)
+            if not stats.sentences:
                 raise Exception("Falha na síntese XTTS")
                 
         except Exception as e:
@@ -405,56 +571,250 @@ class CoquiHumanVoice:
             if GTTS_AVAILABLE:
                 await self._speak_with_gtts_fallback(text, emotion)
     
+    async def _get_xtts_audio(self, text: str, emotion: str, clone_voice: bool = True,
+                              stream: bool = False) -> Optional[Union[CachedAudio, PcmRingBuffer]]:
+        """
+        Busca no cache; se não houver, sintetiza com XTTS e guarda (WAV PCM).
+        
+        Com stream=True e latentes prontos, retorna um PcmRingBuffer que a
+        síntese em streaming vai enchendo (o áudio entra no cache ao final).
+        """
+        profile = self.voice_profiles[emotion]
+        
+        # Usar voz clonada se disponível (o hash da referência entra na chave)
+        reference_voice = self.voices_dir / "reference_voice.wav"
+        speaker = None
+        if clone_voice and reference_voice.exists():
+            speaker = self.speaker_latent_cache.digest_for(reference_voice)   # hash memorizado
+        
+        key = self.audio_cache.make_key(text, emotion, "xtts_v2", {
+            "language": "pt", "speed": profile.speed_factor, "speaker": speaker
+        })
+        cached = self.audio_cache.get(key)
+        if cached:
+            return cached
+        
+        if self.synthesis_process is not None and self.synthesis_process.is_ready:
+            return await self._synthesize_in_process(text, profile, speaker, key, stream)
+        
+        # Configurar parâmetros do XTTS
+        kwargs = {
+            "text": text,
+            "language": "pt",
+            "speed": profile.speed_factor
+        }
+        if speaker:
+            kwargs["speaker_wav"] = str(reference_voice)
+        xtts = self._xtts_model() if speaker else None
+        
+        if stream and self.streaming_synthesis and xtts is not None and hasattr(xtts, "inference_stream") \
+                and self.speaker_latents is not None and self.speaker_latents.digest == speaker:
+            ring = PcmRingBuffer(self.tts_model.synthesizer.output_sample_rate)
+            loop = asyncio.get_event_loop()
+            loop.run_in_executor(None, self._stream_xtts, xtts, text, profile, ring, key)
+            return ring
+        
+        # Executar síntese em thread separada para não bloquear; as amostras
+        # float viram WAV PCM 16-bit em memória (sem tts_to_file)
+        def synthesize():
+            try:
+                with self._synthesis_lock, inference_context():
+                    start = time.perf_counter()
+                    latents = None
+                    if xtts is not None:
+                        try:
+                            latents = self._speaker_latents_for(reference_voice, speaker)
+                        except Exception as e:
+                            self.logger.warning(f"Latentes indisponíveis, usando speaker_wav: {e}")
+                    
+                    if latents is not None:
+                        # Referência já codificada: só a decodificação da frase
+                        samples = xtts.inference(
+                            text, "pt", latents.gpt_cond_latent, latents.speaker_embedding,
+                            speed=profile.speed_factor
+                        )["wav"]
+                        mode = "latents"
+                    else:
+                        samples = self.tts_model.tts(**kwargs)
+                        mode = "speaker_wav"
+                    self._record_synthesis(mode, time.perf_counter() - start)
+                return wav_bytes(samples, self.tts_model.synthesizer.output_sample_rate)
+            except Exception as e:
+                self.logger.error(f"Erro na síntese XTTS: {e}")
+                return None
+        
+        loop = asyncio.get_event_loop()
+        data = await loop.run_in_executor(None, synthesize)
+        if not data:
+            return None
+        return self.audio_cache.put(key, data, "wav")
+    
+    async def _synthesize_in_process(self, text: str, profile: VoiceProfile, speaker: Optional[str],
+                                     key: str, stream: bool) -> Optional[Union[CachedAudio, PcmRingBuffer]]:
+        """Frase sintetizada no processo de síntese; o PCM chega pela memória compartilhada"""
+        process = self.synthesis_process
+        params = {"language": "pt", "speed": profile.speed_factor, "speaker": speaker}
+        
+        if stream and self.streaming_synthesis:
+            ring = PcmRingBuffer(process.sample_rate)
+            stats = ring.stats
+            
+            def on_chunk(frames: bytes) -> bool:
+                # Thread leitora do processo: pedaço vai direto para o buffer
+                if stats.first_chunk is None:
+                    stats.first_chunk = time.perf_counter()
+                stats.chunks += 1
+                stats.audio_seconds += len(frames) / (2 * ring.sample_rate)
+                return ring.write(frames)
+            
+            try:
+                future = process.submit(text, params, stream=True, on_chunk=on_chunk)
+            except Exception as e:
+                self.logger.error(f"Erro no processo de síntese: {e}")
+                return None
+            future.add_done_callback(lambda done: self._finish_process_stream(done, ring, key))
+            return ring
+        
+        try:
+            result = await process.submit(text, params)
+        except Exception as e:
+            self.logger.error(f"Erro no processo de síntese: {e}")
+            return None
+        self._record_synthesis("process", result.synthesis_time)
+        return self.audio_cache.put(key, wav_bytes(result.pcm, result.sample_rate), "wav")
+    
+    def _finish_process_stream(self, future: asyncio.Future, ring: PcmRingBuffer, key: str):
+        """Fim do streaming no processo: fecha o buffer e guarda a frase completa no cache"""
+        ring.close()
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.logger.error(f"Erro na síntese XTTS em streaming: {future.exception()}")
+            return
+        result = future.result()
+        ring.stats.synthesis_time = result.synthesis_time
+        if not result.cancelled and result.pcm:
+            self._record_synthesis("process", result.synthesis_time)
+            self.audio_cache.put(key, wav_bytes(result.pcm, result.sample_rate), "wav")
+    
+    def _stream_xtts(self, xtts, text: str, profile: VoiceProfile, ring: PcmRingBuffer, key: str):
+        """Thread de síntese: pedaços do inference_stream vão direto para o buffer"""
+        latents = self.speaker_latents
+        stats = ring.stats
+        pcm = []
+        completed = False
+        try:
+            with self._synthesis_lock, inference_context():
+                chunks = xtts.inference_stream(
+                    text, "pt", latents.gpt_cond_latent, latents.speaker_embedding,
+                    speed=profile.speed_factor
+                )
+                start = time.perf_counter()
+                for chunk in chunks:
+                    # Só o tempo de geração conta no RTF (não a espera pelo buffer cheio)
+                    stats.synthesis_time += time.perf_counter() - start
+                    if hasattr(chunk, "cpu"):
+                        chunk = chunk.cpu().numpy()
+                    frames = float_to_pcm16(chunk).tobytes()
+                    if stats.first_chunk is None:
+                        stats.first_chunk = time.perf_counter()
+                    stats.chunks += 1
+                    stats.audio_seconds += len(frames) / (2 * ring.sample_rate)
+                    pcm.append(frames)
+                    if not ring.write(frames):
+                        break
+                    start = time.perf_counter()
+                else:
+                    completed = True
+        except Exception as e:
+            self.logger.error(f"Erro na síntese XTTS em streaming: {e}")
+        finally:
+            ring.close()
+        
+        if completed and pcm:
+            self.audio_cache.put(key, wav_bytes(b"".join(pcm), ring.sample_rate), "wav")
+    
+    async def _play_stream_with_emotion(self, ring: PcmRingBuffer, profile: VoiceProfile):
+        """Toca a frase enquanto ela é sintetizada e registra primeiro áudio e RTF"""
+        if not self.pygame_ready:
+            ring.cancel()
+            return
+        
+        try:
+            self.current_playback = await self.playback.play_stream(ring, profile.volume)
+            await self.current_playback.wait(timeout=60)
+        except Exception as e:
+            ring.cancel()
+            self.logger.error(f"Erro na reprodução em streaming: {e}")
+        finally:
+            self.last_stream_stats = ring.stats
+            self.logger.info(f"🌊 XTTS em streaming: {ring.stats.format()}")
+    
+    def _record_synthesis(self, mode: str, seconds: float):
+        """Latência por frase, com latentes em cache ou recodificando a referência"""
+        stats = self.synthesis_stats[mode]
+        stats[0] += 1
+        stats[1] += seconds
+        label = {"latents": "latentes em cache", "speaker_wav": "speaker_wav recodificado",
+                 "process": "processo de síntese"}[mode]
+        self.logger.info(f"🧠 XTTS ({label}): {seconds * 1000:.0f} ms, média {stats[1] / stats[0] * 1000:.0f} ms")
+    
+    def get_synthesis_latency(self) -> Dict[str, Dict]:
+        """Latência média de síntese por frase em cada modo"""
+        return {
+            mode: {"frases": count, "media_ms": round(total / count * 1000, 1) if count else None}
+            for mode, (count, total) in self.synthesis_stats.items()
+        }
+    
     async def _speak_with_gtts_fallback(self, text: str, emotion: str):
         """Fallback usando Google TTS"""
         try:
             profile = self.voice_profiles[emotion]
             
-            tts = gTTS(
-                text=text,
-                lang="pt-br",
-                slow=(profile.speed_factor < 0.9)
-            )
-            
-            audio_path = self.temp_dir / f"fallback_{int(time.time())}.mp3"
-            tts.save(str(audio_path))
-            
-            await self._play_audio_with_emotion(audio_path, profile)
-            
-            # Limpar
-            try:
-                audio_path.unlink()
-            except:
-                pass
+            audio = await self._get_gtts_audio(text, emotion)
+            if audio:
+                await self._play_audio_with_emotion(audio, profile)
                 
         except Exception as e:
             self.logger.error(f"Erro no fallback: {e}")
     
-    async def _play_audio_with_emotion(self, audio_path: Path, profile: VoiceProfile):
-        """Reproduz áudio aplicando configurações emocionais"""
+    async def _get_gtts_audio(self, text: str, emotion: str) -> Optional[CachedAudio]:
+        """Busca no cache; se não houver, gera com gTTS e guarda"""
+        profile = self.voice_profiles[emotion]
+        slow = profile.speed_factor < 0.9
+        key = self.audio_cache.make_key(text, emotion, "gtts", {"lang": "pt-br", "slow": slow})
+        cached = self.audio_cache.get(key)
+        if cached:
+            return cached
+        
+        # MP3 direto para memória (trechos em paralelo, juntados em ordem)
+        data = await self.chunked_tts.synthesize(text, gtts_fetcher(lang="pt-br", slow=slow))
+        return self.audio_cache.put(key, data, "mp3")
+    
+    async def prewarm_common_phrases(self):
+        """Gera em segundo plano as frases fixas que ainda não estão no cache"""
+        async def synthesize(text: str, emotion: str):
+            processed = self._humanize_text(text, emotion)
+            if self.xtts_ready:
+                return await self._get_xtts_audio(processed, emotion)
+            return await self._get_gtts_audio(processed, emotion)
+        
+        await self.audio_cache.prewarm(COMMON_PHRASES, synthesize)
+    
+    async def _play_audio_with_emotion(self, audio: CachedAudio, profile: VoiceProfile, pause: bool = True):
+        """Reproduz áudio (em memória) aplicando configurações emocionais"""
         if not self.pygame_ready:
             return
         
         try:
-            # Carregar e configurar áudio
-            pygame.mixer.music.load(str(audio_path))
-            pygame.mixer.music.set_volume(profile.volume)
+            # Reproduzir da memória
+            self.current_playback = await self.playback.play(audio.data, profile.volume)
             
-            # Reproduzir
-            pygame.mixer.music.play()
-            
-            # Aguardar término com timeout
-            start_time = time.time()
-            while pygame.mixer.music.get_busy():
-                await asyncio.sleep(0.05)  # Check mais frequente
-                
-                # Timeout de segurança (30 segundos)
-                if time.time() - start_time > 30:
-                    pygame.mixer.music.stop()
-                    break
+            # Aguardar o aviso de término (timeout de segurança de 30 segundos)
+            await self.current_playback.wait(timeout=30)
             
             # Pausa emocional após fala
-            if profile.pause_multiplier > 1.0:
+            if pause and profile.pause_multiplier > 1.0:
                 await asyncio.sleep(0.3 * profile.pause_multiplier)
                 
         except Exception as e:
@@ -516,17 +876,28 @@ class CoquiHumanVoice:
         """Retorna informações do sistema"""
         return {
             "coqui_available": COQUI_AVAILABLE,
-            "model_loaded": self.tts_model is not None,
+            "model_loaded": self.xtts_ready,
             "device": self.current_device,
+            "cpu_profile": self.cpu_profile_report or None,
             "pygame_ready": self.pygame_ready,
             "emotions_count": len(self.voice_profiles),
-            "is_initialized": self.is_initialized
+            "is_initialized": self.is_initialized,
+            "speaker_latents": self.speaker_latents.source if self.speaker_latents else None,
+            "synthesis_latency": self.get_synthesis_latency(),
+            "last_stream": self.last_stream_stats.format() if self.last_stream_stats else None,
+            "synthesis_process": self.synthesis_process.get_info() if self.synthesis_process else None,
+            "audio_cache": self.audio_cache.get_info()
         }
     
     async def cleanup(self):
         """Limpa recursos do sistema"""
         self.is_speaking = False
         
+        # Encerrar o processo de síntese (libera a memória compartilhada)
+        if self.synthesis_process is not None:
+            self.synthesis_process.shutdown()
+            self.synthesis_process = None
+        
         # Parar pygame
         if self.pygame_ready:
             try:
@@ -0,0 +1,182 @@
+# core/inference_profile.py - Perfil de inferência em CPU para modelos Coqui: int8 dinâmico, threads, inference_mode e aquecimento
+import contextlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Frases fixas do benchmark (curta, média e longa; com pontuação e números)
+BENCHMARK_SENTENCES = [
+    "Olá! Tudo pronto por aqui.",
+    "Agora são quinze para as três da tarde, e o céu está limpo.",
+    "Encontrei três arquivos na pasta de downloads; quer que eu abra o mais recente ou prefere ver a lista completa?",
+]
+
+@dataclass
+class CpuInferenceProfile:
+    """Como rodar o modelo em CPU (valores do bloco "cpu_inference" da configuração)"""
+    quantize: bool = True              # int8 dinâmico nas camadas elegíveis (nn.Linear)
+    intra_op_threads: int = 0          # 0 = metade dos núcleos lógicos
+    inter_op_threads: int = 1
+    warmup: bool = True
+    warmup_text: str = "Olá, tudo pronto."
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "CpuInferenceProfile":
+        config = config or {}
+        known = {name: config[name] for name in cls.__dataclass_fields__ if name in config}
+        return cls(**known)
+
+    @property
+    def threads(self) -> int:
+        return self.intra_op_threads or max(1, (os.cpu_count() or 2) // 2)
+
+def resolve_device(model_config: Optional[Dict[str, Any]] = None) -> str:
+    """cuda só com use_gpu e GPU presente; "auto" sem GPU vira cpu"""
+    model_config = model_config or {}
+    device = model_config.get("device", "auto")
+    cuda = TORCH_AVAILABLE and torch.cuda.is_available()
+    if device == "cuda" or (device == "auto" and model_config.get("use_gpu", False)):
+        return "cuda" if cuda else "cpu"
+    return "cpu"
+
+def configure_torch_threads(threads: Optional[int], interop: int = 1) -> Dict[str, Any]:
+    """Threads do torch neste processo (intra-op e inter-op); sem torch, nada muda"""
+    if threads:
+        for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ[name] = str(threads)   # vale se o torch ainda não foi importado
+    if not TORCH_AVAILABLE:
+        return {"torch": False}
+    if threads:
+        torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(interop)
+    except RuntimeError:
+        pass   # já fixado (trabalho paralelo já rodou neste processo)
+    return {"torch": True, "intra_op": torch.get_num_threads(), "inter_op": torch.get_num_interop_threads()}
+
+def quantize_dynamic_int8(model) -> int:
+    """
+    Quantização dinâmica int8 (pesos int8, ativações quantizadas na hora)
+    nas nn.Linear do modelo, no lugar. Retorna quantas camadas mudaram.
+    """
+    linear = [module for module in model.modules() if type(module) is torch.nn.Linear]
+    if not linear:
+        return 0
+    try:
+        from torch.ao.quantization import quantize_dynamic
+    except ImportError:
+        from torch.quantization import quantize_dynamic   # torch < 1.10
+    quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return len(linear)
+
+def inference_context():
+    """torch.inference_mode (sem autograd nem contadores de versão); sem torch, nada"""
+    return torch.inference_mode() if TORCH_AVAILABLE else contextlib.nullcontext()
+
+def apply_cpu_profile(model, profile: CpuInferenceProfile, warmup: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+    """
+    Prepara o modelo para CPU: threads, modo de avaliação, int8 dinâmico
+    e uma síntese de aquecimento (alocações e caminhos de código prontos
+    antes da primeira fala de verdade).
+    """
+    logger = logging.getLogger(__name__)
+    report: Dict[str, Any] = configure_torch_threads(profile.threads, profile.inter_op_threads)
+    if hasattr(model, "eval"):
+        model.eval()
+    if profile.quantize and TORCH_AVAILABLE:
+        try:
+            report["quantized_layers"] = quantize_dynamic_int8(model)
+        except Exception as e:
+            report["quantized_layers"] = 0
+            logger.warning(f"Quantização int8 indisponível: {e}")
+    if profile.warmup and warmup is not None:
+        start = time.perf_counter()
+        with inference_context():
+            warmup(profile.warmup_text)
+        report["warmup_s"] = time.perf_counter() - start
+    logger.info(f"⚙️ Perfil de CPU: {report}")
+    return report
+
+def rss_mb() -> Optional[float]:
+    """Memória residente do processo em MB"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / 2 ** 20
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+@dataclass
+class InferenceReport:
+    """RTF e memória de uma configuração sobre as frases fixas"""
+    label: str
+    synthesis_time: float = 0.0
+    audio_seconds: float = 0.0
+    rss_mb: Optional[float] = None
+    sentences: List[float] = field(default_factory=list)   # RTF por frase
+
+    @property
+    def rtf(self) -> Optional[float]:
+        return self.synthesis_time / self.audio_seconds if self.audio_seconds else None
+
+    def format(self) -> str:
+        rtf = f"{self.rtf:.2f}" if self.rtf is not None else "-"
+        rss = f"{self.rss_mb:.0f} MB" if self.rss_mb is not None else "-"
+        return f"{self.label}: RTF {rtf} | RSS {rss} | síntese {self.synthesis_time:.2f}s para {self.audio_seconds:.2f}s de áudio"
+
+def measure_inference(label: str, synthesize: Callable[[str], Any], sample_rate: int,
+                      sentences: Iterable[str] = BENCHMARK_SENTENCES) -> InferenceReport:
+    """Sintetiza as frases fixas sob inference_mode e mede RTF e RSS"""
+    report = InferenceReport(label)
+    for sentence in sentences:
+        start = time.perf_counter()
+        with inference_context():
+            samples = synthesize(sentence)
+        elapsed = time.perf_counter() - start
+        seconds = len(samples) / sample_rate
+        report.synthesis_time += elapsed
+        report.audio_seconds += seconds
+        report.sentences.append(elapsed / seconds if seconds else 0.0)
+    report.rss_mb = rss_mb()
+    return report
+
+def benchmark_xtts(model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2",
+                   reference_wav: str = "voices/reference_voice.wav") -> List[InferenceReport]:
+    """XTTS em CPU antes e depois do perfil, nas mesmas frases (mesmo processo)"""
+    from TTS.api import TTS
+
+    tts = TTS(model_name, progress_bar=False).to("cpu")
+    xtts = tts.synthesizer.tts_model
+    rate = tts.synthesizer.output_sample_rate
+    gpt, speaker = xtts.get_conditioning_latents(audio_path=[reference_wav])
+
+    def synthesize(text: str):
+        return xtts.inference(text, "pt", gpt, speaker)["wav"]
+
+    reports = [measure_inference("padrão (fp32, threads padrão)", synthesize, rate)]
+    profile = CpuInferenceProfile()
+    apply_cpu_profile(xtts, profile, warmup=synthesize)
+    reports.append(measure_inference(f"perfil CPU (int8, {profile.threads} threads)", synthesize, rate))
+    return reports
+
+if __name__ == "__main__":
+    for report in benchmark_xtts():
+        print(f"📊 {report.format()}")
@@ -3,8 +3,9 @@ import re
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 from dataclasses import dataclass, asdict
+from utils.nlu import Utterance, as_utterance
 
 @dataclass
 class ExtractedFact:
@@ -108,23 +109,60 @@ class IntelligentFactExtractor:
             "hobbies": ["futebol", "música", "leitura", "jogos", "filmes", "séries", "culinária", 
                        "viagem", "fotografia", "desenho"]
         }
+        
+        # Gatilhos literais (sem acento) por categoria: a categoria só roda se algum aparecer.
+        # Todo match contém um gatilho a no máximo `max_trigger_lead` caracteres do seu início
+        self.category_triggers = {
+            "age_direct": ["tenho", "idade", "sou de", "nasci"],
+            "age_relative": ["tinha", "aos", "desde", "ha "],
+            "location": ["moro", "vivo", "sou de", "estou em", "aqui em", "cidade de"],
+            "family": ["mae", "pai", "irma", "filh", "marido", "esposa", "namorad"],
+            "occupation": ["trabalho", "sou", "profiss", "atuo", "faculdade", "estudo", "curso"],
+            "preferences": ["gosto", "amo", "adoro", "odeio", "detesto", "favorit", "preferid", "prefiro"],
+            "activities": ["faco", "pratico", "jogo", "assisto", "leio", "escuto", "tempo livre"],
+            "emotions": ["sinto", "estou", "deixa", "faz ficar", "fico", "fiquei"],
+        }
+        self.digit_categories = {"age_direct", "age_relative"}
+        self.max_trigger_lead = 16
+        
+        # Padrões compilados uma única vez
+        self._compiled_patterns = {
+            category: [re.compile(pattern) for pattern in patterns]
+            for category, patterns in self.extraction_patterns.items()
+        }
     
-    def extract_facts(self, text: str, context: str = "") -> List[ExtractedFact]:
+    def _first_trigger_position(self, category: str, utterance: Utterance) -> int:
+        """Posição do primeiro gatilho da categoria no texto (-1 se nenhum)"""
+        if category in self.digit_categories and not utterance.has_digits:
+            return -1
+        
+        positions = [utterance.folded.find(trigger) for trigger in self.category_triggers.get(category, [""])]
+        positions = [position for position in positions if position >= 0]
+        return min(positions) if positions else -1
+    
+    def extract_facts(self, text: Union[str, Utterance], context: str = "") -> List[ExtractedFact]:
         """Extrai fatos de um texto"""
         facts = []
-        text_lower = text.lower()
+        utterance = as_utterance(text)
+        text = utterance.raw
+        text_lower = utterance.lower
         
-        # Extrair fatos explícitos
-        for category, patterns in self.extraction_patterns.items():
+        # Extrair fatos explícitos (só categorias com gatilho, a partir do primeiro gatilho)
+        for category, patterns in self._compiled_patterns.items():
+            trigger_position = self._first_trigger_position(category, utterance)
+            if trigger_position < 0:
+                continue
+            
+            start = max(0, trigger_position - self.max_trigger_lead)
             for pattern in patterns:
-                matches = re.finditer(pattern, text_lower)
+                matches = pattern.finditer(text_lower, start)
                 for match in matches:
                     fact = self._create_fact_from_match(category, match, text, context)
                     if fact:
                         facts.append(fact)
         
         # Fazer inferências
-        inferred_facts = self._make_inferences(text, facts, context)
+        inferred_facts = self._make_inferences(utterance, facts, context)
         facts.extend(inferred_facts)
         
         return facts
@@ -228,7 +266,7 @@ class IntelligentFactExtractor:
             self.logger.error(f"Erro ao criar fato: {e}")
             return None
     
-    def _make_inferences(self, text: str, explicit_facts: List[ExtractedFact], context: str) -> List[ExtractedFact]:
+    def _make_inferences(self, text: Union[str, Utterance], explicit_facts: List[ExtractedFact], context: str) -> List[ExtractedFact]:
         """Faz inferências baseadas nos fatos explícitos e contexto"""
         inferences = []
         
@@ -251,7 +289,7 @@ class IntelligentFactExtractor:
                 inferences.append(birth_fact)
         
         # Inferir localização a partir de contexto
-        text_lower = text.lower()
+        text_lower = as_utterance(text).lower
         for city in self.known_contexts["brazilian_cities"]:
             if city in text_lower and not any(f.subcategory == "location" for f in explicit_facts):
                 location_fact = ExtractedFact(
@@ -0,0 +1,160 @@
+# core/intent_router.py - Roteador de intenções baseado em registro
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Pattern, Union
+
+from utils.nlu import Utterance, as_utterance, fold_accents
+
+# handler(utterance, timings): timings é o TurnTimings do próprio turno (ou None)
+IntentHandler = Callable[[Utterance, Optional[Any]], Awaitable[Optional[str]]]
+
+@dataclass
+class IntentStats:
+    """Contadores de uma intenção"""
+    matches: int = 0          # gatilho encontrado no texto
+    handled: int = 0          # handler devolveu resposta
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.matches if self.matches else 0.0
+
+@dataclass
+class Intent:
+    """Intenção registrada: gatilhos literais e handler assíncrono"""
+    name: str
+    handler: IntentHandler
+    triggers: List[str]
+    priority: int
+    error_response: Optional[str] = None
+
+class IntentRouter:
+    """
+    Compila os gatilhos de todas as intenções em uma única regex.
+
+    Uma varredura do texto devolve as intenções candidatas; elas são tentadas
+    em ordem de prioridade e a primeira que responder (não None) vence.
+    Sem candidata que responda, vai para o fallback (conversa normal).
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.intents: Dict[str, Intent] = {}
+        self.stats: Dict[str, IntentStats] = {}
+        self.fallback: Optional[Intent] = None
+        self._matcher: Optional[Pattern] = None
+        self._owners: Dict[str, FrozenSet[str]] = {}
+
+    def register(self, name: str, handler: IntentHandler, triggers: List[str],
+                 priority: Optional[int] = None, error_response: Optional[str] = None):
+        """Registra uma intenção (prioridade padrão: ordem de registro)"""
+        if priority is None:
+            priority = len(self.intents)
+        self.intents[name] = Intent(name, handler, list(triggers), priority, error_response)
+        self.stats.setdefault(name, IntentStats())
+        self._matcher = None
+
+    def set_fallback(self, name: str, handler: IntentHandler):
+        """Handler usado quando nenhuma intenção responde"""
+        self.fallback = Intent(name, handler, [], priority=len(self.intents))
+        self.stats.setdefault(name, IntentStats())
+
+    def compile(self):
+        """Constrói a regex única com os gatilhos (sem acento) de todas as intenções"""
+        owners: Dict[str, set] = {}
+        for intent in self.intents.values():
+            for trigger in intent.triggers:
+                owners.setdefault(fold_accents(trigger.lower()), set()).add(intent.name)
+
+        # Em cada posição a alternância casa só o gatilho mais longo; os gatilhos
+        # contidos nele (prefixos inclusive) são resolvidos aqui, uma única vez
+        self._owners = {
+            trigger: frozenset().union(*(names for other, names in owners.items() if other in trigger))
+            for trigger in owners
+        }
+
+        alternatives = "|".join(re.escape(trigger) for trigger in sorted(owners, key=len, reverse=True))
+        # Lookahead: testa todas as posições, inclusive gatilhos sobrepostos
+        self._matcher = re.compile(f"(?=({alternatives}))") if owners else None
+        self.logger.info(f"Roteador compilado: {len(self.intents)} intenções, {len(owners)} gatilhos")
+
+    def match(self, text: Union[str, Utterance]) -> List[str]:
+        """Intenções cujos gatilhos aparecem no texto, em ordem de prioridade"""
+        if self._matcher is None:
+            self.compile()
+            if self._matcher is None:
+                return []
+        utterance = as_utterance(text)
+        found = set()
+        for match in self._matcher.finditer(utterance.folded):
+            found |= self._owners[match.group(1)]
+        return sorted(found, key=lambda name: self.intents[name].priority)
+
+    async def dispatch(self, text: Union[str, Utterance], timings=None) -> Optional[str]:
+        """Executa a primeira intenção candidata que responder, ou o fallback"""
+        utterance = as_utterance(text)
+
+        if timings is not None:
+            with timings.stage("roteamento"):
+                candidates = self.match(utterance)
+        else:
+            candidates = self.match(utterance)
+
+        for name in candidates:
+            self.stats[name].matches += 1
+            response = await self._run(self.intents[name], utterance, timings)
+            if response:
+                return response
+
+        if self.fallback:
+            self.stats[self.fallback.name].matches += 1
+            return await self._run(self.fallback, utterance, timings)
+        return None
+
+    async def _run(self, intent: Intent, utterance: Utterance, timings=None) -> Optional[str]:
+        """Chama o handler medindo a latência"""
+        stats = self.stats[intent.name]
+        start = time.perf_counter()
+        try:
+            response = await intent.handler(utterance, timings)
+        except Exception as e:
+            stats.errors += 1
+            self.logger.error(f"Erro na intenção {intent.name}: {e}")
+            response = intent.error_response
+            if response is None:
+                raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+        if response:
+            stats.handled += 1
+        return response
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Contagem e latência (ms) por intenção"""
+        return {
+            name: {
+                'matches': stats.matches,
+                'handled': stats.handled,
+                'errors': stats.errors,
+                'avg_ms': stats.avg_time * 1000,
+                'max_ms': stats.max_time * 1000,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    def format_stats(self) -> str:
+        """Resumo legível das estatísticas"""
+        lines = []
+        for name, stats in self.get_stats().items():
+            lines.append(
+                f"{name}: {stats['handled']}/{stats['matches']} respostas, "
+                f"média {stats['avg_ms']:.1f} ms, máx {stats['max_ms']:.1f} ms"
+            )
+        return "\n".join(lines)
@@ -1,10 +1,13 @@
 # core/minimal_voice_system.py - Sistema mínimo que sempre funciona
 import asyncio
 import logging
-import time
 from pathlib import Path
 from typing import List, Optional
 
+from core.audio_io import gtts_to_bytes
+from core.audio_playback import get_playback_backend
+from core.offline_tts import get_offline_tts
+
 # Imports seguros
 try:
     from gtts import gTTS
@@ -34,6 +37,7 @@ class MinimalVoiceSystem:
         elif PYTTSX3:
             self.system = "pyttsx3"
             print("🎤 Sistema: pyttsx3 Offline")
+            get_offline_tts().start()  # engine criado uma vez, em thread própria
         else:
             self.system = "text"
             print("📝 Sistema: Texto apenas")
@@ -67,24 +71,14 @@ class MinimalVoiceSystem:
             # Processar texto
             processed = text.replace("SEXTA-FEIRA", "Sexta-feira")
             
-            # Gerar áudio
+            # Gerar áudio em memória
             tts = gTTS(text=processed, lang="pt-br")
-            audio_file = self.temp_dir / f"voice_{int(time.time())}.mp3"
-            tts.save(str(audio_file))
-            
-            # Reproduzir
-            pygame.mixer.music.load(str(audio_file))
-            pygame.mixer.music.play()
-            
-            # Aguardar
-            while pygame.mixer.music.get_busy():
-                await asyncio.sleep(0.1)
+            loop = asyncio.get_event_loop()
+            data = await loop.run_in_executor(None, gtts_to_bytes, tts)
             
-            # Limpar
-            try:
-                audio_file.unlink()
-            except:
-                pass
+            # Reproduzir e aguardar o aviso de término
+            playback = await get_playback_backend().play(data)
+            await playback.wait()
                 
         except Exception as e:
             self.logger.error(f"Erro gTTS: {e}")
@@ -95,22 +89,7 @@ class MinimalVoiceSystem:
         try:
             processed = text.replace("SEXTA-FEIRA", "Sexta-feira")
             
-            def speak_sync():
-                engine = pyttsx3.init()
-                
-                # Configurar voz feminina se disponível
-                voices = engine.getProperty('voices')
-                for voice in voices:
-                    if 'zira' in voice.name.lower() or 'helena' in voice.name.lower():
-                        engine.setProperty('voice', voice.id)
-                        break
-                
-                engine.say(processed)
-                engine.runAndWait()
-                engine.stop()
-            
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, speak_sync)
+            await get_offline_tts().say(processed)
             
         except Exception as e:
             self.logger.error(f"Erro pyttsx3: {e}")
@@ -0,0 +1,239 @@
+# core/offline_tts.py - Worker do pyttsx3: um engine, voz resolvida uma vez, fila de falas
+import asyncio
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from core.speech_pipeline import PipelineStats
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    PYTTSX3_AVAILABLE = False
+
+FEMALE_VOICE_KEYWORDS = ("zira", "helena", "female")
+
+@dataclass
+class OfflineSpeechJob:
+    """Uma fala para o worker (rate/volume próprios)"""
+    text: str
+    rate: Optional[int]
+    volume: Optional[float]
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None    # evento started-utterance do engine
+    finished_at: Optional[float] = None
+
+class OfflineTTSWorker:
+    """
+    Thread de longa duração dona de um único engine pyttsx3.
+
+    O engine (e a busca pela voz feminina) é criado uma vez, dentro da
+    própria thread, como o pyttsx3 exige. As falas chegam por uma fila e
+    cada uma aplica seu rate/volume; o término volta ao event loop como um
+    future (True ao terminar; exceção se o engine falhar).
+    """
+
+    _STOP = object()
+
+    def __init__(self, engine_factory: Optional[Callable[[], object]] = None,
+                 voice_keywords: Iterable[str] = FEMALE_VOICE_KEYWORDS):
+        self.logger = logging.getLogger(__name__)
+        self.engine_factory = engine_factory or (pyttsx3.init if PYTTSX3_AVAILABLE else None)
+        self.voice_keywords = tuple(voice_keywords)
+        self.voice_name: Optional[str] = None
+        self.init_time: Optional[float] = None
+        self.spoken = 0
+        self.total_latency = 0.0   # fila + fala, por job
+
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._engine = None
+        self._current: Optional[OfflineSpeechJob] = None
+        self._defaults = {}
+        self._lock = threading.Lock()
+        self._engine_attempted = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Inicia a thread (o engine é criado nela, antes da primeira fala)"""
+        with self._lock:
+            if self.is_running:
+                return
+            if self.engine_factory is None:
+                raise RuntimeError("pyttsx3 não instalado")
+            self._engine_attempted.clear()
+            self._thread = threading.Thread(target=self._run, name="offline-tts", daemon=True)
+            self._thread.start()
+
+    def submit_job(self, text: str, rate: Optional[int] = None, volume: Optional[float] = None) -> OfflineSpeechJob:
+        """Agenda a fala; o job traz o future de término e os tempos medidos"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        job = OfflineSpeechJob(text, rate, volume, loop.create_future(), loop)
+        self._jobs.put(job)
+        return job
+
+    def submit(self, text: str, rate: Optional[int] = None, volume: Optional[float] = None) -> asyncio.Future:
+        """Agenda a fala e retorna o future de término no loop atual"""
+        return self.submit_job(text, rate, volume).future
+
+    async def say(self, text: str, rate: Optional[int] = None, volume: Optional[float] = None) -> bool:
+        return await self.submit(text, rate, volume)
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Espera a criação do engine na thread; True se ele está pronto"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._engine_attempted.wait, timeout)
+        return self._engine is not None
+
+    def stop_current(self):
+        """Interrompe a fala em andamento (a fila continua)"""
+        engine = self._engine
+        if engine is not None:
+            try:
+                engine.stop()
+            except Exception as e:
+                self.logger.debug(f"engine.stop falhou: {e}")
+
+    def shutdown(self, timeout: float = 2.0):
+        """Encerra a thread depois das falas já enfileiradas"""
+        if self.is_running:
+            self._jobs.put(self._STOP)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _create_engine(self):
+        start = time.perf_counter()
+        engine = self.engine_factory()
+        # rate/volume de fábrica: usados pelas falas que não pedem os seus
+        self._defaults = {name: engine.getProperty(name) for name in ('rate', 'volume')}
+        for voice in engine.getProperty('voices') or []:
+            name = (getattr(voice, "name", "") or "").lower()
+            if any(keyword in name for keyword in self.voice_keywords):
+                engine.setProperty('voice', voice.id)
+                self.voice_name = voice.name
+                break
+        connect = getattr(engine, "connect", None)
+        if connect is not None:
+            connect('started-utterance', self._on_started)
+        self.init_time = time.perf_counter() - start
+        self.logger.info(f"🎤 pyttsx3 pronto em {self.init_time * 1000:.0f} ms (voz: {self.voice_name or 'padrão'})")
+        return engine
+
+    def _on_started(self, name=None):
+        job = self._current
+        if job is not None and job.started_at is None:
+            job.started_at = time.perf_counter()
+
+    def _run(self):
+        try:
+            self._engine = self._create_engine()
+        except Exception as e:
+            self.logger.error(f"Erro ao iniciar pyttsx3 (nova tentativa na próxima fala): {e}")
+        self._engine_attempted.set()
+
+        while True:
+            job = self._jobs.get()
+            if job is self._STOP:
+                break
+            if job.future.done():   # cancelada enquanto esperava
+                continue
+            try:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+                self._engine.setProperty('rate', job.rate if job.rate is not None else self._defaults['rate'])
+                self._engine.setProperty('volume', job.volume if job.volume is not None else self._defaults['volume'])
+                self._current = job
+                self._engine.say(job.text)
+                self._engine.runAndWait()
+                job.finished_at = time.perf_counter()
+                self.spoken += 1
+                self.total_latency += job.finished_at - job.enqueued_at
+                self._complete(job, True)
+            except Exception as e:
+                # Engine em estado ruim: recriar na próxima fala
+                self._engine = None
+                self._complete(job, error=e)
+            finally:
+                self._current = None
+
+        self._engine = None
+
+    @staticmethod
+    def _complete(job: OfflineSpeechJob, result: Optional[bool] = None, error: Optional[Exception] = None):
+        def resolve():
+            if job.future.done():
+                return
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+        try:
+            job.loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # loop já encerrado
+
+    def get_info(self) -> dict:
+        return {
+            "running": self.is_running,
+            "voice": self.voice_name,
+            "init_ms": round(self.init_time * 1000, 1) if self.init_time is not None else None,
+            "spoken": self.spoken,
+            "avg_latency_ms": round(self.total_latency / self.spoken * 1000, 1) if self.spoken else None,
+        }
+
+_default_worker: Optional[OfflineTTSWorker] = None
+
+def get_offline_tts() -> OfflineTTSWorker:
+    """Worker compartilhado: um único engine pyttsx3 por processo"""
+    global _default_worker
+    if _default_worker is None:
+        _default_worker = OfflineTTSWorker()
+    return _default_worker
+
+class OfflineVoice:
+    """Voz offline (pyttsx3) com emoção por rate/volume, sobre o worker compartilhado"""
+
+    BASE_RATE = 180
+    EMOTION_PROFILES = {
+        "neutro": (1.0, 0.8), "feliz": (1.15, 0.9), "carinhoso": (0.85, 0.75),
+        "triste": (0.75, 0.65), "curioso": (1.05, 0.85), "animado": (1.25, 0.95),
+        "frustrado": (1.1, 0.88), "sedutor": (0.8, 0.7), "surpreso": (1.3, 0.9),
+    }
+
+    def __init__(self, worker: Optional[OfflineTTSWorker] = None):
+        self.worker = worker or get_offline_tts()
+        self.is_initialized = False
+        self.last_speech_stats: Optional[PipelineStats] = None
+
+    async def initialize(self):
+        """Sobe a thread e espera o engine ficar pronto"""
+        self.is_initialized = await self.worker.wait_ready()
+
+    async def speak(self, text: str, emotion: str = "neutro"):
+        speed, volume = self.EMOTION_PROFILES.get(emotion, self.EMOTION_PROFILES["neutro"])
+        job = self.worker.submit_job(text.replace("SEXTA-FEIRA", "Sexta-feira"),
+                                     rate=int(self.BASE_RATE * speed), volume=volume)
+        await job.future
+        # pyttsx3 sintetiza e toca junto: sem RTF, só o tempo até começar a falar
+        self.last_speech_stats = PipelineStats(
+            sentences=1,
+            first_audio=job.started_at - job.enqueued_at if job.started_at else None,
+            total=(job.finished_at or time.perf_counter()) - job.enqueued_at,
+        )
+
+    def get_available_emotions(self):
+        return list(self.EMOTION_PROFILES.keys())
+
+    def get_voice_info(self):
+        return {"system": "pyttsx3", "quality": "offline", **self.worker.get_info()}
@@ -1,10 +1,14 @@
 # core/python313_voice_system.py - Sistema otimizado para Python 3.13
 import asyncio
 import logging
-import time
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from core.audio_cache import COMMON_PHRASES, CachedAudio, get_audio_cache
+from core.audio_io import gtts_to_bytes
+from core.audio_playback import get_playback_backend
+from core.offline_tts import get_offline_tts
+
 # Imports seguros para Python 3.13
 try:
     from gtts import gTTS
@@ -32,6 +36,19 @@ class Python313VoiceSystem:
         self.current_engine = self._detect_best_engine()
         self.is_speaking = False
         
+        # Cache de áudio compartilhado (pré-aquecido na primeira fala)
+        self.audio_cache = get_audio_cache()
+        self._prewarm_task = None
+        
+        # Saída de áudio com aviso de término
+        self.playback = get_playback_backend()
+        self.current_playback = None
+        
+        # pyttsx3: um engine em thread própria, criado já (não a cada fala)
+        self.offline_tts = get_offline_tts() if PYTTSX3_AVAILABLE else None
+        if self.current_engine == "pyttsx3":
+            self.offline_tts.start()
+        
         # Perfis emocionais otimizados
         self.emotion_profiles = {
             "neutro": {"speed": 1.0, "volume": 0.8, "pause": 1.0},
@@ -99,6 +116,8 @@ class Python313VoiceSystem:
         
         try:
             if self.current_engine == "gtts_pygame":
+                if self._prewarm_task is None:
+                    self._prewarm_task = asyncio.create_task(self.prewarm_common_phrases())
                 await self._speak_gtts_pygame(text, emotion)
             elif self.current_engine == "pyttsx3":
                 await self._speak_pyttsx3(text, emotion)
@@ -118,68 +137,61 @@ class Python313VoiceSystem:
             # Processar texto
             processed_text = self._humanize_text(text, emotion)
             
-            # Gerar áudio
-            tts = gTTS(
-                text=processed_text,
-                lang="pt-br",
-                slow=(profile["speed"] < 0.9)
-            )
+            # Áudio do cache ou gerado agora
+            audio = await self._get_gtts_audio(processed_text, emotion, profile)
+            if audio is None:
+                raise Exception("Falha na geração")
             
-            audio_file = self.temp_dir / f"voice_{emotion}_{int(time.time())}.mp3"
-            tts.save(str(audio_file))
+            # Reproduzir da memória com configurações emocionais
+            self.current_playback = await self.playback.play(audio.data, profile["volume"])
             
-            # Reproduzir com configurações emocionais
-            pygame.mixer.music.load(str(audio_file))
-            pygame.mixer.music.set_volume(profile["volume"])
-            pygame.mixer.music.play()
-            
-            # Aguardar término
-            while pygame.mixer.music.get_busy():
-                await asyncio.sleep(0.05)
+            # Aguardar o aviso de término
+            await self.current_playback.wait()
             
             # Pausa emocional
             if profile["pause"] != 1.0:
                 await asyncio.sleep(0.3 * profile["pause"])
-            
-            # Limpar arquivo
-            try:
-                audio_file.unlink()
-            except:
-                pass
                 
         except Exception as e:
             self.logger.error(f"Erro no gTTS+Pygame: {e}")
             self._speak_text_only(text, emotion)
     
+    async def _get_gtts_audio(self, processed_text: str, emotion: str, profile: Dict) -> Optional[CachedAudio]:
+        """Busca no cache; se não houver, gera com gTTS e guarda"""
+        slow = profile["speed"] < 0.9
+        key = self.audio_cache.make_key(processed_text, emotion, "gtts",
+                                        {"lang": "pt-br", "slow": slow})
+        cached = self.audio_cache.get(key)
+        if cached:
+            return cached
+        
+        # MP3 direto para memória (sem arquivo temporário)
+        tts = gTTS(text=processed_text, lang="pt-br", slow=slow)
+        loop = asyncio.get_event_loop()
+        data = await loop.run_in_executor(None, gtts_to_bytes, tts)
+        return self.audio_cache.put(key, data, "mp3")
+    
+    async def prewarm_common_phrases(self):
+        """Gera em segundo plano as frases fixas que ainda não estão no cache"""
+        async def synthesize(text: str, emotion: str):
+            profile = self.emotion_profiles.get(emotion, self.emotion_profiles["neutro"])
+            return await self._get_gtts_audio(self._humanize_text(text, emotion), emotion, profile)
+        
+        await self.audio_cache.prewarm(COMMON_PHRASES, synthesize)
+    
     async def _speak_pyttsx3(self, text: str, emotion: str):
         """Síntese usando pyttsx3"""
         try:
             profile = self.emotion_profiles.get(emotion, self.emotion_profiles["neutro"])
             processed_text = self._humanize_text(text, emotion)
             
-            def speak_sync():
-                engine = pyttsx3.init()
-                
-                # Configurar voz feminina
-                voices = engine.getProperty('voices')
-                for voice in voices:
-                    if any(keyword in voice.name.lower() for keyword in ['zira', 'helena', 'female']):
-                        engine.setProperty('voice', voice.id)
-                        break
-                
-                # Aplicar configurações emocionais
-                base_rate = 180
-                rate = int(base_rate * profile["speed"])
-                engine.setProperty('rate', rate)
-                engine.setProperty('volume', profile["volume"])
-                
-                engine.say(processed_text)
-                engine.runAndWait()
-                engine.stop()
-            
-            # Executar em thread
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, speak_sync)
+            # Worker do pyttsx3: engine e voz já prontos, rate/volume por fala
+            base_rate = 180
+            await self.offline_tts.say(
+                processed_text,
+                rate=int(base_rate * profile["speed"]),
+                volume=profile["volume"]
+            )
             
             # Pausa emocional
             if profile["pause"] != 1.0:
@@ -306,7 +318,9 @@ class Python313VoiceSystem:
             "gtts_available": GTTS_PYGAME_AVAILABLE,
             "pyttsx3_available": PYTTSX3_AVAILABLE,
             "emotions_count": len(self.emotion_profiles),
-            "python_version": "3.13"
+            "python_version": "3.13",
+            "offline_tts": self.offline_tts.get_info() if self.offline_tts else None,
+            "audio_cache": self.audio_cache.get_info()
         }
     
     async def cleanup(self):
@@ -0,0 +1,128 @@
+# core/speaker_latents.py - Latentes de condicionamento do XTTS calculados uma vez por voz de referência
+import logging
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.audio_cache import file_digest
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+@dataclass
+class SpeakerLatents:
+    """Voz de referência já codificada (gpt_cond_latent + speaker_embedding)"""
+    digest: str
+    gpt_cond_latent: Any
+    speaker_embedding: Any
+    source: str = "computed"   # computed, disk ou memory
+    seconds: float = 0.0       # tempo para obter (cálculo ou leitura)
+
+class SpeakerLatentCache:
+    """
+    Latentes do XTTS por hash da voz de referência, em memória e em disco.
+
+    Sem o cache, tts(speaker_wav=...) recodifica o WAV de referência a cada
+    frase. Aqui o cálculo acontece uma vez; o resultado é salvo em
+    cache/speakers/<modelo>_<hash>.pt e reaproveitado nas próximas sessões.
+    Trocar o arquivo de referência muda o hash e invalida o cache.
+    """
+
+    def __init__(self, directory: str = "cache/speakers", model_name: str = "xtts_v2"):
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self._memory: Dict[str, SpeakerLatents] = {}
+        self._digests: Dict[str, Tuple[Tuple[int, int], str]] = {}   # caminho -> ((mtime, tamanho), hash)
+        self._lock = threading.Lock()
+        self._digest_lock = threading.Lock()   # separado: o cálculo dos latentes segura _lock por segundos
+
+    def path_for(self, digest: str) -> Path:
+        return self.directory / f"{self.model_name}_{digest}.pt"
+
+    def digest_for(self, reference: Path) -> str:
+        """Hash da referência; só relê o arquivo quando mtime ou tamanho mudam (um stat por frase)"""
+        stat = os.stat(reference)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = str(reference)
+        with self._digest_lock:
+            known = self._digests.get(key)
+            if known is not None and known[0] == signature:
+                return known[1]
+        digest = file_digest(reference)
+        with self._digest_lock:
+            self._digests[key] = (signature, digest)
+        return digest
+
+    def get(self, reference: Path, compute: Callable[[Path], Tuple[Any, Any]],
+            device: Optional[str] = None) -> SpeakerLatents:
+        """
+        Latentes da referência: memória, disco ou compute(reference).
+
+        compute recebe o caminho do WAV e retorna (gpt_cond_latent,
+        speaker_embedding), como Xtts.get_conditioning_latents.
+        """
+        digest = self.digest_for(reference)
+        with self._lock:
+            cached = self._memory.get(digest)
+            if cached:
+                return SpeakerLatents(digest, cached.gpt_cond_latent, cached.speaker_embedding, "memory")
+
+            start = time.perf_counter()
+            latents = self._load(digest, device)
+            if latents is not None:
+                source = "disk"
+            else:
+                latents = compute(reference)
+                source = "computed"
+                self._save(digest, latents)
+
+            result = SpeakerLatents(digest, latents[0], latents[1], source, time.perf_counter() - start)
+            self._memory[digest] = result
+            self.logger.info(f"🎤 Latentes da voz {digest} ({source}) em {result.seconds * 1000:.0f} ms")
+            return result
+
+    def _load(self, digest: str, device: Optional[str]):
+        path = self.path_for(digest)
+        if not path.exists():
+            return None
+        try:
+            if TORCH_AVAILABLE:
+                data = torch.load(path, map_location=device or "cpu")
+            else:
+                with open(path, "rb") as f:
+                    data = pickle.load(f)
+            return data["gpt_cond_latent"], data["speaker_embedding"]
+        except Exception as e:
+            self.logger.warning(f"Latentes em disco ilegíveis ({path.name}), recalculando: {e}")
+            return None
+
+    def _save(self, digest: str, latents: Tuple[Any, Any]):
+        path = self.path_for(digest)
+        tmp_path = path.with_suffix(".tmp")
+        data = {"gpt_cond_latent": latents[0], "speaker_embedding": latents[1]}
+        try:
+            if TORCH_AVAILABLE:
+                torch.save(data, tmp_path)
+            else:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Não foi possível salvar os latentes: {e}")
+
+    def forget(self, reference: Optional[Path] = None):
+        """Descarta os latentes em memória (de uma referência ou de todas)"""
+        with self._lock:
+            if reference is None:
+                self._memory.clear()
+            else:
+                self._memory.pop(self.digest_for(reference), None)
@@ -0,0 +1,187 @@
+# core/speech_pipeline.py - Fala em pipeline: sintetiza a frase N+1 enquanto a frase N toca
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Union
+
+# Emoções em que as reticências são pausas de verdade (podem separar frases)
+LONG_PAUSE_EMOTIONS = {"carinhoso", "triste", "sedutor", "reflexivo"}
+
+# Fim de frase: .!?… seguido de espaço ("3.5" e "www.site" não quebram)
+_ANY_END = re.compile(r'(?<=[.!?…])\s+')
+# Sem pausas longas: reticências continuam a frase ("Hmm... como vai?")
+_SHORT_END = re.compile(r'(?:(?<=[!?])|(?<=[^.]\.))\s+')
+_CLAUSE_END = re.compile(r'(?<=[,;:])\s+')
+
+def split_sentences(text: str, emotion: str = "neutro", min_chars: int = 12,
+                    max_chars: int = 180) -> List[str]:
+    """
+    Divide o texto (já processado para a emoção) em frases para síntese.
+
+    Interjeições curtas ("Nossa!", "Ah...") são juntadas à frase seguinte
+    e frases longas são quebradas em vírgulas para o primeiro áudio sair logo.
+    """
+    boundary = _ANY_END if emotion in LONG_PAUSE_EMOTIONS else _SHORT_END
+    pieces = [piece.strip() for piece in boundary.split(text.strip()) if piece.strip()]
+
+    sentences: List[str] = []
+    pending = ""
+    for piece in pieces:
+        pending = f"{pending} {piece}" if pending else piece
+        if len(pending) >= min_chars:
+            sentences.extend(_split_long(pending, max_chars))
+            pending = ""
+    if pending:
+        if sentences and len(sentences[-1]) + len(pending) < max_chars:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Quebra em vírgulas/ponto e vírgula, juntando trechos até max_chars"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    chunks: List[str] = []
+    current = ""
+    for clause in _CLAUSE_END.split(sentence):
+        if current and len(current) + len(clause) + 1 > max_chars:
+            chunks.append(current)
+            current = clause
+        else:
+            current = f"{current} {clause}" if current else clause
+    if current:
+        chunks.append(current)
+    return chunks
+
+class SentenceStreamer:
+    """Junta pedaços de texto (ex.: LLM em streaming) e devolve frases completas"""
+
+    def __init__(self, emotion: str = "neutro", min_chars: int = 12, max_chars: int = 180):
+        self.emotion = emotion
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """Frases já fechadas; a última fica no buffer até chegar mais texto"""
+        self.buffer += chunk
+        sentences = split_sentences(self.buffer, self.emotion, self.min_chars, self.max_chars)
+        if len(sentences) <= 1:
+            return []
+        # Mantém o espaço final: o próximo pedaço pode começar outra palavra
+        trailing = " " if self.buffer[-1:].isspace() else ""
+        self.buffer = sentences[-1] + trailing
+        return sentences[:-1]
+
+    def flush(self) -> List[str]:
+        sentences = split_sentences(self.buffer, self.emotion, self.min_chars, self.max_chars)
+        self.buffer = ""
+        return sentences
+
+async def iter_sentences(chunks: AsyncIterable[str], emotion: str = "neutro") -> AsyncIterator[str]:
+    """Frases a partir de texto que chega aos pedaços"""
+    streamer = SentenceStreamer(emotion)
+    async for chunk in chunks:
+        for sentence in streamer.feed(chunk):
+            yield sentence
+    for sentence in streamer.flush():
+        yield sentence
+
+@dataclass
+class PipelineStats:
+    """Resultado de uma fala em pipeline"""
+    sentences: int = 0
+    failed: int = 0
+    first_audio: Optional[float] = None   # segundos até começar a tocar
+    synthesis_time: float = 0.0
+    audio_time: float = 0.0               # tempo tocando
+    total: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def rtf(self) -> Optional[float]:
+        """Fator de tempo real: síntese / áudio (> 1 não acompanha a fala)"""
+        return self.synthesis_time / self.audio_time if self.audio_time > 0 else None
+
+    def format(self) -> str:
+        first = f"{self.first_audio * 1000:.0f} ms" if self.first_audio is not None else "-"
+        return (f"{self.sentences} frases | primeiro áudio {first} | "
+                f"síntese {self.synthesis_time * 1000:.0f} ms | total {self.total * 1000:.0f} ms")
+
+_END = object()
+
+class SentencePipeline:
+    """
+    Produtor/consumidor: o produtor sintetiza frases à frente (fila limitada)
+    enquanto o consumidor toca a anterior.
+
+    synthesize(frase) deve rodar a engine fora do loop (executor) e
+    retornar o áudio ou None; play(áudio) toca e retorna ao terminar.
+    """
+
+    def __init__(self, synthesize: Callable[[str], Awaitable[Optional[Any]]],
+                 play: Callable[[Any], Awaitable[None]], max_ahead: int = 2):
+        self.logger = logging.getLogger(__name__)
+        self.synthesize = synthesize
+        self.play = play
+        self.max_ahead = max_ahead
+
+    async def run(self, sentences: Union[Iterable[str], AsyncIterable[str]]) -> PipelineStats:
+        stats = PipelineStats()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_ahead)
+        start = time.perf_counter()
+
+        async def produce():
+            try:
+                async for sentence in _as_async(sentences):
+                    synthesis_start = time.perf_counter()
+                    try:
+                        audio = await self.synthesize(sentence)
+                    except Exception as e:
+                        self.logger.error(f"Erro ao sintetizar frase: {e}")
+                        audio = None
+                    stats.synthesis_time += time.perf_counter() - synthesis_start
+                    if audio is None:
+                        stats.failed += 1
+                        continue
+                    await queue.put(audio)
+            except Exception as e:
+                # Texto parou de chegar (ex.: erro no LLM): fala o que já tem
+                stats.error = str(e)
+                self.logger.error(f"Erro na fonte de texto: {e}")
+            await queue.put(_END)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                audio = await queue.get()
+                if audio is _END:
+                    break
+                if stats.first_audio is None:
+                    stats.first_audio = time.perf_counter() - start
+                play_start = time.perf_counter()
+                await self.play(audio)
+                stats.audio_time += time.perf_counter() - play_start
+                stats.sentences += 1
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+
+        stats.total = time.perf_counter() - start
+        self.logger.debug(f"Pipeline de fala: {stats.format()}")
+        return stats
+
+async def _as_async(items: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
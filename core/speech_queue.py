@@ -0,0 +1,200 @@
+# core/speech_queue.py - Fila de fala do agente: ordem garantida, junção de frases curtas e interrupção
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterable, Awaitable, Callable, Deque, Optional
+
+SpeakFunction = Callable[[str, str], Awaitable[None]]
+StreamFunction = Callable[[AsyncIterable[str], str], Awaitable[str]]
+
+@dataclass
+class SpeechStats:
+    """Contadores da fila de fala"""
+    spoken: int = 0           # falas iniciadas (já juntadas)
+    enqueued: int = 0
+    merged: int = 0           # itens que entraram junto com o anterior
+    interrupted: int = 0      # falas cortadas no meio
+    flushed: int = 0          # itens descartados antes de começar
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.spoken if self.spoken else 0.0
+
+@dataclass
+class SpeechItem:
+    """Uma fala na fila (texto pronto ou texto chegando do LLM)"""
+    text: str
+    emotion: str
+    future: asyncio.Future
+    chunks: Optional[AsyncIterable[str]] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    extra: list = field(default_factory=list)   # itens juntados a este
+
+class SpeechQueue:
+    """
+    Uma fila por agente: as falas saem na ordem em que foram pedidas.
+
+    Falas curtas seguidas com a mesma emoção são juntadas em uma só.
+    interrupt() (usuário começou a falar) descarta o que está pendente
+    e corta a fala atual sem esperar o fim do áudio.
+    """
+
+    def __init__(self, speak: SpeakFunction, speak_stream: Optional[StreamFunction] = None,
+                 stop: Optional[Callable[[], None]] = None, merge_chars: int = 120):
+        self.logger = logging.getLogger(__name__)
+        self._speak = speak
+        self._speak_stream = speak_stream
+        self._stop = stop
+        self.merge_chars = merge_chars
+        self.stats = SpeechStats()
+        self.last_latency: Optional[float] = None
+
+        self._pending: Deque[SpeechItem] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Task] = None
+
+    def enqueue(self, text: str, emotion: str = "neutro") -> asyncio.Future:
+        """Agenda a fala; o future resolve com True (falada) ou False (descartada/cortada)"""
+        return self._add(SpeechItem(text, emotion, asyncio.get_running_loop().create_future()))
+
+    def enqueue_stream(self, chunks: AsyncIterable[str], emotion: str = "neutro") -> asyncio.Future:
+        """Agenda texto em streaming; o future resolve com o texto falado ("" se cortado)"""
+        item = SpeechItem("", emotion, asyncio.get_running_loop().create_future(), chunks=chunks)
+        return self._add(item)
+
+    async def say(self, text: str, emotion: str = "neutro") -> bool:
+        """Fala na vez dela e espera terminar"""
+        return await self.enqueue(text, emotion)
+
+    async def say_stream(self, chunks: AsyncIterable[str], emotion: str = "neutro") -> str:
+        return await self.enqueue_stream(chunks, emotion)
+
+    def _add(self, item: SpeechItem) -> asyncio.Future:
+        self._ensure_worker()
+        self._pending.append(item)
+        self.stats.enqueued += 1
+        self._wakeup.set()
+        return item.future
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def is_speaking(self) -> bool:
+        return self._current is not None and not self._current.done()
+
+    def interrupt(self) -> int:
+        """
+        Barge-in: descarta as falas pendentes e corta a atual.
+
+        Retorna quantos itens foram afetados; o áudio para na hora (stop do
+        dispositivo + cancelamento da síntese em andamento).
+        """
+        affected = 0
+        while self._pending:
+            item = self._pending.popleft()
+            self._resolve(item, cancelled=True)
+            self.stats.flushed += 1 + len(item.extra)
+            affected += 1
+
+        if self.is_speaking:
+            if self._stop is not None:
+                try:
+                    self._stop()
+                except Exception as e:
+                    self.logger.error(f"Erro ao parar a reprodução: {e}")
+            self._current.cancel()
+            self.stats.interrupted += 1
+            affected += 1
+        return affected
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.ensure_future(self._run())
+
+    def _next_item(self) -> SpeechItem:
+        """Primeiro da fila, já juntado com as falas curtas seguintes"""
+        item = self._pending.popleft()
+        if item.chunks is not None:
+            return item
+        while self._pending:
+            following = self._pending[0]
+            if (following.chunks is not None or following.emotion != item.emotion
+                    or len(item.text) + len(following.text) + 1 > self.merge_chars):
+                break
+            self._pending.popleft()
+            item.text = f"{item.text} {following.text}"
+            item.extra.append(following)
+            self.stats.merged += 1
+        return item
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            item = self._next_item()
+            latency = time.perf_counter() - item.enqueued_at
+            self.last_latency = latency
+            self.stats.total_latency += latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+            self.stats.spoken += 1
+
+            if item.chunks is not None and self._speak_stream is not None:
+                self._current = asyncio.ensure_future(self._speak_stream(item.chunks, item.emotion))
+            elif item.chunks is not None:
+                self._current = asyncio.ensure_future(self._speak_joined(item))
+            else:
+                self._current = asyncio.ensure_future(self._speak(item.text, item.emotion))
+
+            # wait() não propaga o cancelamento da fala para o worker
+            await asyncio.wait({self._current})
+            task, self._current = self._current, None
+            if task.cancelled():
+                self._resolve(item, cancelled=True)
+            elif task.exception() is not None:
+                self.logger.error(f"Erro na fala: {task.exception()}")
+                self._resolve(item, cancelled=True)
+            else:
+                self._resolve(item, result=task.result())
+
+    async def _speak_joined(self, item: SpeechItem) -> str:
+        """Sem fala em streaming: espera o texto inteiro"""
+        text = "".join([chunk async for chunk in item.chunks]).strip()
+        await self._speak(text, item.emotion)
+        return text
+
+    def _resolve(self, item: SpeechItem, result=None, cancelled: bool = False):
+        for entry in [item] + item.extra:
+            if entry.future.done():
+                continue
+            if entry.chunks is not None:
+                entry.future.set_result("" if cancelled else (result or ""))
+            else:
+                entry.future.set_result(not cancelled)
+
+    async def close(self):
+        """Descarta o pendente e encerra o worker"""
+        self.interrupt()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (f"{s.spoken} falas ({s.enqueued} pedidos, {s.merged} juntados) | "
+                f"espera média {s.avg_latency * 1000:.1f} ms, máx {s.max_latency * 1000:.1f} ms | "
+                f"{s.interrupted} interrompidas, {s.flushed} descartadas")
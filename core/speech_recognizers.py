@@ -0,0 +1,209 @@
+# core/speech_recognizers.py - Backends de reconhecimento: Whisper local (carregado uma vez) ou Google, sobre PCM em memória
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from core.audio_io import pcm16_to_float
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import whisper
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except ImportError:
+    SR_AVAILABLE = False
+
+WHISPER_RATE = 16000   # taxa que o Whisper espera na entrada
+
+class RecognitionUnavailable(RuntimeError):
+    """Serviço fora do ar (rede, modelo ausente) - diferente de "não entendi" (None)"""
+
+@dataclass
+class RecognitionResult:
+    """Uma frase reconhecida e quanto custou"""
+    text: Optional[str]
+    backend: str
+    latency: float          # transcrição (s), sem a espera na fila
+    audio_seconds: float
+
+    @property
+    def rtf(self) -> Optional[float]:
+        return self.latency / self.audio_seconds if self.audio_seconds else None
+
+    def format(self) -> str:
+        rtf = f"{self.rtf:.2f}" if self.rtf is not None else "-"
+        return (f"{self.backend}: {self.latency * 1000:.0f} ms para {self.audio_seconds:.1f}s "
+                f"de fala (RTF {rtf}) -> {self.text!r}")
+
+def resample_linear(audio: "np.ndarray", source_rate: int, target_rate: int) -> "np.ndarray":
+    """Reamostragem linear (voz já limitada em banda pelo microfone; basta para o Whisper)"""
+    if source_rate == target_rate or len(audio) == 0:
+        return audio
+    length = int(round(len(audio) * target_rate / source_rate))
+    positions = np.arange(length) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+class RecognizerBackend(ABC):
+    """PCM 16-bit mono em memória -> texto (None = não entendeu)"""
+
+    name = "base"
+
+    def load(self):
+        """Prepara o backend (idempotente)"""
+
+    @abstractmethod
+    def transcribe(self, pcm: bytes, sample_rate: int) -> Optional[str]:
+        """Texto da frase; RecognitionUnavailable se o serviço estiver fora do ar"""
+
+class WhisperRecognizer(RecognizerBackend):
+    """
+    Whisper local: o modelo é carregado uma vez (na primeira chamada de
+    load, protegida por lock) e recebe o áudio como array float32 a 16 kHz,
+    sem WAV temporário nem rede.
+    """
+
+    name = "whisper"
+
+    def __init__(self, model_name: str = "base", language: str = "pt", device: str = "cpu",
+                 model_loader: Optional[Callable[..., Any]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.model_name = model_name
+        self.language = language
+        self.device = device
+        self.model_loader = model_loader or (whisper.load_model if WHISPER_AVAILABLE else None)
+        self.model = None
+        self.load_time: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self.model is None:
+                if self.model_loader is None:
+                    raise RecognitionUnavailable("whisper não instalado")
+                start = time.perf_counter()
+                self.model = self.model_loader(self.model_name, device=self.device)
+                self.load_time = time.perf_counter() - start
+                self.logger.info(f"🧠 Whisper '{self.model_name}' carregado em {self.load_time:.1f}s ({self.device})")
+        return self.model
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> Optional[str]:
+        model = self.load()
+        audio = resample_linear(pcm16_to_float(pcm), sample_rate, WHISPER_RATE)
+        result = model.transcribe(audio, language=self.language, task="transcribe",
+                                  fp16=self.device == "cuda", temperature=0.0,
+                                  condition_on_previous_text=False)
+        text = (result.get("text") or "").strip()
+        return text or None
+
+class GoogleRecognizer(RecognizerBackend):
+    """recognize_google do speech_recognition (rede a cada frase)"""
+
+    name = "google"
+
+    def __init__(self, language: str = "pt-BR", recognizer=None):
+        self.language = language
+        self.recognizer = recognizer or (sr.Recognizer() if SR_AVAILABLE else None)
+
+    def load(self):
+        if self.recognizer is None:
+            raise RecognitionUnavailable("speech_recognition não instalado")
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> Optional[str]:
+        self.load()
+        try:
+            text = self.recognizer.recognize_google(sr.AudioData(pcm, sample_rate, 2), language=self.language)
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise RecognitionUnavailable(f"serviço de reconhecimento: {e}") from e
+        return text.strip() or None
+
+def create_recognizer(backend: str = "whisper", language: str = "pt-BR", model_name: str = "base",
+                      recognizer=None) -> RecognizerBackend:
+    """Backend pelo nome da configuração; sem o pacote do Whisper, cai para o Google"""
+    logger = logging.getLogger(__name__)
+    if backend == "whisper":
+        if WHISPER_AVAILABLE:
+            from core.inference_profile import resolve_device
+            device = resolve_device({"device": "auto", "use_gpu": True})
+            return WhisperRecognizer(model_name, language.split("-")[0].lower(), device)
+        logger.warning("⚠️ whisper não instalado - reconhecimento pelo Google")
+    elif backend != "google":
+        logger.warning(f"⚠️ Backend de reconhecimento desconhecido: {backend} - usando Google")
+    return GoogleRecognizer(language, recognizer)
+
+class PhraseRecognizer:
+    """
+    Reconhecimento por frase fora do event loop.
+
+    Uma thread própria é dona do backend: o modelo carrega nela (preload
+    ao iniciar, para a primeira frase não pagar o carregamento) e as frases
+    são transcritas uma de cada vez. Cada frase guarda latência e RTF.
+    """
+
+    def __init__(self, backend: RecognizerBackend, history: int = 50):
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.history: Deque[RecognitionResult] = deque(maxlen=history)
+        self.last_result: Optional[RecognitionResult] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"stt-{backend.name}")
+
+    def preload(self) -> Future:
+        """Carrega o backend em segundo plano"""
+        future = self._executor.submit(self.backend.load)
+        future.add_done_callback(self._log_preload)
+        return future
+
+    def _log_preload(self, future: Future):
+        if future.exception() is not None:
+            self.logger.warning(f"⚠️ Reconhecedor {self.backend.name} indisponível: {future.exception()}")
+
+    def submit(self, pcm: bytes, sample_rate: int) -> Future:
+        return self._executor.submit(self._recognize, pcm, sample_rate)
+
+    def recognize(self, pcm: bytes, sample_rate: int) -> RecognitionResult:
+        """Bloqueante: para threads de escuta (não chamar dentro do event loop)"""
+        return self.submit(pcm, sample_rate).result()
+
+    async def recognize_async(self, pcm: bytes, sample_rate: int) -> RecognitionResult:
+        return await asyncio.wrap_future(self.submit(pcm, sample_rate))
+
+    def _recognize(self, pcm: bytes, sample_rate: int) -> RecognitionResult:
+        start = time.perf_counter()
+        text = self.backend.transcribe(pcm, sample_rate)
+        result = RecognitionResult(text, self.backend.name, time.perf_counter() - start,
+                                   len(pcm) / 2 / sample_rate)
+        self.last_result = result
+        self.history.append(result)
+        self.logger.debug(f"🎧 {result.format()}")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        results = list(self.history)
+        rtfs = [r.rtf for r in results if r.rtf is not None]
+        return {
+            "backend": self.backend.name,
+            "frases": len(results),
+            "latencia_media_ms": round(sum(r.latency for r in results) / len(results) * 1000, 1) if results else None,
+            "rtf_medio": round(sum(rtfs) / len(rtfs), 3) if rtfs else None,
+            "carregamento_s": getattr(self.backend, "load_time", None),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -4,8 +4,13 @@ import logging
 import speech_recognition as sr
 import threading
 import time
-from typing import Optional, Callable
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from typing import Optional, Callable, Dict, Any
 from config.settings import VoiceConfig
+from core.speech_recognizers import PhraseRecognizer, RecognitionUnavailable, create_recognizer
+from core.vad_endpointer import VAD_RATE, UtteranceSegment, VadEndpointer, VadSettings
 
 class SpeechToText:
     """Classe para reconhecimento de voz com escuta contínua"""
@@ -16,29 +21,42 @@ class SpeechToText:
         
         # Inicializar reconhecedor
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.vad_settings = VadSettings.from_config(config)
+        # 16 kHz em quadros do tamanho do VAD: cada leitura do microfone vira um quadro
+        self.microphone = sr.Microphone(sample_rate=VAD_RATE,
+                                        chunk_size=VAD_RATE * self.vad_settings.frame_ms // 1000)
+        self.endpointer: Optional[VadEndpointer] = None
+        
+        # Backend de reconhecimento (Whisper local por padrão), carregado em segundo plano
+        self.phrase_recognizer = PhraseRecognizer(create_recognizer(
+            config.stt_backend, config.recognition_language, config.whisper_model, self.recognizer))
+        self.phrase_recognizer.preload()
         
         # Estado da escuta contínua
         self.is_listening_continuously = False
         self.continuous_thread = None
         self.callback_function = None
+        self.speech_start_callback: Optional[Callable[[], None]] = None
+        self.endpoint_latencies = deque(maxlen=50)   # fim da fala -> texto (s)
+        self._unavailable_until = 0.0
         
         # Configurar microfone
         self.setup_microphone()
     
     def setup_microphone(self):
-        """Configura o microfone"""
+        """Configura o microfone e o endpointer (VAD em quadros no lugar do pause_threshold)"""
         try:
             with self.microphone as source:
                 self.logger.info("Calibrando microfone...")
+                # Ruído ambiente: só usado se o webrtcvad não estiver instalado
                 self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                # Ajustar para escuta contínua
-                self.recognizer.energy_threshold = 4000
-                self.recognizer.dynamic_energy_threshold = True
-                self.recognizer.pause_threshold = 1.0
                 self.logger.info("Microfone calibrado para escuta contínua!")
         except Exception as e:
             self.logger.error(f"Erro ao configurar microfone: {e}")
+        
+        self.endpointer = VadEndpointer(self.vad_settings, VAD_RATE,
+                                        on_speech_start=self._on_speech_start,
+                                        energy_threshold=self.recognizer.energy_threshold)
     
     async def listen(self, timeout: int = 5) -> Optional[str]:
         """Escuta uma única vez (modo manual)"""
@@ -55,20 +73,16 @@ class SpeechToText:
             print("🎤 Escutando... (fale agora)")
             
             with self.microphone as source:
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
+                segment = self._capture_utterance(source, timeout)
             
             print("🔄 Processando...")
             
             try:
-                text = self.recognizer.recognize_google(
-                    audio,
-                    language=self.config.recognition_language
-                )
-                return text.strip()
-            except sr.UnknownValueError:
-                print("❌ Não consegui entender")
-                return None
-            except sr.RequestError as e:
+                text = self._recognize(segment)
+                if not text:
+                    print("❌ Não consegui entender")
+                return text
+            except RecognitionUnavailable:
                 print("❌ Erro no serviço de reconhecimento")
                 return None
                 
@@ -79,12 +93,69 @@ class SpeechToText:
             print(f"❌ Erro: {e}")
             return None
     
-    def start_continuous_listening(self, callback: Callable[[str], None]):
-        """Inicia escuta contínua em background"""
+    def _capture_utterance(self, source, timeout: float) -> UtteranceSegment:
+        """Lê quadros até o endpointer fechar uma fala (sem início em `timeout` s: WaitTimeoutError)"""
+        self.endpointer.reset()
+        deadline = time.monotonic() + timeout
+        while True:
+            segments = self.endpointer.feed(source.stream.read(source.CHUNK))
+            if segments:
+                return segments[0]
+            if not self.endpointer.in_speech and time.monotonic() > deadline:
+                raise sr.WaitTimeoutError("nenhuma fala detectada")
+    
+    def _recognize(self, segment: UtteranceSegment) -> Optional[str]:
+        """Segmento do VAD (PCM 16 kHz em memória) -> backend (na thread do reconhecedor)"""
+        result = self.phrase_recognizer.recognize(segment.pcm, segment.sample_rate)
+        self.endpoint_latencies.append(time.perf_counter() - segment.speech_ended_at)
+        return result.text
+    
+    def _on_speech_start(self):
+        """Início de fala confirmado pelo VAD: aviso de barge-in (só na escuta contínua)"""
+        if self.is_listening_continuously and self.speech_start_callback:
+            self.speech_start_callback()
+    
+    def _on_transcribed(self, segment: UtteranceSegment, future: Future):
+        """Texto de um segmento da escuta contínua (roda na thread do reconhecedor)"""
+        try:
+            text = future.result().text
+        except RecognitionUnavailable as e:
+            # Serviço (rede/modelo) fora: descartar falas por um tempo
+            self.logger.warning(f"⚠️ Reconhecimento indisponível: {e}")
+            self._unavailable_until = time.monotonic() + 2
+            return
+        except Exception as e:
+            self.logger.error(f"Erro no reconhecimento: {e}")
+            return
+        
+        self.endpoint_latencies.append(time.perf_counter() - segment.speech_ended_at)
+        # None: não entendeu (ignorar silenciosamente)
+        if text and self.callback_function and self.is_listening_continuously:
+            self.callback_function(text)
+    
+    def get_recognition_stats(self) -> Dict[str, Any]:
+        """Latência e RTF por frase do reconhecedor e fim da fala -> texto"""
+        stats = self.phrase_recognizer.get_stats()
+        latencies = list(self.endpoint_latencies)
+        stats["fim_da_fala_ate_texto_ms"] = (round(sum(latencies) / len(latencies) * 1000, 1)
+                                             if latencies else None)
+        stats["vad"] = {
+            "aggressiveness": self.vad_settings.aggressiveness,
+            "hangover_ms": self.vad_settings.hangover_ms,
+            "min_speech_ms": self.vad_settings.min_speech_ms,
+            "falas": self.endpointer.segments if self.endpointer else 0,
+            "descartadas": self.endpointer.discarded if self.endpointer else 0,
+        }
+        return stats
+    
+    def start_continuous_listening(self, callback: Callable[[str], None],
+                                   on_speech_start: Optional[Callable[[], None]] = None):
+        """Inicia escuta contínua em background (on_speech_start: aviso de barge-in)"""
         if self.is_listening_continuously:
             return
         
         self.callback_function = callback
+        self.speech_start_callback = on_speech_start
         self.is_listening_continuously = True
         
         # Iniciar thread de escuta contínua
@@ -111,31 +182,17 @@ class SpeechToText:
         while self.is_listening_continuously:
             try:
                 with self.microphone as source:
-                    # Escutar com timeout curto para não bloquear
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=8)
-                
-                # Processar áudio em background
-                try:
-                    text = self.recognizer.recognize_google(
-                        audio,
-                        language=self.config.recognition_language
-                    )
-                    
-                    if text and text.strip():
-                        # Chamar callback com o texto reconhecido
-                        if self.callback_function:
-                            self.callback_function(text.strip())
-                            
-                except sr.UnknownValueError:
-                    # Ignorar silenciosamente quando não entender
-                    pass
-                except sr.RequestError:
-                    # Pausar um pouco se houver erro de rede
-                    time.sleep(2)
+                    self.endpointer.reset()
+                    # Microfone aberto direto: o VAD avisa o início da fala (barge-in)
+                    # e fecha cada fala após o hangover, sem parar de ler quadros
+                    while self.is_listening_continuously:
+                        for segment in self.endpointer.feed(source.stream.read(source.CHUNK)):
+                            if time.monotonic() < self._unavailable_until:
+                                continue
+                            # Reconhecimento na thread do reconhecedor (em ordem)
+                            future = self.phrase_recognizer.submit(segment.pcm, segment.sample_rate)
+                            future.add_done_callback(partial(self._on_transcribed, segment))
                     
-            except sr.WaitTimeoutError:
-                # Timeout normal, continuar escutando
-                pass
             except Exception as e:
                 self.logger.error(f"Erro na escuta contínua: {e}")
                 time.sleep(1)
@@ -0,0 +1,446 @@
+# core/synthesis_process.py - Síntese de voz em processo próprio: modelo carregado uma vez, PCM por memória compartilhada
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from core.audio_io import float_to_pcm16
+from core.inference_profile import CpuInferenceProfile, apply_cpu_profile, configure_torch_threads, inference_context
+
+REFERENCE_TEXT = """
+Olá, eu sou a SEXTA-FEIRA, sua assistente pessoal inteligente.
+Estou aqui para ajudá-lo com qualquer coisa que precisar.
+Minha voz foi projetada para ser natural, expressiva e humana.
+"""
+
+@dataclass
+class SynthesisResult:
+    """Uma frase sintetizada no processo de síntese"""
+    pcm: bytes
+    sample_rate: int
+    synthesis_time: float     # medido no processo de síntese
+    chunks: int = 0
+    cancelled: bool = False
+
+    @property
+    def audio_seconds(self) -> float:
+        return len(self.pcm) / (2 * self.sample_rate) if self.sample_rate else 0.0
+
+    @property
+    def rtf(self) -> Optional[float]:
+        return self.synthesis_time / self.audio_seconds if self.audio_seconds else None
+
+class XttsWorkerModel:
+    """
+    XTTS carregado dentro do processo de síntese.
+
+    Só guarda caminhos e opções (é enviado ao processo); TTS e torch são
+    importados em load(), já no processo filho. Em CPU, o perfil de
+    inferência (int8, threads, aquecimento) é aplicado ao carregar.
+    """
+
+    def __init__(self, model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2",
+                 device: str = "cpu", reference_wav: str = "voices/reference_voice.wav",
+                 latents_dir: str = "cache/speakers", cpu_profile: Optional[CpuInferenceProfile] = None):
+        self.model_name = model_name
+        self.device = device
+        self.reference_wav = reference_wav
+        self.latents_dir = latents_dir
+        self.cpu_profile = cpu_profile
+        self.sample_rate = None
+        self.profile_report: Dict[str, Any] = {}
+
+    def load(self):
+        from TTS.api import TTS
+        from core.speaker_latents import SpeakerLatentCache
+
+        self.tts = TTS(self.model_name, progress_bar=False).to(self.device)
+        self.xtts = self.tts.synthesizer.tts_model
+        self.sample_rate = self.tts.synthesizer.output_sample_rate
+        self.latent_cache = SpeakerLatentCache(self.latents_dir)
+        self.latents = None
+
+        reference = Path(self.reference_wav)
+        if not reference.exists():
+            try:
+                self.tts.tts_to_file(text=REFERENCE_TEXT, file_path=str(reference), speaker_wav=None, language="pt")
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Erro ao criar voz de referência: {e}")
+        if reference.exists():
+            self._latents()
+
+        if self.device == "cpu" and self.cpu_profile is not None:
+            speaker = self.latents.digest if self.latents is not None else None
+            self.profile_report = apply_cpu_profile(
+                self.xtts, self.cpu_profile, warmup=lambda text: self.synthesize(text, speaker=speaker))
+
+    def _latents(self, digest: Optional[str] = None):
+        """Latentes da referência atual (recalcula se o arquivo mudou)"""
+        if self.latents is None or (digest is not None and self.latents.digest != digest):
+            self.latents = self.latent_cache.get(
+                Path(self.reference_wav),
+                lambda path: self.xtts.get_conditioning_latents(audio_path=[str(path)]),
+                self.device,
+            )
+        return self.latents
+
+    def synthesize(self, text: str, language: str = "pt", speed: float = 1.0, speaker: Optional[str] = None):
+        with inference_context():
+            if speaker:
+                latents = self._latents(speaker)
+                return self.xtts.inference(text, language, latents.gpt_cond_latent, latents.speaker_embedding,
+                                           speed=speed)["wav"]
+            return self.tts.tts(text=text, language=language, speed=speed)
+
+    def stream(self, text: str, language: str = "pt", speed: float = 1.0, speaker: Optional[str] = None):
+        if not speaker or not hasattr(self.xtts, "inference_stream"):
+            yield self.synthesize(text, language, speed, speaker)
+            return
+        latents = self._latents(speaker)
+        with inference_context():
+            for chunk in self.xtts.inference_stream(text, language, latents.gpt_cond_latent,
+                                                    latents.speaker_embedding, speed=speed):
+                yield chunk.cpu().numpy() if hasattr(chunk, "cpu") else chunk
+
+def _worker_main(conn, model, torch_threads: Optional[int]):
+    """Processo de síntese: configura threads, carrega o modelo e atende os jobs"""
+    threads = configure_torch_threads(torch_threads)
+    start = time.perf_counter()
+    try:
+        model.load()
+    except Exception as e:
+        conn.send(("failed", f"{type(e).__name__}: {e}"))
+        conn.close()
+        return
+    conn.send(("ready", {"load_time": time.perf_counter() - start, "sample_rate": model.sample_rate,
+                         "pid": os.getpid(), **threads, **getattr(model, "profile_report", {})}))
+    _WorkerLoop(conn, model).run()
+
+class _WorkerLoop:
+    """Lado do processo de síntese: fila de jobs, cancelamentos e escrita na memória compartilhada"""
+
+    def __init__(self, conn, model):
+        self.conn = conn
+        self.model = model
+        self.pending: deque = deque()
+        self.cancelled = set()
+        self.arenas: Dict[str, shared_memory.SharedMemory] = {}
+        self.loose: Dict[str, shared_memory.SharedMemory] = {}   # pedaços que não couberam na arena
+        self.stopping = False
+
+    def run(self):
+        try:
+            while not self.stopping:
+                if not self.pending:
+                    self._handle(self.conn.recv())
+                    continue
+                self._process(*self.pending.popleft())
+        except (EOFError, OSError):
+            pass   # processo principal encerrou
+        finally:
+            for segment in itertools.chain(self.arenas.values(), self.loose.values()):
+                segment.close()
+
+    def _handle(self, message):
+        kind = message[0]
+        if kind == "job":
+            self.pending.append(message[1:])
+        elif kind == "cancel":
+            self.cancelled.add(message[1])
+        elif kind == "release":
+            segment = self.loose.pop(message[1], None) or self.arenas.pop(message[1], None)
+            if segment is not None:
+                segment.close()
+        elif kind == "stop":
+            self.stopping = True
+
+    def _drain(self):
+        while self.conn.poll():
+            self._handle(self.conn.recv())
+
+    def _arena(self, name: str) -> shared_memory.SharedMemory:
+        if name not in self.arenas:
+            self.arenas[name] = shared_memory.SharedMemory(name=name)
+        return self.arenas[name]
+
+    def _process(self, job_id: int, arena_name: str, text: str, params: Dict, stream: bool):
+        if job_id in self.cancelled:
+            self.cancelled.discard(job_id)
+            self.conn.send(("done", job_id, {"synthesis_time": 0.0, "chunks": 0, "cancelled": True}))
+            return
+        arena = self._arena(arena_name)
+        offset = 0
+        chunks = 0
+        synthesis_time = 0.0
+        cancelled = False
+        try:
+            if stream and hasattr(self.model, "stream"):
+                pieces = self.model.stream(text, **params)
+            else:
+                pieces = iter([self.model.synthesize(text, **params)])
+            start = time.perf_counter()
+            for samples in pieces:
+                synthesis_time += time.perf_counter() - start
+                pcm = float_to_pcm16(samples).tobytes()
+                if offset + len(pcm) <= arena.size:
+                    arena.buf[offset:offset + len(pcm)] = pcm
+                    self.conn.send(("chunk", job_id, arena_name, offset, len(pcm)))
+                    offset += len(pcm)
+                else:
+                    segment = shared_memory.SharedMemory(create=True, size=max(1, len(pcm)))
+                    segment.buf[:len(pcm)] = pcm
+                    self.loose[segment.name] = segment
+                    self.conn.send(("chunk", job_id, segment.name, 0, len(pcm)))
+                chunks += 1
+                self._drain()
+                if job_id in self.cancelled:
+                    cancelled = True
+                    break
+                start = time.perf_counter()
+        except Exception as e:
+            self.cancelled.discard(job_id)
+            self.conn.send(("error", job_id, f"{type(e).__name__}: {e}"))
+            return
+        self.cancelled.discard(job_id)
+        self.conn.send(("done", job_id, {"synthesis_time": synthesis_time, "chunks": chunks, "cancelled": cancelled}))
+
+@dataclass
+class SynthesisJob:
+    """Job em andamento no lado do processo principal"""
+    job_id: int
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+    arena: shared_memory.SharedMemory
+    on_chunk: Optional[Callable[[bytes], bool]] = None
+    chunks: List[bytes] = field(default_factory=list)
+
+class SynthesisProcess:
+    """
+    Processo dedicado à síntese (XTTS/torch fora do processo do agente).
+
+    O modelo é carregado uma vez no processo filho, com o número de threads
+    do torch configurado lá, sem disputar GIL e CPU com o event loop, o STT
+    e a análise de texto. Os jobs vão por um Pipe; o PCM 16-bit volta por
+    memória compartilhada (uma arena por job, reaproveitada), e pelo Pipe
+    passam só nome, offset e tamanho. Com on_chunk, cada pedaço do
+    streaming é entregue assim que chega (retornar False cancela o job).
+    """
+
+    def __init__(self, model, torch_threads: Optional[int] = None, arena_seconds: float = 30.0,
+                 start_method: str = "spawn", max_free_arenas: int = 2):
+        self.logger = logging.getLogger(__name__)
+        self.model = model
+        self.torch_threads = torch_threads
+        self.arena_seconds = arena_seconds
+        self.start_method = start_method
+        self.max_free_arenas = max_free_arenas
+
+        self.sample_rate: Optional[int] = None
+        self.info: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.completed = 0
+        self.total_synthesis = 0.0
+        self.total_audio = 0.0
+
+        self._process = None
+        self._conn = None
+        self._reader: Optional[threading.Thread] = None
+        self._jobs: Dict[int, SynthesisJob] = {}
+        self._free_arenas: List[shared_memory.SharedMemory] = []
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._ready_event = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.is_running and self.sample_rate is not None
+
+    def start(self):
+        """Sobe o processo de síntese (o modelo carrega lá, em segundo plano)"""
+        with self._lock:
+            if self.is_running:
+                return
+            # Pai e filho no mesmo resource tracker: segmentos anexados no
+            # filho não são apagados quando ele termina
+            resource_tracker.ensure_running()
+            context = multiprocessing.get_context(self.start_method)
+            self._conn, child_conn = context.Pipe()
+            self.sample_rate = None
+            self.error = None
+            self._ready_event.clear()
+            self._process = context.Process(target=_worker_main, args=(child_conn, self.model, self.torch_threads),
+                                            name="tts-synthesis", daemon=True)
+            self._process.start()
+            child_conn.close()
+            self._reader = threading.Thread(target=self._read_loop, args=(self._conn,), name="tts-synthesis-reader",
+                                            daemon=True)
+            self._reader.start()
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Espera o modelo carregar no processo; True se está pronto para sintetizar"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._ready_event.wait, timeout)
+        return self.is_ready
+
+    def submit(self, text: str, params: Optional[Dict] = None, stream: bool = False,
+               on_chunk: Optional[Callable[[bytes], bool]] = None) -> asyncio.Future:
+        """Agenda uma frase; o future resolve com SynthesisResult"""
+        if not self.is_ready:
+            raise RuntimeError(self.error or "processo de síntese não está pronto")
+        loop = asyncio.get_running_loop()
+        job = SynthesisJob(next(self._ids), loop.create_future(), loop, self._acquire_arena(), on_chunk)
+        self._jobs[job.job_id] = job
+        self._send(("job", job.job_id, job.arena.name, text, params or {}, stream))
+        return job.future
+
+    async def synthesize(self, text: str, **params) -> SynthesisResult:
+        return await self.submit(text, params)
+
+    def cancel(self, job_id: int):
+        self._send(("cancel", job_id))
+
+    def _send(self, message):
+        with self._send_lock:
+            self._conn.send(message)
+
+    def _acquire_arena(self) -> shared_memory.SharedMemory:
+        with self._lock:
+            if self._free_arenas:
+                return self._free_arenas.pop()
+        size = int(self.arena_seconds * self.sample_rate) * 2
+        return shared_memory.SharedMemory(create=True, size=size)
+
+    def _release_arena(self, arena: shared_memory.SharedMemory):
+        with self._lock:
+            if len(self._free_arenas) < self.max_free_arenas:
+                self._free_arenas.append(arena)
+                return
+        try:
+            self._send(("release", arena.name))
+        except OSError:
+            pass   # processo de síntese já encerrado
+        arena.close()
+        arena.unlink()
+
+    def _read_loop(self, conn):
+        """Thread do processo principal: recebe pedaços e términos do processo de síntese"""
+        try:
+            while True:
+                message = conn.recv()
+                kind = message[0]
+                if kind == "ready":
+                    self.info = message[1]
+                    self.sample_rate = self.info["sample_rate"]
+                    self.logger.info(f"🧠 Processo de síntese pronto em {self.info['load_time']:.1f}s "
+                                     f"(pid {self.info['pid']}, threads {self.info.get('intra_op', '-')})")
+                    self._ready_event.set()
+                elif kind == "failed":
+                    self.error = message[1]
+                    self.logger.error(f"Processo de síntese não carregou o modelo: {self.error}")
+                    self._ready_event.set()
+                    break
+                elif kind == "chunk":
+                    self._on_chunk(*message[1:])
+                elif kind == "done":
+                    self._finish(message[1], info=message[2])
+                elif kind == "error":
+                    self._finish(message[1], error=RuntimeError(message[2]))
+        except (EOFError, OSError):
+            pass
+        finally:
+            if self.error is None:
+                self.error = "processo de síntese encerrou"
+            self._ready_event.set()
+            for job_id in list(self._jobs):
+                self._finish(job_id, error=RuntimeError(self.error))
+
+    def _on_chunk(self, job_id: int, name: str, offset: int, size: int):
+        job = self._jobs.get(job_id)
+        if job is not None and name == job.arena.name:
+            data = bytes(job.arena.buf[offset:offset + size])
+        else:
+            segment = shared_memory.SharedMemory(name=name)
+            data = bytes(segment.buf[:size])
+            segment.close()
+            segment.unlink()
+            self._send(("release", name))
+        if job is None:
+            return
+        job.chunks.append(data)
+        if job.on_chunk is not None and job.on_chunk(data) is False:
+            job.on_chunk = None
+            self.cancel(job_id)
+
+    def _finish(self, job_id: int, info: Optional[Dict] = None, error: Optional[Exception] = None):
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        self._release_arena(job.arena)
+        result = None
+        if error is None:
+            result = SynthesisResult(b"".join(job.chunks), self.sample_rate, info["synthesis_time"],
+                                     info["chunks"], info["cancelled"])
+            if not result.cancelled:
+                self.completed += 1
+                self.total_synthesis += result.synthesis_time
+                self.total_audio += result.audio_seconds
+
+        def resolve():
+            if job.future.done():
+                return
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+        try:
+            job.loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # loop já encerrado
+
+    def shutdown(self, timeout: float = 5.0):
+        """Encerra o processo (depois do job atual) e libera a memória compartilhada"""
+        if self.is_running:
+            try:
+                self._send(("stop",))
+            except OSError:
+                pass
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout)
+        if self._conn is not None:
+            self._conn.close()
+        if self._reader is not None:
+            self._reader.join(timeout)
+        self._process = None
+        with self._lock:
+            arenas, self._free_arenas = self._free_arenas, []
+        for arena in arenas:
+            arena.close()
+            arena.unlink()
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "ready": self.is_ready,
+            "pid": self.info.get("pid"),
+            "torch_threads": self.info.get("intra_op"),
+            "load_s": round(self.info["load_time"], 1) if "load_time" in self.info else None,
+            "frases": self.completed,
+            "rtf": round(self.total_synthesis / self.total_audio, 2) if self.total_audio else None,
+            "error": self.error,
+        }
@@ -1,8 +1,10 @@
 # core/temporal_inference.py
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple, Union
 import re
 import logging
+from utils.nlu import Utterance, as_utterance
 
 class TemporalInferenceEngine:
     """Sistema de inferência temporal para deduzir informações baseadas no tempo"""
@@ -52,13 +54,13 @@ class TemporalInferenceEngine:
             'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
         }
     
-    def analyze_temporal_context(self, text: str, existing_facts: Dict) -> List[Dict]:
+    def analyze_temporal_context(self, text: Union[str, Utterance], existing_facts: Dict) -> List[Dict]:
         """Analisa contexto temporal e faz inferências"""
         inferences = []
         current_year = datetime.now().year
         
         # Extrair referências temporais
-        temporal_refs = self._extract_temporal_references(text)
+        temporal_refs = self.extract_references(text)
         
         for ref in temporal_refs:
             # Inferir idade baseada em eventos
@@ -79,13 +81,24 @@ class TemporalInferenceEngine:
         
         return inferences
     
-    def _extract_temporal_references(self, text: str) -> List[Dict]:
+    def extract_references(self, text: Union[str, Utterance]) -> List[Dict]:
+        """Referências temporais (datas, tempos relativos, eventos da vida) do texto"""
+        return self._extract_temporal_references(text)
+    
+    def _extract_temporal_references(self, text: Union[str, Utterance]) -> List[Dict]:
         """Extrai referências temporais do texto"""
         references = []
-        text_lower = text.lower()
+        utterance = as_utterance(text)
+        text_lower = utterance.lower
+        
+        # Datas e tempos relativos sempre têm dígitos; eventos dependem de conectivos
+        date_patterns = self.temporal_patterns['absolute_dates'] if utterance.has_digits else []
+        relative_patterns = self.temporal_patterns['relative_time'] if utterance.has_digits else []
+        event_patterns = self.temporal_patterns['life_events'] if utterance.mentions(
+            "quando", "antes de", "depois de", "durante") else []
         
         # Datas absolutas
-        for pattern in self.temporal_patterns['absolute_dates']:
+        for pattern in date_patterns:
             matches = re.finditer(pattern, text_lower)
             for match in matches:
                 if len(match.groups()) == 1:  # Apenas ano
@@ -98,17 +111,21 @@ class TemporalInferenceEngine:
                     })
                 elif len(match.groups()) == 3:  # Data completa
                     day, month, year = match.groups()
+                    # Mês pode vir por extenso ("5 de março de 2019")
+                    month = int(month) if month.isdigit() else self.months.get(month)
+                    if month is None:
+                        continue
                     references.append({
                         'type': 'date',
                         'day': int(day),
-                        'month': int(month),
+                        'month': month,
                         'year': int(year),
                         'original': match.group(0),
                         'confidence': 0.95
                     })
         
         # Tempo relativo
-        for pattern in self.temporal_patterns['relative_time']:
+        for pattern in relative_patterns:
             matches = re.finditer(pattern, text_lower)
             for match in matches:
                 if len(match.groups()) >= 2:
@@ -124,7 +141,7 @@ class TemporalInferenceEngine:
                     })
         
         # Eventos da vida
-        for pattern in self.temporal_patterns['life_events']:
+        for pattern in event_patterns:
             matches = re.finditer(pattern, text_lower)
             for match in matches:
                 event_context = match.group(0)
@@ -249,6 +266,93 @@ class TemporalInferenceEngine:
         
         return inferences
     
+    def reference_to_interval(self, ref: Dict, reference_date: date,
+                              birth_year: Optional[int] = None) -> Optional[Tuple[date, date]]:
+        """
+        Converte uma referência extraída em intervalo de datas.
+        
+        Tempos relativos contam a partir de reference_date (data da mensagem);
+        eventos da vida só viram intervalo quando o ano de nascimento é conhecido.
+        """
+        try:
+            if ref['type'] == 'date':
+                if 'day' in ref:
+                    day = date(ref['year'], ref['month'], ref['day'])
+                    return day, day
+                return date(ref['year'], 1, 1), date(ref['year'], 12, 31)
+            
+            if ref['type'] == 'relative_time':
+                amount, unit = ref['amount'], ref['unit']
+                if unit == 'ano':
+                    year = reference_date.year - amount
+                    return date(year, 1, 1), date(year, 12, 31)
+                if unit in ('mês', 'mes', 'mese'):
+                    month_start = self._shift_months(reference_date.replace(day=1), -amount)
+                    last_day = calendar.monthrange(month_start.year, month_start.month)[1]
+                    return month_start, month_start.replace(day=last_day)
+                if unit == 'semana':
+                    center = reference_date - timedelta(weeks=amount)
+                    return center - timedelta(days=3), center + timedelta(days=3)
+                if unit == 'dia':
+                    day = reference_date - timedelta(days=amount)
+                    return day, day
+                return None
+            
+            if ref['type'] == 'life_event' and birth_year and ref['event'] in self.life_milestones:
+                first_age, last_age = self.life_milestones[ref['event']]
+                return date(birth_year + first_age, 1, 1), date(birth_year + last_age, 12, 31)
+        except (KeyError, ValueError, TypeError, OverflowError):
+            return None
+        
+        return None
+    
+    def parse_time_query(self, text: Union[str, Utterance], today: date = None) -> Optional[Tuple[date, date]]:
+        """
+        Reconhece o período de uma pergunta: "o que falei sobre 2019",
+        "últimos 6 meses", "mês passado", "ano passado", "semana passada".
+        """
+        utterance = as_utterance(text)
+        folded = utterance.folded
+        today = today or date.today()
+        
+        if utterance.has_digits:
+            match = re.search(r'ultim[oa]s (\d+) (anos?|mes(?:es)?|semanas?|dias?)', folded)
+            if match:
+                amount, unit = int(match.group(1)), match.group(2)
+                if unit.startswith('ano'):
+                    return self._shift_months(today, -12 * amount), today
+                if unit.startswith('mes'):
+                    return self._shift_months(today, -amount), today
+                if unit.startswith('semana'):
+                    return today - timedelta(weeks=amount), today
+                return today - timedelta(days=amount), today
+            
+            match = re.search(r'\b(19\d{2}|20\d{2})\b', folded)
+            if match:
+                year = int(match.group(1))
+                return date(year, 1, 1), date(year, 12, 31)
+        
+        if not utterance.mentions("passad", "ultim"):
+            return None
+        
+        if re.search(r'ano passado|ultimo ano', folded):
+            return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+        if re.search(r'mes passado|ultimo mes', folded):
+            month_start = self._shift_months(today.replace(day=1), -1)
+            return month_start, today.replace(day=1) - timedelta(days=1)
+        if re.search(r'semana passada|ultima semana', folded):
+            return today - timedelta(days=today.weekday() + 7), today - timedelta(days=today.weekday() + 1)
+        
+        return None
+    
+    @staticmethod
+    def _shift_months(day: date, months: int) -> date:
+        """Soma meses ajustando o dia ao tamanho do mês"""
+        month_index = day.year * 12 + day.month - 1 + months
+        year, month = divmod(month_index, 12)
+        month += 1
+        return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+    
     def validate_temporal_consistency(self, facts: List[Dict]) -> Dict[str, Any]:
         """Valida consistência temporal dos fatos"""
         validation_results = {
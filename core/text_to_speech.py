@@ -1,8 +1,11 @@
 # core/text_to_speech.py - VERSÃO CORRIGIDA
 import asyncio
 import logging
-from typing import List
+from typing import AsyncIterable, List, Optional
 from config.settings import VoiceConfig
+from core.offline_tts import PYTTSX3_AVAILABLE, OfflineVoice
+from core.tts_router import TTSRouter
+from core.voice_registry import EngineStatus, VoiceCandidate, VoiceRegistry
 
 # Tentar importar sistema ultra-realista
 try:
@@ -13,91 +16,106 @@ except ImportError as e:
     print(f"⚠️ Sistema ultra-realista não disponível: {e}")
     ULTRA_AVAILABLE = False
 
+# Voz humana (XTTS): candidata a upgrade quando o Coqui está instalado
+try:
+    from core.human_voice_system import COQUI_AVAILABLE, CoquiHumanVoice
+    HUMAN_AVAILABLE = COQUI_AVAILABLE
+except ImportError:
+    HUMAN_AVAILABLE = False
+
+class TextOnlyVoice:
+    """Fallback: fala como texto com emoji"""
+    
+    is_initialized = True
+    
+    async def speak(self, text: str, emotion: str = "neutro"):
+        emojis = {
+            "neutro": "🤖", "feliz": "😊", "carinhoso": "🥰",
+            "triste": "😔", "animado": "🤩", "curioso": "🤔",
+            "sedutor": "😏", "surpreso": "😲"
+        }
+        emoji = emojis.get(emotion, "🤖")
+        print(f"{emoji} SEXTA-FEIRA ({emotion}): {text}")
+
 class SuperiorFeminineVoice:
     """Sistema principal da SEXTA-FEIRA - ERRO MECAB CORRIGIDO"""
     
     def __init__(self, config: VoiceConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.voice_system = None
-        self.current_system = "initializing"
-        self.is_initialized = False
         
-        # Auto-inicializar
-        asyncio.create_task(self._smart_initialize())
-    
-    async def _smart_initialize(self):
-        """Inicialização inteligente e robusta"""
-        if self.is_initialized:
-            return
+        # Todos os engines sobem em paralelo; a fala usa o primeiro aceitável
+        # e troca para um melhor quando ele fica pronto
+        self.registry = VoiceRegistry(
+            self._voice_candidates(),
+            fallback=VoiceCandidate("text_fallback", "📝 Modo Texto (Fallback)", TextOnlyVoice),
+            latency_bar=getattr(config, "latency_bar", 2.0),
+            ready_timeout=getattr(config, "ready_timeout", 15.0)
+        )
+        self.registry.on_change = self._on_engine_change
+        
+        # Cada fala vai para o melhor engine saudável dentro do orçamento de latência
+        self.router = TTSRouter(
+            self.registry,
+            latency_budget=getattr(config, "latency_bar", 2.0),
+            failure_threshold=getattr(config, "breaker_failures", 3),
+            cooldown=getattr(config, "breaker_cooldown", 30.0)
+        )
         
         print("\n🎭 INICIANDO SISTEMA DE VOZ SEXTA-FEIRA")
         print("="*50)
-        
+        self.registry.start()
+    
+    def _voice_candidates(self) -> List[VoiceCandidate]:
+        candidates = []
+        if HUMAN_AVAILABLE:
+            candidates.append(VoiceCandidate("human_xtts", "🧠 Voz Humana (XTTS)", CoquiHumanVoice, rank=3))
         if ULTRA_AVAILABLE:
-            try:
-                print("🌟 Carregando sistema ultra-realista...")
-                self.voice_system = UltraRealisticVoice()
-                
-                # Aguardar inicialização (com timeout)
-                max_wait = 60  # 1 minuto
-                wait_time = 0
-                
-                while wait_time < max_wait:
-                    if hasattr(self.voice_system, 'is_initialized') and self.voice_system.is_initialized:
-                        break
-                    await asyncio.sleep(2)
-                    wait_time += 2
-                    if wait_time % 10 == 0:
-                        print(f"⏳ Aguardando... ({wait_time}s)")
-                
-                if hasattr(self.voice_system, 'is_initialized') and self.voice_system.is_initialized:
-                    self.current_system = "ultra_realistic"
-                    print("\n" + "🎉" * 20)
-                    print("✅ VOZ ULTRA-REALISTA ATIVA!")
-                    print("🌟 SEXTA-FEIRA agora fala como ChatGPT!")
-                    print("🎉" * 20)
-                else:
-                    print("⚠️ Timeout na inicialização (usando modo texto)")
-                    self.current_system = "text_fallback"
-                    
-            except Exception as e:
-                print(f"⚠️ Erro no ultra-realista: {e}")
-                self.current_system = "text_fallback"
+            candidates.append(VoiceCandidate("ultra_realistic", "🌟 Voz Ultra-Realista (Estilo ChatGPT)", UltraRealisticVoice, rank=2))
+        if PYTTSX3_AVAILABLE:
+            candidates.append(VoiceCandidate("offline", "🎤 Voz Offline (pyttsx3)", OfflineVoice, rank=1))
+        return candidates
+    
+    def _on_engine_change(self, status: EngineStatus, previous: Optional[EngineStatus]):
+        if previous is None:
+            print(f"✅ Sistema inicializado: {status.label}")
         else:
-            print("📝 Sistema ultra-realista não disponível")
-            self.current_system = "text_fallback"
-        
-        self.is_initialized = True
-        print(f"✅ Sistema inicializado: {self.get_current_system()}")
+            print(f"⬆️ Voz atualizada: {previous.label} -> {status.label}")
+    
+    @property
+    def voice_system(self):
+        return self.registry.active.system if self.registry.active else None
+    
+    @property
+    def current_system(self) -> str:
+        return self.registry.active.name if self.registry.active else "initializing"
+    
+    @property
+    def is_initialized(self) -> bool:
+        return self.registry.is_ready
+    
+    async def _smart_initialize(self):
+        """Espera o future de prontidão do registro (sem polling)"""
+        await self.registry.wait_ready()
     
     async def speak(self, text: str, emotion: str = "neutro"):
         """Interface principal de fala"""
-        # Aguardar inicialização se necessário
-        if not self.is_initialized:
-            await self._smart_initialize()
-        
-        # Se sistema ultra-realista disponível
-        if self.current_system == "ultra_realistic" and self.voice_system:
-            await self.voice_system.speak(text, emotion)
-        else:
-            # Fallback: modo texto com emojis
-            emojis = {
-                "neutro": "🤖", "feliz": "😊", "carinhoso": "🥰",
-                "triste": "😔", "animado": "🤩", "curioso": "🤔",
-                "sedutor": "😏", "surpreso": "😲"
-            }
-            emoji = emojis.get(emotion, "🤖")
-            print(f"{emoji} SEXTA-FEIRA ({emotion}): {text}")
+        # Aguardar o primeiro engine aceitável (uma única inicialização)
+        await self.registry.wait_ready()
+        await self.router.speak(text, emotion)
+    
+    async def speak_stream(self, chunks: AsyncIterable[str], emotion: str = "neutro") -> str:
+        """Fala o texto conforme chega do LLM; retorna o texto completo"""
+        await self.registry.wait_ready()
+        return await self.router.speak_stream(chunks, emotion)
     
     async def test_voice_emotions(self):
         """Teste de emoções"""
-        if not self.is_initialized:
-            await self._smart_initialize()
+        engine = await self.registry.wait_ready()
         
-        if self.current_system == "ultra_realistic" and self.voice_system:
+        if hasattr(engine.system, 'test_ultra_realistic_emotions'):
             print("🎭 Testando sistema ultra-realista...")
-            await self.voice_system.test_ultra_realistic_emotions()
+            await engine.system.test_ultra_realistic_emotions()
         else:
             print("📝 Testando sistema de texto...")
             emotions = ["neutro", "feliz", "carinhoso", "triste", "animado"]
@@ -106,13 +124,12 @@ class SuperiorFeminineVoice:
                 await asyncio.sleep(1)
     
     def get_current_system(self):
-        """Sistema atual em uso"""
-        if self.current_system == "ultra_realistic":
-            return "🌟 Voz Ultra-Realista (Estilo ChatGPT)"
-        elif self.current_system == "text_fallback":
-            return "📝 Modo Texto (Fallback)"
-        else:
-            return "⏳ Inicializando..."
+        """Sistema atual em uso (o da última fala roteada)"""
+        if self.router.last_decision:
+            return self.router.last_decision.label
+        if self.registry.active:
+            return self.registry.active.label
+        return "⏳ Inicializando..."
     
     def get_available_emotions(self):
         """Emoções disponíveis"""
@@ -123,12 +140,20 @@ class SuperiorFeminineVoice:
     def get_voice_info(self):
         """Informações do sistema"""
         if self.voice_system and hasattr(self.voice_system, 'get_voice_info'):
-            return self.voice_system.get_voice_info()
-        return {
-            "system": self.current_system,
-            "quality": "text_only",
-            "status": "fallback"
-        }
+            info = dict(self.voice_system.get_voice_info())
+        else:
+            info = {
+                "system": self.current_system,
+                "quality": "text_only",
+                "status": "fallback"
+            }
+        info["engines"] = self.registry.get_info()
+        info["routing"] = self.router.get_info()
+        return info
+    
+    def get_routing_status(self) -> str:
+        """Decisão da última fala e saúde dos engines (comando "info da voz")"""
+        return self.router.format_status()
 
 # Compatibilidade com nomes antigos
 HumanizedTTS = SuperiorFeminineVoice
@@ -0,0 +1,293 @@
+# core/tts_router.py - Escolha do engine de voz por fala: saúde medida, orçamento de latência e disjuntor
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Deque, Dict, List, Optional
+
+from core.voice_registry import EngineStatus, VoiceRegistry
+
+CLOSED = "fechado"        # em rotação
+OPEN = "aberto"           # fora de rotação até o cooldown
+HALF_OPEN = "meio-aberto" # uma fala de teste decide se volta
+
+@dataclass
+class EngineHealth:
+    """Janela móvel das últimas falas de um engine + estado do disjuntor"""
+    window: int = 20
+    latencies: Deque[float] = field(default_factory=deque)   # segundos até o primeiro áudio
+    rtfs: Deque[float] = field(default_factory=deque)
+    outcomes: Deque[bool] = field(default_factory=deque)
+    consecutive_failures: int = 0
+    state: str = CLOSED
+    opened_at: Optional[float] = None
+    trips: int = 0
+    routed: int = 0
+    last_error: Optional[str] = None
+
+    def record(self, success: bool, latency: Optional[float] = None, rtf: Optional[float] = None):
+        self._push(self.outcomes, success)
+        if success:
+            self.consecutive_failures = 0
+            if latency is not None:
+                self._push(self.latencies, latency)
+            if rtf is not None:
+                self._push(self.rtfs, rtf)
+        else:
+            self.consecutive_failures += 1
+
+    def _push(self, values: deque, value):
+        values.append(value)
+        while len(values) > self.window:
+            values.popleft()
+
+    @property
+    def latency(self) -> Optional[float]:
+        return sum(self.latencies) / len(self.latencies) if self.latencies else None
+
+    @property
+    def rtf(self) -> Optional[float]:
+        return sum(self.rtfs) / len(self.rtfs) if self.rtfs else None
+
+    @property
+    def failure_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+@dataclass
+class RouteDecision:
+    """Por que uma fala foi para um engine"""
+    engine: str
+    label: str
+    reason: str
+    expected_latency: Optional[float] = None
+    skipped: Dict[str, str] = field(default_factory=dict)
+    success: Optional[bool] = None
+    latency: Optional[float] = None
+
+    def format(self) -> str:
+        expected = f" (esperado {self.expected_latency * 1000:.0f} ms)" if self.expected_latency is not None else ""
+        skipped = "; ".join(f"{name}: {why}" for name, why in self.skipped.items())
+        return f"{self.label}: {self.reason}{expected}" + (f" | fora: {skipped}" if skipped else "")
+
+class TTSRouter:
+    """
+    Escolhe, a cada fala, o engine entre os prontos no registro.
+
+    Entre os engines saudáveis cuja latência esperada (média móvel do tempo
+    até o primeiro áudio; sem falas, a síntese de teste) cabe no orçamento e
+    cujo RTF acompanha a fala, vence o de maior qualidade (rank). Sem nenhum
+    dentro do orçamento, vai o mais rápido. O disjuntor abre após
+    failure_threshold falhas seguidas (ou taxa de falha alta na janela) e,
+    passado o cooldown, deixa passar uma fala de teste (meio-aberto).
+    Exceção no engine passa a fala para o próximo; falha que o próprio
+    engine já contornou (0 frases tocadas) só conta na saúde.
+    """
+
+    def __init__(self, registry: VoiceRegistry, latency_budget: float = 2.0, max_rtf: float = 1.0,
+                 failure_threshold: int = 3, max_failure_rate: float = 0.5, min_samples: int = 4,
+                 cooldown: float = 30.0, window: int = 20):
+        self.logger = logging.getLogger(__name__)
+        self.registry = registry
+        self.latency_budget = latency_budget
+        self.max_rtf = max_rtf
+        self.failure_threshold = failure_threshold
+        self.max_failure_rate = max_failure_rate
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.window = window
+
+        self.health: Dict[str, EngineHealth] = {}
+        self.last_decision: Optional[RouteDecision] = None
+
+    def health_of(self, name: str) -> EngineHealth:
+        if name not in self.health:
+            self.health[name] = EngineHealth(window=self.window)
+        return self.health[name]
+
+    def _allows(self, health: EngineHealth, now: float) -> bool:
+        """Disjuntor: aberto bloqueia até o cooldown, depois vira meio-aberto"""
+        if health.state == OPEN and now - health.opened_at >= self.cooldown:
+            health.state = HALF_OPEN
+        return health.state != OPEN
+
+    def expected_latency(self, status: EngineStatus) -> Optional[float]:
+        health = self.health.get(status.name)
+        if health is not None and health.latency is not None:
+            return health.latency
+        return status.probe_latency
+
+    def _within_budget(self, status: EngineStatus) -> bool:
+        expected = self.expected_latency(status)
+        rtf = self.health_of(status.name).rtf
+        return ((expected is None or expected <= self.latency_budget)
+                and (rtf is None or rtf <= self.max_rtf))
+
+    def route(self) -> List[EngineStatus]:
+        """Engines na ordem de tentativa para a próxima fala (fallback por último)"""
+        now = time.perf_counter()
+        fallback = self.registry.fallback.name if self.registry.fallback else None
+        skipped: Dict[str, str] = {}
+        usable = []
+        for status in self.registry.statuses.values():
+            if status.name == fallback or not status.ready or status.system is None:
+                continue
+            health = self.health_of(status.name)
+            if not self._allows(health, now):
+                skipped[status.name] = f"disjuntor aberto ({health.last_error or 'falhas'})"
+                continue
+            usable.append(status)
+
+        within = sorted((s for s in usable if self._within_budget(s)),
+                        key=lambda s: (-s.rank, self.expected_latency(s) or 0.0))
+        over = sorted((s for s in usable if not self._within_budget(s)),
+                      key=lambda s: self.expected_latency(s) or 0.0)
+        for status in over:
+            health = self.health_of(status.name)
+            if health.rtf is not None and health.rtf > self.max_rtf:
+                skipped.setdefault(status.name, f"RTF {health.rtf:.2f}")
+            else:
+                skipped.setdefault(status.name, f"lento ({self.expected_latency(status) * 1000:.0f} ms)")
+
+        order = within + over
+        if fallback is not None:
+            order.append(self._fallback_status())
+        elif not order and self.registry.active is not None:
+            order.append(self.registry.active)
+
+        if order:
+            chosen = order[0]
+            if any(s is chosen for s in within):
+                reason = "meio-aberto, fala de teste" if self.health_of(chosen.name).state == HALF_OPEN \
+                    else "melhor dentro do orçamento"
+            elif any(s is chosen for s in over):
+                reason = "mais rápido (nenhum dentro do orçamento)"
+            else:
+                reason = "nenhum engine saudável"
+            skipped.pop(chosen.name, None)
+            self.last_decision = RouteDecision(chosen.name, chosen.label, reason,
+                                               self.expected_latency(chosen), skipped)
+        return order
+
+    def _fallback_status(self) -> EngineStatus:
+        """Fallback do registro, criado só quando alguma fala precisa dele"""
+        candidate = self.registry.fallback
+        if candidate.name not in self.registry.statuses:
+            self.registry.statuses[candidate.name] = EngineStatus(
+                candidate.name, candidate.label, -1, candidate.factory(), ready=True, init_time=0.0)
+        return self.registry.statuses[candidate.name]
+
+    def record(self, name: str, success: bool, latency: Optional[float] = None,
+               rtf: Optional[float] = None, error: Optional[str] = None):
+        """Resultado de uma fala: atualiza a janela e o disjuntor"""
+        health = self.health_of(name)
+        health.record(success, latency, rtf)
+        if not success:
+            health.last_error = error
+        if success and health.state == HALF_OPEN:
+            health.state = CLOSED
+            self.logger.info(f"🔌 {name} de volta à rotação")
+        elif not success and self._should_trip(health):
+            health.state = OPEN
+            health.opened_at = time.perf_counter()
+            health.trips += 1
+            self.logger.warning(f"🔌 {name} fora de rotação por {self.cooldown:.0f}s: {error}")
+
+    def _should_trip(self, health: EngineHealth) -> bool:
+        if health.state == HALF_OPEN:
+            return True
+        if health.consecutive_failures >= self.failure_threshold:
+            return True
+        return len(health.outcomes) >= self.min_samples and health.failure_rate >= self.max_failure_rate
+
+    def _measure(self, status: EngineStatus, before: Any, elapsed: float):
+        """(sucesso, latência, RTF) a partir do last_speech_stats novo do engine"""
+        stats = getattr(status.system, "last_speech_stats", None)
+        if stats is None or stats is before:
+            return True, elapsed, None   # engine sem medição: tempo total da chamada
+        if not stats.sentences:
+            return False, None, None
+        latency = stats.first_audio if stats.first_audio is not None else elapsed
+        return True, latency, stats.rtf
+
+    async def speak(self, text: str, emotion: str = "neutro"):
+        """Fala no engine escolhido; exceção passa para o próximo da ordem"""
+        fallback = self.registry.fallback.name if self.registry.fallback else None
+        for status in self.route():
+            before = getattr(status.system, "last_speech_stats", None)
+            start = time.perf_counter()
+            try:
+                await status.system.speak(text, emotion)
+            except Exception as e:
+                self._finish(status, False, error=str(e))
+                self.logger.error(f"Erro em {status.label}, tentando o próximo: {e}")
+                continue
+            success, latency, rtf = self._measure(status, before, time.perf_counter() - start)
+            self._finish(status, success, latency, rtf, None if success else "nenhuma frase tocada")
+            return
+        if fallback is None:
+            self.logger.error("Nenhum engine de voz conseguiu falar")
+
+    async def speak_stream(self, chunks: AsyncIterable[str], emotion: str = "neutro") -> str:
+        """Texto em streaming não pode ser repetido: vai só para o engine escolhido"""
+        order = self.route()
+        status = order[0]
+        before = getattr(status.system, "last_speech_stats", None)
+        start = time.perf_counter()
+        try:
+            if hasattr(status.system, "speak_stream"):
+                text = await status.system.speak_stream(chunks, emotion)
+            else:
+                text = "".join([chunk async for chunk in chunks]).strip()
+                await status.system.speak(text, emotion)
+        except Exception as e:
+            self._finish(status, False, error=str(e))
+            raise
+        success, latency, rtf = self._measure(status, before, time.perf_counter() - start)
+        self._finish(status, success, latency, rtf, None if success else "nenhuma frase tocada")
+        return text
+
+    def _finish(self, status: EngineStatus, success: bool, latency: Optional[float] = None,
+                rtf: Optional[float] = None, error: Optional[str] = None):
+        if self.registry.fallback is None or status.name != self.registry.fallback.name:
+            self.record(status.name, success, latency, rtf, error)
+        self.health_of(status.name).routed += 1
+        decision = self.last_decision
+        if decision is not None and decision.engine == status.name:
+            decision.success = success
+            decision.latency = latency
+        self.logger.debug(f"🔀 {status.name}: {'ok' if success else 'falhou'}"
+                          + (f" em {latency * 1000:.0f} ms" if latency is not None else ""))
+
+    def get_info(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000) if value is not None else None
+
+        return {
+            "latency_budget_ms": ms(self.latency_budget),
+            "last_decision": self.last_decision.format() if self.last_decision else None,
+            "engines": {
+                name: {
+                    "state": health.state,
+                    "routed": health.routed,
+                    "latency_ms": ms(health.latency),
+                    "rtf": round(health.rtf, 2) if health.rtf is not None else None,
+                    "failure_rate": round(health.failure_rate, 2),
+                    "trips": health.trips,
+                    "last_error": health.last_error,
+                }
+                for name, health in self.health.items()
+            },
+        }
+
+    def format_status(self) -> str:
+        """Resumo falável: engine da última fala e saúde de cada um"""
+        if self.last_decision is None:
+            return "Ainda não escolhi nenhum engine de voz."
+        parts = [f"Última fala: {self.last_decision.format()}."]
+        for name, health in self.health.items():
+            label = self.registry.statuses[name].label if name in self.registry.statuses else name
+            latency = f"{health.latency * 1000:.0f} ms" if health.latency is not None else "sem medição"
+            rtf = f", RTF {health.rtf:.2f}" if health.rtf is not None else ""
+            parts.append(f"{label}: {health.state}, {latency}{rtf}, "
+                         f"{health.failure_rate * 100:.0f}% de falhas.")
+        return " ".join(parts)
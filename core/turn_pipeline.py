@@ -0,0 +1,78 @@
+# core/turn_pipeline.py - Etapas do turno com medição e tarefas fora do caminho crítico
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Dict, List, Optional, Set, Tuple
+
+class TurnTimings:
+    """Tempos das etapas de um turno (caminho crítico e etapas em paralelo)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: List[Tuple[str, float, bool]] = []   # (etapa, segundos, em paralelo)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mede uma etapa do caminho crítico"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start, False))
+
+    def record(self, name: str, seconds: float, background: bool = False):
+        self.stages.append((name, seconds, background))
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Etapa -> milissegundos"""
+        return {name: seconds * 1000 for name, seconds, _ in self.stages}
+
+    def format(self) -> str:
+        parts = []
+        for name, seconds, background in self.stages:
+            suffix = " ∥" if background else ""
+            parts.append(f"{name} {seconds * 1000:.1f} ms{suffix}")
+        parts.append(f"total {self.total * 1000:.1f} ms")
+        return " | ".join(parts)
+
+class BackgroundTasks:
+    """Tarefas disparadas fora do caminho crítico (persistência, análises)"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def spawn(self, coroutine: Awaitable, name: str,
+              timings: Optional[TurnTimings] = None) -> asyncio.Task:
+        """Agenda a corrotina; o tempo dela entra em timings como etapa paralela"""
+        async def run():
+            start = time.perf_counter()
+            try:
+                return await coroutine
+            except Exception as e:
+                self.logger.error(f"Erro na tarefa em segundo plano '{name}': {e}")
+            finally:
+                if timings is not None:
+                    timings.record(name, time.perf_counter() - start, background=True)
+
+        task = asyncio.ensure_future(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def drain(self, timeout: float = 5.0):
+        """Espera as tarefas pendentes (ex.: antes de encerrar)"""
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        if pending:
+            self.logger.warning(f"{len(pending)} tarefas em segundo plano não terminaram")
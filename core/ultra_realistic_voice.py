@@ -21,7 +21,13 @@ import logging
 import time
 import os
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, AsyncIterable
+
+from core.audio_cache import COMMON_PHRASES, CachedAudio, get_audio_cache
+from core.audio_io import gtts_to_bytes
+from core.chunked_tts import get_chunked_tts, gtts_fetcher
+from core.audio_playback import get_playback_backend
+from core.speech_pipeline import PipelineStats, SentencePipeline, SentenceStreamer, split_sentences
 
 # Verificar dependências essenciais
 SYSTEM_READY = True
@@ -56,10 +62,19 @@ class PerfectWorkingVoice:
         self.logger = logging.getLogger(__name__)
         self.is_initialized = False
         self.is_speaking = False
+        self.init_task = None
+        self.probe_latency: Optional[float] = None  # gTTS do teste rápido (rede incluída)
+        self.last_speech_stats: Optional[PipelineStats] = None  # lido pelo roteador de TTS
+        
+        # Cache de áudio compartilhado (frases repetidas não são sintetizadas de novo)
+        self.audio_cache = get_audio_cache()
+        
+        # Saída de áudio com aviso de término
+        self.playback = get_playback_backend()
+        self.current_playback = None
         
-        # Diretórios
-        self.temp_dir = Path("temp_audio")
-        self.temp_dir.mkdir(exist_ok=True)
+        # gTTS: trechos de falas longas buscados em paralelo
+        self.chunked_tts = get_chunked_tts()
         
         # Configurações emocionais FINAIS
         self.emotions = {
@@ -116,7 +131,7 @@ class PerfectWorkingVoice:
         print("🎭 Sistema final criado!")
         
         if SYSTEM_READY:
-            asyncio.create_task(self.initialize())
+            self.init_task = asyncio.create_task(self.initialize())
     
     async def initialize(self):
         """Inicialização final otimizada"""
@@ -138,6 +153,9 @@ class PerfectWorkingVoice:
             
             self.is_initialized = True
             
+            # Frases fixas geradas em segundo plano
+            asyncio.create_task(self.prewarm_common_phrases())
+            
             print("\n✅ SISTEMA FINAL FUNCIONANDO!")
             print("🎉 Pronto para uso!")
             
@@ -148,14 +166,14 @@ class PerfectWorkingVoice:
     async def _lightning_test(self):
         """Teste ultra-rápido"""
         try:
-            test_file = self.temp_dir / "lightning_test.mp3"
-            
-            # Teste mínimo com gTTS
+            # Teste mínimo com gTTS (em memória)
             tts = gTTS(text="Ok", lang="pt")  # pt em vez de pt-br
-            tts.save(str(test_file))
+            loop = asyncio.get_event_loop()
+            start = time.perf_counter()
+            data = await loop.run_in_executor(None, gtts_to_bytes, tts)
+            self.probe_latency = time.perf_counter() - start
             
-            if test_file.exists():
-                test_file.unlink()
+            if data:
                 print("⚡ Teste passou!")
             else:
                 raise Exception("Teste falhou")
@@ -185,21 +203,11 @@ class PerfectWorkingVoice:
             # Configuração emocional
             config = self.emotions.get(emotion, self.emotions["neutro"])
             
-            print(f"🎭 Gerando voz {emotion} (sistema final)...")
+            # Frase N+1 é gerada enquanto a frase N toca
+            stats = await self._speak_sentences(split_sentences(processed_text, emotion), emotion, config)
             
-            # Gerar áudio com configuração corrigida
-            audio_file = await self._generate_optimized_audio(processed_text, config)
-            
-            if audio_file and audio_file.exists():
-                # Reproduzir
-                await self._play_optimized_audio(audio_file, config)
+            if stats.sentences:
                 print(f"🎉 SEXTA-FEIRA ({emotion}): {text}")
-                
-                # Limpar
-                try:
-                    audio_file.unlink()
-                except:
-                    pass
             else:
                 raise Exception("Falha na geração")
             
@@ -209,8 +217,67 @@ class PerfectWorkingVoice:
         finally:
             self.is_speaking = False
     
-    def _optimize_text_for_emotion(self, text: str, emotion: str) -> str:
-        """Otimiza texto para máxima expressividade"""
+    async def speak_stream(self, chunks: AsyncIterable[str], emotion: str = "neutro") -> str:
+        """Fala o texto conforme ele chega (ex.: LLM em streaming); retorna o texto completo"""
+        received = []
+        
+        async def collect():
+            async for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+        
+        if not SYSTEM_READY or not self.is_initialized or self.is_speaking:
+            async for _ in collect():
+                pass
+            text = "".join(received).strip()
+            self._text_fallback(text, emotion)
+            return text
+        
+        self.is_speaking = True
+        config = self.emotions.get(emotion, self.emotions["neutro"])
+        
+        async def sentences():
+            streamer = SentenceStreamer(emotion)
+            first = True
+            async for chunk in collect():
+                for sentence in streamer.feed(chunk):
+                    yield self._optimize_text_for_emotion(sentence, emotion, first)
+                    first = False
+            for sentence in streamer.flush():
+                yield self._optimize_text_for_emotion(sentence, emotion, first)
+                first = False
+        
+        try:
+            stats = await self._speak_sentences(sentences(), emotion, config)
+            text = "".join(received).strip()
+            if stats.sentences:
+                print(f"🎉 SEXTA-FEIRA ({emotion}): {text}")
+            else:
+                self._text_fallback(text, emotion)
+            return text
+        finally:
+            self.is_speaking = False
+    
+    async def _speak_sentences(self, sentences, emotion: str, config: Dict) -> PipelineStats:
+        """Sintetiza à frente (fila limitada) enquanto a frase anterior toca"""
+        async def synthesize(sentence: str):
+            return await self._get_audio(sentence, emotion, config)
+        
+        async def play(audio: CachedAudio):
+            await self._play_optimized_audio(audio, config, pause=False)
+        
+        stats = await SentencePipeline(synthesize, play).run(sentences)
+        self.last_speech_stats = stats
+        self.logger.info(f"🎭 Fala em pipeline: {stats.format()}")
+        
+        # Pausa emocional só no fim da fala
+        pause = config.get("pause", 0.3)
+        if stats.sentences and pause > 0.1:
+            await asyncio.sleep(pause)
+        return stats
+    
+    def _optimize_text_for_emotion(self, text: str, emotion: str, first: bool = True) -> str:
+        """Otimiza texto para máxima expressividade (interjeições só na primeira frase)"""
         # Limpeza básica
         processed = text.replace("SEXTA-FEIRA", "Sexta-feira")
         processed = processed.replace("IA", "inteligência artificial")
@@ -234,20 +301,20 @@ class PerfectWorkingVoice:
         elif text_mod == "melancholic":
             # Triste - tom melancólico
             processed = processed.replace(".", "...")
-            if not processed.startswith(("Ah", "Oh")):
+            if first and not processed.startswith(("Ah", "Oh")):
                 processed = "Ah... " + processed
                 
         elif text_mod == "energetic":
             # Animado - máxima energia
             processed = processed.replace(".", "!")
-            if not processed.startswith(("Nossa", "Uau", "Que")):
+            if first and not processed.startswith(("Nossa", "Uau", "Que")):
                 processed = "Nossa! " + processed
                 
         elif text_mod == "questioning":
             # Curioso - questionamento
             if "?" not in processed:
                 processed = processed.replace(".", "?")
-            if not processed.startswith("Hmm"):
+            if first and not processed.startswith("Hmm"):
                 processed = "Hmm... " + processed
                 
         elif text_mod == "sultry":
@@ -259,48 +326,64 @@ class PerfectWorkingVoice:
                 
         elif text_mod == "shocked":
             # Surpreso - máxima surpresa
-            if not processed.startswith(("Uau", "Nossa", "Caramba")):
+            if first and not processed.startswith(("Uau", "Nossa", "Caramba")):
                 processed = "Uau! " + processed
             processed = processed.replace(".", "!")
         
         return processed
     
-    async def _generate_optimized_audio(self, text: str, config: Dict) -> Optional[Path]:
-        """Gera áudio com configuração otimizada"""
+    def _cache_key(self, processed_text: str, emotion: str, config: Dict) -> str:
+        """Chave do cache: volume e pausa são aplicados na reprodução, não entram"""
+        params = {"lang": "pt", "slow": bool(config.get("speed", False))}
+        return self.audio_cache.make_key(processed_text, emotion, "gtts", params)
+    
+    async def _get_audio(self, processed_text: str, emotion: str, config: Dict) -> Optional[CachedAudio]:
+        """Busca no cache; se não houver, gera com gTTS e guarda"""
+        key = self._cache_key(processed_text, emotion, config)
+        cached = self.audio_cache.get(key)
+        if cached:
+            return cached
+        
+        print(f"🎭 Gerando voz {emotion} (sistema final)...")
+        data = await self._generate_optimized_audio(processed_text, config)
+        if not data:
+            return None
+        return self.audio_cache.put(key, data, "mp3")
+    
+    async def prewarm_common_phrases(self):
+        """Gera em segundo plano as frases fixas que ainda não estão no cache"""
+        async def synthesize(text: str, emotion: str):
+            config = self.emotions.get(emotion, self.emotions["neutro"])
+            processed = self._optimize_text_for_emotion(text, emotion)
+            return await self._get_audio(processed, emotion, config)
+        
+        await self.audio_cache.prewarm(COMMON_PHRASES, synthesize)
+    
+    async def _generate_optimized_audio(self, text: str, config: Dict) -> Optional[bytes]:
+        """Gera o MP3 em memória com configuração otimizada"""
         try:
             # Usar 'pt' em vez de 'pt-br' (corrige deprecação)
             use_slow = config.get("speed", False)
             
-            tts = gTTS(
-                text=text,
-                lang="pt",  # Corrigido: pt em vez de pt-br
-                slow=use_slow
-            )
-            
-            audio_file = self.temp_dir / f"final_{int(time.time())}.mp3"
-            tts.save(str(audio_file))
-            
-            return audio_file
+            # Trechos buscados em paralelo e juntados em ordem, direto para memória
+            fetch = gtts_fetcher(lang="pt", slow=use_slow)  # Corrigido: pt em vez de pt-br
+            return await self.chunked_tts.synthesize(text, fetch)
             
         except Exception as e:
             print(f"❌ Erro no gTTS: {e}")
             return None
     
-    async def _play_optimized_audio(self, audio_file: Path, config: Dict):
-        """Reproduz áudio otimizado"""
+    async def _play_optimized_audio(self, audio: CachedAudio, config: Dict, pause: bool = True):
+        """Reproduz áudio otimizado a partir da memória"""
         try:
-            pygame.mixer.music.load(str(audio_file))
-            pygame.mixer.music.set_volume(config["volume"])
-            pygame.mixer.music.play()
+            self.current_playback = await self.playback.play(audio.data, config["volume"])
             
-            # Aguardar reprodução
-            while pygame.mixer.music.get_busy():
-                await asyncio.sleep(0.05)
+            # Aguardar o aviso de término
+            await self.current_playback.wait()
             
             # Pausa emocional
-            pause = config.get("pause", 0.3)
-            if pause > 0.1:
-                await asyncio.sleep(pause)
+            if pause and config.get("pause", 0.3) > 0.1:
+                await asyncio.sleep(config.get("pause", 0.3))
                 
         except Exception as e:
             print(f"⚠️ Erro na reprodução: {e}")
@@ -355,7 +438,8 @@ class PerfectWorkingVoice:
             "system": "final_optimized",
             "engine": "gtts_optimized",
             "language": "pt",
-            "status": "working" if self.is_initialized else "loading"
+            "status": "working" if self.is_initialized else "loading",
+            "audio_cache": self.audio_cache.get_info()
         }
 
 # Compatibilidade
@@ -0,0 +1,211 @@
+# core/vad_endpointer.py - Fim de fala por VAD em quadros (webrtcvad): o segmento sai assim que a fala acaba
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+VAD_RATE = 16000                        # taxa do microfone na escuta
+VAD_RATES = (8000, 16000, 32000, 48000)  # aceitas pelo webrtcvad
+VAD_FRAME_MS = (10, 20, 30)
+
+@dataclass
+class VadSettings:
+    """Parâmetros do endpointer (aggressiveness, hangover e fala mínima vêm da VoiceConfig)"""
+    aggressiveness: int = 2         # 0 (deixa passar mais) a 3 (filtra mais ruído)
+    frame_ms: int = 30
+    start_ms: int = 90              # voz seguida que abre uma fala
+    hangover_ms: int = 300          # silêncio que encerra a fala
+    min_speech_ms: int = 250        # mais curto que isso (clique, tosse) é descartado
+    pre_roll_ms: int = 200          # áudio antes do início que vai junto no segmento
+    max_utterance_s: float = 10.0   # fala longa é cortada aqui
+
+    @classmethod
+    def from_config(cls, config) -> "VadSettings":
+        return cls(aggressiveness=config.vad_aggressiveness, hangover_ms=config.vad_hangover_ms,
+                   min_speech_ms=config.vad_min_speech_ms)
+
+@dataclass
+class UtteranceSegment:
+    """Uma fala delimitada pelo VAD (tempos em segundos do fluxo de áudio)"""
+    pcm: bytes
+    sample_rate: int
+    start: float          # primeiro quadro com voz
+    end: float            # fim do último quadro com voz
+    emitted: float        # quando o endpointer fechou a fala (end + hangover)
+    emitted_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def endpoint_delay(self) -> float:
+        """Quanto depois do fim real da fala o segmento saiu"""
+        return self.emitted - self.end
+
+    @property
+    def speech_ended_at(self) -> float:
+        """Fim da fala no relógio de perf_counter (captura em tempo real)"""
+        return self.emitted_at - self.endpoint_delay
+
+class EnergyVad:
+    """Voz por energia (RMS) - reserva para quando o webrtcvad não está instalado"""
+
+    def __init__(self, threshold: float = 300.0):
+        self.threshold = threshold
+
+    def is_speech(self, frame: bytes, sample_rate: int) -> bool:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return bool(samples.size) and float(np.sqrt(np.mean(samples ** 2))) > self.threshold
+
+def create_vad(aggressiveness: int = 2, energy_threshold: float = 300.0) -> Callable[[bytes, int], bool]:
+    """is_speech(quadro, taxa) do webrtcvad; sem ele, por energia"""
+    if WEBRTCVAD_AVAILABLE:
+        return webrtcvad.Vad(aggressiveness).is_speech
+    logging.getLogger(__name__).warning("⚠️ webrtcvad não instalado - fim de fala por energia")
+    return EnergyVad(energy_threshold).is_speech
+
+class VadEndpointer:
+    """
+    Endpointer em quadros de 10-30 ms.
+
+    Cada quadro passa pelo VAD. start_ms de voz seguida abre a fala (com
+    pre_roll_ms de áudio anterior); hangover_ms de silêncio a fecha, e o
+    segmento sai nesse quadro, sem esperar o pause_threshold do
+    speech_recognition. Falas abaixo de min_speech_ms são descartadas;
+    on_speech_start dispara quando a fala passa desse mínimo (aviso de
+    barge-in no início da fala, não depois da frase inteira).
+    """
+
+    def __init__(self, settings: Optional[VadSettings] = None, sample_rate: int = VAD_RATE,
+                 is_speech: Optional[Callable[[bytes, int], bool]] = None,
+                 on_speech_start: Optional[Callable[[], None]] = None, energy_threshold: float = 300.0):
+        self.logger = logging.getLogger(__name__)
+        self.settings = settings or VadSettings()
+        if sample_rate not in VAD_RATES:
+            raise ValueError(f"Taxa não suportada pelo VAD: {sample_rate} (use {VAD_RATES})")
+        if self.settings.frame_ms not in VAD_FRAME_MS:
+            raise ValueError(f"Quadro não suportado pelo VAD: {self.settings.frame_ms} ms (use {VAD_FRAME_MS})")
+
+        self.sample_rate = sample_rate
+        self.is_speech = is_speech or create_vad(self.settings.aggressiveness, energy_threshold)
+        self.on_speech_start = on_speech_start
+
+        frame_ms = self.settings.frame_ms
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * 2
+        self.frame_seconds = frame_ms / 1000
+        self.start_frames = max(1, self.settings.start_ms // frame_ms)
+        self.hangover_frames = max(1, self.settings.hangover_ms // frame_ms)
+        self.min_speech_frames = max(1, self.settings.min_speech_ms // frame_ms)
+        self.max_frames = max(1, int(self.settings.max_utterance_s * 1000) // frame_ms)
+
+        self.segments = 0
+        self.discarded = 0
+        self._buffer = bytearray()
+        self._pre_roll: deque = deque(maxlen=self.settings.pre_roll_ms // frame_ms + self.start_frames)
+        self.reset()
+
+    @property
+    def in_speech(self) -> bool:
+        return self._triggered
+
+    def reset(self):
+        """Esquece o áudio pendente (nova escuta)"""
+        self._buffer.clear()
+        self._pre_roll.clear()
+        self._frames: List[bytes] = []
+        self._index = 0
+        self._run = 0
+        self._silence = 0
+        self._triggered = False
+        self._confirmed = False
+        self._onset = 0
+        self._last_voiced = 0
+
+    def feed(self, pcm: bytes) -> List[UtteranceSegment]:
+        """PCM 16-bit mono em qualquer tamanho; devolve as falas que terminaram nele"""
+        self._buffer.extend(pcm)
+        segments = []
+        while len(self._buffer) >= self.frame_bytes:
+            frame = bytes(self._buffer[:self.frame_bytes])
+            del self._buffer[:self.frame_bytes]
+            segment = self.process_frame(frame)
+            if segment is not None:
+                segments.append(segment)
+        return segments
+
+    def process_frame(self, frame: bytes) -> Optional[UtteranceSegment]:
+        index = self._index
+        self._index += 1
+        voiced = self.is_speech(frame, self.sample_rate)
+
+        if not self._triggered:
+            self._pre_roll.append(frame)
+            self._run = self._run + 1 if voiced else 0
+            if self._run >= self.start_frames:
+                self._triggered = True
+                self._onset = index - self._run + 1
+                self._last_voiced = index
+                self._silence = 0
+                self._frames = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._check_confirmed(index)
+            return None
+
+        self._frames.append(frame)
+        if voiced:
+            self._last_voiced = index
+            self._silence = 0
+            self._check_confirmed(index)
+        else:
+            self._silence += 1
+
+        if self._silence >= self.hangover_frames or index - self._onset + 1 >= self.max_frames:
+            return self._close(index)
+        return None
+
+    def flush(self) -> Optional[UtteranceSegment]:
+        """Fim do áudio: fecha a fala em andamento"""
+        if not self._triggered:
+            return None
+        return self._close(self._index - 1)
+
+    def _check_confirmed(self, index: int):
+        if not self._confirmed and self._last_voiced - self._onset + 1 >= self.min_speech_frames:
+            self._confirmed = True
+            if self.on_speech_start:
+                self.on_speech_start()
+
+    def _close(self, index: int) -> Optional[UtteranceSegment]:
+        segment = None
+        if self._confirmed:
+            trailing = index - self._last_voiced   # silêncio do hangover fica de fora
+            pcm = b"".join(self._frames[:len(self._frames) - trailing])
+            segment = UtteranceSegment(pcm, self.sample_rate,
+                                       start=self._onset * self.frame_seconds,
+                                       end=(self._last_voiced + 1) * self.frame_seconds,
+                                       emitted=(index + 1) * self.frame_seconds)
+            self.segments += 1
+        else:
+            self.discarded += 1
+
+        self._frames = []
+        self._run = 0
+        self._silence = 0
+        self._triggered = False
+        self._confirmed = False
+        return segment
@@ -0,0 +1,169 @@
+# core/voice_registry.py - Engines de voz testados em paralelo, com future de prontidão
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+@dataclass
+class VoiceCandidate:
+    """Um sistema de voz que pode ser usado (rank maior = melhor qualidade)"""
+    name: str
+    label: str
+    factory: Callable[[], Any]
+    rank: int = 0
+
+@dataclass
+class EngineStatus:
+    """Resultado da sonda de um candidato"""
+    name: str
+    label: str
+    rank: int
+    system: Any = None
+    ready: bool = False
+    init_time: Optional[float] = None
+    probe_latency: Optional[float] = None   # síntese de teste medida na inicialização
+    error: Optional[str] = None
+
+class VoiceRegistry:
+    """
+    Inicializa todos os candidatos ao mesmo tempo e expõe um future de prontidão.
+
+    O future resolve com o primeiro engine pronto cuja síntese de teste
+    ficou dentro de latency_bar (candidatos sem medição contam como
+    dentro). Se nenhum ficar pronto em ready_timeout, resolve com o
+    fallback. Depois disso, um engine de rank maior que fique pronto
+    substitui o ativo em segundo plano (upgrade).
+    """
+
+    def __init__(self, candidates: List[VoiceCandidate], fallback: Optional[VoiceCandidate] = None,
+                 latency_bar: float = 2.0, ready_timeout: float = 15.0, init_timeout: float = 120.0):
+        self.logger = logging.getLogger(__name__)
+        self.candidates = list(candidates)
+        self.fallback = fallback
+        self.latency_bar = latency_bar
+        self.ready_timeout = ready_timeout
+        self.init_timeout = init_timeout
+
+        self.statuses: Dict[str, EngineStatus] = {
+            c.name: EngineStatus(c.name, c.label, c.rank) for c in self.candidates
+        }
+        self.active: Optional[EngineStatus] = None
+        self.on_change: Optional[Callable[[EngineStatus, Optional[EngineStatus]], None]] = None
+        self.ready: Optional[asyncio.Future] = None
+        self._tasks: List[asyncio.Task] = []
+        self.started_at: Optional[float] = None
+
+    def start(self):
+        """Dispara as sondas (precisa de um loop rodando)"""
+        if self.ready is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self.ready = loop.create_future()
+        self.started_at = time.perf_counter()
+        for candidate in self.candidates:
+            self._tasks.append(loop.create_task(self._probe(candidate)))
+        self._tasks.append(loop.create_task(self._fallback_after_timeout()))
+
+    async def wait_ready(self) -> EngineStatus:
+        """Engine em uso assim que houver um aceitável (sem polling)"""
+        self.start()
+        await asyncio.shield(self.ready)
+        return self.active
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready is not None and self.ready.done()
+
+    def acceptable(self, status: EngineStatus) -> bool:
+        return status.ready and (status.probe_latency is None or status.probe_latency <= self.latency_bar)
+
+    async def _probe(self, candidate: VoiceCandidate):
+        status = self.statuses[candidate.name]
+        start = time.perf_counter()
+        try:
+            status.system = candidate.factory()
+            await asyncio.wait_for(self._initialize(status.system), self.init_timeout)
+            status.ready = bool(getattr(status.system, "is_initialized", True))
+            status.probe_latency = getattr(status.system, "probe_latency", None)
+            if not status.ready:
+                status.error = "não inicializou"
+        except asyncio.TimeoutError:
+            status.error = f"timeout ({self.init_timeout:.0f}s)"
+        except Exception as e:
+            status.error = str(e)
+        status.init_time = time.perf_counter() - start
+
+        if status.ready:
+            self.logger.info(f"🎤 {candidate.label} pronto em {status.init_time:.1f}s"
+                             + (f" (teste {status.probe_latency * 1000:.0f} ms)" if status.probe_latency is not None else ""))
+        else:
+            self.logger.warning(f"🎤 {candidate.label} indisponível: {status.error}")
+        self._consider(status)
+
+        if all(s.init_time is not None for s in self.statuses.values()) and not self.is_ready:
+            self._use_fallback()   # todos terminaram e nenhum serviu
+
+    @staticmethod
+    async def _initialize(system):
+        """Aguarda a inicialização do sistema, já em andamento ou não"""
+        pending = getattr(system, "init_task", None)
+        if pending is not None:
+            await pending
+            return
+        initialize = getattr(system, "initialize", None)
+        if initialize is not None:
+            result = initialize()
+            if inspect.isawaitable(result):
+                await result
+
+    def _consider(self, status: EngineStatus):
+        if not self.acceptable(status):
+            return
+        if self.active is not None and self.active.rank >= status.rank:
+            return
+        previous, self.active = self.active, status
+        if previous is not None:
+            self.logger.info(f"⬆️ Voz atualizada: {previous.label} -> {status.label}")
+        if self.on_change:
+            self.on_change(status, previous)
+        if not self.ready.done():
+            self.ready.set_result(status)
+
+    async def _fallback_after_timeout(self):
+        await asyncio.sleep(self.ready_timeout)
+        if not self.is_ready:
+            self.logger.warning(f"Nenhuma voz pronta em {self.ready_timeout:.0f}s, usando fallback")
+            self._use_fallback()
+
+    def _use_fallback(self):
+        if self.is_ready:
+            return
+        if self.fallback is not None:
+            status = EngineStatus(self.fallback.name, self.fallback.label, -1, self.fallback.factory(), ready=True)
+            self.statuses.setdefault(status.name, status)
+            self.active = status
+            if self.on_change:
+                self.on_change(status, None)
+        self.ready.set_result(self.active)
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "active": self.active.name if self.active else None,
+            "latency_bar_ms": round(self.latency_bar * 1000),
+            "engines": {
+                name: {
+                    "ready": s.ready,
+                    "init_s": round(s.init_time, 2) if s.init_time is not None else None,
+                    "probe_ms": round(s.probe_latency * 1000) if s.probe_latency is not None else None,
+                    "error": s.error,
+                }
+                for name, s in self.statuses.items()
+            },
+        }
@@ -95,11 +95,10 @@ class WorkingTTSSystem:
                 if not pygame.mixer.get_init():
                     pygame.mixer.init()
                 
-                pygame.mixer.music.load(str(audio_file))
-                pygame.mixer.music.play()
+                from core.audio_playback import get_playback_backend
                 
-                while pygame.mixer.music.get_busy():
-                    await asyncio.sleep(0.1)
+                playback = await get_playback_backend().play(audio_file.read_bytes())
+                await playback.wait()
                     
             except ImportError:
                 print("🔊 Instale pygame para reprodução automática")
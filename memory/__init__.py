@@ -2,5 +2,6 @@
 
 from .user_profile import UserProfile, UserInfo
 from .database import DatabaseManager
+from .timeline import TimelineEntry, TimelineIndex
 
-__all__ = ['UserProfile', 'UserInfo', 'DatabaseManager']
\ No newline at end of file
+__all__ = ['UserProfile', 'UserInfo', 'DatabaseManager', 'TimelineEntry', 'TimelineIndex']
\ No newline at end of file
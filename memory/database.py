@@ -2,10 +2,11 @@
 import sqlite3
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from config.settings import DatabaseConfig
+from memory.events import next_occurrence
 
 class DatabaseManager:
     def __init__(self, config: DatabaseConfig):
@@ -13,6 +14,9 @@ class DatabaseManager:
         self.logger = logging.getLogger(__name__)
         self.connection: Optional[sqlite3.Connection] = None
         Path("data").mkdir(exist_ok=True)
+        
+        # Cache de "próximos N dias": (hoje, dias) -> eventos; limpo a cada escrita em events
+        self._upcoming_cache: Dict[Tuple[date, int], List[Dict[str, Any]]] = {}
     
     async def initialize(self):
         try:
@@ -58,6 +62,44 @@ class DatabaseManager:
                 "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
             )
             
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS backfill_checkpoints ("
+                "name TEXT PRIMARY KEY, "
+                "last_message_id INTEGER NOT NULL, "
+                "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS timeline ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "message_id INTEGER, "
+                "start_date TEXT NOT NULL, "
+                "end_date TEXT NOT NULL, "
+                "kind TEXT NOT NULL, "
+                "original TEXT, "
+                "excerpt TEXT, "
+                "confidence REAL DEFAULT 0.0, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_timeline_start ON timeline (start_date)")
+            
+            # Eventos: únicos por data (event_date) ou anuais por dia/mês (month_day = "MM-DD")
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "name TEXT NOT NULL, "
+                "source TEXT NOT NULL DEFAULT 'user', "
+                "category TEXT, "
+                "recurrence TEXT NOT NULL DEFAULT 'none', "
+                "event_date TEXT, "
+                "month_day TEXT NOT NULL, "
+                "year INTEGER, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+                "UNIQUE (name, source))"
+            )
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_date ON events (recurrence, event_date)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_month_day ON events (recurrence, month_day)")
+            
             self.connection.commit()
             self.logger.info("Tabelas criadas!")
             
@@ -89,7 +131,8 @@ class DatabaseManager:
             self.logger.error(f"Erro ao carregar perfil: {e}")
             return None
     
-    async def save_conversation_message(self, session_id: str, role: str, content: str, metadata: Dict = None):
+    async def save_conversation_message(self, session_id: str, role: str, content: str, metadata: Dict = None) -> Optional[int]:
+        """Salva a mensagem e retorna seu id"""
         try:
             cursor = self.connection.cursor()
             metadata_json = json.dumps(metadata) if metadata else None
@@ -98,8 +141,10 @@ class DatabaseManager:
                 (session_id, role, content, metadata_json)
             )
             self.connection.commit()
+            return cursor.lastrowid
         except Exception as e:
             self.logger.error(f"Erro ao salvar mensagem: {e}")
+            return None
     
     async def get_conversation_history(self, session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         try:
@@ -125,6 +170,182 @@ class DatabaseManager:
             self.logger.error(f"Erro ao obter histórico: {e}")
             return []
     
+    async def get_user_messages_after(self, after_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+        """Mensagens do usuário com id maior que after_id, em ordem (para leitura em blocos)"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "SELECT id, content, timestamp FROM conversations "
+                "WHERE role = 'user' AND id > ? ORDER BY id LIMIT ?",
+                (after_id, limit)
+            )
+            return [
+                {'id': row['id'], 'content': row['content'], 'timestamp': row['timestamp']}
+                for row in cursor.fetchall()
+            ]
+        except Exception as e:
+            self.logger.error(f"Erro ao ler mensagens do histórico: {e}")
+            return []
+    
+    async def get_backfill_checkpoint(self, name: str) -> int:
+        """Último id de mensagem processado por um backfill (0 se nunca rodou)"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute('SELECT last_message_id FROM backfill_checkpoints WHERE name = ?', (name,))
+            row = cursor.fetchone()
+            return row['last_message_id'] if row else 0
+        except Exception as e:
+            self.logger.error(f"Erro ao ler checkpoint: {e}")
+            return 0
+    
+    async def save_backfill_checkpoint(self, name: str, last_message_id: int):
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO backfill_checkpoints (name, last_message_id, updated_at) VALUES (?, ?, ?)",
+                (name, last_message_id, datetime.now())
+            )
+            self.connection.commit()
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar checkpoint: {e}")
+    
+    async def add_timeline_entries(self, entries: List[Dict[str, Any]]):
+        """Salva referências temporais (datas em ISO: ordenam como texto)"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.executemany(
+                "INSERT INTO timeline (message_id, start_date, end_date, kind, original, excerpt, confidence) "
+                "VALUES (:message_id, :start_date, :end_date, :kind, :original, :excerpt, :confidence)",
+                entries
+            )
+            self.connection.commit()
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar linha do tempo: {e}")
+    
+    async def get_timeline_entries(self) -> List[Dict[str, Any]]:
+        """Todas as referências temporais, ordenadas pelo início"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "SELECT message_id, start_date, end_date, kind, original, excerpt, confidence "
+                "FROM timeline ORDER BY start_date"
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            self.logger.error(f"Erro ao ler linha do tempo: {e}")
+            return []
+    
+    async def upsert_event(self, name: str, day: int, month: int, year: Optional[int] = None,
+                           recurrence: str = "none", category: str = None, source: str = "user") -> Optional[int]:
+        """Cria ou atualiza um evento (recurrence: 'none' ou 'yearly')"""
+        try:
+            event_date = date(year, month, day).isoformat() if year else None
+            if recurrence == "none" and event_date is None:
+                recurrence = "yearly"
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO events (name, source, category, recurrence, event_date, month_day, year) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, source, category, recurrence, event_date, f"{month:02d}-{day:02d}", year)
+            )
+            self.connection.commit()
+            self._upcoming_cache.clear()
+            return cursor.lastrowid
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar evento: {e}")
+            return None
+    
+    async def get_event_names(self, source: str = "user") -> List[str]:
+        """Nomes dos eventos de uma origem"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT name FROM events WHERE source = ?", (source,))
+            return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            self.logger.error(f"Erro ao listar eventos: {e}")
+            return []
+    
+    async def delete_event(self, name: str, source: str = "user"):
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM events WHERE name = ? AND source = ?", (name, source))
+            self.connection.commit()
+            self._upcoming_cache.clear()
+        except Exception as e:
+            self.logger.error(f"Erro ao remover evento: {e}")
+    
+    async def get_upcoming_events(self, days: int = 7, today: date = None) -> List[Dict[str, Any]]:
+        """
+        Eventos de hoje até hoje + days, em ordem de data.
+        
+        Únicos: busca por intervalo em event_date. Anuais: intervalo em month_day
+        (dois intervalos na virada do ano) e expansão para a próxima ocorrência.
+        """
+        today = today or date.today()
+        cache_key = (today, days)
+        if cache_key in self._upcoming_cache:
+            return [dict(event) for event in self._upcoming_cache[cache_key]]
+        
+        try:
+            end = today + timedelta(days=days)
+            cursor = self.connection.cursor()
+            columns = "id, name, category, recurrence, event_date, month_day, year"
+            
+            cursor.execute(
+                f"SELECT {columns} FROM events WHERE recurrence = 'none' AND event_date BETWEEN ? AND ?",
+                (today.isoformat(), end.isoformat())
+            )
+            rows = cursor.fetchall()
+            
+            start_key, end_key = today.strftime("%m-%d"), end.strftime("%m-%d")
+            if days >= 365:
+                cursor.execute(f"SELECT {columns} FROM events WHERE recurrence = 'yearly'")
+            elif start_key <= end_key:
+                # 29/02 é comemorado em 28/02 fora de ano bissexto
+                cursor.execute(
+                    f"SELECT {columns} FROM events WHERE recurrence = 'yearly' "
+                    "AND (month_day BETWEEN ? AND ? OR month_day = '02-29')",
+                    (start_key, end_key)
+                )
+            else:
+                cursor.execute(
+                    f"SELECT {columns} FROM events WHERE recurrence = 'yearly' "
+                    "AND (month_day >= ? OR month_day <= ? OR month_day = '02-29')",
+                    (start_key, end_key)
+                )
+            rows += cursor.fetchall()
+            
+            events = []
+            for row in rows:
+                if row['recurrence'] == 'yearly':
+                    month, day = (int(part) for part in row['month_day'].split('-'))
+                    occurrence = next_occurrence(month, day, today)
+                    if occurrence > end:
+                        continue
+                else:
+                    occurrence = date.fromisoformat(row['event_date'])
+                
+                event = {
+                    'id': row['id'],
+                    'name': row['name'],
+                    'category': row['category'],
+                    'recurrence': row['recurrence'],
+                    'date': occurrence.strftime("%d/%m"),
+                    'iso_date': occurrence.isoformat(),
+                    'days_until': (occurrence - today).days
+                }
+                if row['recurrence'] == 'yearly' and row['year']:
+                    event['years'] = occurrence.year - row['year']
+                events.append(event)
+            
+            events.sort(key=lambda event: (event['iso_date'], event['name']))
+            self._upcoming_cache[cache_key] = events
+            return [dict(event) for event in events]
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao buscar próximos eventos: {e}")
+            return []
+    
     async def add_knowledge(self, topic: str, content: str, source: str = None, confidence: float = 1.0):
         try:
             cursor = self.connection.cursor()
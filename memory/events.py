@@ -0,0 +1,59 @@
+# memory/events.py - Datas de eventos: interpretação e recorrência anual
+import re
+from datetime import date
+from typing import Optional, Tuple
+
+MONTHS = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'marco': 3, 'abril': 4,
+    'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
+    'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
+}
+
+# Nomes que indicam data que se repete todo ano
+RECURRING_HINTS = ("aniversário", "aniversario", "bodas", "natal")
+
+def parse_event_date(value: str) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Interpreta datas do perfil: "15/03", "15/03/1990", "1990-03-15", "15 de março".
+    Retorna (dia, mês, ano ou None) ou None se não reconhecer.
+    """
+    text = value.strip().lower()
+
+    match = re.fullmatch(r'(\d{4})-(\d{1,2})-(\d{1,2})', text)
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+        return _validated(day, month, year)
+
+    match = re.fullmatch(r'(\d{1,2})/(\d{1,2})(?:/(\d{4}))?', text)
+    if match:
+        day, month = int(match.group(1)), int(match.group(2))
+        return _validated(day, month, int(match.group(3)) if match.group(3) else None)
+
+    match = re.fullmatch(r'(\d{1,2}) de ([a-zç]+)(?: de (\d{4}))?', text)
+    if match and match.group(2) in MONTHS:
+        year = int(match.group(3)) if match.group(3) else None
+        return _validated(int(match.group(1)), MONTHS[match.group(2)], year)
+
+    return None
+
+def _validated(day: int, month: int, year: Optional[int]) -> Optional[Tuple[int, int, Optional[int]]]:
+    try:
+        date(year or 2000, month, day)  # 2000 é bissexto: aceita 29/02 sem ano
+    except ValueError:
+        return None
+    return day, month, year
+
+def is_recurring(name: str, year: Optional[int]) -> bool:
+    """Sem ano, ou aniversário/data comemorativa: repete todo ano"""
+    return year is None or any(hint in name.lower() for hint in RECURRING_HINTS)
+
+def next_occurrence(month: int, day: int, today: date) -> date:
+    """Próxima ocorrência (hoje inclusive) de uma data anual; 29/02 cai em 28/02 fora de ano bissexto"""
+    for year in (today.year, today.year + 1):
+        try:
+            occurrence = date(year, month, day)
+        except ValueError:
+            occurrence = date(year, month, day - 1)
+        if occurrence >= today:
+            return occurrence
+    return occurrence
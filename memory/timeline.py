@@ -0,0 +1,95 @@
+# memory/timeline.py - Índice de referências temporais da linha do tempo do usuário
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+@dataclass
+class TimelineEntry:
+    """Referência temporal como intervalo de datas, ligada à mensagem de origem"""
+    start: date
+    end: date
+    kind: str                         # date, relative_time ou life_event
+    original: str                     # trecho que gerou a referência ("em 2019")
+    message_id: Optional[int] = None
+    excerpt: str = ""                 # começo da mensagem de origem
+    confidence: float = 0.0
+
+    def describe_period(self) -> str:
+        """Período legível: ano, mês ou intervalo"""
+        if self.start == self.end:
+            return self.start.strftime("%d/%m/%Y")
+        if self.start.month == 1 and self.start.day == 1 and self.end.month == 12 and self.end.day == 31:
+            if self.start.year == self.end.year:
+                return str(self.start.year)
+            return f"{self.start.year}-{self.end.year}"
+        return f"{self.start.strftime('%d/%m/%Y')} a {self.end.strftime('%d/%m/%Y')}"
+
+class _SpanBucket:
+    """Intervalos de duração parecida, ordenados pelo início"""
+
+    def __init__(self):
+        self.starts: List[int] = []              # ordinais dos inícios, ordenados
+        self.entries: List[TimelineEntry] = []   # mesma ordem de starts
+        self.max_span = 0                        # maior duração no balde (dias)
+
+class TimelineIndex:
+    """
+    Intervalos em arrays ordenados pelo início (bisect), separados por faixa de duração.
+
+    A consulta por sobreposição busca, em cada faixa, os inícios em
+    [início - maior duração da faixa, fim] e filtra pelo fim. Separar dias de
+    anos mantém a janela de candidatos curta: O(faixas * log n + candidatos).
+    """
+
+    def __init__(self):
+        self._buckets: Dict[int, _SpanBucket] = {}   # bit_length da duração -> balde
+        self._by_message: Dict[int, List[TimelineEntry]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, entry: TimelineEntry):
+        """Insere mantendo a ordem pelo início"""
+        start = entry.start.toordinal()
+        span = entry.end.toordinal() - start
+        bucket = self._buckets.setdefault(span.bit_length(), _SpanBucket())
+        position = bisect_right(bucket.starts, start)
+        bucket.starts.insert(position, start)
+        bucket.entries.insert(position, entry)
+        bucket.max_span = max(bucket.max_span, span)
+        self._count += 1
+        if entry.message_id is not None:
+            self._by_message.setdefault(entry.message_id, []).append(entry)
+
+    def query(self, start: date, end: date) -> List[TimelineEntry]:
+        """Entradas cujo intervalo cruza [start, end], em ordem cronológica"""
+        first_day, last_day = start.toordinal(), end.toordinal()
+        found = []
+        for bucket in self._buckets.values():
+            first = bisect_left(bucket.starts, first_day - bucket.max_span)
+            last = bisect_right(bucket.starts, last_day)
+            found.extend(entry for entry in bucket.entries[first:last] if entry.end >= start)
+        found.sort(key=lambda entry: entry.start)
+        return found
+
+    def query_year(self, year: int) -> List[TimelineEntry]:
+        return self.query(date(year, 1, 1), date(year, 12, 31))
+
+    def query_last(self, days: int, today: date = None) -> List[TimelineEntry]:
+        """Entradas dos últimos N dias"""
+        today = today or date.today()
+        return self.query(today - timedelta(days=days), today)
+
+    def for_message(self, message_id: int) -> List[TimelineEntry]:
+        return self._by_message.get(message_id, [])
+
+    @staticmethod
+    def format_for_prompt(entries: List[TimelineEntry], limit: int = 5) -> str:
+        """Linhas curtas para injetar no prompt (mais recentes primeiro)"""
+        lines = []
+        for entry in sorted(entries, key=lambda e: e.start, reverse=True)[:limit]:
+            excerpt = f': "{entry.excerpt}"' if entry.excerpt else f' ("{entry.original}")'
+            lines.append(f"- {entry.describe_period()}{excerpt}")
+        return "\n".join(lines)
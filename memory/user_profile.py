@@ -3,10 +3,12 @@ import json
 import logging
 import re
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from memory.database import DatabaseManager
+from memory.events import is_recurring, parse_event_date
+from utils.nlu import Utterance, as_utterance
 
 @dataclass
 class UserInfo:
@@ -21,6 +23,7 @@ class UserInfo:
     family: Dict[str, str] = None
     goals: List[str] = None
     personality_traits: List[str] = None
+    fact_confidence: Dict[str, float] = None  # Confiança de cada campo vindo de extração
     
     def __post_init__(self):
         if self.hobbies is None:
@@ -35,6 +38,8 @@ class UserInfo:
             self.goals = []
         if self.personality_traits is None:
             self.personality_traits = []
+        if self.fact_confidence is None:
+            self.fact_confidence = {}
 
 class UserProfile:
     """Gerencia perfil e informações do usuário"""
@@ -89,6 +94,8 @@ class UserProfile:
             else:
                 # Tentar carregar de arquivo JSON (backup)
                 await self.load_from_file()
+            
+            await self.sync_important_dates()
                 
         except Exception as e:
             self.logger.error(f"Erro ao carregar perfil: {e}")
@@ -134,14 +141,15 @@ class UserProfile:
         except Exception as e:
             self.logger.error(f"Erro ao salvar arquivo: {e}")
     
-    async def extract_and_update_info(self, text: str):
+    async def extract_and_update_info(self, text: Union[str, Utterance]):
         """Extrai e atualiza informações do texto"""
-        text_lower = text.lower()
+        utterance = as_utterance(text)
+        text_lower = utterance.lower
         updated = False
         
         try:
             # Extrair nome
-            if not self.user_info.name:
+            if not self.user_info.name and utterance.mentions("chamo", "nome", "sou"):
                 for pattern in self.extraction_patterns['name']:
                     match = re.search(pattern, text_lower)
                     if match:
@@ -153,7 +161,7 @@ class UserProfile:
                             break
             
             # Extrair idade
-            if not self.user_info.age:
+            if not self.user_info.age and utterance.mentions("anos", "idade"):
                 for pattern in self.extraction_patterns['age']:
                     match = re.search(pattern, text_lower)
                     if match:
@@ -165,7 +173,7 @@ class UserProfile:
                             break
             
             # Extrair localização
-            if not self.user_info.location:
+            if not self.user_info.location and utterance.mentions("moro", "vivo", "sou de"):
                 for pattern in self.extraction_patterns['location']:
                     match = re.search(pattern, text_lower)
                     if match:
@@ -177,7 +185,7 @@ class UserProfile:
                             break
             
             # Extrair profissão
-            if not self.user_info.occupation:
+            if not self.user_info.occupation and utterance.mentions("trabalho", "profiss"):
                 for pattern in self.extraction_patterns['occupation']:
                     match = re.search(pattern, text_lower)
                     if match:
@@ -189,7 +197,9 @@ class UserProfile:
                             break
             
             # Extrair hobbies
-            for pattern in self.extraction_patterns['hobbies']:
+            hobby_patterns = self.extraction_patterns['hobbies'] if utterance.mentions(
+                "gosto", "amo", "hobby", "horas vagas") else []
+            for pattern in hobby_patterns:
                 match = re.search(pattern, text_lower)
                 if match:
                     hobby = match.group(1).strip()
@@ -208,6 +218,9 @@ class UserProfile:
                 (r'tenho uma filha chamada (.+?)(?:\.|,|$)', 'filha')
             ]
             
+            if not utterance.mentions("chama"):
+                family_patterns = []
+            
             for pattern, relation in family_patterns:
                 match = re.search(pattern, text_lower)
                 if match and relation not in self.user_info.family:
@@ -223,6 +236,70 @@ class UserProfile:
         except Exception as e:
             self.logger.error(f"Erro na extração de informações: {e}")
     
+    # Subcategorias do extrator -> parentesco usado em user_info.family
+    FAMILY_RELATIONS = {
+        'mother': 'mãe', 'father': 'pai', 'brother': 'irmão', 'sister': 'irmã',
+        'son': 'filho', 'daughter': 'filha', 'husband': 'marido', 'wife': 'esposa',
+        'boyfriend': 'namorado', 'girlfriend': 'namorada'
+    }
+    
+    def upsert_fact(self, subcategory: str, value: Any, confidence: float, min_confidence: float = 0.5) -> bool:
+        """
+        Aplica um fato extraído ao perfil respeitando a confiança.
+        
+        Campos únicos só são substituídos por fatos de confiança maior ou igual à registrada;
+        valores definidos sem confiança registrada (conversa ao vivo) são mantidos.
+        Não salva - quem chama decide quando persistir.
+        """
+        if confidence < min_confidence or value in (None, ""):
+            return False
+        
+        info = self.user_info
+        
+        # Campos com vários valores
+        if subcategory in ('hobby', 'likes'):
+            value = str(value).strip()
+            if value and value not in info.hobbies:
+                info.hobbies.append(value)
+                return True
+            return False
+        
+        if subcategory == 'dislikes':
+            dislikes = info.preferences.setdefault('dislikes', [])
+            value = str(value).strip()
+            if value and value not in dislikes:
+                dislikes.append(value)
+                return True
+            return False
+        
+        # Campos únicos
+        if subcategory == 'age':
+            # Só idade declarada, como inteiro: textos ("5" de "há 5 anos atrás") e
+            # estimativas (age_inferred, marcos da vida) não viram idade
+            field_name = 'age'
+            if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 120:
+                return False
+            current = info.age
+        elif subcategory in ('location', 'occupation'):
+            field_name = subcategory
+            current = getattr(info, subcategory)
+        elif subcategory in self.FAMILY_RELATIONS:
+            field_name = f"family.{self.FAMILY_RELATIONS[subcategory]}"
+            current = info.family.get(self.FAMILY_RELATIONS[subcategory])
+        else:
+            return False
+        
+        known_confidence = info.fact_confidence.get(field_name, 1.0 if current else 0.0)
+        if confidence < known_confidence or current == value:
+            return False
+        
+        if field_name.startswith('family.'):
+            info.family[field_name.split('.', 1)[1]] = value
+        else:
+            setattr(info, field_name, value)
+        info.fact_confidence[field_name] = confidence
+        return True
+    
     def get_user_name(self) -> str:
         """Retorna nome do usuário ou padrão"""
         return self.user_info.name if self.user_info.name else "usuário"
@@ -277,4 +354,26 @@ class UserProfile:
         """Adiciona data importante"""
         self.user_info.important_dates[date_name] = date_value
         import asyncio
-        asyncio.create_task(self.save_profile())
\ No newline at end of file
+        asyncio.create_task(self.save_profile())
+        asyncio.create_task(self.sync_important_dates())
+    
+    async def sync_important_dates(self):
+        """Espelha important_dates na tabela de eventos (consultas por intervalo de datas)"""
+        synced = set()
+        for name, value in self.user_info.important_dates.items():
+            parsed = parse_event_date(str(value))
+            if parsed is None:
+                self.logger.debug(f"Data não reconhecida para '{name}': {value}")
+                continue
+            day, month, year = parsed
+            recurrence = "yearly" if is_recurring(name, year) else "none"
+            await self.database.upsert_event(
+                name, day, month, year, recurrence,
+                category="important_date", source="profile"
+            )
+            synced.add(name)
+        
+        # Datas removidas (ou que deixaram de ser reconhecidas) saem da tabela
+        for name in await self.database.get_event_names("profile"):
+            if name not in synced:
+                await self.database.delete_event(name, "profile")
\ No newline at end of file
@@ -2,7 +2,7 @@
 import asyncio
 import logging
 import ollama
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from config.settings import ModelConfig
 
 class LocalLLM:
@@ -72,32 +72,51 @@ class LocalLLM:
         except Exception as e:
             self.logger.error(f"Erro no teste do modelo: {e}")
     
+    def _build_messages(self, prompt: str, use_history: bool) -> List[Dict[str, str]]:
+        messages = []
+        
+        if use_history and self.conversation_history:
+            # Manter apenas as últimas conversas
+            recent_history = self.conversation_history[-4:]  # Ainda menor
+            messages.extend(recent_history)
+        
+        # Adicionar prompt atual
+        messages.append({
+            'role': 'user',
+            'content': prompt
+        })
+        return messages
+    
+    def _options(self) -> Dict[str, Any]:
+        return {
+            'temperature': self.config.temperature,
+            'num_predict': self.config.max_tokens,
+            'top_p': 0.9,
+            'repeat_penalty': 1.1
+        }
+    
+    def _remember(self, prompt: str, assistant_message: str):
+        """Adiciona a troca ao histórico"""
+        self.conversation_history.append({
+            'role': 'user',
+            'content': prompt
+        })
+        self.conversation_history.append({
+            'role': 'assistant',
+            'content': assistant_message
+        })
+        
+        # Limitar histórico
+        if len(self.conversation_history) > 8:
+            self.conversation_history = self.conversation_history[-6:]
+    
     async def generate_response(self, prompt: str, use_history: bool = True) -> Optional[str]:
         try:
-            # Preparar mensagens
-            messages = []
-            
-            if use_history and self.conversation_history:
-                # Manter apenas as últimas conversas
-                recent_history = self.conversation_history[-4:]  # Ainda menor
-                messages.extend(recent_history)
-            
-            # Adicionar prompt atual
-            messages.append({
-                'role': 'user',
-                'content': prompt
-            })
-            
             # Gerar resposta
             response = await self.client.chat(
                 model=self.config.model_name,
-                messages=messages,
-                options={
-                    'temperature': self.config.temperature,
-                    'num_predict': self.config.max_tokens,
-                    'top_p': 0.9,
-                    'repeat_penalty': 1.1
-                }
+                messages=self._build_messages(prompt, use_history),
+                options=self._options()
             )
             
             if response and 'message' in response and 'content' in response['message']:
@@ -105,18 +124,7 @@ class LocalLLM:
                 
                 # Adicionar ao histórico
                 if use_history:
-                    self.conversation_history.append({
-                        'role': 'user',
-                        'content': prompt
-                    })
-                    self.conversation_history.append({
-                        'role': 'assistant',
-                        'content': assistant_message
-                    })
-                    
-                    # Limitar histórico
-                    if len(self.conversation_history) > 8:
-                        self.conversation_history = self.conversation_history[-6:]
+                    self._remember(prompt, assistant_message)
                 
                 return assistant_message
             else:
@@ -127,6 +135,33 @@ class LocalLLM:
             self.logger.error(f"Erro ao gerar resposta: {e}")
             return f"Desculpe, houve um erro: {str(e)[:100]}"
     
+    async def stream_response(self, prompt: str, use_history: bool = True) -> AsyncIterator[str]:
+        """Gera a resposta em pedaços conforme o modelo produz (para falar enquanto gera)"""
+        parts = []
+        try:
+            stream = await self.client.chat(
+                model=self.config.model_name,
+                messages=self._build_messages(prompt, use_history),
+                options=self._options(),
+                stream=True
+            )
+            
+            async for chunk in stream:
+                content = chunk['message']['content']
+                if content:
+                    parts.append(content)
+                    yield content
+                    
+        except Exception as e:
+            self.logger.error(f"Erro ao gerar resposta em streaming: {e}")
+            if not parts:
+                yield f"Desculpe, houve um erro: {str(e)[:100]}"
+                return
+        
+        assistant_message = "".join(parts).strip()
+        if use_history and assistant_message:
+            self._remember(prompt, assistant_message)
+    
     def clear_history(self):
         self.conversation_history = []
         self.logger.info("Histórico limpo")
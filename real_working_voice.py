@@ -39,13 +39,13 @@ def check_dependencies():
         deps_needed.append("pygame")
         print("❌ Pygame não instalado")
     
-    # Verificar pydub (para melhorias de áudio)
+    # Verificar numpy (para melhorias de áudio)
     try:
-        import pydub
-        print("✅ Pydub OK")
+        import numpy
+        print("✅ NumPy OK")
     except ImportError:
-        deps_needed.append("pydub")
-        print("❌ Pydub não instalado")
+        deps_needed.append("numpy")
+        print("❌ NumPy não instalado")
     
     # Instalar dependências faltando
     if deps_needed:
@@ -82,6 +82,7 @@ class FakeMeCab:
 sys.modules['MeCab'] = FakeMeCab()
 
 import asyncio
+import io
 import logging
 import time
 import tempfile
@@ -105,16 +106,17 @@ except ImportError:
     REAL_VOICE_OK = False
     missing_deps.append("pygame")
 
-try:
-    from pydub import AudioSegment
-    from pydub.effects import normalize, compress_dynamic_range
-    AUDIO_ENHANCEMENT = True
-except ImportError:
-    AUDIO_ENHANCEMENT = False
+from core.audio_io import decode_to_float, wav_bytes
+from core.audio_playback import get_playback_backend
+from core.chunked_tts import get_chunked_tts, gtts_fetcher
+from core.emotion_dsp import NUMPY_AVAILABLE, process_emotion
+
+# Processamento emocional em NumPy (uma passada, sem cópias por etapa)
+AUDIO_ENHANCEMENT = NUMPY_AVAILABLE
 
 if not REAL_VOICE_OK:
     print(f"❌ Faltando: {', '.join(missing_deps)}")
-    print("Execute: pip install gtts pygame pydub")
+    print("Execute: pip install gtts pygame numpy")
 
 class RealWorkingVoice:
     """Sistema de voz que REALMENTE funciona - sem complicações"""
@@ -228,15 +230,13 @@ class RealWorkingVoice:
         """Teste rápido para garantir funcionamento"""
         try:
             print("🧪 Teste rápido...")
-            test_file = self.temp_dir / "quick_test.mp3"
-            
-            # Gerar áudio simples
+            # Gerar áudio simples (em memória)
             tts = gTTS(text="Teste", lang="pt-br")
-            tts.save(str(test_file))
+            buffer = io.BytesIO()
+            tts.write_to_fp(buffer)
             
-            # Verificar se arquivo foi criado
-            if test_file.exists() and test_file.stat().st_size > 1000:
-                test_file.unlink()
+            # Verificar se o áudio foi gerado
+            if buffer.tell() > 1000:
                 print("✅ Teste passou!")
                 return True
             else:
@@ -271,26 +271,17 @@ class RealWorkingVoice:
             
             print(f"🎭 Gerando voz {emotion} (sistema real)...")
             
-            # Gerar áudio base com gTTS
-            audio_file = await self._generate_base_audio(processed_text, config)
+            # Gerar áudio base com gTTS (em memória)
+            audio_data = await self._generate_base_audio(processed_text, config)
             
-            if audio_file and audio_file.exists():
+            if audio_data:
                 # Aplicar melhorias emocionais
-                enhanced_file = await self._enhance_audio_for_emotion(audio_file, config)
+                enhanced_data = await self._enhance_audio_for_emotion(audio_data, config)
                 
                 # Reproduzir
-                await self._play_enhanced_audio(enhanced_file, config)
+                await self._play_enhanced_audio(enhanced_data, config)
                 
                 print(f"🎉 SEXTA-FEIRA ({emotion}): {text}")
-                
-                # Limpar
-                try:
-                    if audio_file.exists():
-                        audio_file.unlink()
-                    if enhanced_file and enhanced_file.exists() and enhanced_file != audio_file:
-                        enhanced_file.unlink()
-                except:
-                    pass
             else:
                 raise Exception("Falha na geração do áudio base")
             
@@ -356,101 +347,46 @@ class RealWorkingVoice:
         
         return processed
     
-    async def _generate_base_audio(self, text: str, config: Dict) -> Optional[Path]:
-        """Gera áudio base com gTTS"""
+    async def _generate_base_audio(self, text: str, config: Dict) -> Optional[bytes]:
+        """Gera áudio base (MP3 em memória) com gTTS"""
         try:
             # Configurar velocidade através do parâmetro slow
             slow_speech = config["speed_multiplier"] < 0.9
             
-            # Gerar com gTTS
-            tts = gTTS(
-                text=text,
-                lang="pt-br",  # Português brasileiro
-                slow=slow_speech
-            )
-            
-            # Salvar
-            audio_file = self.temp_dir / f"base_{int(time.time())}.mp3"
-            tts.save(str(audio_file))
-            
-            return audio_file
+            # Gerar com gTTS: trechos em paralelo, juntados em ordem, direto para memória
+            fetch = gtts_fetcher(lang="pt-br", slow=slow_speech)  # Português brasileiro
+            return await get_chunked_tts().synthesize(text, fetch)
             
         except Exception as e:
             print(f"❌ Erro no gTTS: {e}")
             return None
     
-    async def _enhance_audio_for_emotion(self, audio_file: Path, config: Dict) -> Path:
-        """Aplica melhorias emocionais no áudio"""
+    async def _enhance_audio_for_emotion(self, audio_data: bytes, config: Dict) -> bytes:
+        """Aplica melhorias emocionais no áudio (WAV na taxa do mixer)"""
         if not AUDIO_ENHANCEMENT:
-            return audio_file
+            return audio_data
         
         try:
-            # Carregar áudio
-            audio = AudioSegment.from_mp3(str(audio_file))
-            
-            # Aplicar modificações baseadas na emoção
-            
-            # 1. Ajustar velocidade
-            speed_mult = config["speed_multiplier"]
-            if speed_mult != 1.0:
-                # Mudar velocidade sem alterar pitch
-                new_sample_rate = int(audio.frame_rate * speed_mult)
-                audio = audio._spawn(audio.raw_data, overrides={"frame_rate": new_sample_rate})
-                audio = audio.set_frame_rate(22050)  # Normalizar
+            # Decodificar uma vez para float32; tom, velocidade, filtros e
+            # dinâmica rodam no mesmo array, fora do event loop
+            samples, rate = decode_to_float(audio_data)
+            out_rate = pygame.mixer.get_init()[0]
             
-            # 2. Ajustar pitch (simulado através de velocidade + resampling)
-            pitch_shift = config.get("pitch_shift", 0)
-            if pitch_shift != 0:
-                # Simulação de pitch shift
-                pitch_factor = 1.0 + (pitch_shift * 0.05)  # 5% por unidade
-                new_rate = int(audio.frame_rate * pitch_factor)
-                audio = audio._spawn(audio.raw_data, overrides={"frame_rate": new_rate})
-                audio = audio.set_frame_rate(22050)
+            loop = asyncio.get_event_loop()
+            enhanced = await loop.run_in_executor(None, process_emotion, samples, rate, config, out_rate)
             
-            # 3. Ajustar volume
-            volume_db = (config["volume"] - 0.85) * 20  # Converter para dB
-            if volume_db != 0:
-                audio = audio + volume_db
-            
-            # 4. Normalizar e comprimir
-            audio = normalize(audio)
-            audio = compress_dynamic_range(audio)
-            
-            # 5. Adicionar efeitos específicos por emoção
-            emotion_style = config.get("voice_style", "normal")
-            
-            if emotion_style == "soft":
-                # Suavizar para carinhoso
-                audio = audio.low_pass_filter(3000)
-                
-            elif emotion_style == "energetic" or emotion_style == "excited":
-                # Aumentar agudos para feliz/animado
-                audio = audio.high_pass_filter(100)
-                
-            elif emotion_style == "melancholic":
-                # Filtro para tristeza
-                audio = audio.low_pass_filter(2000)
-            
-            # Salvar áudio processado
-            enhanced_file = self.temp_dir / f"enhanced_{int(time.time())}.wav"
-            audio.export(str(enhanced_file), format="wav")
-            
-            return enhanced_file
+            return wav_bytes(enhanced, out_rate)
             
         except Exception as e:
             print(f"⚠️ Erro no processamento (usando original): {e}")
-            return audio_file
+            return audio_data
     
-    async def _play_enhanced_audio(self, audio_file: Path, config: Dict):
-        """Reproduz áudio com configurações emocionais"""
+    async def _play_enhanced_audio(self, audio_data: bytes, config: Dict):
+        """Reproduz áudio (em memória) com configurações emocionais"""
         try:
-            pygame.mixer.music.load(str(audio_file))
-            pygame.mixer.music.set_volume(config["volume"])
-            pygame.mixer.music.play()
-            
-            # Aguardar reprodução
-            while pygame.mixer.music.get_busy():
-                await asyncio.sleep(0.05)
+            # Reproduzir e aguardar o aviso de término (sem get_busy a cada 50 ms)
+            playback = await get_playback_backend().play(audio_data, volume=config["volume"])
+            await playback.wait()
             
             # Pausa emocional
             pause_duration = config.get("pause_after", 0.3)
@@ -507,7 +443,7 @@ class RealWorkingVoice:
         elif not self.is_initialized:
             return "⏳ Sistema Real (Carregando...)"
         else:
-            enhancement = " + Processamento" if AUDIO_ENHANCEMENT else ""
+            enhancement = " + DSP NumPy" if AUDIO_ENHANCEMENT else ""
             return f"🌟 Sistema Real (gTTS{enhancement})"
     
     def get_voice_info(self):
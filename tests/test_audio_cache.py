@@ -0,0 +1,100 @@
+# test_audio_cache.py - Cache de áudio endereçado por conteúdo
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.audio_cache import AudioCache
+
+SYNTHESIS_DELAY = 0.05
+
+def test_key_is_stable_and_sensitive():
+    """Mesmos parâmetros em qualquer ordem dão a mesma chave"""
+    key = AudioCache.make_key("Olá!", "feliz", "gtts", {"lang": "pt", "slow": False})
+    assert key == AudioCache.make_key("Olá!", "feliz", "gtts", {"slow": False, "lang": "pt"})
+    assert key != AudioCache.make_key("Olá!", "neutro", "gtts", {"lang": "pt", "slow": False})
+    assert key != AudioCache.make_key("Olá!", "feliz", "xtts_v2", {"lang": "pt", "slow": False})
+    assert key != AudioCache.make_key("Olá!", "feliz", "gtts", {"lang": "pt", "slow": True})
+
+def test_lru_eviction_and_persistence(tmp_path):
+    """Limite de disco remove o menos usado; índice sobrevive a reinício"""
+    cache = AudioCache(str(tmp_path), max_disk_mb=0.003, max_memory_mb=0.001)
+    block = b"x" * 1000
+    cache.put("a", block, "mp3")
+    cache.put("b", block, "wav")
+    cache.put("c", block, "mp3")
+    assert cache.get("a").data == block   # "a" passa a ser o mais recente
+    cache.put("d", block, "mp3")           # estoura o limite: sai "b"
+
+    assert "b" not in cache and not (tmp_path / "b.wav").exists()
+    assert cache.stats["evictions"] == 1
+
+    reopened = AudioCache(str(tmp_path), max_disk_mb=0.003)
+    assert {"a", "c", "d"} == {key for key in ("a", "b", "c", "d") if key in reopened}
+    audio = reopened.get("c")
+    assert audio.fmt == "mp3" and audio.path.read_bytes() == block
+
+def test_prewarm_skips_cached_phrases(tmp_path):
+    """Pré-aquecimento só sintetiza o que falta"""
+    cache = AudioCache(str(tmp_path))
+    synthesized = []
+
+    async def synthesize(text, emotion):
+        key = cache.make_key(text, emotion, "fake")
+        if key in cache:
+            return None
+        synthesized.append(text)
+        return cache.put(key, text.encode(), "wav")
+
+    phrases = [("Criando backup...", "neutro"), ("Até logo!", "feliz")]
+    assert asyncio.run(cache.prewarm(phrases, synthesize, delay=0)) == 2
+    assert asyncio.run(cache.prewarm(phrases, synthesize, delay=0)) == 0
+    assert synthesized == ["Criando backup...", "Até logo!"]
+
+def test_benchmark_repeated_phrase(tmp_path, repeats: int = 20):
+    """Frase repetida: síntese a cada vez contra cache"""
+    cache = AudioCache(str(tmp_path))
+    audio = b"\0" * 64000  # ~2 s de PCM 16 kHz
+
+    def synthesize(text):
+        time.sleep(SYNTHESIS_DELAY)
+        return audio
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        synthesize("Analisando meu código...")
+    uncached = (time.perf_counter() - start) / repeats
+
+    key = cache.make_key("Analisando meu código...", "curioso", "fake")
+    start = time.perf_counter()
+    for _ in range(repeats):
+        hit = cache.get(key)
+        if hit is None:
+            cache.put(key, synthesize("Analisando meu código..."), "wav")
+    cached = (time.perf_counter() - start) / repeats
+
+    cache._memory.clear()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        cache._memory.clear()
+        cache.get(key)
+    disk = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        cache.get(key)
+    memory = (time.perf_counter() - start) / repeats
+
+    print(f"\n📊 Frase repetida {repeats}x (síntese simulada {SYNTHESIS_DELAY * 1000:.0f} ms)")
+    print(f"   Sem cache:         {uncached * 1000:.2f} ms")
+    print(f"   Com cache:         {cached * 1000:.2f} ms")
+    print(f"   Acerto em disco:   {disk * 1000:.3f} ms")
+    print(f"   Acerto em memória: {memory * 1000:.4f} ms")
+    assert memory < disk < uncached
+
+if __name__ == "__main__":
+    test_key_is_stable_and_sensitive()
+    print("✅ Cache de áudio OK!")
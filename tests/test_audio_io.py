@@ -0,0 +1,83 @@
+# test_audio_io.py - Caminho de áudio em memória (sem arquivos temporários)
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.audio_io import gtts_to_bytes, read_wav, wav_bytes
+
+MP3_SIZE = 48000  # ~3 s de fala do gTTS
+
+class FakeTTS:
+    """Mesma interface do gTTS: write_to_fp escreve em partes, save abre o arquivo"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def write_to_fp(self, fp):
+        for index in range(0, len(self.data), 1024):
+            fp.write(self.data[index:index + 1024])
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            self.write_to_fp(f)
+
+def test_gtts_bytes_match_saved_file(tmp_path):
+    """write_to_fp em memória gera os mesmos bytes que save()"""
+    tts = FakeTTS(bytes(range(256)) * 40)
+    tts.save(tmp_path / "audio.mp3")
+    assert gtts_to_bytes(tts) == (tmp_path / "audio.mp3").read_bytes()
+
+def test_wav_roundtrip_from_pcm_bytes():
+    """PCM 16-bit vira WAV em memória e volta igual"""
+    frames = bytes(range(200))
+    data = wav_bytes(frames, 24000)
+    assert data[:4] == b"RIFF"
+    assert read_wav(data) == (frames, 24000, 1)
+
+def test_wav_from_float_samples():
+    """Amostras float do XTTS são limitadas e convertidas para 16-bit"""
+    np = pytest.importorskip("numpy")
+    samples = np.array([0.0, 0.5, -0.5, 2.0, -2.0], dtype=np.float32)
+    frames, rate, _ = read_wav(wav_bytes(samples, 22050))
+    pcm = np.frombuffer(frames, dtype=np.int16)
+    assert rate == 22050
+    assert pcm.tolist() == [0, 16383, -16383, 32767, -32767]
+
+def test_benchmark_memory_vs_temp_file(repeats: int = 200):
+    """Arquivo temporário (salvar, recarregar, apagar) contra BytesIO"""
+    tts = FakeTTS(b"\xff" * MP3_SIZE)
+    temp_dir = Path(tempfile.mkdtemp())
+
+    start = time.perf_counter()
+    for index in range(repeats):
+        audio_file = temp_dir / f"final_{int(time.time())}_{index}.mp3"
+        tts.save(str(audio_file))
+        with open(audio_file, "rb") as f:   # pygame.mixer.music.load lê do disco
+            data = f.read()
+        audio_file.unlink()
+    file_time = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        data = gtts_to_bytes(tts)
+        buffer = io.BytesIO(data)            # Sound(file=BytesIO) lê da memória
+        buffer.read()
+    memory_time = (time.perf_counter() - start) / repeats
+
+    temp_dir.rmdir()
+    print(f"\n📊 MP3 de {MP3_SIZE // 1000} KB, {repeats} falas")
+    print(f"   Arquivo temporário: {file_time * 1000:.3f} ms")
+    print(f"   Em memória:         {memory_time * 1000:.3f} ms")
+    print(f"   Economia:           {(file_time - memory_time) * 1000:.3f} ms por fala")
+    assert memory_time < file_time
+
+if __name__ == "__main__":
+    test_wav_roundtrip_from_pcm_bytes()
+    print("✅ Áudio em memória OK!")
@@ -0,0 +1,97 @@
+# test_audio_playback.py - Término da reprodução por aviso (sem polling)
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.audio_io import wav_bytes
+from core.audio_playback import NullBackend
+
+RATE = 16000
+
+def clip(seconds: float) -> bytes:
+    """Silêncio em WAV com a duração pedida"""
+    return wav_bytes(b"\0\0" * int(RATE * seconds), RATE)
+
+def test_voice_completes_and_cues_overlap():
+    """Fala termina com True; sons curtos tocam por cima da fala"""
+    async def scenario():
+        backend = NullBackend()
+        voice = await backend.play(clip(0.12))
+        cue = await backend.play(clip(0.03), cue=True)
+        assert await cue.wait() is True
+        assert not voice.done
+        assert await voice.wait() is True
+        return backend, voice
+
+    backend, voice = asyncio.run(scenario())
+    assert backend.max_active == 2 and backend.active == 0
+    assert voice.finished_at - voice.started >= 0.11
+
+def test_new_speech_replaces_and_stop_is_immediate():
+    """Nova fala no canal da voz interrompe a anterior; stop resolve na hora"""
+    async def scenario():
+        backend = NullBackend()
+        first = await backend.play(clip(1.0))
+        second = await backend.play(clip(1.0))
+        assert await first.wait() is False
+
+        start = time.perf_counter()
+        backend.stop_all()
+        assert await second.wait() is False
+        return time.perf_counter() - start
+
+    assert asyncio.run(scenario()) < 0.01
+
+def test_wait_timeout_stops_playback():
+    """Timeout de segurança interrompe a reprodução"""
+    async def scenario():
+        handle = await NullBackend().play(clip(1.0))
+        return await handle.wait(timeout=0.05), handle.done
+
+    assert asyncio.run(scenario()) == (False, True)
+
+def test_benchmark_event_vs_polling(clips: int = 8):
+    """Atraso entre o fim real do áudio e o despertar de quem espera"""
+    rng = random.Random(3)
+    durations = [rng.uniform(0.1, 0.2) for _ in range(clips)]
+
+    async def polling():
+        tails, wakeups = [], 0
+        for duration in durations:
+            end = time.perf_counter() + duration
+            while time.perf_counter() < end:      # get_busy()
+                await asyncio.sleep(0.05)
+                wakeups += 1
+            tails.append(time.perf_counter() - end)
+        return tails, wakeups
+
+    async def event_driven():
+        backend = NullBackend()
+        tails = []
+        for duration in durations:
+            handle = await backend.play(clip(duration))
+            await handle.wait()
+            tails.append(time.perf_counter() - (handle.started + duration))
+        return tails, clips
+
+    poll_tails, poll_wakeups = asyncio.run(polling())
+    event_tails, event_wakeups = asyncio.run(event_driven())
+    poll_avg = sum(poll_tails) / clips
+    event_avg = sum(event_tails) / clips
+
+    print(f"\n📊 {clips} falas de 100-200 ms")
+    print(f"   Polling 50 ms: atraso médio {poll_avg * 1000:.1f} ms, {poll_wakeups} despertares")
+    print(f"   Aviso de fim:  atraso médio {event_avg * 1000:.1f} ms, {event_wakeups} despertares")
+    assert event_avg < poll_avg
+    assert event_wakeups < poll_wakeups
+
+if __name__ == "__main__":
+    test_voice_completes_and_cues_overlap()
+    test_new_speech_replaces_and_stop_is_immediate()
+    test_wait_timeout_stops_playback()
+    print("✅ Reprodução por aviso OK!")
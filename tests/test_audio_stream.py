@@ -0,0 +1,136 @@
+# test_audio_stream.py - Síntese em streaming: buffer circular + reprodução a partir do primeiro pedaço
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.audio_io import wav_bytes
+from core.audio_playback import NullBackend
+from core.audio_stream import PcmRingBuffer
+
+RATE = 16000
+CHUNK_SECONDS = 0.1     # áudio por pedaço do inference_stream
+GENERATE_SECONDS = 0.04  # tempo para gerar cada pedaço (RTF 0.4)
+
+def pcm(seconds: float, value: int = 0) -> bytes:
+    return value.to_bytes(2, "little", signed=True) * int(RATE * seconds)
+
+def fake_inference_stream(chunks: int):
+    """Mesmo formato do Xtts.inference_stream: pedaços gerados um a um"""
+    for index in range(chunks):
+        time.sleep(GENERATE_SECONDS)
+        yield pcm(CHUNK_SECONDS, index)
+
+def produce(ring: PcmRingBuffer, chunks: int):
+    """Thread de síntese como em CoquiHumanVoice._stream_xtts"""
+    start = time.perf_counter()
+    for frames in fake_inference_stream(chunks):
+        ring.stats.synthesis_time += time.perf_counter() - start
+        ring.stats.chunks += 1
+        ring.stats.audio_seconds += len(frames) / (2 * RATE)
+        if not ring.write(frames):
+            break
+        start = time.perf_counter()
+    ring.close()
+
+def test_ring_keeps_order_across_wraparound():
+    """Escritas maiores que o buffer chegam inteiras e em ordem"""
+    async def scenario():
+        ring = PcmRingBuffer(RATE, capacity_seconds=0.05)
+        data = bytes(range(256)) * 40
+        writer = threading.Thread(target=lambda: (ring.write(data), ring.close()))
+        writer.start()
+        received = bytearray()
+        while True:
+            chunk = await ring.read_chunk(300)
+            if not chunk:
+                break
+            received += chunk
+        writer.join()
+        return bytes(received), data
+
+    received, data = asyncio.run(scenario())
+    assert received == data
+
+def test_cancel_releases_blocked_writer():
+    """Buffer cheio bloqueia a síntese; cancelar libera e write retorna False"""
+    async def scenario():
+        ring = PcmRingBuffer(RATE, capacity_seconds=0.01)
+        results = []
+        writer = threading.Thread(target=lambda: results.append(ring.write(pcm(1.0))))
+        writer.start()
+        await asyncio.sleep(0.05)
+        assert writer.is_alive()
+        ring.cancel()
+        writer.join(timeout=1)
+        return results, await ring.read_chunk(100)
+
+    results, after = asyncio.run(scenario())
+    assert results == [False] and after == b""
+
+def test_stream_playback_starts_on_first_chunk_and_stops_fast():
+    """Reprodução começa no primeiro pedaço; stop corta e para a síntese"""
+    async def scenario():
+        backend = NullBackend()
+        ring = PcmRingBuffer(RATE)
+        loop = asyncio.get_running_loop()
+        producer = loop.run_in_executor(None, produce, ring, 30)
+        handle = await backend.play_stream(ring)
+        await asyncio.sleep(0.25)
+        first_audio = ring.stats.time_to_first_audio
+
+        start = time.perf_counter()
+        handle.stop()
+        completed = await handle.wait()
+        stop_time = time.perf_counter() - start
+        await producer
+        return first_audio, completed, stop_time, ring.stats.chunks, backend
+
+    first_audio, completed, stop_time, produced, backend = asyncio.run(scenario())
+    assert first_audio < GENERATE_SECONDS + 0.05
+    assert completed is False and stop_time < 0.01
+    assert produced < 30
+    assert backend.active == 0
+
+def test_benchmark_streaming_vs_full_waveform(chunks: int = 15):
+    """Forma de onda inteira antes de tocar contra tocar a partir do primeiro pedaço"""
+    async def full_waveform():
+        backend = NullBackend()
+        requested = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        frames = await loop.run_in_executor(None, lambda: b"".join(fake_inference_stream(chunks)))
+        handle = await backend.play(wav_bytes(frames, RATE))
+        first_audio = handle.started - requested
+        await handle.wait()
+        return first_audio, time.perf_counter() - requested
+
+    async def streaming():
+        backend = NullBackend()
+        ring = PcmRingBuffer(RATE)
+        loop = asyncio.get_running_loop()
+        producer = loop.run_in_executor(None, produce, ring, chunks)
+        handle = await backend.play_stream(ring)
+        assert await handle.wait() is True
+        await producer
+        return ring.stats, time.perf_counter() - ring.stats.requested_at
+
+    full_first, full_total = asyncio.run(full_waveform())
+    stats, stream_total = asyncio.run(streaming())
+    audio = chunks * CHUNK_SECONDS
+
+    print(f"\n📊 Frase de {audio:.1f} s em {chunks} pedaços (RTF de geração {GENERATE_SECONDS / CHUNK_SECONDS:.1f})")
+    print(f"   Forma de onda inteira: primeiro áudio {full_first * 1000:.0f} ms, fim {full_total * 1000:.0f} ms")
+    print(f"   Streaming:             {stats.format()}, fim {stream_total * 1000:.0f} ms")
+    assert stats.time_to_first_audio < full_first / 3
+    assert stats.rtf < 1.0 and stats.underruns == 0
+    assert stream_total < full_total
+
+if __name__ == "__main__":
+    test_ring_keeps_order_across_wraparound()
+    test_cancel_releases_blocked_writer()
+    test_stream_playback_starts_on_first_chunk_and_stops_fast()
+    print("✅ Síntese em streaming OK!")
@@ -0,0 +1,149 @@
+# test_chunked_tts.py - Trechos do gTTS em paralelo contra um endpoint HTTP local com latência
+import asyncio
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.chunked_tts import ParallelChunkSynthesizer, split_for_tts
+
+LONG_ANSWER = ("Claro, posso te ajudar com isso. Primeiro, abra as configurações do sistema; "
+               "depois, procure a seção de rede e escolha a conexão sem fio. Se a senha pedir "
+               "confirmação, digite de novo com calma. Pronto: agora é só esperar conectar!")
+
+class FakeTTSServer:
+    """Endpoint local no lugar do Google: espera `latency` e devolve o trecho como 'áudio'"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, fail_on: str = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_on = fail_on
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                text = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)["q"][0]
+                with server._lock:
+                    server.active += 1
+                    server.requests += 1
+                    server.max_active = max(server.max_active, server.active)
+                time.sleep(server.latency + random.uniform(0, server.jitter))
+                with server._lock:
+                    server.active -= 1
+                if server.fail_on and server.fail_on in text:
+                    self.send_response(429)
+                    self.end_headers()
+                    return
+                body = f"[{text}]".encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/translate_tts"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def fetch(self, chunk: str) -> bytes:
+        query = urllib.parse.urlencode({"q": chunk})
+        with urllib.request.urlopen(f"{self.url}?{query}", timeout=5) as response:
+            return response.read()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def server():
+    fake = FakeTTSServer()
+    yield fake
+    fake.close()
+
+def expected_audio(text: str) -> bytes:
+    return b"".join(f"[{chunk}]".encode("utf-8") for chunk in split_for_tts(text))
+
+def test_split_at_phrase_boundaries_and_limit():
+    """Quebra em frases/orações; trecho longo sem pontuação quebra entre palavras"""
+    chunks = split_for_tts(LONG_ANSWER)
+    assert chunks[:3] == ["Claro,", "posso te ajudar com isso.", "Primeiro,"]
+    assert all(len(c) <= 100 for c in chunks)
+    assert " ".join(chunks) == " ".join(LONG_ANSWER.split())
+
+    words = " ".join(["palavra"] * 40)
+    long_chunks = split_for_tts(words, max_chars=50)
+    assert all(len(c) <= 50 for c in long_chunks) and " ".join(long_chunks) == words
+    assert split_for_tts("O valor é 3.5 hoje") == ["O valor é 3.5 hoje"]
+
+def test_chunks_joined_in_text_order(server):
+    """Respostas chegam fora de ordem, o áudio sai na ordem do texto"""
+    server.jitter = 0.05
+    synthesizer = ParallelChunkSynthesizer(max_concurrency=8)
+    data = asyncio.run(synthesizer.synthesize(LONG_ANSWER, server.fetch))
+    assert data == expected_audio(LONG_ANSWER)
+    assert synthesizer.last_stats.chunks == len(split_for_tts(LONG_ANSWER))
+
+def test_concurrency_is_bounded(server):
+    """Nunca mais que max_concurrency requisições ao mesmo tempo, mesmo com duas falas"""
+    synthesizer = ParallelChunkSynthesizer(max_concurrency=3)
+
+    async def scenario():
+        return await asyncio.gather(synthesizer.synthesize(LONG_ANSWER, server.fetch),
+                                    synthesizer.synthesize(LONG_ANSWER, server.fetch))
+
+    first, second = asyncio.run(scenario())
+    assert first == second == expected_audio(LONG_ANSWER)
+    assert server.max_active == 3
+
+def test_failed_chunk_fails_the_utterance(server):
+    """Um trecho recusado (ex.: 429) derruba a fala em vez de devolver áudio com buraco"""
+    server.fail_on = "senha"
+    synthesizer = ParallelChunkSynthesizer(max_concurrency=2)
+    with pytest.raises(Exception):
+        asyncio.run(synthesizer.synthesize(LONG_ANSWER, server.fetch))
+
+def test_benchmark_serial_vs_parallel(latency: float = 0.08):
+    """Resposta longa: trechos um após o outro (como o gTTS) contra 4 em paralelo"""
+    fake = FakeTTSServer(latency=latency)
+    try:
+        start = time.perf_counter()
+        serial = b"".join(fake.fetch(chunk) for chunk in split_for_tts(LONG_ANSWER))
+        serial_time = time.perf_counter() - start
+
+        synthesizer = ParallelChunkSynthesizer(max_concurrency=4)
+        start = time.perf_counter()
+        parallel = asyncio.run(synthesizer.synthesize(LONG_ANSWER, fake.fetch))
+        parallel_time = time.perf_counter() - start
+    finally:
+        fake.close()
+
+    chunks = len(split_for_tts(LONG_ANSWER))
+    print(f"\n📊 {len(LONG_ANSWER)} caracteres, {chunks} trechos, {latency * 1000:.0f} ms por requisição")
+    print(f"   Em série:   {serial_time * 1000:.0f} ms")
+    print(f"   Paralelo 4: {parallel_time * 1000:.0f} ms ({serial_time / parallel_time:.1f}x)")
+    assert parallel == serial
+    assert parallel_time < serial_time / 2
+
+if __name__ == "__main__":
+    test_split_at_phrase_boundaries_and_limit()
+    fake = FakeTTSServer()
+    try:
+        test_chunks_joined_in_text_order(fake)
+    finally:
+        fake.close()
+    print("✅ gTTS em trechos paralelos OK!")
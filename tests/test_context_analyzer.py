@@ -0,0 +1,92 @@
+# test_context_analyzer.py - Classificador should_respond do modo contínuo
+import re
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.context_analyzer import ContextAnalyzer
+
+CORPUS_FILE = Path(__file__).parent / "fixtures" / "continuous_transcripts.txt"
+
+def load_corpus():
+    """Carrega o corpus de transcrições gravadas"""
+    lines = CORPUS_FILE.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+def naive_stages(analyzer: ContextAnalyzer, text: str):
+    """Referência: testa padrão por padrão, como antes da compilação"""
+    text_lower = text.lower()
+    groups = {
+        "temporal": analyzer.temporal_friday_patterns,
+        "name": analyzer.friday_name_patterns,
+        "deactivation": analyzer.deactivation_patterns,
+        "self_reference": analyzer.self_reference_patterns,
+        "indirect": analyzer.indirect_patterns,
+        "negative": analyzer.negative_patterns,
+    }
+    return frozenset(
+        name for name, patterns in groups.items()
+        if any(re.search(pattern, text_lower) for pattern in patterns)
+    )
+
+def test_compiled_stages_match_reference():
+    """Pré-filtro + regex combinada devem dar o mesmo resultado que os padrões isolados"""
+    analyzer = ContextAnalyzer()
+    for text in load_corpus():
+        assert analyzer._classify(text.lower()) == naive_stages(analyzer, text), text
+
+def test_should_respond_decisions():
+    """Decisões principais do modo contínuo"""
+    analyzer = ContextAnalyzer()
+    assert analyzer.should_respond("na sexta eu vou no médico")[0] is False
+    assert analyzer.should_respond("ei sexta me ajuda com uma coisa")[0] is True
+    assert analyzer.should_respond("mudo")[0] is False
+    assert analyzer.should_respond("coloca água no feijão")[0] is False
+    assert analyzer.is_talking_about_friday_calendar("toda sexta tem pizza")
+
+def test_cache_hits_on_repeated_utterances():
+    """Frases idênticas devem vir do cache LRU"""
+    analyzer = ContextAnalyzer()
+    for text in load_corpus():
+        analyzer.should_respond(text)
+    assert analyzer.get_classifier_cache_info().hits > 0
+
+def test_throughput_on_corpus(rounds: int = 200):
+    """Mede frases/segundo do classificador sobre o corpus gravado"""
+    corpus = load_corpus()
+    analyzer = ContextAnalyzer()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            naive_stages(analyzer, text)
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            analyzer._classify_stages(text.lower())
+    compiled_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            analyzer._classify(text.lower())
+    cached_time = time.perf_counter() - start
+
+    total = rounds * len(corpus)
+    print(f"\n📊 {total} frases do corpus")
+    print(f"   Padrão a padrão:  {total / naive_time:,.0f} frases/s")
+    print(f"   Compilado:        {total / compiled_time:,.0f} frases/s")
+    print(f"   Compilado + LRU:  {total / cached_time:,.0f} frases/s")
+    assert compiled_time > 0 and cached_time > 0
+
+if __name__ == "__main__":
+    test_compiled_stages_match_reference()
+    test_should_respond_decisions()
+    test_cache_hits_on_repeated_utterances()
+    test_throughput_on_corpus()
+    print("✅ Classificador OK!")
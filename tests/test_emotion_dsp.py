@@ -0,0 +1,141 @@
+# test_emotion_dsp.py - Processamento emocional vetorizado (NumPy) contra a cadeia do pydub
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from core.audio_io import float_to_pcm16, read_wav, wav_bytes
+from core.emotion_dsp import apply_biquads, biquad, process_emotion, resample_poly, time_stretch
+
+RATE = 22050
+GTTS_RATE = 24000
+
+EMOTIONS = {
+    "feliz": {"speed_multiplier": 1.15, "pitch_shift": 2, "volume": 0.9, "voice_style": "energetic"},
+    "carinhoso": {"speed_multiplier": 0.85, "pitch_shift": -1, "volume": 0.75, "voice_style": "soft"},
+    "triste": {"speed_multiplier": 0.75, "pitch_shift": -2, "volume": 0.7, "voice_style": "melancholic"},
+}
+
+def tone(frequency: float, seconds: float, rate: int = RATE) -> "np.ndarray":
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+def dominant_frequency(samples, rate: int) -> float:
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return np.argmax(spectrum) * rate / len(samples)
+
+def speech_like(seconds: float, rate: int = GTTS_RATE) -> "np.ndarray":
+    """Vogais com tom variando e pausas (envelope silábico)"""
+    t = np.arange(int(rate * seconds)) / rate
+    pitch = 200 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None) ** 0.5
+    return (0.3 * voice * envelope).astype(np.float32)
+
+def test_resample_keeps_tone_and_length():
+    """24 kHz -> 22,05 kHz polifásico: mesma frequência, amplitude e duração"""
+    x = tone(440, 1.0, GTTS_RATE)
+    y = resample_poly(x, 147, 160)
+    assert abs(len(y) - len(x) * 147 / 160) <= 1
+    assert abs(dominant_frequency(y, RATE) - 440) < 2
+    assert abs(np.abs(y[1000:-1000]).max() - 0.5) < 0.01
+
+def test_time_stretch_changes_duration_not_pitch():
+    """Fala mais lenta/rápida sem mudar o tom"""
+    x = tone(220, 1.0)
+    for stretch in (0.8, 1.3):
+        y = time_stretch(x, RATE, stretch)
+        assert len(y) == round(len(x) * stretch)
+        assert abs(dominant_frequency(y, RATE) - 220) < 2
+
+def test_fused_biquads_match_direct_iir():
+    """Cascata aplicada por FFT = filtros IIR aplicados amostra a amostra"""
+    rng = np.random.default_rng(5)
+    x = rng.standard_normal(3000).astype(np.float32) * 0.1
+    filters = (("highpass", 70.0), ("lowpass", 2000.0))
+
+    expected = x.astype(np.float64)
+    for kind, frequency in filters:
+        b, a = biquad(kind, frequency, RATE)
+        y = np.zeros_like(expected)
+        for n in range(len(expected)):
+            y[n] = (b[0] * expected[n] + (b[1] * expected[n - 1] if n > 0 else 0)
+                    + (b[2] * expected[n - 2] if n > 1 else 0)
+                    - (a[1] * y[n - 1] if n > 0 else 0) - (a[2] * y[n - 2] if n > 1 else 0))
+        expected = y
+
+    assert np.max(np.abs(apply_biquads(x, filters, RATE) - expected)) < 1e-4
+
+def test_chain_applies_pitch_speed_and_limits():
+    """Tom sobe com pitch_shift, duração segue speed e o resultado cabe em 16-bit"""
+    x = tone(200, 1.0, GTTS_RATE)
+    y = process_emotion(x, GTTS_RATE, EMOTIONS["feliz"], RATE)
+    assert abs(len(y) / RATE - 1.0 / 1.15) < 0.01
+    assert abs(dominant_frequency(y, RATE) - 200 * 1.10) < 3
+    assert np.abs(y).max() <= 1.0
+
+    frames, rate, _ = read_wav(wav_bytes(y, RATE))
+    assert rate == RATE and len(frames) == 2 * len(y)
+
+def pydub_chain(segment, config):
+    """Cadeia original do RealWorkingVoice._enhance_audio_for_emotion"""
+    from pydub.effects import compress_dynamic_range, normalize
+
+    audio = segment
+    speed_mult = config["speed_multiplier"]
+    if speed_mult != 1.0:
+        audio = audio._spawn(audio.raw_data, overrides={"frame_rate": int(audio.frame_rate * speed_mult)})
+        audio = audio.set_frame_rate(RATE)
+    pitch_shift = config.get("pitch_shift", 0)
+    if pitch_shift != 0:
+        audio = audio._spawn(audio.raw_data, overrides={"frame_rate": int(audio.frame_rate * (1.0 + pitch_shift * 0.05))})
+        audio = audio.set_frame_rate(RATE)
+    audio = audio + (config["volume"] - 0.85) * 20
+    audio = normalize(audio)
+    audio = compress_dynamic_range(audio)
+    if config["voice_style"] == "soft":
+        audio = audio.low_pass_filter(3000)
+    elif config["voice_style"] in ("energetic", "excited"):
+        audio = audio.high_pass_filter(100)
+    elif config["voice_style"] == "melancholic":
+        audio = audio.low_pass_filter(2000)
+    return audio
+
+def test_benchmark_numpy_vs_pydub(seconds: float = 4.0, repeats: int = 3):
+    """Mesma fala de gTTS (24 kHz) pelas duas cadeias, até o WAV pronto para tocar"""
+    pydub = pytest.importorskip("pydub")
+    samples = speech_like(seconds)
+    pcm = float_to_pcm16(samples).tobytes()
+
+    def run_pydub(config):
+        segment = pydub.AudioSegment(data=pcm, sample_width=2, frame_rate=GTTS_RATE, channels=1)
+        return pydub_chain(segment, config).raw_data
+
+    def run_numpy(config):
+        return wav_bytes(process_emotion(samples, GTTS_RATE, config, RATE), RATE)
+
+    print(f"\n📊 Fala de {seconds:.0f} s, média de {repeats} execuções")
+    for emotion, config in EMOTIONS.items():
+        timings = {}
+        for name, chain in (("pydub", run_pydub), ("numpy", run_numpy)):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                chain(config)
+            timings[name] = (time.perf_counter() - start) / repeats
+        print(f"   {emotion:10s} pydub {timings['pydub'] * 1000:6.1f} ms | "
+              f"numpy {timings['numpy'] * 1000:6.1f} ms ({timings['pydub'] / timings['numpy']:.1f}x)")
+        assert timings["numpy"] < timings["pydub"]
+
+if __name__ == "__main__":
+    test_resample_keeps_tone_and_length()
+    test_time_stretch_changes_duration_not_pitch()
+    test_fused_biquads_match_direct_iir()
+    test_chain_applies_pitch_speed_and_limits()
+    print("✅ Processamento emocional OK!")
@@ -0,0 +1,92 @@
+# test_emotion_lexicon.py - Scorer de emoções (Aho-Corasick)
+import re
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.emotion_lexicon import DEFAULT_EMOTION_LEXICON, EmotionLexiconScorer, get_emotion_scorer
+
+CORPUS_FILE = Path(__file__).parent / "fixtures" / "continuous_transcripts.txt"
+
+def load_corpus():
+    lines = CORPUS_FILE.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+def regex_reference(text: str):
+    """Referência lenta: uma regex com fronteira de palavra por entrada do léxico"""
+    normalized = " ".join(text.lower().split())
+    counts = {emotion: 0.0 for emotion in DEFAULT_EMOTION_LEXICON}
+    for emotion, entries in DEFAULT_EMOTION_LEXICON.items():
+        for entry, weight in entries.items():
+            pattern = r"(?<!\w)" + re.escape(entry) + r"(?!\w)"
+            counts[emotion] += weight * len(re.findall(pattern, normalized))
+    return counts
+
+def test_word_boundaries():
+    """'mal' dentro de 'normal' e 'bom' dentro de 'bombom' não contam"""
+    scorer = get_emotion_scorer()
+    scores = scorer.score("tudo normal por aqui, comprei um bombom")
+    assert scores["triste"] == 0.0
+    assert scores["feliz"] == 0.0
+    assert scores["neutro"] == 1.0
+    assert scorer.score("estou mal hoje")["triste"] > 0
+
+def test_multi_word_weighted_entries():
+    """Entradas de várias palavras com peso"""
+    scorer = EmotionLexiconScorer({
+        "frustrado": {"não funciona": 2.0},
+        "feliz": ["funciona"],
+    })
+    matches = scorer.find_matches("isso  não   funciona")
+    found = {(emotion, weight) for _, _, emotion, weight in matches}
+    assert ("frustrado", 2.0) in found
+    assert ("feliz", 1.0) in found
+    assert scorer.score("não funciona")["frustrado"] == 2.0 / 2 * 10
+
+def test_matches_regex_reference_on_corpus():
+    """Uma passada do autômato equivale a uma regex por entrada"""
+    scorer = get_emotion_scorer()
+    for text in load_corpus():
+        counts = {emotion: 0.0 for emotion in DEFAULT_EMOTION_LEXICON}
+        for _, _, emotion, weight in scorer.find_matches(text):
+            counts[emotion] += weight
+        assert counts == regex_reference(text), text
+
+def test_batch_api():
+    """score_many devolve o mesmo que score, na mesma ordem"""
+    scorer = get_emotion_scorer()
+    corpus = load_corpus()
+    assert scorer.score_many(corpus) == [scorer.score(text) for text in corpus]
+
+def test_throughput_on_corpus(rounds: int = 200):
+    """Compara o autômato com uma regex por entrada"""
+    corpus = load_corpus()
+    scorer = get_emotion_scorer()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            regex_reference(text)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        scorer.score_many(corpus)
+    automaton_time = time.perf_counter() - start
+
+    total = rounds * len(corpus)
+    print(f"\n📊 {total} falas pontuadas")
+    print(f"   Regex por entrada: {total / reference_time:,.0f} falas/s")
+    print(f"   Aho-Corasick:      {total / automaton_time:,.0f} falas/s")
+    assert automaton_time > 0
+
+if __name__ == "__main__":
+    test_word_boundaries()
+    test_multi_word_weighted_entries()
+    test_matches_regex_reference_on_corpus()
+    test_batch_api()
+    test_throughput_on_corpus()
+    print("✅ Scorer de emoções OK!")
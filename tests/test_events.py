@@ -0,0 +1,152 @@
+# test_events.py - Tabela de eventos e consulta dos próximos dias
+import asyncio
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import DatabaseConfig
+from core.conversation import ConversationManager
+from memory.database import DatabaseManager
+from memory.events import next_occurrence, parse_event_date
+from memory.user_profile import UserProfile
+
+async def open_database(tmp_path):
+    database = DatabaseManager(DatabaseConfig(conversations_db=str(tmp_path / "conversations.db")))
+    await database.initialize()
+    return database
+
+def test_parse_and_recurrence():
+    """Formatos aceitos e 29/02 fora de ano bissexto"""
+    assert parse_event_date("15/03") == (15, 3, None)
+    assert parse_event_date("15/03/1990") == (15, 3, 1990)
+    assert parse_event_date("1990-03-15") == (15, 3, 1990)
+    assert parse_event_date("5 de março") == (5, 3, None)
+    assert parse_event_date("31/02") is None
+    assert parse_event_date("semana que vem") is None
+    assert next_occurrence(2, 29, date(2026, 2, 1)) == date(2026, 2, 28)
+    assert next_occurrence(1, 5, date(2026, 12, 30)) == date(2027, 1, 5)
+
+def test_upcoming_events_range_scan(tmp_path, monkeypatch):
+    """Eventos únicos e anuais, virada de ano, cache invalidado por escrita"""
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        database = await open_database(tmp_path)
+        today = date(2026, 12, 28)
+
+        await database.upsert_event("Aniversário da mãe", 2, 1, 1960, "yearly")
+        await database.upsert_event("Consulta médica", 30, 12, 2026)
+        await database.upsert_event("Viagem", 30, 12, 2025)
+        await database.upsert_event("Aniversário do Léo", 15, 6, None)
+
+        events = await database.get_upcoming_events(7, today)
+        assert [event['name'] for event in events] == ["Consulta médica", "Aniversário da mãe"]
+        assert events[1]['date'] == "02/01" and events[1]['years'] == 67
+        assert events[0]['days_until'] == 2
+
+        # Segunda chamada vem do cache; escrita invalida
+        assert await database.get_upcoming_events(7, today) == events
+        await database.upsert_event("Reunião", 29, 12, 2026)
+        assert len(await database.get_upcoming_events(7, today)) == 3
+        await database.close()
+
+    asyncio.run(scenario())
+
+def test_profile_dates_feed_suggestions(tmp_path, monkeypatch):
+    """important_dates do perfil viram eventos; sugestões e lembretes usam a tabela"""
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        database = await open_database(tmp_path)
+        profile = UserProfile(database)
+        tomorrow = date.today() + timedelta(days=1)
+        profile.user_info.important_dates = {
+            "aniversário da Ana": tomorrow.strftime("%d/%m"),
+            "formatura": (date.today() + timedelta(days=30)).strftime("%d/%m/%Y"),
+            "algum dia": "logo",
+        }
+        await profile.sync_important_dates()
+
+        manager = ConversationManager(database, profile, None)
+        suggestions = await manager.get_conversation_suggestions()
+        assert any("aniversário da Ana" in suggestion for suggestion in suggestions)
+        assert await manager.get_event_reminders() == ["Amanhã: aniversário da Ana"]
+        assert len(await database.get_upcoming_events(31)) == 2
+        await database.close()
+
+    asyncio.run(scenario())
+
+def test_removed_profile_dates_leave_events(tmp_path, monkeypatch):
+    """Data apagada do perfil some da tabela; eventos de outra origem ficam"""
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        database = await open_database(tmp_path)
+        profile = UserProfile(database)
+        profile.user_info.important_dates = {"aniversário da Ana": "15/03", "formatura": "20/12/2030"}
+        await profile.sync_important_dates()
+        await database.upsert_event("formatura", 20, 12, 2030)
+
+        del profile.user_info.important_dates["formatura"]
+        await profile.sync_important_dates()
+        assert await database.get_event_names("profile") == ["aniversário da Ana"]
+        assert await database.get_event_names("user") == ["formatura"]
+        assert [event['name'] for event in await database.get_upcoming_events(3650)] == ["aniversário da Ana", "formatura"]
+        await database.close()
+
+    asyncio.run(scenario())
+
+def test_benchmark_indexed_scan(tmp_path, monkeypatch, count: int = 5000):
+    """Busca por intervalo indexada contra interpretar o JSON do perfil"""
+    monkeypatch.chdir(tmp_path)
+    rng = random.Random(5)
+    important_dates = {}
+    for index in range(count):
+        day = date(2000, 1, 1) + timedelta(days=rng.randrange(0, 366))
+        important_dates[f"aniversário {index}"] = day.strftime("%d/%m")
+
+    async def scenario():
+        database = await open_database(tmp_path)
+        profile = UserProfile(database)
+        profile.user_info.important_dates = important_dates
+        await profile.sync_important_dates()
+        today = date(2026, 10, 19)
+
+        start = time.perf_counter()
+        for _ in range(20):
+            upcoming = []
+            for name, value in important_dates.items():
+                day, month, _ = parse_event_date(value)
+                occurrence = next_occurrence(month, day, today)
+                if (occurrence - today).days <= 7:
+                    upcoming.append(name)
+        parse_time = (time.perf_counter() - start) / 20
+
+        start = time.perf_counter()
+        for _ in range(20):
+            database._upcoming_cache.clear()
+            events = await database.get_upcoming_events(7, today)
+        scan_time = (time.perf_counter() - start) / 20
+
+        start = time.perf_counter()
+        for _ in range(20):
+            await database.get_upcoming_events(7, today)
+        cached_time = (time.perf_counter() - start) / 20
+
+        assert sorted(event['name'] for event in events) == sorted(upcoming)
+        print(f"\n📊 Próximos 7 dias entre {count} datas")
+        print(f"   Interpretar perfil: {parse_time * 1000:.2f} ms")
+        print(f"   Busca indexada:     {scan_time * 1000:.2f} ms")
+        print(f"   Cache:              {cached_time * 1000:.3f} ms")
+        await database.close()
+
+    asyncio.run(scenario())
+
+if __name__ == "__main__":
+    test_parse_and_recurrence()
+    print("✅ Eventos OK!")
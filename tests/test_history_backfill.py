@@ -0,0 +1,122 @@
+# test_history_backfill.py - Backfill paralelo de fatos do histórico
+import asyncio
+import sys
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import DatabaseConfig
+from core.history_backfill import CHECKPOINT_NAME, HistoryBackfill
+from memory.database import DatabaseManager
+from memory.user_profile import UserProfile
+
+HISTORY = [
+    ("user", "oi sexta-feira, tudo bem?"),
+    ("assistant", "Tudo ótimo! E você?"),
+    ("user", "eu tenho 30 anos e moro em Curitiba"),
+    ("user", "trabalho como engenheiro"),
+    ("user", "minha mãe se chama Ana"),
+    ("user", "gosto de jogar xadrez"),
+    ("user", "nasci em 1990"),
+    ("assistant", "moro em Marte"),
+]
+
+async def build_history(tmp_path, repeat: int = 1):
+    database = DatabaseManager(DatabaseConfig(conversations_db=str(tmp_path / "conversations.db")))
+    await database.initialize()
+    for _ in range(repeat):
+        for role, content in HISTORY:
+            await database.save_conversation_message("sessao", role, content)
+    return database
+
+def test_backfill_fills_profile_and_resumes(tmp_path, monkeypatch):
+    """Fatos chegam ao perfil e uma segunda execução começa do checkpoint"""
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        database = await build_history(tmp_path)
+        profile = UserProfile(database)
+        backfill = HistoryBackfill(database, profile, chunk_size=2, workers=2)
+
+        stats = await backfill.run()
+        assert stats.messages == 6
+        assert stats.chunks == 3
+        info = profile.user_info
+        assert info.location == "Curitiba"           # mensagem do assistente não conta
+        assert info.occupation == "engenheiro"
+        assert info.family["mãe"] == "Ana"
+        assert "jogar xadrez" in info.hobbies
+        assert info.age == 30                         # "nasci em 1990" não vira idade
+        assert await database.get_backfill_checkpoint(CHECKPOINT_NAME) == stats.last_message_id
+
+        resumed = await backfill.run()
+        assert resumed.messages == 0
+
+        await database.save_conversation_message("sessao", "user", "agora moro em Recife")
+        resumed = await backfill.run()
+        assert resumed.messages == 1
+        assert profile.user_info.location == "Recife"
+        await database.close()
+
+    asyncio.run(scenario())
+
+def test_upsert_respects_confidence(tmp_path, monkeypatch):
+    """Fato menos confiável não sobrescreve um mais confiável; valor ao vivo é preservado"""
+    monkeypatch.chdir(tmp_path)
+    profile = UserProfile(None)
+
+    assert profile.upsert_fact("occupation", "médico", 0.9)
+    assert not profile.upsert_fact("occupation", "estudante", 0.6)
+    assert profile.user_info.occupation == "médico"
+    assert profile.upsert_fact("occupation", "cirurgião", 0.9)
+
+    profile.user_info.location = "Natal"        # definido na conversa, sem confiança registrada
+    assert not profile.upsert_fact("location", "Fortaleza", 0.95)
+    assert not profile.upsert_fact("age", 1990, 0.95)
+    assert not profile.upsert_fact("location", "Belém", 0.3)
+
+def test_relative_and_inferred_ages_are_ignored(tmp_path, monkeypatch):
+    """Tempo relativo, ano de um evento e marco da vida não substituem a idade declarada"""
+    monkeypatch.chdir(tmp_path)
+    noise = ["há 5 anos atrás comprei um carro", "em 2008 fui pra praia",
+             "quando eu estava na faculdade era difícil"]
+
+    async def scenario(messages):
+        database = DatabaseManager(DatabaseConfig(conversations_db=str(tmp_path / f"{len(messages)}.db")))
+        await database.initialize()
+        for content in messages:
+            await database.save_conversation_message("sessao", "user", content)
+        profile = UserProfile(database)
+        await HistoryBackfill(database, profile, chunk_size=2, workers=1).run()
+        await database.close()
+        return profile.user_info.age
+
+    assert asyncio.run(scenario(noise)) is None
+    assert asyncio.run(scenario(["eu tenho 30 anos"] + noise)) == 30
+
+    profile = UserProfile(None)
+    assert not profile.upsert_fact("age", "5", 0.95)
+    assert not profile.upsert_fact("age_inferred", 21, 0.9)
+    assert profile.upsert_fact("age", 25, 0.85)
+
+def test_benchmark_backfill_throughput(tmp_path, monkeypatch):
+    """Mensagens por segundo com 1 e 2 processos"""
+    monkeypatch.chdir(tmp_path)
+
+    async def measure(workers):
+        database = await build_history(tmp_path / f"w{workers}", repeat=150)
+        profile = UserProfile(database)
+        stats = await HistoryBackfill(database, profile, chunk_size=100, workers=workers).run()
+        await database.close()
+        return stats
+
+    results = {}
+    for workers in (1, 2):
+        (tmp_path / f"w{workers}").mkdir()
+        results[workers] = asyncio.run(measure(workers))
+
+    print(f"\n📊 Backfill de {results[1].messages} mensagens")
+    for workers, stats in results.items():
+        print(f"   {workers} processo(s): {stats.messages_per_second:,.0f} msg/s")
+    assert results[1].messages == results[2].messages == 900
@@ -0,0 +1,105 @@
+# test_inference_profile.py - Perfil de CPU: dispositivo, int8 dinâmico, aquecimento e RTF/RSS antes e depois
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.inference_profile import (BENCHMARK_SENTENCES, CpuInferenceProfile, apply_cpu_profile,
+                                    measure_inference, resolve_device, rss_mb)
+
+RATE = 24000
+
+def test_profile_from_config_ignores_unknown_keys():
+    """Bloco cpu_inference da configuração vira o perfil (chaves extras ignoradas)"""
+    profile = CpuInferenceProfile.from_config({"quantize": False, "intra_op_threads": 3, "synthesis_process": True})
+    assert not profile.quantize and profile.threads == 3 and profile.warmup
+    assert CpuInferenceProfile().threads >= 1
+
+def test_auto_device_without_gpu_is_cpu():
+    """Sem GPU (ou sem use_gpu), "auto" e até "cuda" caem para cpu"""
+    assert resolve_device({"device": "auto", "use_gpu": False}) == "cpu"
+    assert resolve_device({}) == "cpu"
+    assert resolve_device({"device": "cpu", "use_gpu": True}) == "cpu"
+    try:
+        import torch
+        has_gpu = torch.cuda.is_available()
+    except ImportError:
+        has_gpu = False
+    if not has_gpu:
+        assert resolve_device({"device": "cuda"}) == "cpu"
+        assert resolve_device({"device": "auto", "use_gpu": True}) == "cpu"
+
+def test_warmup_runs_once_and_is_timed():
+    """Aquecimento sintetiza o texto do perfil uma vez, no carregamento"""
+    calls = []
+
+    class Model:
+        def eval(self):
+            calls.append("eval")
+
+    report = apply_cpu_profile(Model(), CpuInferenceProfile(quantize=False, intra_op_threads=2),
+                               warmup=lambda text: calls.append(text))
+    assert calls == ["eval", "Olá, tudo pronto."] and report["warmup_s"] >= 0
+
+def test_measure_inference_reports_rtf_and_rss():
+    """RTF = síntese / duração do áudio, nas frases fixas"""
+    def synthesize(text: str):
+        time.sleep(0.002)
+        return [0.0] * int(RATE * 0.1)   # 100 ms de áudio por frase
+
+    report = measure_inference("fake", synthesize, RATE)
+    assert len(report.sentences) == len(BENCHMARK_SENTENCES)
+    assert abs(report.audio_seconds - 0.1 * len(BENCHMARK_SENTENCES)) < 1e-6
+    assert 0.01 < report.rtf < 1.0
+    assert report.rss_mb is None or report.rss_mb > 0
+    assert "RTF" in report.format()
+
+def test_dynamic_int8_quantizes_linear_layers():
+    """nn.Linear vira Linear dinâmica int8; saída fica próxima da original"""
+    torch = pytest.importorskip("torch")
+    from core.inference_profile import quantize_dynamic_int8
+
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(64, 128), torch.nn.GELU(), torch.nn.Linear(128, 64))
+    x = torch.randn(8, 64)
+    expected = model(x).detach()
+    assert quantize_dynamic_int8(model) == 2
+    assert "quantized" in type(model[0]).__module__
+    with torch.inference_mode():
+        assert torch.allclose(model(x), expected, atol=0.05)
+
+def test_benchmark_cpu_profile_rtf_and_rss(hidden: int = 1024, layers: int = 8, steps: int = 40):
+    """Decoder de brinquedo (pilha de Linear, passo a passo como o GPT do XTTS): padrão contra perfil"""
+    torch = pytest.importorskip("torch")
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(*[torch.nn.Linear(hidden, hidden) for _ in range(layers)])
+    samples_per_step = 256   # áudio que cada passo do decoder "gera"
+
+    def synthesize(text: str):
+        state = torch.randn(1, hidden)
+        for _ in range(steps + len(text)):
+            state = torch.tanh(model(state))
+        return [0.0] * ((steps + len(text)) * samples_per_step)
+
+    before = measure_inference("padrão (fp32)", synthesize, RATE)
+    profile = CpuInferenceProfile()
+    report = apply_cpu_profile(model, profile, warmup=synthesize)
+    after = measure_inference(f"perfil CPU (int8, {profile.threads} threads)", synthesize, RATE)
+
+    print(f"\n📊 {len(BENCHMARK_SENTENCES)} frases fixas, {layers}x Linear {hidden}")
+    print(f"   {before.format()}")
+    print(f"   {after.format()}")
+    print(f"   {report['quantized_layers']} camadas int8, aquecimento {report['warmup_s'] * 1000:.0f} ms")
+    assert report["quantized_layers"] == layers
+    assert after.rtf < before.rtf
+
+if __name__ == "__main__":
+    test_profile_from_config_ignores_unknown_keys()
+    test_auto_device_without_gpu_is_cpu()
+    test_warmup_runs_once_and_is_timed()
+    test_measure_inference_reports_rtf_and_rss()
+    print("✅ Perfil de inferência em CPU OK!")
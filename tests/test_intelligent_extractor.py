@@ -0,0 +1,87 @@
+# test_intelligent_extractor.py - Regressão da extração de fatos com gatilhos
+import re
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.intelligent_extractor import IntelligentFactExtractor
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+def load_lines(name):
+    lines = (FIXTURES / name).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+def load_corpus():
+    return load_lines("fact_sentences.txt") + load_lines("continuous_transcripts.txt")
+
+def fact_key(fact):
+    """Campos comparáveis (timestamp muda a cada chamada)"""
+    return (fact.category, fact.subcategory, fact.fact, fact.value,
+            fact.confidence, fact.source_text, fact.inferred)
+
+def reference_extract(extractor, text):
+    """Extração original: toda regex de toda categoria, desde o início do texto"""
+    facts = []
+    for category, patterns in extractor.extraction_patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, text.lower()):
+                fact = extractor._create_fact_from_match(category, match, text, "")
+                if fact:
+                    facts.append(fact)
+    facts.extend(extractor._make_inferences(text, facts, ""))
+    return facts
+
+def test_gated_extraction_is_identical():
+    """Gatilhos e varredura ancorada não mudam nenhum fato extraído"""
+    extractor = IntelligentFactExtractor()
+    for text in load_corpus():
+        gated = [fact_key(fact) for fact in extractor.extract_facts(text)]
+        reference = [fact_key(fact) for fact in reference_extract(extractor, text)]
+        assert gated == reference, text
+
+def test_identical_on_long_history():
+    """Textos longos (histórico concatenado) também dão o mesmo resultado"""
+    extractor = IntelligentFactExtractor()
+    long_text = ". ".join(load_corpus())
+    gated = [fact_key(fact) for fact in extractor.extract_facts(long_text)]
+    reference = [fact_key(fact) for fact in reference_extract(extractor, long_text)]
+    assert gated == reference
+
+def test_known_facts():
+    extractor = IntelligentFactExtractor()
+    facts = {fact.subcategory: fact.value for fact in extractor.extract_facts("eu tenho 32 anos")}
+    assert facts["age"] == 32
+    assert extractor.extract_facts("o cachorro tá latindo de novo") == []
+
+def test_benchmark_gated_extraction(rounds: int = 50):
+    corpus = load_corpus()
+    extractor = IntelligentFactExtractor()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            reference_extract(extractor, text)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            extractor.extract_facts(text)
+    gated_time = time.perf_counter() - start
+
+    total = rounds * len(corpus)
+    print(f"\n📊 {total} extrações")
+    print(f"   Todas as regex:   {total / reference_time:,.0f} frases/s")
+    print(f"   Com gatilhos:     {total / gated_time:,.0f} frases/s")
+    assert gated_time > 0
+
+if __name__ == "__main__":
+    test_gated_extraction_is_identical()
+    test_identical_on_long_history()
+    test_known_facts()
+    test_benchmark_gated_extraction()
+    print("✅ Extração com gatilhos OK!")
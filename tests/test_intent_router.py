@@ -0,0 +1,158 @@
+# test_intent_router.py - Roteador de intenções por registro
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.command_executor import InternalCommandExecutor
+from core.intent_router import IntentRouter
+from core.turn_pipeline import TurnTimings
+from utils.nlu import Utterance
+
+CORPUS_FILE = Path(__file__).parent / "fixtures" / "continuous_transcripts.txt"
+
+def load_corpus():
+    lines = CORPUS_FILE.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+def make_router(calls):
+    """Roteador com handlers que registram quem foi chamado"""
+    def handler(name, response):
+        async def handle(utterance, timings=None):
+            calls.append(name)
+            return response
+        return handle
+
+    router = IntentRouter()
+    router.register("evolution", handler("evolution", None), ["otimize", "evolua"])
+    router.register("command", handler("command", "comando"), ["backup", "código"])
+    router.register("modification", handler("modification", "modificação"), ["otimize seu código"])
+    router.set_fallback("chat", handler("chat", "conversa"))
+    return router
+
+def test_priority_and_fallthrough():
+    """Candidatas em ordem de prioridade; None passa para a próxima"""
+    calls = []
+    router = make_router(calls)
+
+    assert router.match("otimize seu codigo") == ["evolution", "command", "modification"]
+    assert asyncio.run(router.dispatch("otimize seu código")) == "comando"
+    assert calls == ["evolution", "command"]
+
+    calls.clear()
+    assert asyncio.run(router.dispatch("bom dia")) == "conversa"
+    assert calls == ["chat"]
+
+    stats = router.get_stats()
+    assert stats["evolution"] == {**stats["evolution"], "matches": 1, "handled": 0}
+    assert stats["command"]["handled"] == 1
+    assert stats["chat"]["handled"] == 1
+    assert stats["modification"]["matches"] == 0
+
+def test_error_response():
+    """Handler com resposta de erro não derruba o turno"""
+    async def broken(utterance, timings=None):
+        raise RuntimeError("falhou")
+
+    router = IntentRouter()
+    router.register("evolution", broken, ["evolua"], error_response="Erro no sistema.")
+    assert asyncio.run(router.dispatch("evolua agora")) == "Erro no sistema."
+    assert router.get_stats()["evolution"]["errors"] == 1
+
+def test_handlers_receive_their_own_turn_timings():
+    """Turnos sobrepostos (modo contínuo): cada handler mede no TurnTimings do seu turno"""
+    seen = {}
+
+    async def chat(utterance, timings=None):
+        await asyncio.sleep(0.01 if utterance.raw == "primeiro" else 0)
+        seen[utterance.raw] = timings
+        return "ok"
+
+    router = IntentRouter()
+    router.set_fallback("chat", chat)
+    first, second = TurnTimings(), TurnTimings()
+
+    async def scenario():
+        await asyncio.gather(router.dispatch("primeiro", first), router.dispatch("segundo", second))
+
+    asyncio.run(scenario())
+    assert seen["primeiro"] is first and seen["segundo"] is second
+
+def test_command_triggers_cover_executor():
+    """Todo texto que o executor reconheceria é candidato no roteador"""
+    executor = InternalCommandExecutor(agent=None)
+    router = IntentRouter()
+
+    async def noop(utterance, timings=None):
+        return None
+
+    router.register("internal_command", noop, executor.trigger_literals())
+    samples = load_corpus() + [
+        "analise seu código", "teste sua voz", "faça um backup", "se melhore",
+        "como você está", "info da voz", "reseta áudio", "teste qualidade",
+    ]
+    for text in samples:
+        utterance = Utterance.from_text(text)
+        command, _, confidence = executor.detector.detect_command(utterance)
+        recognized = (command and confidence > 0.8) or executor._detect_voice_commands(utterance)
+        if recognized:
+            assert router.match(utterance) == ["internal_command"], text
+
+def test_benchmark_routing(rounds: int = 200):
+    """Cascata antiga (listas + detector + comandos de voz) contra a regex única"""
+    corpus = load_corpus()
+    executor = InternalCommandExecutor(agent=None)
+    evolution = ["analise seu código", "melhore seu sistema", "otimize", "revise", "como está seu código", "evolua"]
+    modification = ["analisar código", "verifica seu código", "melhorar código", "backup código",
+                    "teste sua voz", "como você está", "qual seu status", "relatório completo"]
+    router = IntentRouter()
+
+    async def noop(utterance, timings=None):
+        return None
+
+    router.register("evolution", noop, evolution)
+    router.register("internal_command", noop, executor.trigger_literals())
+    router.register("self_modification", noop, modification)
+    router.compile()
+
+    utterances = [Utterance.from_text(text) for text in corpus]
+
+    def cascade(utterance):
+        any(cmd in utterance.lower for cmd in evolution)
+        executor.detector.detect_command(utterance)
+        executor._detect_voice_commands(utterance)
+        any(cmd in utterance.lower for cmd in modification)
+
+    def routed(utterance):
+        if "internal_command" in router.match(utterance):
+            executor.detector.detect_command(utterance)
+            executor._detect_voice_commands(utterance)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in utterances:
+            cascade(utterance)
+    cascade_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in utterances:
+            routed(utterance)
+    router_time = time.perf_counter() - start
+
+    total = rounds * len(utterances)
+    print(f"\n📊 {total} entradas roteadas")
+    print(f"   Cascata:     {total / cascade_time:,.0f} entradas/s")
+    print(f"   Regex única: {total / router_time:,.0f} entradas/s")
+    assert router_time > 0
+
+if __name__ == "__main__":
+    test_priority_and_fallthrough()
+    test_error_response()
+    test_handlers_receive_their_own_turn_timings()
+    test_command_triggers_cover_executor()
+    test_benchmark_routing()
+    print("✅ Roteador de intenções OK!")
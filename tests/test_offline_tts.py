@@ -0,0 +1,162 @@
+# test_offline_tts.py - Worker do pyttsx3: engine único, voz resolvida uma vez
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.offline_tts import OfflineTTSWorker
+
+INIT_SECONDS = 0.03      # pyttsx3.init() carrega o driver
+VOICES_SECONDS = 0.02    # getProperty('voices') enumera as vozes do sistema
+SPEAK_SECONDS = 0.005    # runAndWait de uma frase curta
+
+class FakeVoice:
+    def __init__(self, voice_id: str, name: str):
+        self.id = voice_id
+        self.name = name
+
+class FakeEngine:
+    """Mesma interface do engine do pyttsx3, com os custos de inicialização"""
+
+    instances = 0
+
+    def __init__(self):
+        time.sleep(INIT_SECONDS)
+        FakeEngine.instances += 1
+        self.thread = threading.current_thread()
+        self.properties = {"rate": 200, "volume": 1.0, "voice": "david"}
+        self.spoken = []
+
+    def getProperty(self, name):
+        if name == "voices":
+            time.sleep(VOICES_SECONDS)
+            return [FakeVoice("david", "Microsoft David"), FakeVoice("zira", "Microsoft Zira Desktop")]
+        return self.properties[name]
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def say(self, text):
+        if text == "quebra":
+            raise RuntimeError("driver falhou")
+        self.spoken.append((text, self.properties["rate"], self.properties["volume"], self.properties["voice"]))
+
+    def runAndWait(self):
+        assert threading.current_thread() is self.thread   # pyttsx3 exige a mesma thread
+        time.sleep(SPEAK_SECONDS)
+
+    def stop(self):
+        pass
+
+def test_one_engine_voice_once_and_per_job_settings():
+    """Um engine, voz feminina escolhida uma vez, rate/volume por fala"""
+    engines = []
+
+    def factory():
+        engines.append(FakeEngine())
+        return engines[-1]
+
+    async def scenario():
+        worker = OfflineTTSWorker(factory)
+        results = await asyncio.gather(
+            worker.say("rápida", rate=207, volume=0.9),
+            worker.say("lenta", rate=135, volume=0.65),
+            worker.say("padrão"),
+        )
+        worker.shutdown()
+        return worker, results
+
+    worker, results = asyncio.run(scenario())
+    assert results == [True, True, True]
+    assert len(engines) == 1
+    assert engines[0].spoken == [("rápida", 207, 0.9, "zira"), ("lenta", 135, 0.65, "zira"), ("padrão", 200, 1.0, "zira")]
+    assert worker.voice_name == "Microsoft Zira Desktop"
+    assert worker.get_info()["spoken"] == 3
+
+def test_engine_error_reaches_future_and_engine_is_recreated():
+    """Falha do driver vira exceção no future; a próxima fala recria o engine"""
+    engines = []
+
+    def factory():
+        engines.append(FakeEngine())
+        return engines[-1]
+
+    async def scenario():
+        worker = OfflineTTSWorker(factory)
+        with pytest.raises(RuntimeError):
+            await worker.say("quebra")
+        ok = await worker.say("de novo")
+        worker.shutdown()
+        return ok
+
+    assert asyncio.run(scenario()) is True
+    assert len(engines) == 2
+
+def test_cancelled_job_is_skipped():
+    """Fala cancelada antes da vez não chega ao engine"""
+    engines = []
+
+    def factory():
+        engines.append(FakeEngine())
+        return engines[-1]
+
+    async def scenario():
+        worker = OfflineTTSWorker(factory)
+        first = worker.submit("primeira")
+        second = worker.submit("cancelada")
+        second.cancel()
+        await first
+        await worker.say("terceira")
+        worker.shutdown()
+
+    asyncio.run(scenario())
+    assert [text for text, *_ in engines[0].spoken] == ["primeira", "terceira"]
+
+def test_benchmark_worker_vs_engine_per_utterance(utterances: int = 8):
+    """pyttsx3.init() + busca da voz a cada frase contra o worker persistente"""
+    def speak_sync(text):
+        engine = FakeEngine()
+        for voice in engine.getProperty("voices"):
+            if "zira" in voice.name.lower():
+                engine.setProperty("voice", voice.id)
+                break
+        engine.setProperty("rate", 180)
+        engine.say(text)
+        engine.runAndWait()
+
+    async def per_utterance():
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        for index in range(utterances):
+            await loop.run_in_executor(None, speak_sync, f"frase {index}")
+        return (time.perf_counter() - start) / utterances
+
+    async def persistent():
+        worker = OfflineTTSWorker(FakeEngine)
+        worker.start()
+        await worker.say("aquecimento")
+        start = time.perf_counter()
+        for index in range(utterances):
+            await worker.say(f"frase {index}", rate=180)
+        elapsed = (time.perf_counter() - start) / utterances
+        worker.shutdown()
+        return elapsed
+
+    old = asyncio.run(per_utterance())
+    new = asyncio.run(persistent())
+    print(f"\n📊 {utterances} frases curtas (init {INIT_SECONDS * 1000:.0f} ms, vozes {VOICES_SECONDS * 1000:.0f} ms)")
+    print(f"   Engine por frase: {old * 1000:.1f} ms por frase")
+    print(f"   Worker:           {new * 1000:.1f} ms por frase")
+    assert new < old
+
+if __name__ == "__main__":
+    test_one_engine_voice_once_and_per_job_settings()
+    test_engine_error_reaches_future_and_engine_is_recreated()
+    test_cancelled_job_is_skipped()
+    print("✅ Worker do pyttsx3 OK!")
@@ -0,0 +1,132 @@
+# test_speaker_latents.py - Latentes da voz de referência calculados uma vez e persistidos
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.speaker_latents import SpeakerLatentCache
+
+ENCODE_SECONDS = 0.03   # codificar o WAV de referência (get_conditioning_latents)
+DECODE_SECONDS = 0.01   # gerar uma frase a partir dos latentes
+
+class FakeEncoder:
+    """Conta quantas vezes a referência foi codificada"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, reference: Path):
+        self.calls += 1
+        time.sleep(ENCODE_SECONDS)
+        data = reference.read_bytes()
+        return [len(data)] * 4, [data[0]] * 8
+
+def make_reference(tmp_path: Path, content: bytes = b"RIFF referencia") -> Path:
+    reference = tmp_path / "reference_voice.wav"
+    reference.write_bytes(content)
+    return reference
+
+def test_computed_once_then_memory(tmp_path):
+    """Primeira chamada calcula; as seguintes vêm da memória"""
+    encoder = FakeEncoder()
+    cache = SpeakerLatentCache(str(tmp_path / "speakers"))
+    reference = make_reference(tmp_path)
+
+    first = cache.get(reference, encoder)
+    second = cache.get(reference, encoder)
+    assert (first.source, second.source) == ("computed", "memory")
+    assert second.gpt_cond_latent == first.gpt_cond_latent
+    assert encoder.calls == 1
+
+def test_persisted_across_sessions(tmp_path):
+    """Nova sessão lê os latentes do disco sem codificar de novo"""
+    reference = make_reference(tmp_path)
+    SpeakerLatentCache(str(tmp_path / "speakers")).get(reference, FakeEncoder())
+
+    encoder = FakeEncoder()
+    latents = SpeakerLatentCache(str(tmp_path / "speakers")).get(reference, encoder)
+    assert latents.source == "disk"
+    assert encoder.calls == 0
+    assert latents.speaker_embedding == [ord("R")] * 8
+
+def test_new_reference_invalidates(tmp_path):
+    """Outro WAV de referência tem outro hash e é codificado de novo"""
+    encoder = FakeEncoder()
+    cache = SpeakerLatentCache(str(tmp_path / "speakers"))
+    reference = make_reference(tmp_path)
+    old = cache.get(reference, encoder)
+
+    make_reference(tmp_path, b"RIFF outra voz, mais longa")
+    new = cache.get(reference, encoder)
+    assert new.digest != old.digest and new.source == "computed"
+    assert encoder.calls == 2
+
+def test_reference_hashed_once_per_version(tmp_path, monkeypatch):
+    """Frases seguidas não re-hasheiam o WAV; arquivo trocado (mtime/tamanho) sim"""
+    import core.speaker_latents as speaker_latents
+    hashes = []
+    real_digest = speaker_latents.file_digest
+    monkeypatch.setattr(speaker_latents, "file_digest", lambda path: hashes.append(path) or real_digest(path))
+
+    cache = SpeakerLatentCache(str(tmp_path / "speakers"))
+    reference = make_reference(tmp_path)
+    digest = cache.digest_for(reference)
+    for _ in range(5):
+        assert cache.digest_for(reference) == digest
+        cache.get(reference, FakeEncoder())
+    assert len(hashes) == 1
+
+    make_reference(tmp_path, b"RIFF outra voz, mais longa")
+    assert cache.digest_for(reference) != digest and len(hashes) == 2
+
+def test_corrupted_file_is_recomputed(tmp_path):
+    """Arquivo de latentes ilegível não derruba a voz: recalcula"""
+    reference = make_reference(tmp_path)
+    cache = SpeakerLatentCache(str(tmp_path / "speakers"))
+    latents = cache.get(reference, FakeEncoder())
+    cache.path_for(latents.digest).write_bytes(b"lixo")
+
+    encoder = FakeEncoder()
+    again = SpeakerLatentCache(str(tmp_path / "speakers")).get(reference, encoder)
+    assert again.source == "computed" and encoder.calls == 1
+
+def test_benchmark_per_utterance_latency(tmp_path, utterances: int = 10):
+    """Latência por frase: speaker_wav a cada frase contra latentes em cache"""
+    reference = make_reference(tmp_path)
+
+    def synthesize_with_speaker_wav(encoder):
+        encoder(reference)              # tts(speaker_wav=...) recodifica sempre
+        time.sleep(DECODE_SECONDS)
+
+    def synthesize_with_latents(cache, encoder):
+        cache.get(reference, encoder)
+        time.sleep(DECODE_SECONDS)
+
+    encoder = FakeEncoder()
+    start = time.perf_counter()
+    for _ in range(utterances):
+        synthesize_with_speaker_wav(encoder)
+    without = (time.perf_counter() - start) / utterances
+
+    cached_encoder = FakeEncoder()
+    cache = SpeakerLatentCache(str(tmp_path / "speakers"))
+    start = time.perf_counter()
+    for _ in range(utterances):
+        synthesize_with_latents(cache, cached_encoder)
+    with_cache = (time.perf_counter() - start) / utterances
+
+    print(f"\n📊 {utterances} frases (codificação {ENCODE_SECONDS * 1000:.0f} ms, "
+          f"decodificação {DECODE_SECONDS * 1000:.0f} ms)")
+    print(f"   Sem cache: {without * 1000:.1f} ms por frase ({encoder.calls} codificações)")
+    print(f"   Com cache: {with_cache * 1000:.1f} ms por frase ({cached_encoder.calls} codificação)")
+    assert cached_encoder.calls == 1
+    assert with_cache < without
+
+if __name__ == "__main__":
+    import tempfile
+    test_computed_once_then_memory(Path(tempfile.mkdtemp()))
+    test_persisted_across_sessions(Path(tempfile.mkdtemp()))
+    test_new_reference_invalidates(Path(tempfile.mkdtemp()))
+    print("✅ Latentes da voz OK!")
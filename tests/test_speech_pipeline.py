@@ -0,0 +1,99 @@
+# test_speech_pipeline.py - Fala em pipeline (síntese da próxima frase durante a reprodução)
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.speech_pipeline import SentencePipeline, SentenceStreamer, iter_sentences, split_sentences
+
+SYNTHESIS_PER_CHAR = 0.0004   # síntese simulada proporcional ao texto
+PLAYBACK_PER_CHAR = 0.0006    # reprodução mais lenta que a síntese
+
+RESPONSE = ("Claro, posso ajudar com isso. Primeiro, vamos revisar o que você já tem pronto. "
+            "Depois, eu sugiro dividir o trabalho em partes menores. Assim fica mais fácil "
+            "acompanhar o progresso. No fim, revisamos tudo juntos!")
+
+async def fake_synthesize(sentence):
+    await asyncio.sleep(len(sentence) * SYNTHESIS_PER_CHAR)
+    return sentence
+
+async def fake_play(audio):
+    await asyncio.sleep(len(audio) * PLAYBACK_PER_CHAR)
+
+def test_emotion_aware_split():
+    """Reticências só quebram frase em emoções de pausa longa; interjeições não ficam sozinhas"""
+    text = "Ah... Olá, tudo bem? Hoje o dia está ótimo. Nossa! 3.5 graus lá fora."
+    assert split_sentences(text) == ["Ah... Olá, tudo bem?", "Hoje o dia está ótimo.",
+                                     "Nossa! 3.5 graus lá fora."]
+
+    gentle = "Você é muito especial para mim... Sabia disso?"
+    assert split_sentences(gentle, "neutro") == [gentle]
+    assert split_sentences(gentle, "carinhoso") == ["Você é muito especial para mim...", "Sabia disso?"]
+
+    long_sentence = ", ".join(["uma parte bem comprida da frase"] * 10) + "."
+    chunks = split_sentences(long_sentence, max_chars=80)
+    assert all(len(chunk) <= 80 for chunk in chunks)
+    assert " ".join(chunks) == long_sentence
+
+def test_streamed_text_gives_same_sentences():
+    """Texto em pedaços (como do LLM) gera as mesmas frases que o texto inteiro"""
+    async def chunks():
+        for index in range(0, len(RESPONSE), 7):
+            yield RESPONSE[index:index + 7]
+
+    async def collect():
+        return [sentence async for sentence in iter_sentences(chunks())]
+
+    assert asyncio.run(collect()) == split_sentences(RESPONSE)
+
+    streamer = SentenceStreamer()
+    assert streamer.feed("Tudo certo") == []
+    assert streamer.flush() == ["Tudo certo"]
+
+def test_failed_sentence_is_skipped():
+    """Frase que falha na síntese não interrompe as demais"""
+    played = []
+
+    async def synthesize(sentence):
+        if "falha" in sentence:
+            raise RuntimeError("engine indisponível")
+        return sentence
+
+    async def play(audio):
+        played.append(audio)
+
+    sentences = ["Primeira frase ok.", "Esta falha aqui.", "Terceira frase ok."]
+    stats = asyncio.run(SentencePipeline(synthesize, play).run(sentences))
+    assert played == ["Primeira frase ok.", "Terceira frase ok."]
+    assert stats.sentences == 2 and stats.failed == 1
+
+def test_benchmark_pipelined_speech():
+    """Arquivo único contra pipeline por frase: tempo até o primeiro áudio e total"""
+    async def whole_response():
+        start = time.perf_counter()
+        audio = await fake_synthesize(RESPONSE)
+        first_audio = time.perf_counter() - start
+        await fake_play(audio)
+        return first_audio, time.perf_counter() - start
+
+    async def pipelined():
+        stats = await SentencePipeline(fake_synthesize, fake_play).run(split_sentences(RESPONSE))
+        return stats.first_audio, stats.total
+
+    whole_first, whole_total = asyncio.run(whole_response())
+    pipe_first, pipe_total = asyncio.run(pipelined())
+
+    print(f"\n📊 Resposta de {len(RESPONSE)} caracteres, {len(split_sentences(RESPONSE))} frases")
+    print(f"   Arquivo único: primeiro áudio {whole_first * 1000:.0f} ms, total {whole_total * 1000:.0f} ms")
+    print(f"   Pipeline:      primeiro áudio {pipe_first * 1000:.0f} ms, total {pipe_total * 1000:.0f} ms")
+    assert pipe_first < whole_first / 2
+    assert pipe_total < whole_total
+
+if __name__ == "__main__":
+    test_emotion_aware_split()
+    test_streamed_text_gives_same_sentences()
+    test_failed_sentence_is_skipped()
+    print("✅ Pipeline de fala OK!")
@@ -0,0 +1,158 @@
+# test_speech_queue.py - Fila de fala: ordem, junção de frases curtas e barge-in
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.audio_io import wav_bytes
+from core.audio_playback import NullBackend
+from core.speech_queue import SpeechQueue
+
+RATE = 16000
+
+class FakeVoice:
+    """Voz de teste: cada fala toca um WAV de silêncio proporcional ao texto"""
+
+    def __init__(self, seconds_per_char: float = 0.002):
+        self.backend = NullBackend()
+        self.seconds_per_char = seconds_per_char
+        self.spoken = []
+        self.is_speaking = False
+        self.dropped = 0
+
+    async def speak(self, text: str, emotion: str = "neutro"):
+        self.spoken.append((text, emotion))
+        clip = wav_bytes(b"\0\0" * int(RATE * len(text) * self.seconds_per_char), RATE)
+        handle = await self.backend.play(clip)
+        await handle.wait()
+
+    async def speak_dropping(self, text: str, emotion: str = "neutro"):
+        """Comportamento antigo: se já está falando, descarta"""
+        if self.is_speaking:
+            self.dropped += 1
+            return
+        self.is_speaking = True
+        try:
+            await self.speak(text, emotion)
+        finally:
+            self.is_speaking = False
+
+async def chunks_of(text: str):
+    for word in text.split():
+        await asyncio.sleep(0)
+        yield word + " "
+
+def test_order_is_kept_under_concurrent_requests():
+    """Pedidos simultâneos saem na ordem, e nenhum se perde"""
+    async def scenario():
+        voice = FakeVoice()
+        queue = SpeechQueue(voice.speak, merge_chars=0)
+        texts = [f"resposta número {index}" for index in range(6)]
+        results = await asyncio.gather(*(queue.say(text) for text in texts))
+        await queue.close()
+        return voice, texts, results
+
+    voice, texts, results = asyncio.run(scenario())
+    assert [text for text, _ in voice.spoken] == texts
+    assert results == [True] * 6
+
+def test_short_items_merge_only_with_same_emotion():
+    """Frases curtas seguidas viram uma fala; emoção diferente quebra a junção"""
+    async def scenario():
+        voice = FakeVoice()
+        queue = SpeechQueue(voice.speak)
+        futures = [queue.enqueue("Pronto.", "feliz"),
+                   queue.enqueue("Arquivo salvo.", "feliz"),
+                   queue.enqueue("Backup feito.", "feliz"),
+                   queue.enqueue("Mas falhou o envio.", "preocupada")]
+        results = await asyncio.gather(*futures)
+        await queue.close()
+        return voice, queue, results
+
+    voice, queue, results = asyncio.run(scenario())
+    assert voice.spoken == [("Pronto. Arquivo salvo. Backup feito.", "feliz"),
+                            ("Mas falhou o envio.", "preocupada")]
+    assert results == [True] * 4
+    assert queue.stats.merged == 2 and queue.stats.spoken == 2
+
+def test_stream_items_keep_their_turn():
+    """Texto em streaming espera a vez e devolve o texto falado"""
+    async def scenario():
+        voice = FakeVoice()
+        queue = SpeechQueue(voice.speak)
+        before = queue.enqueue("Vou pensar.")
+        streamed = queue.enqueue_stream(chunks_of("Aqui está a resposta completa."))
+        return await before, await streamed, voice.spoken
+
+    before, streamed, spoken = asyncio.run(scenario())
+    assert before is True
+    assert streamed == "Aqui está a resposta completa."
+    assert [text for text, _ in spoken] == ["Vou pensar.", streamed]
+
+def test_interrupt_flushes_and_stops_within_100ms():
+    """Barge-in: pendentes descartados e fala atual cortada em menos de 100 ms"""
+    async def scenario():
+        voice = FakeVoice(seconds_per_char=0.05)     # ~2 s de fala
+        queue = SpeechQueue(voice.speak, stop=voice.backend.stop_all, merge_chars=0)
+        current = queue.enqueue("uma resposta bem comprida aqui")
+        pending = [queue.enqueue("depois"), queue.enqueue("e depois")]
+        await asyncio.sleep(0.05)
+        assert queue.is_speaking
+
+        start = time.perf_counter()
+        affected = queue.interrupt()
+        results = await asyncio.gather(current, *pending)
+        elapsed = time.perf_counter() - start
+        await queue.close()
+        return voice, queue, affected, results, elapsed
+
+    voice, queue, affected, results, elapsed = asyncio.run(scenario())
+    assert elapsed < 0.1
+    assert affected == 3
+    assert results == [False, False, False]
+    assert len(voice.spoken) == 1 and voice.backend.active == 0
+    assert queue.stats.interrupted == 1 and queue.stats.flushed == 2
+
+def test_benchmark_queue_vs_dropping(requests: int = 6):
+    """Respostas que chegam durante uma fala: descartadas (antes) ou enfileiradas"""
+    texts = [f"notificação {index}" for index in range(requests)]
+
+    async def dropping():
+        voice = FakeVoice()
+        start = time.perf_counter()
+        await asyncio.gather(*(voice.speak_dropping(text) for text in texts))
+        return len(voice.spoken), voice.dropped, time.perf_counter() - start
+
+    async def queued(merge_chars: int):
+        voice = FakeVoice()
+        queue = SpeechQueue(voice.speak, merge_chars=merge_chars)
+        start = time.perf_counter()
+        await asyncio.gather(*(queue.say(text) for text in texts))
+        total = time.perf_counter() - start
+        await queue.close()
+        return voice, queue, total
+
+    drop_spoken, drop_lost, drop_time = asyncio.run(dropping())
+    voice, queue, queue_time = asyncio.run(queued(120))
+    _, single, single_time = asyncio.run(queued(0))
+    delivered = sum(text.count("notificação") for text, _ in voice.spoken)
+
+    print(f"\n📊 {requests} falas pedidas ao mesmo tempo")
+    print(f"   Descartando: {drop_spoken} falada(s), {drop_lost} perdida(s), {drop_time * 1000:.0f} ms")
+    print(f"   Fila sem junção: {single.format_stats()} ({single_time * 1000:.0f} ms)")
+    print(f"   Fila com junção: {queue.format_stats()} ({queue_time * 1000:.0f} ms)")
+    print(f"   Entregues: {delivered} de {requests}")
+    assert drop_lost == requests - 1
+    assert delivered == requests
+    assert queue.stats.spoken < single.stats.spoken == requests
+    assert queue.stats.avg_latency < single.stats.avg_latency
+
+if __name__ == "__main__":
+    test_order_is_kept_under_concurrent_requests()
+    test_short_items_merge_only_with_same_emotion()
+    test_stream_items_keep_their_turn()
+    test_interrupt_flushes_and_stops_within_100ms()
+    print("✅ Fila de fala OK!")
@@ -0,0 +1,168 @@
+# test_speech_recognizers.py - Reconhecedor por frase: Whisper carregado uma vez, PCM em memória, latência e RTF
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from core.audio_io import float_to_pcm16
+from core.speech_recognizers import (WHISPER_AVAILABLE, GoogleRecognizer, PhraseRecognizer,
+                                     RecognitionUnavailable, RecognizerBackend, WhisperRecognizer,
+                                     create_recognizer, resample_linear)
+
+def tone_pcm(seconds: float, rate: int = 16000) -> bytes:
+    t = np.arange(int(rate * seconds)) / rate
+    return float_to_pcm16(0.3 * np.sin(2 * np.pi * 200 * t)).tobytes()
+
+class FakeWhisperModel:
+    """Modelo no lugar do Whisper: guarda o que recebeu e gasta `cost` por frase"""
+
+    def __init__(self, cost: float = 0.0):
+        self.cost = cost
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append((audio, options))
+        time.sleep(self.cost)
+        return {"text": " abre o navegador "}
+
+class Loader:
+    """model_loader que conta carregamentos (e demora `delay`)"""
+
+    def __init__(self, delay: float = 0.0, cost: float = 0.0):
+        self.delay = delay
+        self.cost = cost
+        self.loads = 0
+
+    def __call__(self, name: str, device: str = "cpu"):
+        self.loads += 1
+        time.sleep(self.delay)
+        return FakeWhisperModel(self.cost)
+
+def test_resample_to_whisper_rate():
+    """44.1 kHz -> 16 kHz mantém a duração; mesma taxa não copia"""
+    audio = np.zeros(44100, dtype=np.float32)
+    assert len(resample_linear(audio, 44100, 16000)) == 16000
+    assert resample_linear(audio, 16000, 16000) is audio
+
+def test_whisper_loaded_once_and_gets_float_audio():
+    """Várias threads pedindo ao mesmo tempo: um carregamento; entrada float32 a 16 kHz, sem disco"""
+    loader = Loader(delay=0.05)
+    backend = WhisperRecognizer("tiny", "pt", model_loader=loader)
+    threads = [threading.Thread(target=backend.load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.transcribe(tone_pcm(0.5, rate=8000), 8000) == "abre o navegador"
+    audio, options = backend.model.calls[0]
+    assert loader.loads == 1 and backend.load_time >= 0.05
+    assert audio.dtype == np.float32 and len(audio) == 8000
+    assert options["language"] == "pt" and options["fp16"] is False
+
+def test_phrase_stats_latency_and_rtf():
+    """Cada frase guarda latência e RTF; as médias saem em get_stats"""
+    recognizer = PhraseRecognizer(WhisperRecognizer(model_loader=Loader(cost=0.02)))
+    try:
+        recognizer.preload().result()
+        result = recognizer.recognize(tone_pcm(1.0), 16000)
+        recognizer.recognize(tone_pcm(0.5), 16000)
+    finally:
+        recognizer.shutdown()
+    assert result.text == "abre o navegador" and result.audio_seconds == 1.0
+    assert 0.02 <= result.latency < 0.5 and result.rtf == result.latency
+    stats = recognizer.get_stats()
+    assert stats["frases"] == 2 and stats["backend"] == "whisper" and stats["rtf_medio"] > 0
+
+def test_recognition_does_not_block_event_loop():
+    """Transcrição lenta roda na thread do reconhecedor: o loop continua respondendo"""
+    recognizer = PhraseRecognizer(WhisperRecognizer(model_loader=Loader(cost=0.2)))
+    ticks = []
+
+    async def scenario():
+        async def ticker():
+            for _ in range(10):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        return await asyncio.gather(recognizer.recognize_async(tone_pcm(1.0), 16000), ticker())
+
+    try:
+        result, _ = asyncio.run(scenario())
+    finally:
+        recognizer.shutdown()
+    assert result.text == "abre o navegador"
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+def test_unavailable_backends_raise_recognition_unavailable():
+    """Sem modelo ou sem serviço: RecognitionUnavailable (a escuta pausa em vez de 'não entendi')"""
+    backend = WhisperRecognizer()
+    backend.model_loader = None   # pacote ausente
+    with pytest.raises(RecognitionUnavailable):
+        backend.transcribe(tone_pcm(0.1), 16000)
+
+    class FailingGoogle:
+        def recognize_google(self, audio, language):
+            raise sr.RequestError("sem rede")
+
+    sr = pytest.importorskip("speech_recognition")
+    with pytest.raises(RecognitionUnavailable, match="sem rede"):
+        GoogleRecognizer("pt-BR", FailingGoogle()).transcribe(tone_pcm(0.1), 16000)
+
+def test_create_recognizer_by_name():
+    """"whisper" usa o modelo local quando instalado; senão (ou nome desconhecido) cai para o Google"""
+    backend = create_recognizer("whisper", "pt-BR", "tiny")
+    assert isinstance(backend, WhisperRecognizer if WHISPER_AVAILABLE else GoogleRecognizer)
+    if WHISPER_AVAILABLE:
+        assert backend.language == "pt" and backend.model is None   # carrega só no preload
+    assert isinstance(create_recognizer("outro"), GoogleRecognizer)
+    assert isinstance(create_recognizer("google"), RecognizerBackend)
+
+def test_benchmark_first_phrase_lazy_vs_preloaded(load_delay: float = 0.3, cost: float = 0.03):
+    """Primeira frase: modelo carregado sob demanda contra preload ao iniciar a escuta"""
+    def first_phrase(preload: bool) -> float:
+        recognizer = PhraseRecognizer(WhisperRecognizer(model_loader=Loader(load_delay, cost)))
+        try:
+            if preload:
+                recognizer.preload()
+                time.sleep(load_delay + 0.05)   # usuário ainda não falou
+            start = time.perf_counter()
+            recognizer.recognize(tone_pcm(1.5), 16000)
+            return time.perf_counter() - start
+        finally:
+            recognizer.shutdown()
+
+    lazy = first_phrase(False)
+    preloaded = first_phrase(True)
+    print(f"\n📊 Primeira frase (carregamento {load_delay * 1000:.0f} ms, transcrição {cost * 1000:.0f} ms)")
+    print(f"   Sob demanda: {lazy * 1000:.0f} ms")
+    print(f"   Preload:     {preloaded * 1000:.0f} ms")
+    assert preloaded < lazy - load_delay / 2
+
+def test_benchmark_whisper_tiny_rtf():
+    """Whisper tiny real em CPU: latência e RTF por frase (precisa do pacote e do modelo)"""
+    pytest.importorskip("whisper")
+    recognizer = PhraseRecognizer(create_recognizer("whisper", "pt-BR", "tiny"))
+    try:
+        recognizer.preload().result()
+        for seconds in (1.0, 3.0):
+            result = recognizer.recognize(tone_pcm(seconds), 16000)
+            print(f"\n📊 {result.format()}")
+            assert result.rtf is not None
+    finally:
+        recognizer.shutdown()
+
+if __name__ == "__main__":
+    test_resample_to_whisper_rate()
+    test_whisper_loaded_once_and_gets_float_audio()
+    test_phrase_stats_latency_and_rtf()
+    test_recognition_does_not_block_event_loop()
+    print("✅ Reconhecedor por frase OK!")
@@ -0,0 +1,189 @@
+# test_synthesis_process.py - Síntese em processo próprio: jobs pelo Pipe, PCM por memória compartilhada
+import asyncio
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from core.audio_io import float_to_pcm16
+from core.synthesis_process import SynthesisProcess
+
+RATE = 16000
+
+class FakeModel:
+    """Modelo que gasta CPU em Python puro (segura o GIL, como o laço do decoder)"""
+
+    def __init__(self, work: int = 20000, fail_load: bool = False):
+        self.work = work
+        self.fail_load = fail_load
+        self.sample_rate = None
+
+    def load(self):
+        time.sleep(0.02)
+        if self.fail_load:
+            raise RuntimeError("modelo não encontrado")
+        self.sample_rate = RATE
+
+    def _burn(self):
+        total = 0.0
+        for i in range(self.work):
+            total += math.sin(i)
+        return total
+
+    def synthesize(self, text: str, speed: float = 1.0):
+        if text == "erro":
+            raise ValueError("texto inválido")
+        self._burn()
+        seconds = 0.01 * len(text) / speed
+        t = np.arange(int(RATE * seconds)) / RATE
+        return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def stream(self, text: str, speed: float = 1.0):
+        for word in text.split():
+            yield self.synthesize(word, speed)
+
+def start(model=None, **kwargs) -> SynthesisProcess:
+    return SynthesisProcess(model or FakeModel(), start_method="fork", **kwargs)
+
+def test_result_matches_in_process_synthesis():
+    """PCM que volta pela memória compartilhada = síntese no próprio processo"""
+    async def scenario():
+        process = start(torch_threads=2)
+        try:
+            assert await process.wait_ready(10)
+            result = await process.synthesize("Olá, tudo bem com você?", speed=1.2)
+            info = process.get_info()
+        finally:
+            process.shutdown()
+        return result, info
+
+    result, info = asyncio.run(scenario())
+    model = FakeModel()
+    expected = float_to_pcm16(model.synthesize("Olá, tudo bem com você?", speed=1.2)).tobytes()
+    assert result.pcm == expected and result.sample_rate == RATE
+    assert result.synthesis_time > 0 and result.rtf is not None
+    assert info["frases"] == 1 and info["pid"] is not None
+
+def test_stream_chunks_arrive_in_order_and_oversized_uses_loose_segment():
+    """Pedaços do streaming chegam em ordem; o que não cabe na arena vai em segmento próprio"""
+    text = "um dois três quatro cinco"
+    received = []
+
+    async def scenario():
+        process = start(arena_seconds=0.1)   # arena pequena: parte dos pedaços transborda
+        try:
+            await process.wait_ready(10)
+            result = await process.submit(text, stream=True, on_chunk=lambda data: received.append(data))
+            again = await process.synthesize("de novo")   # arena reaproveitada
+        finally:
+            process.shutdown()
+        return result, again
+
+    result, again = asyncio.run(scenario())
+    model = FakeModel()
+    expected = [float_to_pcm16(model.synthesize(word)).tobytes() for word in text.split()]
+    assert received == expected and result.chunks == 5 and result.pcm == b"".join(expected)
+    assert again.pcm == float_to_pcm16(model.synthesize("de novo")).tobytes()
+
+def test_on_chunk_false_cancels_job():
+    """Consumidor parou (ex.: fala interrompida): o processo para de sintetizar"""
+    async def scenario():
+        process = start(FakeModel(work=200000))
+        try:
+            await process.wait_ready(10)
+            result = await process.submit("a b c d e f g h i j", stream=True, on_chunk=lambda data: False)
+            follow_up = await process.synthesize("depois")
+        finally:
+            process.shutdown()
+        return result, follow_up
+
+    result, follow_up = asyncio.run(scenario())
+    assert result.cancelled and result.chunks < 10
+    assert len(follow_up.pcm) > 0
+
+def test_errors_reach_the_caller():
+    """Erro na frase vira exceção no future; modelo que não carrega deixa o processo não pronto"""
+    async def failing_job():
+        process = start()
+        try:
+            await process.wait_ready(10)
+            with pytest.raises(RuntimeError, match="texto inválido"):
+                await process.synthesize("erro")
+            return await process.synthesize("ok")
+        finally:
+            process.shutdown()
+
+    async def failing_load():
+        process = start(FakeModel(fail_load=True))
+        ready = await process.wait_ready(10)
+        process.shutdown()
+        return ready, process.error
+
+    assert len(asyncio.run(failing_job()).pcm) > 0
+    ready, error = asyncio.run(failing_load())
+    assert not ready and "modelo não encontrado" in error
+
+def test_benchmark_event_loop_lag_thread_vs_process(sentences: int = 6, work: int = 400000):
+    """Atraso do event loop (tique de 5 ms) enquanto frases são sintetizadas"""
+    model = FakeModel(work=work)
+    model.load()
+
+    async def measure(synthesize_all):
+        lags = []
+        done = False
+
+        async def ticker():
+            while not done:
+                start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - start - 0.005)
+
+        tick = asyncio.ensure_future(ticker())
+        start = time.perf_counter()
+        await synthesize_all()
+        elapsed = time.perf_counter() - start
+        done = True
+        await tick
+        return sum(lags) / len(lags), sorted(lags)[int(len(lags) * 0.95)], elapsed
+
+    async def in_thread():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(1) as executor:
+            for i in range(sentences):
+                await loop.run_in_executor(executor, model.synthesize, f"frase número {i}")
+
+    async def in_process():
+        process = start(FakeModel(work=work))
+        await process.wait_ready(10)
+
+        async def run():
+            for i in range(sentences):
+                await process.synthesize(f"frase número {i}")
+        try:
+            return await measure(run)
+        finally:
+            process.shutdown()
+
+    thread_mean, thread_p95, thread_time = asyncio.run(measure(in_thread))
+    process_mean, process_p95, process_time = asyncio.run(in_process())
+    print(f"\n📊 {sentences} frases com decoder em Python puro (segura o GIL)")
+    print(f"   Thread do executor: atraso do loop p95 {thread_p95 * 1000:.1f} ms, "
+          f"médio {thread_mean * 1000:.1f} ms, total {thread_time * 1000:.0f} ms")
+    print(f"   Processo próprio:   atraso do loop p95 {process_p95 * 1000:.1f} ms, "
+          f"médio {process_mean * 1000:.1f} ms, total {process_time * 1000:.0f} ms")
+    assert process_mean < thread_mean
+
+if __name__ == "__main__":
+    test_result_matches_in_process_synthesis()
+    test_stream_chunks_arrive_in_order_and_oversized_uses_loose_segment()
+    test_on_chunk_false_cancels_job()
+    test_errors_reach_the_caller()
+    print("✅ Processo de síntese OK!")
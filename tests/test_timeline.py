@@ -0,0 +1,123 @@
+# test_timeline.py - Índice da linha do tempo (intervalos + bisect)
+import asyncio
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import DatabaseConfig
+from core.conversation import ConversationManager
+from core.temporal_inference import TemporalInferenceEngine
+from memory.database import DatabaseManager
+from memory.timeline import TimelineEntry, TimelineIndex
+from memory.user_profile import UserProfile
+
+TODAY = date(2026, 10, 19)
+
+def random_entries(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    entries = []
+    for index in range(count):
+        start = date(1990, 1, 1) + timedelta(days=rng.randrange(0, 13000))
+        span = rng.choice([0, 0, 6, 30, 364, 2900])
+        entries.append(TimelineEntry(start, start + timedelta(days=span), "date", f"ref {index}", message_id=index))
+    return entries
+
+def linear_query(entries, start, end):
+    return [entry for entry in entries if entry.start <= end and entry.end >= start]
+
+def test_query_matches_linear_scan():
+    """Consulta por sobreposição igual a varrer tudo"""
+    entries = random_entries(2000)
+    index = TimelineIndex()
+    for entry in entries:
+        index.add(entry)
+
+    rng = random.Random(3)
+    for _ in range(300):
+        start = date(1990, 1, 1) + timedelta(days=rng.randrange(0, 13000))
+        end = start + timedelta(days=rng.choice([0, 30, 365, 1000]))
+        expected = sorted(linear_query(entries, start, end), key=lambda e: (e.start, e.message_id))
+        found = sorted(index.query(start, end), key=lambda e: (e.start, e.message_id))
+        assert found == expected
+
+    assert [e.start for e in index.query(date(1990, 1, 1), date(2030, 1, 1))] == sorted(e.start for e in entries)
+
+def test_time_queries():
+    """Períodos reconhecidos nas perguntas"""
+    engine = TemporalInferenceEngine()
+    assert engine.parse_time_query("o que eu falei sobre 2019?", TODAY) == (date(2019, 1, 1), date(2019, 12, 31))
+    assert engine.parse_time_query("o que aconteceu nos últimos 6 meses", TODAY) == (date(2026, 4, 19), TODAY)
+    assert engine.parse_time_query("e no mês passado?", TODAY) == (date(2026, 9, 1), date(2026, 9, 30))
+    assert engine.parse_time_query("bom dia", TODAY) is None
+
+    refs = engine.extract_references("casei em 5 de março de 2019")
+    assert engine.reference_to_interval(refs[0], TODAY) == (date(2019, 3, 5), date(2019, 3, 5))
+
+def test_conversation_timeline(tmp_path):
+    """Mensagens do usuário viram intervalos, persistem e voltam no prompt"""
+    async def scenario():
+        database = DatabaseManager(DatabaseConfig(conversations_db=str(tmp_path / "conversations.db")))
+        await database.initialize()
+        profile = UserProfile(database)
+        manager = ConversationManager(database, profile, None)
+
+        trip_id = await manager.add_message("user", "em 2019 eu fiz uma viagem para o Chile")
+        await manager.add_message("user", "há 2 dias comecei a correr")
+        await manager.add_message("assistant", "em 2019 eu ainda não existia")
+        await manager.add_message("user", "o que eu te contei sobre 2019?")
+
+        context = manager.get_timeline_context("o que eu te contei sobre 2019?")
+        assert "viagem para o Chile" in context
+        assert "te contei" not in context
+        assert manager.timeline.for_message(trip_id)[0].kind == "date"
+        assert len(manager.get_timeline_context("e nos últimos 7 dias?").splitlines()) == 1
+
+        # Nova sessão: índice reconstruído do banco
+        reloaded = ConversationManager(database, profile, None)
+        await reloaded.load_timeline()
+        assert len(reloaded.timeline) == len(manager.timeline)
+        await database.close()
+
+    asyncio.run(scenario())
+
+def test_benchmark_interval_queries(queries: int = 2000):
+    """Bisect contra varredura linear em 20 mil referências"""
+    entries = random_entries(20000)
+    index = TimelineIndex()
+    for entry in entries:
+        index.add(entry)
+
+    rng = random.Random(11)
+    windows = []
+    for _ in range(queries):
+        start = date(1990, 1, 1) + timedelta(days=rng.randrange(0, 13000))
+        windows.append((start, start + timedelta(days=180)))
+
+    start_time = time.perf_counter()
+    for start, end in windows:
+        linear_query(entries, start, end)
+    linear_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for start, end in windows:
+        index.query(start, end)
+    index_time = time.perf_counter() - start_time
+
+    print(f"\n📊 {queries} consultas em {len(entries)} referências")
+    print(f"   Varredura linear: {linear_time / queries * 1e6:,.0f} µs/consulta")
+    print(f"   Bisect:           {index_time / queries * 1e6:,.0f} µs/consulta")
+    assert index_time > 0
+
+if __name__ == "__main__":
+    import tempfile
+    test_query_matches_linear_scan()
+    test_time_queries()
+    with tempfile.TemporaryDirectory() as folder:
+        test_conversation_timeline(Path(folder))
+    test_benchmark_interval_queries()
+    print("✅ Linha do tempo OK!")
@@ -0,0 +1,198 @@
+# test_tts_router.py - Roteamento por fala: saúde dos engines, orçamento de latência e disjuntor
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.speech_pipeline import PipelineStats
+from core.tts_router import CLOSED, HALF_OPEN, OPEN, TTSRouter
+from core.voice_registry import VoiceCandidate, VoiceRegistry
+
+class FakeEngine:
+    """Engine com latência até o primeiro áudio, RTF e falhas configuráveis"""
+
+    def __init__(self, latency: float = 0.01, rtf: float = 0.3, fail: str = None, swallow: bool = False):
+        self.latency = latency
+        self.rtf = rtf
+        self.fail = fail            # "raise" ou None
+        self.swallow = swallow      # falha contornada pelo próprio engine (0 frases)
+        self.is_initialized = True
+        self.spoken = []
+        self.last_speech_stats = None
+
+    async def speak(self, text: str, emotion: str = "neutro"):
+        await asyncio.sleep(self.latency)
+        if self.fail == "raise":
+            raise RuntimeError("engine quebrado")
+        if self.swallow:
+            self.last_speech_stats = PipelineStats(failed=1, synthesis_time=self.latency)
+            return
+        self.spoken.append(text)
+        self.last_speech_stats = PipelineStats(sentences=1, first_audio=self.latency,
+                                               synthesis_time=self.rtf, audio_time=1.0)
+
+class TextEngine:
+    is_initialized = True
+
+    def __init__(self):
+        self.spoken = []
+
+    async def speak(self, text: str, emotion: str = "neutro"):
+        self.spoken.append(text)
+
+async def make_router(engines, **kwargs):
+    """Registro já pronto com os engines dados ({nome: (rank, engine)})"""
+    candidates = [VoiceCandidate(name, name.upper(), lambda e=engine: e, rank)
+                  for name, (rank, engine) in engines.items()]
+    registry = VoiceRegistry(candidates, VoiceCandidate("texto", "TEXTO", TextEngine))
+    await registry.wait_ready()
+    await asyncio.sleep(0.01)   # todas as sondas terminam
+    return TTSRouter(registry, **kwargs)
+
+def test_best_rank_within_budget_then_fastest():
+    """Dentro do orçamento vence a qualidade; engine lento perde a vez"""
+    async def scenario():
+        xtts, gtts = FakeEngine(latency=0.05), FakeEngine(latency=0.01)
+        router = await make_router({"xtts": (3, xtts), "gtts": (2, gtts)}, latency_budget=0.03)
+        await router.speak("um")            # sem medições: rank decide
+        await router.speak("dois")          # xtts medido acima do orçamento
+        return xtts.spoken, gtts.spoken, router
+
+    xtts_spoken, gtts_spoken, router = asyncio.run(scenario())
+    assert xtts_spoken == ["um"] and gtts_spoken == ["dois"]
+    assert router.last_decision.engine == "gtts"
+    assert "xtts" in router.last_decision.skipped
+    assert router.get_info()["engines"]["xtts"]["latency_ms"] == 50
+
+def test_high_rtf_is_out_of_budget():
+    """Engine que sintetiza mais devagar do que fala não é escolhido"""
+    async def scenario():
+        xtts, gtts = FakeEngine(rtf=1.6), FakeEngine()
+        router = await make_router({"xtts": (3, xtts), "gtts": (2, gtts)})
+        await router.speak("um")
+        await router.speak("dois")
+        return router.last_decision
+
+    decision = asyncio.run(scenario())
+    assert decision.engine == "gtts" and decision.skipped["xtts"] == "RTF 1.60"
+
+def test_exception_fails_over_and_breaker_opens_then_half_opens():
+    """Exceção: próximo engine fala; N falhas seguidas abrem o disjuntor"""
+    async def scenario():
+        xtts, gtts = FakeEngine(fail="raise"), FakeEngine()
+        router = await make_router({"xtts": (3, xtts), "gtts": (2, gtts)},
+                                   failure_threshold=2, cooldown=0.05)
+        await router.speak("um")
+        await router.speak("dois")
+        opened = router.health["xtts"].state
+        await router.speak("três")           # disjuntor aberto: xtts nem é tentado
+        calls_while_open = len(gtts.spoken)
+        await asyncio.sleep(0.06)
+        xtts.fail = None
+        await router.speak("quatro")          # meio-aberto: fala de teste
+        return opened, calls_while_open, router, xtts.spoken
+
+    opened, calls_while_open, router, xtts_spoken = asyncio.run(scenario())
+    assert opened == OPEN and calls_while_open == 3
+    assert xtts_spoken == ["quatro"] and router.health["xtts"].state == CLOSED
+    assert router.health["xtts"].trips == 1
+
+def test_half_open_failure_reopens():
+    """Fala de teste falhou: volta a abrir na hora"""
+    async def scenario():
+        xtts, gtts = FakeEngine(fail="raise"), FakeEngine()
+        router = await make_router({"xtts": (3, xtts), "gtts": (2, gtts)},
+                                   failure_threshold=1, cooldown=0.02)
+        await router.speak("um")
+        await asyncio.sleep(0.03)
+        router.route()
+        state = router.health["xtts"].state
+        await router.speak("dois")
+        return state, router.health["xtts"]
+
+    state, health = asyncio.run(scenario())
+    assert state == HALF_OPEN and health.state == OPEN and health.trips == 2
+
+def test_swallowed_failure_counts_without_repeating_speech():
+    """Engine que já contornou a falha (0 frases) não fala de novo em outro"""
+    async def scenario():
+        xtts, gtts = FakeEngine(swallow=True), FakeEngine()
+        router = await make_router({"xtts": (3, xtts), "gtts": (2, gtts)}, failure_threshold=2)
+        await router.speak("um")
+        await router.speak("dois")
+        await router.speak("três")
+        return gtts.spoken, router.health["xtts"]
+
+    gtts_spoken, health = asyncio.run(scenario())
+    assert gtts_spoken == ["três"] and health.state == OPEN and health.failure_rate == 1.0
+
+def test_all_broken_uses_text_fallback_and_status_is_readable():
+    """Nenhum engine saudável: fallback de texto; status descreve a decisão"""
+    async def scenario():
+        gtts = FakeEngine(fail="raise")
+        router = await make_router({"gtts": (2, gtts)}, failure_threshold=1)
+        await router.speak("um")
+        await router.speak("dois")
+        return router
+
+    router = asyncio.run(scenario())
+    assert router.last_decision.engine == "texto"
+    assert router.last_decision.reason == "nenhum engine saudável"
+    status = router.format_status()
+    assert "TEXTO" in status and "GTTS: aberto" in status
+
+def test_benchmark_router_vs_fixed_engine(utterances: int = 20):
+    """Engine principal degrada no meio da sessão: fixo contra roteado"""
+    def degrading():
+        engine = FakeEngine(latency=0.005)
+        original = engine.speak
+
+        async def speak(text, emotion="neutro"):
+            if len(engine.spoken) >= 4:
+                engine.latency = 0.06
+            if len(engine.spoken) >= 8:
+                engine.fail = "raise"
+            await original(text, emotion)
+        engine.speak = speak
+        return engine
+
+    async def fixed():
+        xtts, gtts = degrading(), FakeEngine(latency=0.01)
+        delays, failed = [], 0
+        for i in range(utterances):
+            start = time.perf_counter()
+            try:
+                await xtts.speak(f"frase {i}")
+            except RuntimeError:
+                failed += 1
+            delays.append(time.perf_counter() - start)
+        return sum(delays) / len(delays), failed
+
+    async def routed():
+        xtts, gtts = degrading(), FakeEngine(latency=0.01)
+        router = await make_router({"xtts": (3, xtts), "gtts": (2, gtts)}, latency_budget=0.03)
+        delays = []
+        for i in range(utterances):
+            start = time.perf_counter()
+            await router.speak(f"frase {i}")
+            delays.append(time.perf_counter() - start)
+        return sum(delays) / len(delays), utterances - len(xtts.spoken) - len(gtts.spoken)
+
+    fixed_avg, fixed_failed = asyncio.run(fixed())
+    routed_avg, routed_failed = asyncio.run(routed())
+    print(f"\n📊 {utterances} falas, engine principal fica lento e depois quebra")
+    print(f"   Fixo:    {fixed_avg * 1000:.1f} ms por fala, {fixed_failed} sem voz")
+    print(f"   Roteado: {routed_avg * 1000:.1f} ms por fala, {routed_failed} sem voz")
+    assert routed_avg < fixed_avg and routed_failed < fixed_failed
+
+if __name__ == "__main__":
+    test_best_rank_within_budget_then_fastest()
+    test_high_rtf_is_out_of_budget()
+    test_exception_fails_over_and_breaker_opens_then_half_opens()
+    test_half_open_failure_reopens()
+    test_swallowed_failure_counts_without_repeating_speech()
+    test_all_broken_uses_text_fallback_and_status_is_readable()
+    print("✅ Roteador de TTS OK!")
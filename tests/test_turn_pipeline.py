@@ -0,0 +1,95 @@
+# test_turn_pipeline.py - Turno em etapas com tarefas fora do caminho crítico
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.turn_pipeline import BackgroundTasks, TurnTimings
+
+LLM_DELAY = 0.08
+PERSIST_DELAY = 0.03
+EXTRACTION_DELAY = 0.02
+
+async def fake_llm():
+    await asyncio.sleep(LLM_DELAY)
+    return "resposta"
+
+async def fake_persist():
+    await asyncio.sleep(PERSIST_DELAY)
+
+async def fake_extraction():
+    await asyncio.sleep(EXTRACTION_DELAY)
+
+async def sequential_turn():
+    """Como era: gravar, extrair e só então chamar o LLM"""
+    await fake_persist()
+    await fake_extraction()
+    return await fake_llm()
+
+async def overlapped_turn(background: BackgroundTasks, timings: TurnTimings):
+    """Gravar e extrair em paralelo com o LLM"""
+    background.spawn(fake_persist(), "persistência", timings)
+    background.spawn(fake_extraction(), "extração", timings)
+    with timings.stage("llm"):
+        return await fake_llm()
+
+def test_background_stages_are_timed():
+    """Etapas paralelas aparecem nos tempos do turno"""
+    async def scenario():
+        background = BackgroundTasks()
+        timings = TurnTimings()
+        assert await overlapped_turn(background, timings) == "resposta"
+        await background.drain()
+        return timings
+
+    timings = asyncio.run(scenario())
+    stages = timings.as_dict()
+    assert set(stages) == {"llm", "persistência", "extração"}
+    assert stages["llm"] >= LLM_DELAY * 1000 * 0.9
+    assert "∥" in timings.format()
+
+def test_background_errors_do_not_break_turn():
+    """Falha na gravação é registrada, não derruba a resposta"""
+    async def broken():
+        raise RuntimeError("banco indisponível")
+
+    async def scenario():
+        background = BackgroundTasks()
+        background.spawn(broken(), "persistência")
+        response = await fake_llm()
+        await background.drain()
+        return response, background.pending
+
+    assert asyncio.run(scenario()) == ("resposta", 0)
+
+def test_overlap_shortens_turn(turns: int = 5):
+    """Latência do turno: em série contra em paralelo"""
+    async def measure():
+        start = time.perf_counter()
+        for _ in range(turns):
+            await sequential_turn()
+        sequential = (time.perf_counter() - start) / turns
+
+        background = BackgroundTasks()
+        start = time.perf_counter()
+        for _ in range(turns):
+            await overlapped_turn(background, TurnTimings())
+        overlapped = (time.perf_counter() - start) / turns
+        await background.drain()
+        return sequential, overlapped
+
+    sequential, overlapped = asyncio.run(measure())
+    print(f"\n📊 Turno (LLM {LLM_DELAY * 1000:.0f} ms, gravação {PERSIST_DELAY * 1000:.0f} ms, "
+          f"extração {EXTRACTION_DELAY * 1000:.0f} ms)")
+    print(f"   Em série:    {sequential * 1000:.0f} ms")
+    print(f"   Em paralelo: {overlapped * 1000:.0f} ms")
+    assert overlapped < sequential
+
+if __name__ == "__main__":
+    test_background_stages_are_timed()
+    test_background_errors_do_not_break_turn()
+    test_overlap_shortens_turn()
+    print("✅ Pipeline do turno OK!")
@@ -0,0 +1,122 @@
+# test_utterance.py - Normalização compartilhada entre os analisadores
+import re
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.nlu import Utterance, fold_accents
+from core.command_detector import InternalCommandDetector
+from core.context_analyzer import ContextAnalyzer
+from core.intelligent_extractor import IntelligentFactExtractor
+from core.temporal_inference import TemporalInferenceEngine
+
+CORPUS_FILE = Path(__file__).parent / "fixtures" / "continuous_transcripts.txt"
+
+COMMANDS = [
+    "analise seu código",
+    "faça uma auto-análise",
+    "teste sua voz",
+    "mostre suas emoções",
+    "teste coqui",
+    "faça um backup",
+    "salve seu código",
+    "se melhore",
+    "otimize seu código",
+    "como você está",
+    "relatório completo",
+    "eu tenho 30 anos e moro em são paulo",
+    "há 5 anos eu tinha 20 anos",
+    "quando eu estudava na faculdade",
+    "nasci em 1994",
+]
+
+def load_corpus():
+    lines = CORPUS_FILE.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")] + COMMANDS
+
+def test_utterance_offsets_and_index():
+    """Tokens, offsets e índice de palavras sem acento"""
+    utterance = Utterance.from_text("Analise seu Código, SEXTA-FEIRA!")
+    assert utterance.lower == "analise seu código, sexta-feira!"
+    assert len(utterance.folded) == len(utterance.lower)
+    assert utterance.folded == fold_accents(utterance.lower) == "analise seu codigo, sexta-feira!"
+    assert utterance.tokens == ["analise", "seu", "código", "sexta", "feira"]
+    for token, (start, end) in zip(utterance.tokens, utterance.spans):
+        assert utterance.lower[start:end] == token
+    assert utterance.has_keyword("codigo") and utterance.has_keyword("código")
+    assert not utterance.has_keyword("cod")
+    assert utterance.mentions("cod")
+
+def test_command_gates_match_reference():
+    """Pré-filtros literais não mudam a detecção de comandos"""
+    detector = InternalCommandDetector()
+    groups = [
+        ("analyze_code", detector.code_analysis_patterns),
+        ("test_voice", detector.voice_test_patterns),
+        ("test_human_voice", detector.human_voice_patterns),
+        ("create_backup", detector.backup_patterns),
+        ("self_improve", detector.improvement_patterns),
+        ("status_report", detector.status_patterns),
+    ]
+    for text in load_corpus():
+        expected = None
+        for command, patterns in groups:
+            if any(re.search(pattern, text.lower()) for pattern in patterns):
+                expected = command
+                break
+        assert detector.detect_command(text)[0] == expected, text
+
+def test_string_and_utterance_paths_agree():
+    """Passar texto cru ou Utterance dá o mesmo resultado"""
+    detector = InternalCommandDetector()
+    analyzer = ContextAnalyzer()
+    extractor = IntelligentFactExtractor()
+    temporal = TemporalInferenceEngine()
+    for text in load_corpus():
+        utterance = Utterance.from_text(text)
+        assert detector.detect_command(text) == detector.detect_command(utterance)
+        assert analyzer.analyze_emotional_context(text) == analyzer.analyze_emotional_context(utterance)
+        assert [f.fact for f in extractor.extract_facts(text)] == [f.fact for f in extractor.extract_facts(utterance)]
+        assert temporal._extract_temporal_references(text) == temporal._extract_temporal_references(utterance)
+
+def test_benchmark_shared_normalization(rounds: int = 50):
+    """Antes: cada analisador normaliza o texto. Depois: uma Utterance por turno"""
+    corpus = load_corpus()
+    detector = InternalCommandDetector()
+    analyzer = ContextAnalyzer()
+    extractor = IntelligentFactExtractor()
+    temporal = TemporalInferenceEngine()
+
+    def run_turn(text):
+        detector.detect_command(text)
+        analyzer.analyze_emotional_context(text)
+        extractor.extract_facts(text)
+        temporal._extract_temporal_references(text)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            run_turn(text)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            run_turn(Utterance.from_text(text))
+    after = time.perf_counter() - start
+
+    turns = rounds * len(corpus)
+    print(f"\n📊 {turns} turnos de NLU")
+    print(f"   Texto cru por analisador: {before / turns * 1e6:,.1f} µs/turno")
+    print(f"   Utterance compartilhada:  {after / turns * 1e6:,.1f} µs/turno")
+    assert after > 0
+
+if __name__ == "__main__":
+    test_utterance_offsets_and_index()
+    test_command_gates_match_reference()
+    test_string_and_utterance_paths_agree()
+    test_benchmark_shared_normalization()
+    print("✅ Normalização compartilhada OK!")
@@ -0,0 +1,145 @@
+# test_vad_endpointer.py - Fim de fala por VAD em quadros sobre gravações WAV: segmentos, barge-in e latência até o texto
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from core.audio_io import float_to_pcm16, read_wav
+from core.speech_recognizers import PhraseRecognizer, RecognizerBackend
+from core.vad_endpointer import EnergyVad, VadEndpointer, VadSettings
+
+FIXTURES = Path(__file__).parent / "fixtures" / "vad"
+LABELS = json.loads((FIXTURES / "labels.json").read_text(encoding="utf-8"))
+TOLERANCE = 0.1   # s (quadro de 30 ms + bordas suaves das sílabas)
+
+def load_fixture(name: str):
+    pcm, rate, _ = read_wav((FIXTURES / name).read_bytes())
+    return pcm, rate
+
+def endpoint(pcm: bytes, rate: int, settings: VadSettings = None, is_speech=None, **kwargs):
+    endpointer = VadEndpointer(settings, rate, is_speech=is_speech or EnergyVad(300).is_speech, **kwargs)
+    segments = endpointer.feed(pcm)
+    last = endpointer.flush()
+    return segments + ([last] if last else []), endpointer
+
+def tone(seconds: float, rate: int = 16000) -> bytes:
+    t = np.arange(int(rate * seconds)) / rate
+    return float_to_pcm16(0.3 * np.sin(2 * np.pi * 200 * t)).tobytes()
+
+def silence(seconds: float, rate: int = 16000) -> bytes:
+    return bytes(int(rate * seconds) * 2)
+
+@pytest.mark.parametrize("name", sorted(LABELS))
+def test_segments_match_recorded_speech(name):
+    """Uma fala por trecho anotado; início/fim dentro da tolerância; saída = fim + hangover"""
+    pcm, rate = load_fixture(name)
+    segments, endpointer = endpoint(pcm, rate)
+    labels = LABELS[name]["fala"]
+    assert len(segments) == len(labels)
+    for segment, (start, end) in zip(segments, labels):
+        assert abs(segment.start - start) < TOLERANCE and abs(segment.end - end) < TOLERANCE
+        assert abs(segment.endpoint_delay - 0.3) < 0.031
+        # PCM do segmento: pre-roll (6 quadros de 30 ms) + fala, sem o silêncio do hangover
+        assert abs(len(segment.pcm) / 2 / rate - segment.duration - 0.18) < 0.001
+
+def test_short_burst_is_discarded_without_barge_in():
+    """Ruído curto abre e fecha sem virar fala nem cortar o agente"""
+    starts = []
+    segments, endpointer = endpoint(silence(0.3) + tone(0.15) + silence(0.6), 16000,
+                                    on_speech_start=lambda: starts.append(1))
+    assert segments == [] and endpointer.discarded == 1 and starts == []
+
+def test_speech_start_fires_at_onset():
+    """Barge-in dispara min_speech_ms depois do início, não depois da frase inteira"""
+    starts = []
+    endpointer = VadEndpointer(None, 16000, is_speech=EnergyVad(300).is_speech,
+                               on_speech_start=lambda: starts.append(endpointer._index * endpointer.frame_seconds))
+    pcm, rate = load_fixture("comando_curto.wav")
+    segment = None
+    for offset in range(0, len(pcm), endpointer.frame_bytes):
+        segment = segment or next(iter(endpointer.feed(pcm[offset:offset + endpointer.frame_bytes])), None)
+    assert len(starts) == 1 and segment is not None
+    assert abs(starts[0] - (segment.start + 0.25)) < 0.061
+    assert starts[0] < segment.end - 0.5
+
+def test_chunk_size_does_not_change_segments():
+    """Leituras de qualquer tamanho dão os mesmos segmentos"""
+    pcm, rate = load_fixture("duas_frases.wav")
+    whole, _ = endpoint(pcm, rate)
+    endpointer = VadEndpointer(None, rate, is_speech=EnergyVad(300).is_speech)
+    pieces = []
+    for offset in range(0, len(pcm), 1000):
+        pieces += endpointer.feed(pcm[offset:offset + 1000])
+    assert [(s.start, s.end, s.pcm) for s in pieces] == [(s.start, s.end, s.pcm) for s in whole]
+
+def test_max_utterance_and_settings():
+    """Fala longa é cortada em max_utterance_s; taxa/quadro inválidos viram ValueError"""
+    segments, _ = endpoint(tone(3.0), 16000, VadSettings(max_utterance_s=1.0))
+    assert len(segments) == 3 and abs(segments[0].duration - 1.0) < 0.031
+    with pytest.raises(ValueError):
+        VadEndpointer(None, 44100, is_speech=EnergyVad().is_speech)
+    with pytest.raises(ValueError):
+        VadEndpointer(VadSettings(frame_ms=25), 16000, is_speech=EnergyVad().is_speech)
+
+def test_webrtcvad_on_recordings():
+    """webrtcvad de verdade nas gravações: mesmas falas das anotações"""
+    pytest.importorskip("webrtcvad")
+    from core.vad_endpointer import create_vad
+    for name, labels in LABELS.items():
+        pcm, rate = load_fixture(name)
+        segments, _ = endpoint(pcm, rate, is_speech=create_vad(2))
+        assert len(segments) == len(labels["fala"]), name
+
+class FixedCostRecognizer(RecognizerBackend):
+    """Reconhecedor local com custo proporcional à fala (RTF fixo)"""
+
+    name = "fake"
+
+    def __init__(self, rtf: float = 0.05):
+        self.rtf = rtf
+
+    def transcribe(self, pcm: bytes, sample_rate: int):
+        time.sleep(len(pcm) / 2 / sample_rate * self.rtf)
+        return "ok"
+
+def test_benchmark_end_of_speech_to_transcript():
+    """Fim da fala -> texto nas gravações: pause_threshold de 1 s (antes) contra VAD com hangover de 300 ms"""
+    recognizer = PhraseRecognizer(FixedCostRecognizer())
+    results = {}
+    try:
+        for label, settings in (("pause_threshold 1.0s", VadSettings(hangover_ms=1000)),
+                                ("VAD hangover 300ms", VadSettings())):
+            latencies, count = [], 0
+            for name in sorted(LABELS):
+                pcm, rate = load_fixture(name)
+                segments, _ = endpoint(pcm, rate, settings)
+                for segment in segments:
+                    result = recognizer.recognize(segment.pcm, segment.sample_rate)
+                    latencies.append(segment.endpoint_delay + result.latency)
+                count += len(segments)
+            results[label] = (sum(latencies) / len(latencies), count)
+    finally:
+        recognizer.shutdown()
+
+    expected = sum(len(labels["fala"]) for labels in LABELS.values())
+    print(f"\n📊 {len(LABELS)} gravações, {expected} falas anotadas (reconhecedor com RTF 0.05)")
+    for label, (mean, count) in results.items():
+        print(f"   {label}: fim da fala -> texto {mean * 1000:.0f} ms, {count} falas")
+    old, new = results["pause_threshold 1.0s"], results["VAD hangover 300ms"]
+    assert new[0] < old[0] - 0.5
+    assert new[1] == expected and old[1] < expected   # pausa de 0.8 s juntava duas frases
+
+if __name__ == "__main__":
+    for fixture in sorted(LABELS):
+        test_segments_match_recorded_speech(fixture)
+    test_short_burst_is_discarded_without_barge_in()
+    test_speech_start_fires_at_onset()
+    test_chunk_size_does_not_change_segments()
+    print("✅ Endpointer por VAD OK!")
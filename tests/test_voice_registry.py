@@ -0,0 +1,156 @@
+# test_voice_registry.py - Engines de voz em paralelo, future de prontidão e upgrade
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.voice_registry import VoiceCandidate, VoiceRegistry
+
+class FakeVoice:
+    """Sistema de voz com tempo de inicialização e síntese de teste configuráveis"""
+
+    def __init__(self, init_seconds: float, probe_latency=None, fails: bool = False):
+        self.init_seconds = init_seconds
+        self.probe_latency = None
+        self._probe = probe_latency
+        self.fails = fails
+        self.is_initialized = False
+        self.initialize_calls = 0
+
+    async def initialize(self):
+        self.initialize_calls += 1
+        await asyncio.sleep(self.init_seconds)
+        if self.fails:
+            raise RuntimeError("sem rede")
+        self.probe_latency = self._probe
+        self.is_initialized = True
+
+    async def speak(self, text: str, emotion: str = "neutro"):
+        pass
+
+class SelfStartingVoice(FakeVoice):
+    """Sistema que dispara a própria inicialização no construtor (como o CoquiHumanVoice)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.init_task = asyncio.create_task(self.initialize())
+
+def candidate(name: str, rank: int, **kwargs) -> VoiceCandidate:
+    return VoiceCandidate(name, name.upper(), lambda: FakeVoice(**kwargs), rank)
+
+FALLBACK = VoiceCandidate("texto", "TEXTO", lambda: FakeVoice(0))
+
+def test_first_acceptable_then_background_upgrade():
+    """Pronto com o primeiro aceitável; o melhor assume quando fica pronto"""
+    async def scenario():
+        registry = VoiceRegistry([
+            candidate("xtts", 3, init_seconds=0.15, probe_latency=0.5),
+            candidate("gtts", 2, init_seconds=0.02, probe_latency=0.3),
+            candidate("pyttsx3", 1, init_seconds=0.05),
+        ], FALLBACK, latency_bar=1.0)
+        changes = []
+        registry.on_change = lambda status, previous: changes.append(
+            (status.name, previous.name if previous else None))
+
+        start = time.perf_counter()
+        first = await registry.wait_ready()
+        ready_time = time.perf_counter() - start
+        await asyncio.sleep(0.2)
+        return first.name, ready_time, registry.active.name, changes, registry
+
+    first, ready_time, active, changes, registry = asyncio.run(scenario())
+    assert first == "gtts" and ready_time < 0.1
+    assert active == "xtts"
+    assert changes == [("gtts", None), ("xtts", "gtts")]   # pyttsx3 (rank menor) não troca
+    assert registry.statuses["xtts"].system.initialize_calls == 1
+
+def test_engine_over_latency_bar_is_skipped():
+    """Engine pronto mas lento na síntese de teste não é usado"""
+    async def scenario():
+        registry = VoiceRegistry([
+            candidate("xtts", 3, init_seconds=0.01, probe_latency=4.0),
+            candidate("gtts", 2, init_seconds=0.05, probe_latency=0.4),
+        ], FALLBACK, latency_bar=2.0)
+        status = await registry.wait_ready()
+        await asyncio.sleep(0.02)
+        return status.name, registry.active.name, registry.get_info()
+
+    first, active, info = asyncio.run(scenario())
+    assert first == active == "gtts"
+    assert info["engines"]["xtts"]["ready"] and info["engines"]["xtts"]["probe_ms"] == 4000
+
+def test_all_failed_uses_fallback_without_waiting_timeout():
+    """Todos falharam: fallback na hora, não no fim do ready_timeout"""
+    async def scenario():
+        registry = VoiceRegistry([
+            candidate("gtts", 2, init_seconds=0.01, fails=True),
+            candidate("pyttsx3", 1, init_seconds=0.02, fails=True),
+        ], FALLBACK, ready_timeout=5.0)
+        start = time.perf_counter()
+        status = await registry.wait_ready()
+        elapsed = time.perf_counter() - start
+        await registry.close()
+        return status.name, elapsed, registry.get_info()
+
+    name, elapsed, info = asyncio.run(scenario())
+    assert name == "texto" and elapsed < 0.5
+    assert info["engines"]["gtts"]["error"] == "sem rede"
+
+def test_ready_timeout_falls_back_then_upgrades():
+    """Nada pronto no prazo: fallback; o engine lento assume quando termina"""
+    async def scenario():
+        registry = VoiceRegistry([candidate("xtts", 3, init_seconds=0.2)], FALLBACK, ready_timeout=0.05)
+        status = await registry.wait_ready()
+        await asyncio.sleep(0.25)
+        return status.name, registry.active.name
+
+    assert asyncio.run(scenario()) == ("texto", "xtts")
+
+def test_benchmark_future_vs_polling(poll_interval: float = 0.2, init_seconds: float = 0.03):
+    """Prontidão por polling (is_initialized a cada intervalo) contra o future"""
+    async def polling():
+        voice = FakeVoice(init_seconds)
+        asyncio.ensure_future(voice.initialize())
+        start = time.perf_counter()
+        while not voice.is_initialized:
+            await asyncio.sleep(poll_interval)
+        return time.perf_counter() - start
+
+    async def future():
+        registry = VoiceRegistry([candidate("gtts", 2, init_seconds=init_seconds)], FALLBACK)
+        start = time.perf_counter()
+        await registry.wait_ready()
+        elapsed = time.perf_counter() - start
+        await registry.close()
+        return elapsed
+
+    polled = asyncio.run(polling())
+    awaited = asyncio.run(future())
+    print(f"\n📊 Engine pronto em {init_seconds * 1000:.0f} ms (polling a cada {poll_interval * 1000:.0f} ms)")
+    print(f"   Polling: fala liberada em {polled * 1000:.0f} ms")
+    print(f"   Future:  fala liberada em {awaited * 1000:.0f} ms")
+    assert awaited < polled
+
+def test_self_starting_system_is_initialized_once():
+    """Inicialização já em andamento (init_task) é aguardada, não repetida"""
+    async def scenario():
+        registry = VoiceRegistry([
+            VoiceCandidate("xtts", "XTTS", lambda: SelfStartingVoice(0.05, probe_latency=0.2), 3),
+        ], FALLBACK, latency_bar=1.0)
+        first = await registry.wait_ready()
+        return first, registry.statuses["xtts"].system
+
+    first, system = asyncio.run(scenario())
+    assert first.name == "xtts" and system.is_initialized
+    assert system.initialize_calls == 1
+
+if __name__ == "__main__":
+    test_first_acceptable_then_background_upgrade()
+    test_engine_over_latency_bar_is_skipped()
+    test_all_failed_uses_fallback_without_waiting_timeout()
+    test_ready_timeout_falls_back_then_upgrades()
+    test_self_starting_system_is_initialized_once()
+    print("✅ Registro de vozes OK!")
@@ -1,4 +1,5 @@
 """Módulo de utilitários"""
 
-# Adicione aqui quando criar os utilitários
-__all__ = []
\ No newline at end of file
+from .nlu import Utterance, as_utterance, fold_accents
+
+__all__ = ['Utterance', 'as_utterance', 'fold_accents']
\ No newline at end of file
@@ -0,0 +1,86 @@
+# utils/nlu.py - Normalização compartilhada de texto para os analisadores
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Pattern, Tuple, Union
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def _build_fold_table() -> Dict[int, str]:
+    """Tabela de remoção de acentos que preserva o tamanho do texto (á -> a, ç -> c)"""
+    table = {}
+    for code in range(0x00C0, 0x0250):
+        char = chr(code)
+        base = unicodedata.normalize("NFD", char)[0]
+        if base != char and base.isascii():
+            table[code] = base
+    return table
+
+_FOLD_TABLE = _build_fold_table()
+
+def fold_accents(text: str) -> str:
+    """Remove acentos mantendo os mesmos offsets do texto original"""
+    return text.translate(_FOLD_TABLE)
+
+def compile_any(patterns: List[str]) -> Pattern:
+    """Combina vários padrões em uma única regex (uma varredura por grupo)"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+def compile_literals(literals: List[str]) -> Pattern:
+    """Pré-filtro literal: casa se qualquer um dos literais aparecer no texto"""
+    return re.compile("|".join(re.escape(literal) for literal in literals))
+
+@dataclass
+class Utterance:
+    """Entrada do usuário normalizada uma única vez por turno"""
+    raw: str
+    lower: str                                    # raw.lower() - mesmos offsets das regex antigas
+    folded: str                                   # lower sem acentos (mesmo tamanho de lower)
+    tokens: List[str] = field(default_factory=list)
+    spans: List[Tuple[int, int]] = field(default_factory=list)
+    keywords: Dict[str, List[int]] = field(default_factory=dict)  # token sem acento -> posições
+    has_digits: bool = False
+
+    @classmethod
+    def from_text(cls, text: str) -> "Utterance":
+        """Normaliza, remove acentos, tokeniza e indexa as palavras"""
+        lower = text.lower()
+        folded = fold_accents(lower)
+
+        tokens = []
+        spans = []
+        keywords: Dict[str, List[int]] = {}
+        for index, match in enumerate(_TOKEN_PATTERN.finditer(lower)):
+            tokens.append(match.group(0))
+            spans.append(match.span())
+            keywords.setdefault(folded[match.start():match.end()], []).append(index)
+
+        return cls(
+            raw=text,
+            lower=lower,
+            folded=folded,
+            tokens=tokens,
+            spans=spans,
+            keywords=keywords,
+            has_digits=any(char.isdigit() for char in lower)
+        )
+
+    def has_keyword(self, *words: str) -> bool:
+        """Verifica no índice se alguma palavra inteira (sem acento) aparece"""
+        return any(fold_accents(word) in self.keywords for word in words)
+
+    def mentions(self, *literals: str) -> bool:
+        """Verifica se algum literal aparece em qualquer posição (literais já sem acento)"""
+        return any(literal in self.folded for literal in literals)
+
+    def word_count(self) -> int:
+        return len(self.lower.split())
+
+    def __str__(self) -> str:
+        return self.raw
+
+def as_utterance(text: Union[str, Utterance]) -> Utterance:
+    """Aceita texto cru ou Utterance já construída"""
+    if isinstance(text, Utterance):
+        return text
+    return Utterance.from_text(text)